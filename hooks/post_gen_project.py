@@ -3,11 +3,29 @@ This script handles post-project generation tasks:
 1. Poetry Environment Setup: Creates and configures Poetry environment with optional groups
 2. Data Science Tools Setup: Configures DVC, MLflow, and Jupyter if selected
 3. Git Repository Initialization: Initializes Git repository if selected
+
+All dependency groups (including MLflow and DVC) are written to pyproject.toml
+first and resolved and installed in a single pass, instead of one `poetry add`
+(and one full resolution) per group. As with `poetry add`, packages without a
+constraint then get a caret bound on the installed version (e.g. "^2.2.3").
+
+Offline mode installs from a pre-built lock file and a local wheel directory
+without network access. It is enabled with environment variables:
+
+- CCDS_OFFLINE=1: install without network access.
+- CCDS_LOCK_FILE: poetry.lock to reuse (generated for the same dependency choices).
+- CCDS_WHEEL_DIR: directory of wheels, e.g. built with `pip wheel -w`.
 """
 
+import json
 import os
+import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
+from contextlib import contextmanager
 from colorama import Fore, Style, just_fix_windows_console
 
 # Initialize Colorama for Windows compatibility
@@ -33,6 +51,42 @@ DATA_SCIENCE_DEPENDENCIES = "{{ cookiecutter.data_science_dependencies }}"
 VIZ_DEPENDENCIES = "{{ cookiecutter.vizualization_dependencies }}"
 TEST_DEPENDENCIES = "{{ cookiecutter.testing_dependencies }}"
 
+# Offline installation settings
+OFFLINE = os.environ.get("CCDS_OFFLINE", "").lower() in {"1", "true", "yes"}
+LOCK_FILE = os.environ.get("CCDS_LOCK_FILE", "")
+WHEEL_DIR = os.environ.get("CCDS_WHEEL_DIR", "")
+
+# Dependency specification: name, optional extras and optional version constraint
+DEPENDENCY_PATTERN = re.compile(
+    r"^(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[(?P<extras>[^\]]*)\])?\s*(?P<constraint>.*)$"
+)
+
+# Elapsed seconds per setup phase, reported at the end
+PHASE_TIMINGS = []
+
+
+@contextmanager
+def timed_phase(name):
+    """Time a setup phase and record it for the final summary."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        PHASE_TIMINGS.append((name, elapsed))
+        print(f"{MSG_COLOR}[{elapsed:6.2f}s] {name}{RESET_ALL}")
+
+
+def print_timings():
+    """Print the time spent in each setup phase."""
+    if not PHASE_TIMINGS:
+        return
+    total = sum(elapsed for _, elapsed in PHASE_TIMINGS)
+    print(f"{MSG_COLOR}Setup timings:{RESET_ALL}")
+    for name, elapsed in PHASE_TIMINGS:
+        print(f"{MSG_COLOR}  {name:<28} {elapsed:7.2f}s{RESET_ALL}")
+    print(f"{MSG_COLOR}  {'total':<28} {total:7.2f}s{RESET_ALL}")
+
 
 # --- Environment Setup ---
 def configure_poetry():
@@ -48,47 +102,225 @@ def configure_poetry():
         sys.exit(1)
 
 
-def add_dependencies():
-    """Add user-specified dependencies to poetry for each group."""
+def split_dependencies(dep_string):
+    """Split a comma-separated dependency string into package specifications."""
+    return [pkg.strip() for pkg in dep_string.strip().split(",") if pkg.strip()]
+
+
+def collect_dependencies():
+    """
+    Collect the user-specified dependencies of every group.
+
+    Returns a dict mapping the group name ("main" for the project dependencies)
+    to the sorted package specifications of that group.
+    """
     # Always include these in dev dependencies
     always_dev = {"mypy", "ruff", "black", "pre-commit"}
-    # Handle dev dependencies
-    dev_pkgs = {pkg.strip()
-                for pkg in DEV_DEPENDENCIES.strip().split(",") if pkg.strip()}
-    dev_pkgs.update(always_dev)
-    dev_pkgs = sorted(dev_pkgs)
-    if dev_pkgs:
-        print(
-            f"{MSG_COLOR}Adding dev dependencies: {', '.join(dev_pkgs)} --group dev{RESET_ALL}")
-        try:
-            subprocess.check_call(
-                ["poetry", "add", "--group", "dev"] + dev_pkgs)
-        except subprocess.CalledProcessError as e:
-            print(f"{ERROR_COLOR}Error adding dev dependencies: {e}{RESET_ALL}")
-            sys.exit(1)
-
-    # Handle other groups
-    dep_groups = [
-        (PROJECT_DEPENDENCIES, []),
-        (NOTEBOOK_DEPENDENCIES, ["--group", "notebook"]),
-        (DATA_SCIENCE_DEPENDENCIES, ["--group", "data-science"]),
-        (VIZ_DEPENDENCIES, ["--group", "viz"]),
-        (TEST_DEPENDENCIES, ["--group", "test"]),
-    ]
-    for dep_string, group_args in dep_groups:
-        dep_string = dep_string.strip()
-        if dep_string:
-            pkgs = [pkg.strip()
-                    for pkg in dep_string.split(",") if pkg.strip()]
-            if pkgs:
-                print(
-                    f"{MSG_COLOR}Adding dependencies: {', '.join(pkgs)} {' '.join(group_args)}{RESET_ALL}")
-                try:
-                    subprocess.check_call(
-                        ["poetry", "add"] + group_args + pkgs)
-                except subprocess.CalledProcessError as e:
-                    print(f"{ERROR_COLOR}Error adding dependencies: {e}{RESET_ALL}")
-                    sys.exit(1)
+    dev_pkgs = set(split_dependencies(DEV_DEPENDENCIES)) | always_dev
+
+    data_science_pkgs = set(split_dependencies(DATA_SCIENCE_DEPENDENCIES))
+    if USE_MLFLOW.lower() == "yes":
+        data_science_pkgs.add("mlflow")
+    if USE_DVC.lower() == "yes":
+        data_science_pkgs.add("dvc")
+
+    groups = {
+        "main": set(split_dependencies(PROJECT_DEPENDENCIES)),
+        "dev": dev_pkgs,
+        "notebook": set(split_dependencies(NOTEBOOK_DEPENDENCIES)),
+        "data-science": data_science_pkgs,
+        "viz": set(split_dependencies(VIZ_DEPENDENCIES)),
+        "test": set(split_dependencies(TEST_DEPENDENCIES)),
+    }
+    return {group: unique_dependencies(pkgs) for group, pkgs in groups.items() if pkgs}
+
+
+def normalize_name(name):
+    """Normalize a package name as in poetry.lock (lowercase, dashes)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def unique_dependencies(specs):
+    """
+    Keep one specification per package, sorted by name.
+
+    A specification with a constraint or extras (e.g. "black>=24") takes
+    precedence over the bare package name.
+    """
+    by_name = {}
+    for spec in sorted(specs):
+        match = DEPENDENCY_PATTERN.match(spec)
+        name = normalize_name(match.group("name")) if match else spec
+        if len(spec) > len(by_name.get(name, "")):
+            by_name[name] = spec
+    return [by_name[name] for name in sorted(by_name)]
+
+
+def format_dependency(spec, versions=None):
+    """
+    Format a package specification (e.g. "black>=24", "dvc[s3]") as a TOML entry.
+
+    A package without a constraint gets a caret bound on its version in
+    `versions` (a dict of normalized name to version), like `poetry add`,
+    or "*" if its version is not known yet.
+    """
+    match = DEPENDENCY_PATTERN.match(spec)
+    if match is None:
+        print(f"{ERROR_COLOR}Invalid dependency specification: {spec}{RESET_ALL}")
+        sys.exit(1)
+    name = match.group("name")
+    constraint = match.group("constraint").strip()
+    if not constraint:
+        version = (versions or {}).get(normalize_name(name))
+        constraint = f"^{version}" if version else "*"
+    extras = [extra.strip()
+              for extra in (match.group("extras") or "").split(",") if extra.strip()]
+    if extras:
+        extras_list = ", ".join(f'"{extra}"' for extra in extras)
+        # Built without f-string brace escapes, which Jinja would try to render
+        return name + ' = { version = "' + constraint + '", extras = [' + extras_list + "] }"
+    return f'{name} = "{constraint}"'
+
+
+def write_dependencies(groups, versions=None, pyproject_path="pyproject.toml"):
+    """
+    Write all dependency groups to pyproject.toml without resolving them.
+
+    Project dependencies are added to [tool.poetry.dependencies]; every other
+    group gets its own [tool.poetry.group.<name>.dependencies] table. See
+    `format_dependency` for `versions`.
+    """
+    print(f"{MSG_COLOR}Writing dependency groups to {pyproject_path}...{RESET_ALL}")
+    with open(pyproject_path, encoding="utf-8") as f:
+        content = f.read()
+
+    main_table = "[tool.poetry.dependencies]\n"
+    if main_table not in content:
+        print(f"{ERROR_COLOR}{main_table.strip()} not found in {pyproject_path}{RESET_ALL}")
+        sys.exit(1)
+
+    main_pkgs = groups.get("main", [])
+    if main_pkgs:
+        # Insert the project dependencies at the end of the main table
+        table_start = content.index(main_table) + len(main_table)
+        table_end = content.find("\n[", table_start)
+        table_end = len(content) if table_end == -1 else table_end
+        entries = "".join(f"{format_dependency(pkg, versions)}\n" for pkg in main_pkgs)
+        content = content[:table_end].rstrip("\n") + "\n" + entries + content[table_end:]
+        print(f"{MSG_COLOR}Adding dependencies: {', '.join(main_pkgs)}{RESET_ALL}")
+
+    group_tables = []
+    for group, pkgs in groups.items():
+        if group == "main":
+            continue
+        entries = "".join(f"{format_dependency(pkg, versions)}\n" for pkg in pkgs)
+        group_tables.append(f"[tool.poetry.group.{group}.dependencies]\n{entries}")
+        print(f"{MSG_COLOR}Adding dependencies: {', '.join(pkgs)} --group {group}{RESET_ALL}")
+
+    if group_tables:
+        # Group tables go right after the main dependency table
+        marker = "\n[build-system]"
+        insert_at = content.find(marker)
+        insert_at = len(content) if insert_at == -1 else insert_at
+        block = "\n" + "\n".join(group_tables)
+        content = content[:insert_at].rstrip("\n") + "\n" + block + content[insert_at:]
+
+    with open(pyproject_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def pin_lower_bounds(groups, versions, pyproject_path="pyproject.toml"):
+    """Replace the "*" constraints written to pyproject.toml by caret bounds."""
+    print(f"{MSG_COLOR}Writing version bounds to {pyproject_path}...{RESET_ALL}")
+    with open(pyproject_path, encoding="utf-8") as f:
+        content = f.read()
+    for pkgs in groups.values():
+        for pkg in pkgs:
+            entry = format_dependency(pkg)
+            bounded = format_dependency(pkg, versions)
+            content = content.replace(f"\n{entry}\n", f"\n{bounded}\n", 1)
+    with open(pyproject_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def install_dependencies(groups):
+    """Resolve all groups once and install them into the project environment."""
+    print(f"{MSG_COLOR}Resolving and installing dependencies...{RESET_ALL}")
+    try:
+        # Without a lock file, `poetry install` resolves all groups in one pass
+        # and writes poetry.lock before installing
+        subprocess.check_call(["poetry", "install"])
+        pin_lower_bounds(groups, read_locked_versions("poetry.lock"))
+        # Only refreshes the lock file hash: Poetry 2 keeps the locked
+        # versions, which satisfy the new bounds
+        subprocess.check_call(["poetry", "lock"])
+        print(f"{MSG_COLOR}Dependencies installed successfully.{RESET_ALL}")
+    except subprocess.CalledProcessError as e:
+        print(f"{ERROR_COLOR}Error installing dependencies: {e}{RESET_ALL}")
+        sys.exit(1)
+
+
+def read_locked_versions(lock_path):
+    """Return the version of every package in a poetry.lock file, by name."""
+    import tomllib
+
+    with open(lock_path, "rb") as f:
+        lock = tomllib.load(f)
+    return {normalize_name(pkg["name"]): pkg["version"] for pkg in lock.get("package", [])}
+
+
+def read_installed_versions():
+    """Return the version of every package installed in the project environment."""
+    output = subprocess.check_output(
+        ["poetry", "run", "python", "-m", "pip", "list", "--format=json"], text=True)
+    return {normalize_name(pkg["name"]): pkg["version"] for pkg in json.loads(output)}
+
+
+def install_dependencies_offline(groups):
+    """
+    Install all groups from a local wheel directory without network access.
+
+    The pre-built lock file (if given) is copied to poetry.lock and its pins are
+    used as pip constraints, so the environment matches the lock exactly. The
+    project itself is then installed in editable mode; without a lock file it
+    is built from the wheel directory, which must contain poetry-core.
+    """
+    print(f"{MSG_COLOR}Installing dependencies offline from {WHEEL_DIR}...{RESET_ALL}")
+    if not WHEEL_DIR or not os.path.isdir(WHEEL_DIR):
+        print(f"{ERROR_COLOR}Offline mode requires CCDS_WHEEL_DIR to be an existing "
+              f"directory of wheels.{RESET_ALL}")
+        sys.exit(1)
+
+    pip_command = ["poetry", "run", "python", "-m", "pip", "install",
+                   "--no-index", "--find-links", WHEEL_DIR]
+    # Without a lock file, `poetry install --only-root` would try to resolve online
+    root_command = (["poetry", "install", "--only-root"] if LOCK_FILE
+                    else pip_command + ["--no-deps", "-e", "."])
+    constraints_path = None
+    if LOCK_FILE:
+        shutil.copyfile(LOCK_FILE, "poetry.lock")
+        pins = read_locked_versions("poetry.lock").items()
+        with tempfile.NamedTemporaryFile(
+                "w", suffix=".txt", delete=False, encoding="utf-8") as f:
+            f.write("".join(f"{name}=={version}\n" for name, version in pins))
+        constraints_path = f.name
+        pip_command += ["--constraint", constraints_path]
+
+    requirements = sorted({pkg for pkgs in groups.values() for pkg in pkgs})
+    try:
+        subprocess.check_call(pip_command + requirements)
+        # Install the project itself; all dependencies are already present
+        subprocess.check_call(root_command)
+        if not LOCK_FILE:
+            # With a lock file the bounds were written from it up front
+            pin_lower_bounds(groups, read_installed_versions())
+        print(f"{MSG_COLOR}Dependencies installed successfully.{RESET_ALL}")
+    except subprocess.CalledProcessError as e:
+        print(f"{ERROR_COLOR}Error installing dependencies offline: {e}{RESET_ALL}")
+        sys.exit(1)
+    finally:
+        if constraints_path:
+            os.remove(constraints_path)
 
 
 def create_env_file():
@@ -104,26 +336,11 @@ def create_env_file():
 
 
 # --- Data Science Tools Setup ---
-def setup_mlflow():
-    """Configure MLflow if selected."""
-    print(f"{MSG_COLOR}Setting up MLflow...{RESET_ALL}")
-    try:
-        subprocess.check_call(["poetry", "add"] +
-                              ["--group", "data-science", "mlflow"])
-        print(f"{MSG_COLOR}MLflow directory created successfully.{RESET_ALL}")
-    except subprocess.CalledProcessError as e:
-        print(f"{ERROR_COLOR}Error setting up MLflow: {e}{RESET_ALL}")
-        sys.exit(1)
-
-
 def setup_dvc():
-    """Initialize DVC if selected."""
+    """Initialize DVC if selected (installed with the data-science group)."""
     print(f"{MSG_COLOR}Setting up DVC...{RESET_ALL}")
     try:
-        subprocess.check_call(["poetry", "add"] +
-                              ["--group", "data-science", "dvc"])
-        # Initialize DVC repository
-        subprocess.check_call(["dvc", "init"])
+        subprocess.check_call(["poetry", "run", "dvc", "init"])
         print(f"{MSG_COLOR}DVC initialized successfully.{RESET_ALL}")
     except subprocess.CalledProcessError as e:
         print(f"{ERROR_COLOR}Error initializing DVC: {e}{RESET_ALL}")
@@ -158,24 +375,35 @@ def main():
 
     # Handle virtual environment setup
     if INITIALIZE_POETRY_ENV.lower() == "yes":
-        configure_poetry()
-        add_dependencies()
+        with timed_phase("configure poetry"):
+            configure_poetry()
+        groups = collect_dependencies()
+        # A pre-built lock file gives the versions, hence the bounds, up front
+        versions = read_locked_versions(LOCK_FILE) if OFFLINE and LOCK_FILE else None
+        with timed_phase("write pyproject.toml"):
+            write_dependencies(groups, versions)
+        if OFFLINE:
+            with timed_phase("install (offline)"):
+                install_dependencies_offline(groups)
+        else:
+            with timed_phase("resolve and install"):
+                install_dependencies(groups)
         create_env_file()
-        # Handle data science tools setup
-        if USE_MLFLOW.lower() == "yes":
-            setup_mlflow()
-
+        # Handle data science tools setup (MLflow is installed with its group)
         if USE_DVC.lower() == "yes":
-            setup_dvc()
+            with timed_phase("dvc init"):
+                setup_dvc()
     else:
         print(f"{MSG_COLOR}Skipping virtual environment setup.{RESET_ALL}")
 
     # Handle Git repository initialization
     if INITIALIZE_GIT_REPOSITORY.lower() == "yes":
-        initialize_git()
+        with timed_phase("git init"):
+            initialize_git()
     else:
         print(f"{MSG_COLOR}Skipping Git repository initialization.{RESET_ALL}")
 
+    print_timings()
     print(f"{MSG_COLOR}All post-generation tasks completed!{RESET_ALL}")
 
 
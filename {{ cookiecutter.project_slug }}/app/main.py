@@ -1,4 +1,246 @@
-from {{ cookiecutter.module_name }}.__main__ import main
+"""
+Micro-batching inference server for models saved with `save_model`.
+
+A dependency-free asyncio HTTP/1.1 server (with keep-alive) in front of
+`{{ cookiecutter.module_name }}.models.serving`. Concurrent requests for a model are scored together in
+micro-batches, and models are loaded once at startup and kept in memory.
+
+Endpoints:
+    POST /predict/<model>  {"instances": [{"feature": value, ...}, ...]}
+                           -> {"predictions": [...]}
+    GET  /metrics          -> p50/p90/p99 latency, throughput and drift per model
+    GET  /health           -> {"status": "ok", "models": [...]}
+
+Usage:
+    python app/main.py --models-dir models --port 8000
+    python app/main.py --model churn=models/model.joblib --max-latency-ms 2
+    python scripts/load_test.py --data data/processed/features.parquet
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.models.serving import ModelRegistry
+from {{ cookiecutter.module_name }}.utils.paths import models_dir
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status code and a JSON message."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def read_request(
+    reader: asyncio.StreamReader
+) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """
+    Read one HTTP request.
+
+    Returns
+    -------
+    tuple or None
+        Method, path, lower-cased headers and body, or None if the client
+        closed the connection.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line") from None
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Content-Length must be an integer") from None
+    if length < 0:
+        raise HTTPError(400, "Content-Length must not be negative")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    payload: Any,
+    keep_alive: bool
+) -> None:
+    """Write a JSON response."""
+    body = json.dumps(payload, default=_json_default).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+class InferenceServer:
+    """
+    HTTP front end of a `ModelRegistry`.
+
+    Parameters
+    ----------
+    registry : ModelRegistry
+        Models to serve.
+    """
+
+    def __init__(self, registry: ModelRegistry) -> None:
+        self.registry = registry
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Any:
+        """Route a request and return the JSON payload."""
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            return {"status": "ok", "models": sorted(self.registry.models)}
+        if path == "/metrics":
+            return self.registry.metrics()
+        if path.startswith("/predict/"):
+            if method != "POST":
+                raise HTTPError(405, "Use POST to predict")
+            return await self.predict(path[len("/predict/"):], body)
+        raise HTTPError(404, f"Unknown path: {path}")
+
+    async def predict(self, name: str, body: bytes) -> Dict[str, List[Any]]:
+        """Score the instances of a request with the micro-batcher of `name`."""
+        if name not in self.registry.models:
+            raise HTTPError(404, f"Unknown model: {name}")
+        try:
+            instances = json.loads(body)["instances"]
+            X = pd.DataFrame.from_records(instances)
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPError(
+                400, f"Expected a JSON object with an 'instances' list: {e}"
+            ) from e
+        if X.empty:
+            return {"predictions": []}
+        try:
+            predictions = await self.registry.batcher(name).submit(X)
+        except ValueError as e:
+            # Invalid features, e.g. missing columns or non-numeric values
+            raise HTTPError(400, f"Invalid instances: {e}") from e
+        except Exception as e:
+            raise HTTPError(500, f"Prediction failed: {e}") from e
+        return {"predictions": predictions.tolist()}
+
+    async def handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the requests of one connection until it is closed."""
+        try:
+            while True:
+                # A request that cannot be parsed leaves the stream unusable
+                keep_alive = False
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = 200, await self.dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        """Serve until interrupted, then stop the micro-batchers."""
+        server = await asyncio.start_server(self.handle, host, port)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows
+                pass
+        print(f"Serving {', '.join(sorted(self.registry.models))} on http://{host}:{port}")
+        async with server:
+            await stop.wait()
+        await self.registry.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    serving = get_settings().serving
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models-dir", default=None,
+                        help="Serve every saved model of this directory "
+                             "(default: models/).")
+    parser.add_argument("--model", action="append", default=[], metavar="NAME=PATH",
+                        help="Serve a saved model under NAME. May be repeated.")
+    parser.add_argument("--host", default=serving.host)
+    parser.add_argument("--port", type=int, default=serving.port)
+    parser.add_argument("--max-batch-size", type=int, default=None,
+                        help="Maximum rows per micro-batch.")
+    parser.add_argument("--max-latency-ms", type=float, default=None,
+                        help="Maximum wait for a micro-batch to fill.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Load the models and serve them until interrupted."""
+    args = parse_args(argv)
+    options = {
+        "max_batch_size": args.max_batch_size,
+        "max_latency_ms": args.max_latency_ms,
+    }
+    if args.model:
+        paths = dict(item.split("=", 1) for item in args.model)
+        registry = ModelRegistry.from_paths(paths, **options)
+    else:
+        directory = args.models_dir or models_dir()
+        registry = ModelRegistry.from_directory(directory, **options)
+    if not registry.models:
+        print("No models to serve.", file=sys.stderr)
+        return 1
+
+    asyncio.run(InferenceServer(registry).serve(args.host, args.port))
+    return 0
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Compare pytest-benchmark results against a baseline.
+
+Exits with a non-zero status if any benchmark got slower or used more peak
+memory than the baseline by more than the allowed tolerance, so that
+``make bench`` fails loudly on regressions.
+
+Usage:
+    python scripts/compare_benchmarks.py reports/benchmarks/latest.json \
+        reports/benchmarks/baseline.json --time-tolerance 0.2
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def load_results(filepath: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Load a pytest-benchmark JSON file keyed by benchmark name.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to a file written with ``--benchmark-json``.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Mean time (seconds), rows and peak memory (bytes) per benchmark.
+    """
+    with open(filepath, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        bench["fullname"]: {
+            "mean": bench["stats"]["mean"],
+            "rows": bench["extra_info"].get("rows"),
+            "peak_memory_bytes": bench["extra_info"].get("peak_memory_bytes"),
+        }
+        for bench in data["benchmarks"]
+    }
+
+
+def find_regressions(
+    latest: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    time_tolerance: float,
+    memory_tolerance: float,
+) -> List[str]:
+    """
+    List the benchmarks whose time or memory regressed beyond the tolerances.
+
+    Parameters
+    ----------
+    latest : Dict[str, Dict[str, Any]]
+        Latest results from `load_results`.
+    baseline : Dict[str, Dict[str, Any]]
+        Baseline results from `load_results`.
+    time_tolerance : float
+        Allowed relative increase of the mean time (0.2 means 20%).
+    memory_tolerance : float
+        Allowed relative increase of the peak memory.
+
+    Returns
+    -------
+    List[str]
+        One message per regression.
+    """
+    regressions = []
+    for name, result in sorted(latest.items()):
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+
+        time_ratio = result["mean"] / reference["mean"]
+        if time_ratio > 1 + time_tolerance:
+            rows = result["rows"] or 1
+            regressions.append(
+                f"{name}: {time_ratio - 1:+.0%} time "
+                f"({rows / reference['mean']:,.0f} -> {rows / result['mean']:,.0f} rows/s)"
+            )
+
+        peak, reference_peak = result["peak_memory_bytes"], reference["peak_memory_bytes"]
+        if peak and reference_peak and peak > reference_peak * (1 + memory_tolerance):
+            regressions.append(
+                f"{name}: {peak / reference_peak - 1:+.0%} peak memory "
+                f"({reference_peak / 2**20:,.1f} -> {peak / 2**20:,.1f} MiB)"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Compare the results and report regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("latest", type=Path, help="latest benchmark results")
+    parser.add_argument("baseline", type=Path, help="baseline benchmark results")
+    parser.add_argument("--time-tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown (default: 0.2)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.2,
+                        help="allowed relative peak memory increase (default: 0.2)")
+    args = parser.parse_args()
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run 'make bench-baseline' to create one.")
+        return 0
+
+    regressions = find_regressions(
+        load_results(args.latest),
+        load_results(args.baseline),
+        args.time_tolerance,
+        args.memory_tolerance,
+    )
+    if regressions:
+        print(f"{len(regressions)} benchmark regression(s) against {args.baseline}:")
+        for message in regressions:
+            print(f"  - {message}")
+        return 1
+
+    print(f"No benchmark regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
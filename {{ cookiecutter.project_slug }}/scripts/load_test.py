@@ -0,0 +1,148 @@
+"""
+Load generator for the inference server in ``app/main.py``.
+
+Opens `--concurrency` keep-alive connections that send prediction requests
+back to back for `--duration` seconds. Each request holds `--rows` rows sampled
+from a feature dataset. Afterwards it prints the client-side latency
+percentiles and throughput, and the server's ``/metrics``.
+
+Usage:
+    python scripts/load_test.py --data data/processed/features.parquet \
+        --model model --concurrency 64 --duration 10 --rows 1
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+async def request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    path: str,
+    payload: Optional[bytes] = None
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Send one HTTP/1.1 request over a keep-alive connection.
+
+    Returns
+    -------
+    tuple of (int, dict)
+        Status code and decoded JSON body.
+    """
+    body = payload or b""
+    head = (
+        f"{method} {path} HTTP/1.1\r\n"
+        "Host: localhost\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(
+    host: str,
+    port: int,
+    path: str,
+    payloads: List[bytes],
+    deadline: float,
+    latencies: List[float],
+    errors: List[int]
+) -> None:
+    """Send requests on one connection until the deadline."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        i = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, "POST", path, payloads[i % len(payloads)])
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the load test and return the client and server statistics."""
+    df = pd.read_parquet(args.data) if args.data.suffix == ".parquet" else pd.read_csv(args.data)
+    df = df.drop(columns=[args.target], errors="ignore")
+
+    # Pre-encode the request bodies so that the client does not bottleneck
+    rng = np.random.default_rng(0)
+    payloads = []
+    for _ in range(256):
+        sample = df.iloc[rng.integers(0, len(df), args.rows)]
+        records = json.loads(sample.to_json(orient="records"))
+        payloads.append(json.dumps({"instances": records}).encode("utf-8"))
+
+    path = f"/predict/{args.model}"
+    latencies: List[float] = []
+    errors: List[int] = []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        client(args.host, args.port, path, payloads, deadline, latencies, errors)
+        for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, server_metrics = await request(reader, writer, "GET", "/metrics")
+    writer.close()
+
+    p50, p90, p99 = (np.percentile(latencies, [50, 90, 99]) * 1000) if latencies else (None,) * 3
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": len(latencies) / elapsed,
+        "rows_per_s": len(latencies) * args.rows / elapsed,
+        "latency_ms": {"p50": p50, "p90": p90, "p99": p99},
+        "server": server_metrics.get(args.model),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the inference server.")
+    parser.add_argument("--data", type=Path, required=True,
+                        help="Feature dataset (parquet or csv) to sample requests from.")
+    parser.add_argument("--model", default="model", help="Served model name.")
+    parser.add_argument("--target", default="target",
+                        help="Target column dropped from the dataset, if present.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Number of concurrent connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run.")
+    parser.add_argument("--rows", type=int, default=1, help="Rows per request.")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2, default=float))
+    return 1 if results["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Top-level package for {{ cookiecutter.project_name }}.
+
+Subpackages are loaded lazily so that importing the package (for example to
+run the CLI) stays fast and does not pull in the data science stack.
+"""
+
+from {{ cookiecutter.module_name }}.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["data", "features", "models", "utils", "visualization"],
+)
@@ -1,9 +1,590 @@
 """
 This module is used to run the CLI.
+
+Each pipeline stage is exposed as a subcommand sharing the same performance
+options (``--jobs``, ``--chunk-size``, ``--memory-limit`` and ``--profile``),
+so batch jobs can drive the pipeline without wrapper scripts::
+
+    my-cli make-dataset data/raw/input.csv data/interim/dataset.parquet
+    my-cli validate data/raw/input.csv --schema config/schema.yml
+    my-cli profile data/interim/dataset.parquet --jobs -1
+    my-cli build-features data/interim/dataset.parquet data/processed/features.parquet
+    my-cli train data/processed/features.parquet --target label --jobs -1
+    my-cli train data/processed/today.parquet --incremental --model-type sgd
+    my-cli predict models/model.joblib data/processed/new.parquet predictions.parquet
+    my-cli evaluate models/model.joblib data/processed/test.parquet --target label
+    my-cli pipeline --jobs -1
+
+Options that are not given default to the ``compute`` settings of
+``config/<env>.yml`` (see `config`), so production runs pick up more workers
+and bigger chunks than development runs without extra flags.
+
+Stage implementations are imported inside the command handlers so that
+``my-cli --help`` does not import the data science stack.
 """
 
-def main():
+import argparse
+import json
+import os
+import sys
+from typing import Any, Callable, List, Optional, Sequence
+
+from {{ cookiecutter.module_name }}.utils.parallel import parse_size
+
+
+def _parse_size(value: str) -> int:
+    """Parse a size such as ``512M`` (see `utils.parallel.parse_size`)."""
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _split_list(value: str) -> List[str]:
+    """Parse a comma separated list of column names."""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _parse_ints(value: str) -> List[int]:
+    """Parse a comma separated list of integers."""
+    return [int(item) for item in _split_list(value)]
+
+
+def _parse_values(value: str) -> List[Any]:
+    """Parse a comma separated list of values, decoding each as JSON if possible."""
+    values: List[Any] = []
+    for item in _split_list(value):
+        try:
+            values.append(json.loads(item))
+        except json.JSONDecodeError:
+            values.append(item)
+    return values
+
+
+def _parse_param(value: str) -> tuple[str, Any]:
+    """Parse a ``key=value`` model parameter, decoding the value as JSON if possible."""
+    key, sep, raw = value.partition('=')
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"Expected key=value, got {value!r}")
+    try:
+        return key, json.loads(raw)
+    except json.JSONDecodeError:
+        return key, raw
+
+
+def apply_memory_limit(limit_bytes: int) -> None:
+    """
+    Cap the address space of the current process.
+
+    Allocations above the limit raise ``MemoryError`` instead of pushing the
+    machine into swap. Only supported on POSIX systems.
+
+    Parameters
+    ----------
+    limit_bytes : int
+        Maximum address space in bytes.
+    """
+    try:
+        import resource
+    except ImportError:
+        print("Warning: --memory-limit is not supported on this platform",
+              file=sys.stderr)
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit_bytes = min(limit_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, hard))
+
+
+# --- Command handlers ---
+def _run_make_dataset(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.data.make_dataset import make_dataset
+
+    df = make_dataset(
+        args.input,
+        args.output,
+        chunk_size=args.chunk_size,
+        n_jobs=args.jobs,
+        drop_duplicates=not args.keep_duplicates,
+        partition_cols=args.partition_by,
+        schema=args.schema,
+        drop_invalid=args.drop_invalid,
+    )
+    print(f"Wrote {len(df)} rows to {args.output}")
+
+
+def _run_validate(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.data.validation import validate_dataset
+
+    report = validate_dataset(
+        args.data,
+        args.schema,
+        chunk_size=args.chunk_size,
+        max_samples=args.max_samples,
+    )
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2, default=str)
+    print(report.summary())
+    if not report.ok:
+        sys.exit(1)
+
+
+def _run_profile(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.utils.paths import reports_dir
+    from {{ cookiecutter.module_name }}.visualization.profile import profile_dataset
+
+    output_dir = args.output_dir or reports_dir('profile')
+    profile = profile_dataset(
+        args.data,
+        output_dir=output_dir,
+        columns=args.columns,
+        chunk_size=args.chunk_size,
+        n_jobs=args.jobs,
+        top_k=args.top_k,
+        figures=not args.no_figures,
+    )
+    print(f"Profiled {profile.rows} rows and {len(profile.columns)} columns "
+          f"into {output_dir}")
+
+
+def _run_fetch(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.data.fetch import FetchError, fetch_manifest
+
+    try:
+        results = fetch_manifest(
+            args.manifest,
+            names=args.only,
+            max_workers=args.connections,
+            force=args.force,
+        )
+    except FetchError as error:
+        results = error.results
+    for result in results:
+        if result.status == 'failed':
+            print(f"{result.name}: failed ({result.error})", file=sys.stderr)
+            continue
+        line = f"{result.name}: {result.status}"
+        if result.status == 'downloaded':
+            line += f" ({result.bytes} bytes{', resumed' if result.resumed else ''})"
+        print(f"{line} -> {result.path} [{result.checksum}]")
+    if any(result.status == 'failed' for result in results):
+        sys.exit(1)
+
+
+def _run_synthesize(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.data.synthetic import (
+        SyntheticSpec,
+        write_synthetic,
+    )
+
+    levels = tuple(args.cardinality)
+    cardinality = levels[0] if len(levels) == 1 else levels
+    spec = SyntheticSpec(
+        rows=args.rows,
+        numeric=args.numeric,
+        categorical=args.categorical,
+        datetime=args.datetime,
+        cardinality=cardinality,
+        null_rate=args.null_rate,
+        target=None if args.target == 'none' else args.target,
+        seed=args.seed,
+    )
+    write_synthetic(spec, args.output, chunk_size=args.chunk_size, n_jobs=args.jobs)
+    print(f"Wrote {spec.rows} rows and {len(spec.columns)} columns to {args.output}")
+
+
+def _run_build_features(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.features.build_features import (
+        build_features_file,
+    )
+
+    df_features = build_features_file(
+        args.input,
+        args.output,
+        target=args.target,
+        transformers_path=args.transformers_path,
+        use_cache=args.cache,
+        scale_columns=args.scale,
+        categorical_columns=args.categorical,
+        datetime_column=args.datetime,
+        interaction_columns=args.interactions,
+        selection=dict(args.select) or None,
+        chunk_size=args.chunk_size,
+        n_jobs=args.jobs,
+    )
+    print(f"Wrote {df_features.shape[1]} columns to {args.output}")
+
+
+def _run_train(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.models.train_model import (
+        train_model,
+        train_model_incremental,
+    )
+    from {{ cookiecutter.module_name }}.utils.paths import models_dir
+
+    model_path = args.model_path or models_dir('model.joblib')
+    if args.incremental:
+        train_model_incremental(
+            args.data,
+            target=args.target,
+            model_type=args.model_type,
+            task=args.task,
+            model_path=model_path,
+            checkpoint_path=args.checkpoint,
+            chunk_size=args.chunk_size,
+            classes=args.classes,
+            n_jobs=args.jobs,
+            **dict(args.param),
+        )
+        print(f"Saved model to {model_path}")
+        return
+    train_model(
+        args.data,
+        target=args.target,
+        model_type=args.model_type,
+        task=args.task,
+        model_path=model_path,
+        n_jobs=args.jobs,
+        **dict(args.param),
+    )
+    print(f"Saved model to {model_path}")
+
+
+def _run_predict(args: argparse.Namespace) -> None:
+    import pandas as pd
+
+    from {{ cookiecutter.module_name }}.data.data_loader import save_dataset
+    from {{ cookiecutter.module_name }}.models.predict_model import predict_model
+
+    predictions = predict_model(
+        args.model,
+        args.data,
+        chunk_size=args.chunk_size,
+        n_jobs=args.jobs,
+    )
+    save_dataset(pd.DataFrame({'prediction': predictions}), args.output)
+    print(f"Wrote {len(predictions)} predictions to {args.output}")
+
+
+def _run_evaluate(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.models.predict_model import evaluate_model
+
+    metrics = evaluate_model(
+        args.model,
+        args.data,
+        target=args.target,
+        task=args.task,
+        chunk_size=args.chunk_size,
+        n_jobs=args.jobs,
+    )
+    print(json.dumps({name: float(value) for name, value in metrics.items()}, indent=2))
+
+
+def _run_pipeline(args: argparse.Namespace) -> None:
+    from {{ cookiecutter.module_name }}.pipeline import Pipeline, default_pipeline
+
+    if args.dvc_file:
+        pipeline = Pipeline.from_dvc_yaml(args.dvc_file)
+    else:
+        pipeline = default_pipeline()
+
+    if args.export_dvc is not None:
+        print(f"Wrote {pipeline.to_dvc_yaml(args.export_dvc or None)}")
+        return
+    if args.status:
+        for name, status in pipeline.status().items():
+            print(f"{name}: {status}")
+        return
+
+    executed = pipeline.run(
+        targets=args.stages or None,
+        n_jobs=args.jobs,
+        force=args.force,
+        with_deps=not args.no_deps,
+        dry_run=args.dry_run,
+        profile=args.profile_format if args.profile else None,
+    )
+    verb = 'Would run' if args.dry_run else 'Ran'
+    print(f"{verb} {len(executed)} stage(s): {', '.join(executed) or 'none'}")
+
+
+# --- Argument parsing ---
+def _common_options() -> argparse.ArgumentParser:
+    """Options shared by every pipeline subcommand."""
+    parser = argparse.ArgumentParser(add_help=False)
+    group = parser.add_argument_group(
+        'performance options', 'defaults are read from config/<env>.yml')
+    group.add_argument(
+        '--env', default=None,
+        help='configuration environment, e.g. dev or prod')
+    group.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='number of parallel workers (-1 uses all CPUs)')
+    group.add_argument(
+        '--chunk-size', type=int, default=None,
+        help='process data in chunks of this many rows')
+    group.add_argument(
+        '--memory-limit', type=_parse_size, default=None, metavar='SIZE',
+        help='cap process memory, e.g. 512M or 8G (POSIX only)')
+    group.add_argument(
+        '--profile', action='store_true',
+        help='record spans and write a profile of the command to logs/')
+    group.add_argument(
+        '--profile-format', choices=['cprofile', 'collapsed'], default='cprofile',
+        help='cProfile stats (.prof) or flamegraph-ready collapsed stacks (.folded)')
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser for the CLI.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser with one subcommand per pipeline stage.
+    """
+    parser = argparse.ArgumentParser(
+        prog='my-cli',
+        description='Run the {{ cookiecutter.project_name }} pipeline stages.',
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    common = _common_options()
+
+    make_dataset = subparsers.add_parser(
+        'make-dataset', parents=[common], help='clean a raw dataset')
+    make_dataset.add_argument('input', help='raw data file')
+    make_dataset.add_argument('output', help='cleaned dataset (.parquet or .csv)')
+    make_dataset.add_argument(
+        '--keep-duplicates', action='store_true', help='keep duplicated rows')
+    make_dataset.add_argument(
+        '--partition-by', type=_split_list, metavar='COLS',
+        help='write a hive-partitioned Parquet directory split by COLS')
+    make_dataset.add_argument(
+        '--schema', metavar='PATH',
+        help='validate the cleaned rows against a YAML schema')
+    make_dataset.add_argument(
+        '--drop-invalid', action='store_true',
+        help='drop rows failing --schema instead of failing the stage')
+    make_dataset.set_defaults(handler=_run_make_dataset)
+
+    validate = subparsers.add_parser(
+        'validate', parents=[common], help='check a dataset against a schema')
+    validate.add_argument('data', help='dataset to check')
+    validate.add_argument(
+        '--schema', required=True, metavar='PATH', help='YAML schema file')
+    validate.add_argument(
+        '--output', metavar='PATH',
+        help='write the report with sample bad rows as JSON')
+    validate.add_argument(
+        '--max-samples', type=int, default=20,
+        help='number of sample bad rows to report')
+    validate.set_defaults(handler=_run_validate)
+
+    profile = subparsers.add_parser(
+        'profile', parents=[common],
+        help='profile a dataset in one streaming pass')
+    profile.add_argument('data', help='dataset to profile')
+    profile.add_argument(
+        '--output-dir', metavar='DIR',
+        help='report directory (default: reports/profile)')
+    profile.add_argument(
+        '--columns', type=_split_list, metavar='COLS',
+        help='columns to profile (default: all)')
+    profile.add_argument(
+        '--top-k', type=int, default=10,
+        help='most frequent values reported per column')
+    profile.add_argument(
+        '--no-figures', action='store_true', help='only write the JSON summary')
+    profile.set_defaults(handler=_run_profile)
+
+    fetch = subparsers.add_parser(
+        'fetch', parents=[common],
+        help='download the raw data files of the manifest')
+    fetch.add_argument(
+        '--manifest', metavar='PATH',
+        help='data manifest (default: config/data_manifest.yml)')
+    fetch.add_argument(
+        '--only', type=_split_list, metavar='NAMES',
+        help='files to download (default: all)')
+    fetch.add_argument(
+        '--connections', type=int, default=None,
+        help='maximum concurrent downloads (default: fetch.max_workers)')
+    fetch.add_argument(
+        '--force', action='store_true',
+        help='download files even if their checksum matches')
+    fetch.set_defaults(handler=_run_fetch)
+
+    synthesize = subparsers.add_parser(
+        'synthesize', parents=[common],
+        help='generate a synthetic dataset for load tests')
+    synthesize.add_argument(
+        'output', help='output file (.parquet, .csv, .npy or .xlsx)')
+    synthesize.add_argument('--rows', type=int, required=True, help='number of rows')
+    synthesize.add_argument(
+        '--numeric', type=int, default=4, help='number of numerical columns')
+    synthesize.add_argument(
+        '--categorical', type=int, default=2, help='number of categorical columns')
+    synthesize.add_argument(
+        '--datetime', type=int, default=1, help='number of datetime columns')
+    synthesize.add_argument(
+        '--cardinality', type=_parse_ints,
+        default=[100], metavar='N[,N...]',
+        help='levels of every categorical column, or of each one')
+    synthesize.add_argument(
+        '--null-rate', type=float, default=0.0, help='share of missing feature values')
+    synthesize.add_argument(
+        '--target', choices=['classification', 'regression', 'none'],
+        default='classification', help='kind of target column')
+    synthesize.add_argument('--seed', type=int, default=0, help='random seed')
+    synthesize.set_defaults(handler=_run_synthesize)
+
+    build_features = subparsers.add_parser(
+        'build-features', parents=[common], help='build the feature matrix')
+    build_features.add_argument('input', help='processed dataset')
+    build_features.add_argument('output', help='feature dataset (.parquet or .csv)')
+    build_features.add_argument(
+        '--target', default='target', help='target column passed through unchanged')
+    build_features.add_argument(
+        '--scale', type=_split_list, metavar='COLS', help='columns to scale')
+    build_features.add_argument(
+        '--categorical', type=_split_list, metavar='COLS',
+        help='columns to one-hot encode')
+    build_features.add_argument(
+        '--datetime', metavar='COL', help='datetime column to expand')
+    build_features.add_argument(
+        '--interactions', type=_split_list, metavar='COLS',
+        help='columns to create pairwise products from')
+    build_features.add_argument(
+        '--transformers-path', metavar='PATH',
+        help='reuse fitted transformers from PATH, or save them there')
+    build_features.add_argument(
+        '--cache', action='store_true',
+        help='reuse cached feature columns from data/processed/features')
+    build_features.add_argument(
+        '--select', type=_parse_param, action='append', default=[],
+        metavar='KEY=VALUE',
+        help='feature selector parameter, e.g. correlation_threshold=0.95; '
+             'may be repeated')
+    build_features.set_defaults(handler=_run_build_features)
+
+    train = subparsers.add_parser('train', parents=[common], help='train a model')
+    train.add_argument('data', help='training feature dataset')
+    train.add_argument('--target', default='target', help='target column')
+    train.add_argument('--model-type', default='random_forest', help='model type')
+    train.add_argument(
+        '--task', choices=['classification', 'regression', 'clustering'],
+        default='classification')
+    train.add_argument(
+        '--model-path', help='where to save the model (default: models/model.joblib)')
+    train.add_argument(
+        '--param', type=_parse_param, action='append', default=[],
+        metavar='KEY=VALUE', help='estimator parameter, may be repeated')
+    train.add_argument(
+        '--incremental', action='store_true',
+        help='train with partial_fit on chunks, updating the checkpointed model')
+    train.add_argument(
+        '--checkpoint', metavar='PATH',
+        help='incremental training checkpoint (default: model path with .ckpt suffix)')
+    train.add_argument(
+        '--classes', type=_parse_values, metavar='VALUES',
+        help='every class of the target, for incremental classification')
+    train.set_defaults(handler=_run_train)
+
+    predict = subparsers.add_parser(
+        'predict', parents=[common], help='score a dataset with a saved model')
+    predict.add_argument('model', help='saved model')
+    predict.add_argument('data', help='feature dataset')
+    predict.add_argument('output', help='predictions file (.parquet or .csv)')
+    predict.set_defaults(handler=_run_predict)
+
+    evaluate = subparsers.add_parser(
+        'evaluate', parents=[common], help='evaluate a saved model')
+    evaluate.add_argument('model', help='saved model')
+    evaluate.add_argument('data', help='labelled feature dataset')
+    evaluate.add_argument('--target', default='target', help='target column')
+    evaluate.add_argument(
+        '--task', choices=['classification', 'regression'], default='classification')
+    evaluate.set_defaults(handler=_run_evaluate)
+
+    pipeline = subparsers.add_parser(
+        'pipeline', parents=[common],
+        help='run the stage DAG, skipping up-to-date stages')
+    pipeline.add_argument('stages', nargs='*', help='stages to run (default: all)')
+    pipeline.add_argument(
+        '--force', action='store_true', help='run stages even if up to date')
+    pipeline.add_argument(
+        '--no-deps', action='store_true', help='do not run upstream stages')
+    pipeline.add_argument(
+        '--dry-run', action='store_true', help='only list the stages that would run')
+    pipeline.add_argument(
+        '--status', action='store_true', help='show whether each stage is up to date')
+    pipeline.add_argument(
+        '--dvc-file', metavar='PATH', help='read the stages from a dvc.yaml file')
+    pipeline.add_argument(
+        '--export-dvc', nargs='?', const='', metavar='PATH',
+        help='write the stages to a dvc.yaml file (default: ./dvc.yaml)')
+    pipeline.set_defaults(handler=_run_pipeline)
+
+    return parser
+
+
+def _apply_settings(args: argparse.Namespace) -> None:
+    """Fill performance options that were not given from the configuration."""
+    from {{ cookiecutter.module_name }}.config import ENV_PREFIX, ENV_VAR, get_settings
+
+    # Exported so that worker processes load the same configuration
+    if args.env:
+        os.environ[ENV_VAR] = args.env
+    if args.profile:
+        os.environ[f"{ENV_PREFIX}PROFILING__SPANS"] = 'true'
+    compute = get_settings().compute
+    if args.jobs is None:
+        args.jobs = compute.n_jobs
+    if args.chunk_size is None:
+        args.chunk_size = compute.chunk_size
+    if args.memory_limit is None and compute.memory_limit:
+        args.memory_limit = parse_size(compute.memory_limit)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     """
     Entry point for the CLI.
+
+    Parameters
+    ----------
+    argv : sequence of str, optional
+        Command line arguments (default is ``sys.argv[1:]``).
+
+    Returns
+    -------
+    int
+        Exit code.
     """
-    print("Hello from CLI!")
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 0
+
+    _apply_settings(args)
+    if args.memory_limit is not None:
+        apply_memory_limit(args.memory_limit)
+
+    handler: Callable[[argparse.Namespace], None] = args.handler
+    if args.profile and args.command != 'pipeline':
+        from {{ cookiecutter.module_name }}.utils.paths import logs_dir
+        from {{ cookiecutter.module_name }}.utils.profiling import profile_call
+
+        profile_call(
+            handler, args, name=args.command, output_format=args.profile_format
+        )
+        print(f"Profile and spans written to {logs_dir()}", file=sys.stderr)
+    else:
+        handler(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
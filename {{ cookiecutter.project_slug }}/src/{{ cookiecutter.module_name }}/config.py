@@ -0,0 +1,222 @@
+"""
+This module loads the environment-aware project configuration.
+
+Settings are read from ``config/<env>.yml`` (``dev`` by default, selected with
+the `{{ cookiecutter.module_name.upper() }}_ENV` environment variable), validated with pydantic and cached,
+so the files are only parsed once per process. Any value can be overridden
+with an environment variable named after its section and key, e.g.
+``{{ cookiecutter.module_name.upper() }}_COMPUTE__N_JOBS=8`` or ``{{ cookiecutter.module_name.upper() }}_PLOTTING__SHOW=false``.
+
+Example
+-------
+>>> from {{ cookiecutter.module_name }}.config import get_settings
+>>> settings = get_settings()
+>>> settings.compute.n_jobs
+2
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional
+
+import yaml
+from pydantic import BaseModel
+
+from {{ cookiecutter.module_name }}.utils.paths import config_dir, project_dir
+
+# Prefix of the environment variables overriding configuration values
+ENV_PREFIX = "{{ cookiecutter.module_name.upper() }}_"
+# Environment variable selecting the configuration file
+ENV_VAR = f"{ENV_PREFIX}ENV"
+DEFAULT_ENV = "dev"
+
+
+class ComputeSettings(BaseModel):
+    """Parallelism and memory settings."""
+
+    n_jobs: int = 1
+    backend: Literal['threads', 'processes'] = 'threads'
+    chunk_size: Optional[int] = None
+    memory_limit: Optional[str] = None
+
+
+class DataSettings(BaseModel):
+    """Data loading and dtype policies."""
+
+    csv_engine: Optional[Literal['c', 'python', 'pyarrow']] = None
+    excel_engine: Optional[Literal['calamine', 'openpyxl', 'xlrd', 'odf', 'pyxlsb']] = None
+    dtype_backend: Optional[Literal['numpy_nullable', 'pyarrow']] = None
+    float_dtype: Literal['float32', 'float64'] = 'float64'
+    dataframe_backend: Literal['pandas', 'polars', 'duckdb'] = 'pandas'
+    parquet_compression: Literal['snappy', 'zstd', 'gzip', 'brotli', 'lz4', 'none'] = 'snappy'
+    row_group_size: Optional[int] = None
+
+
+class CacheSettings(BaseModel):
+    """On-disk cache settings."""
+
+    dir: Path = Path('data/interim/cache')
+    features_dir: Path = Path('data/processed/features')
+    max_size: Optional[str] = None
+
+    @property
+    def path(self) -> Path:
+        """Cache directory, resolved against the project root if relative."""
+        return self.dir if self.dir.is_absolute() else project_dir(self.dir)
+
+    @property
+    def features_path(self) -> Path:
+        """Feature store directory, resolved against the project root if relative."""
+        return self.features_dir if self.features_dir.is_absolute() else project_dir(self.features_dir)
+
+
+class PlottingSettings(BaseModel):
+    """Figure rendering settings."""
+
+    dpi: int = 300
+    show: bool = True
+
+
+class ProfilingSettings(BaseModel):
+    """Instrumentation settings (see `utils.profiling`)."""
+
+    spans: bool = False
+    spans_file: str = 'spans.jsonl'
+    sample_interval: float = 0.005
+
+
+class ServingSettings(BaseModel):
+    """Inference server settings (see `models.serving`)."""
+
+    host: str = '127.0.0.1'
+    port: int = 8000
+    max_batch_size: int = 256
+    max_latency_ms: float = 5.0
+    workers: int = 1
+
+
+class MonitoringSettings(BaseModel):
+    """Drift monitoring settings (see `models.monitoring`)."""
+
+    enabled: bool = True
+    bins: int = 10
+    psi_threshold: float = 0.2
+    log_file: str = 'drift.jsonl'
+
+
+class FetchSettings(BaseModel):
+    """Data download settings (see `data.fetch`)."""
+
+    manifest: Path = Path('config/data_manifest.yml')
+    max_workers: int = 4
+    retries: int = 3
+    timeout: float = 30.0
+    backoff: float = 1.0
+
+    @property
+    def manifest_path(self) -> Path:
+        """Manifest file, resolved against the project root if relative."""
+        return self.manifest if self.manifest.is_absolute() else project_dir(self.manifest)
+
+
+class Settings(BaseModel):
+    """Project settings."""
+
+    env: str = DEFAULT_ENV
+    compute: ComputeSettings = ComputeSettings()
+    data: DataSettings = DataSettings()
+    cache: CacheSettings = CacheSettings()
+    plotting: PlottingSettings = PlottingSettings()
+    profiling: ProfilingSettings = ProfilingSettings()
+    serving: ServingSettings = ServingSettings()
+    monitoring: MonitoringSettings = MonitoringSettings()
+    fetch: FetchSettings = FetchSettings()
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge `override` into a copy of `base`."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _env_overrides(environ: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Collect overrides from ``<PREFIX><SECTION>__<KEY>`` environment variables.
+
+    Only variables naming a known settings section are used. Values are parsed
+    as YAML scalars so that numbers, booleans and ``null`` are typed.
+    """
+    overrides: Dict[str, Any] = {}
+    for name, raw_value in environ.items():
+        if not name.startswith(ENV_PREFIX):
+            continue
+        keys = name[len(ENV_PREFIX):].lower().split('__')
+        if len(keys) < 2 or keys[0] not in Settings.model_fields:
+            continue
+        target = overrides
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = yaml.safe_load(raw_value)
+    return overrides
+
+
+def load_settings(
+    env: Optional[str] = None,
+    config_path: Optional[Path] = None
+) -> Settings:
+    """
+    Load and validate settings without caching.
+
+    Parameters
+    ----------
+    env : str, optional
+        Environment name. Defaults to the `ENV_VAR` environment variable, or
+        'dev' if unset.
+    config_path : pathlib.Path, optional
+        Configuration file to read instead of ``config/<env>.yml``.
+
+    Returns
+    -------
+    Settings
+        Validated settings.
+    """
+    env = env or os.environ.get(ENV_VAR, DEFAULT_ENV)
+    config_path = config_path or config_dir(f"{env}.yml")
+
+    values: Dict[str, Any] = {'env': env}
+    if config_path.is_file():
+        with open(config_path, encoding='utf-8') as f:
+            values = _deep_merge(values, yaml.safe_load(f) or {})
+    values = _deep_merge(values, _env_overrides(dict(os.environ)))
+    return Settings.model_validate(values)
+
+
+@lru_cache(maxsize=None)
+def get_settings(env: Optional[str] = None) -> Settings:
+    """
+    Return the settings for `env`, loading them on first use.
+
+    Parameters
+    ----------
+    env : str, optional
+        Environment name (see `load_settings`).
+
+    Returns
+    -------
+    Settings
+        Cached settings.
+    """
+    return load_settings(env)
+
+
+def reset_settings() -> None:
+    """
+    Clear the cached settings so that they are loaded again on next use.
+    """
+    get_settings.cache_clear()
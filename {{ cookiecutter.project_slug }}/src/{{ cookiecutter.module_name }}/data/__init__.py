@@ -0,0 +1,46 @@
+"""
+Data loading and dataset creation utilities.
+"""
+
+from {{ cookiecutter.module_name }}.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["data_loader", "fetch", "make_dataset", "synthetic", "validation"],
+    attrs={
+        "data_loader": [
+            "load_csv",
+            "load_excel",
+            "iter_excel",
+            "load_parquet",
+            "load_numpy",
+            "load_dataset",
+            "iter_dataset",
+            "save_dataset",
+        ],
+        "fetch": [
+            "ChecksumError",
+            "FetchError",
+            "FetchResult",
+            "Manifest",
+            "ManifestEntry",
+            "fetch_file",
+            "fetch_manifest",
+        ],
+        "synthetic": [
+            "SyntheticSpec",
+            "generate_frame",
+            "iter_synthetic",
+            "write_synthetic",
+            "synthetic_dataset",
+        ],
+        "validation": [
+            "ColumnSchema",
+            "DatasetSchema",
+            "ValidationError",
+            "ValidationReport",
+            "Validator",
+            "validate_dataset",
+        ],
+    },
+)
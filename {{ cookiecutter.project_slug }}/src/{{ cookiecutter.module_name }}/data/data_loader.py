@@ -2,23 +2,147 @@
 Data loading utilities.
 """
 
+import importlib.util
+import os
+import shutil
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import quote
 
 import numpy as np
 import pandas as pd
 
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.backends import (
+    arrow_to_pandas,
+    duckdb_to_arrow,
+    quote_identifier,
+    quote_literal,
+    resolve_backend,
+)
+from {{ cookiecutter.module_name }}.utils.parallel import iter_slices, resolve_n_jobs
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
 
+if TYPE_CHECKING:
+    from {{ cookiecutter.module_name }}.data.validation import Validator
+
+# Rows per chunk of `iter_excel` and `iter_dataset` when neither the argument
+# nor the ``compute.chunk_size`` setting is given
+DEFAULT_CHUNK_SIZE = 100_000
+# Directory name of missing partition values, as written by Hive and pyarrow
+HIVE_NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+# Schema file of partitioned datasets written by `save_dataset`
+COMMON_METADATA = '_common_metadata'
+# `pandas.read_csv` options rejected by its pyarrow engine
+PYARROW_CSV_UNSUPPORTED = frozenset({
+    'chunksize', 'comment', 'converters', 'dayfirst', 'delim_whitespace',
+    'dialect', 'float_precision', 'iterator', 'lineterminator', 'low_memory',
+    'memory_map', 'nrows', 'quoting', 'skipfooter', 'skipinitialspace',
+    'thousands',
+})
+
+
+def _loader_backend(
+    dataframe_backend: Optional[str],
+    kwargs: Dict[str, Any],
+    supported: Tuple[str, ...]
+) -> str:
+    """Resolve the backend of a loader call, checking its reader options.
+
+    Options other than `supported` are pandas reader options. With such
+    options, a backend selected globally falls back to pandas, while a
+    backend requested by the call is an error.
+    """
+    backend = resolve_backend(dataframe_backend)
+    unsupported = sorted(set(kwargs) - set(supported))
+    if backend != 'pandas' and unsupported:
+        if dataframe_backend is not None:
+            raise ValueError(
+                f"Options {unsupported} are not supported by the {backend} backend; "
+                "use dataframe_backend='pandas'"
+            )
+        backend = 'pandas'
+    return backend
+
+
+def _read_csv_backend(
+    filepath: Union[str, Path],
+    backend: str,
+    usecols: Optional[List[str]] = None,
+    sep: Optional[str] = None,
+    delimiter: Optional[str] = None,
+    nrows: Optional[int] = None
+) -> pd.DataFrame:
+    """Read a CSV file with Polars or DuckDB into pandas."""
+    sep = sep or delimiter or ','
+    if backend == 'polars':
+        import polars as pl
+
+        # Infer dtypes from every row, as pandas does
+        frame = pl.scan_csv(filepath, separator=sep, infer_schema_length=None)
+        if usecols is not None:
+            # pandas keeps the file order of the selected columns
+            frame = frame.select([
+                name for name in frame.collect_schema().names() if name in usecols
+            ])
+        if nrows is not None:
+            frame = frame.head(nrows)
+        table = frame.collect().to_arrow()
+    else:
+        import duckdb
+
+        with duckdb.connect() as connection:
+            # Full-file type inference restricted to the types pandas infers,
+            # so that date-like strings stay strings
+            relation = connection.sql(
+                f"SELECT * FROM read_csv({quote_literal(filepath)}, header=true, "
+                f"delim={quote_literal(sep)}, sample_size=-1, "
+                "auto_type_candidates=['BOOLEAN', 'BIGINT', 'DOUBLE', 'VARCHAR'])"
+            )
+            if usecols is not None:
+                relation = relation.project(', '.join(
+                    quote_identifier(name)
+                    for name in relation.columns if name in usecols
+                ))
+            if nrows is not None:
+                relation = relation.limit(nrows)
+            table = duckdb_to_arrow(relation)
+    return arrow_to_pandas(table, dtype_backend=get_settings().data.dtype_backend)
+
+
+@instrument()
 def load_csv(
     filepath: Union[str, Path],
+    dataframe_backend: Optional[str] = None,
     **kwargs
 ) -> pd.DataFrame:
     """Load data from a CSV file.
 
+    The parser engine and dtype backend default to the ``data`` settings of
+    the project configuration. With the Polars or DuckDB backend the file is
+    parsed by that engine on all cores; only the ``usecols``, ``sep`` (or
+    ``delimiter``) and ``nrows`` options are supported there.
+
     Parameters
     ----------
     filepath : Union[str, Path]
         Path to the CSV file
+    dataframe_backend : Optional[str], optional
+        'pandas', 'polars' or 'duckdb', by default the active backend (see
+        `utils.backends`)
 
     Returns
     -------
@@ -26,42 +150,287 @@ def load_csv(
         Loaded data
     """
 
+    backend = _loader_backend(
+        dataframe_backend, kwargs, ('usecols', 'sep', 'delimiter', 'nrows')
+    )
+    if backend != 'pandas':
+        return _read_csv_backend(filepath, backend, **kwargs)
+
+    settings = get_settings().data
+    # The configured pyarrow engine only applies to the options it supports;
+    # other reads fall back to pandas' default engine
+    unsupported = [
+        name for name in PYARROW_CSV_UNSUPPORTED if kwargs.get(name) is not None
+    ]
+    if settings.csv_engine and not (
+        settings.csv_engine == 'pyarrow' and unsupported
+    ):
+        kwargs.setdefault('engine', settings.csv_engine)
+    if settings.dtype_backend:
+        kwargs.setdefault('dtype_backend', settings.dtype_backend)
     return pd.read_csv(filepath, **kwargs)
 
 
+def _excel_engine(engine: Optional[str] = None) -> Optional[str]:
+    """Resolve the Excel engine: argument, ``data.excel_engine``, then calamine."""
+    engine = engine or get_settings().data.excel_engine
+    if engine is None and importlib.util.find_spec('python_calamine') is not None:
+        engine = 'calamine'
+    return engine
+
+
+def _read_sheet(
+    filepath: Union[str, Path],
+    sheet_name: Union[str, int],
+    engine: Optional[str],
+    kwargs: Dict[str, Any]
+) -> pd.DataFrame:
+    """Read one sheet; run in worker processes by `load_excel`."""
+    return pd.read_excel(filepath, sheet_name=sheet_name, engine=engine, **kwargs)
+
+
+@instrument()
 def load_excel(
     filepath: Union[str, Path],
-    sheet_name: Optional[Union[str, int]] = 0,
+    sheet_name: Optional[Union[str, int, List[Union[str, int]]]] = 0,
+    engine: Optional[str] = None,
+    n_jobs: Optional[int] = None,
     **kwargs
-) -> pd.DataFrame:
+) -> Union[pd.DataFrame, Dict[Union[str, int], pd.DataFrame]]:
     """Load data from an Excel file.
 
+    The fastest available engine is used by default: python-calamine if it
+    is installed, otherwise pandas' default (openpyxl for ``.xlsx``, opened
+    read-only). Several sheets are parsed in parallel worker processes,
+    since parsing is CPU bound and holds the GIL. For sheets too large to
+    hold in memory, see `iter_excel`.
+
     Parameters
     ----------
     filepath : Union[str, Path]
         Path to the Excel file
-    sheet_name : Optional[Union[str, int]], optional
-        Name or index of the sheet to load, by default 0
+    sheet_name : Optional[Union[str, int, List[Union[str, int]]]], optional
+        Name or index of the sheet to load, a list of them, or None for all
+        sheets, by default 0
+    engine : Optional[str], optional
+        Excel engine, by default the configured ``data.excel_engine`` or
+        calamine when installed
+    n_jobs : Optional[int], optional
+        Number of sheets parsed in parallel (-1 for all CPUs), by default the
+        configured ``compute.n_jobs``
 
     Returns
     -------
+    Union[pd.DataFrame, Dict[Union[str, int], pd.DataFrame]]
+        Loaded data, or a dict of DataFrames keyed by sheet if `sheet_name`
+        is a list or None
+    """
+
+    engine = _excel_engine(engine)
+    dtype_backend = get_settings().data.dtype_backend
+    if dtype_backend:
+        kwargs.setdefault('dtype_backend', dtype_backend)
+    if sheet_name is not None and not isinstance(sheet_name, list):
+        return pd.read_excel(filepath, sheet_name=sheet_name, engine=engine, **kwargs)
+
+    if sheet_name is None:
+        with pd.ExcelFile(filepath, engine=engine) as workbook:
+            sheet_name = list(workbook.sheet_names)
+    n_jobs = get_settings().compute.n_jobs if n_jobs is None else n_jobs
+    n_workers = min(resolve_n_jobs(n_jobs), len(sheet_name))
+    if n_workers <= 1:
+        return pd.read_excel(filepath, sheet_name=sheet_name, engine=engine, **kwargs)
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        frames = executor.map(
+            _read_sheet,
+            [filepath] * len(sheet_name),
+            sheet_name,
+            [engine] * len(sheet_name),
+            [kwargs] * len(sheet_name),
+        )
+        return dict(zip(sheet_name, frames, strict=True))
+
+
+def _trim_trailing_empty(rows: Iterable[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+    """Drop trailing empty rows, which sheets often report past the data."""
+    empty: List[Tuple[Any, ...]] = []
+    for row in rows:
+        if all(value is None or value == '' for value in row):
+            empty.append(row)
+            continue
+        yield from empty
+        empty.clear()
+        yield row
+
+
+def _iter_sheet_rows(
+    filepath: Path,
+    sheet_name: Union[str, int],
+    engine: Optional[str]
+) -> Iterator[Tuple[Any, ...]]:
+    """Stream the cell values of a sheet row by row."""
+    if engine == 'calamine':
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(str(filepath))
+        try:
+            sheet = (
+                workbook.get_sheet_by_index(sheet_name) if isinstance(sheet_name, int)
+                else workbook.get_sheet_by_name(sheet_name)
+            )
+            rows = (
+                sheet.iter_rows() if hasattr(sheet, 'iter_rows') else sheet.to_python()
+            )
+            # Excel stores every number as a float; like pandas' calamine
+            # reader, whole numbers come back as ints
+            yield from (
+                tuple(
+                    int(value) if isinstance(value, float) and value.is_integer()
+                    else value
+                    for value in row
+                )
+                for row in rows
+            )
+        finally:
+            # Older releases have no close() and release the file when collected
+            close = getattr(workbook, 'close', None)
+            if close is not None:
+                close()
+        return
+
+    from openpyxl import load_workbook
+
+    # Read-only mode streams rows from the XML instead of building the
+    # workbook object model in memory
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        sheet = (
+            workbook.worksheets[sheet_name] if isinstance(sheet_name, int)
+            else workbook[sheet_name]
+        )
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_excel(
+    filepath: Union[str, Path],
+    sheet_name: Union[str, int] = 0,
+    chunk_size: Optional[int] = None,
+    header: bool = True,
+    engine: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """Iterate over an Excel sheet in chunks of rows.
+
+    Rows are streamed from the file, so memory use is bounded by the chunk
+    size rather than the sheet size. ``.xlsx`` files are streamed with
+    calamine (if installed) or openpyxl in read-only mode; other formats are
+    read whole with `load_excel` and then split.
+
+    Parameters
+    ----------
+    filepath : Union[str, Path]
+        Path to the Excel file
+    sheet_name : Union[str, int], optional
+        Name or index of the sheet, by default 0
+    chunk_size : Optional[int], optional
+        Rows per chunk, by default the configured ``compute.chunk_size`` or
+        `DEFAULT_CHUNK_SIZE`
+    header : bool, optional
+        Whether the first row holds the column names, by default True
+    engine : Optional[str], optional
+        'calamine' or 'openpyxl', by default the configured
+        ``data.excel_engine`` or calamine when installed
+
+    Yields
+    ------
     pd.DataFrame
-        Loaded data
+        Consecutive chunks of the sheet
     """
 
-    return pd.read_excel(filepath, sheet_name=sheet_name, **kwargs)
+    filepath = Path(filepath)
+    chunk_size = chunk_size or get_settings().compute.chunk_size or DEFAULT_CHUNK_SIZE
+    engine = _excel_engine(engine)
+    if engine not in (None, 'calamine', 'openpyxl') or (
+        engine != 'calamine' and filepath.suffix.lower() not in ('.xlsx', '.xlsm')
+    ):
+        df = load_excel(
+            filepath, sheet_name=sheet_name, engine=engine, header=0 if header else None
+        )
+        yield from iter_slices(df, chunk_size)
+        return
+
+    dtype_backend = get_settings().data.dtype_backend
+    rows = _trim_trailing_empty(_iter_sheet_rows(filepath, sheet_name, engine))
+    columns = None
+    if header:
+        columns = next(rows, None)
+        if columns is None:
+            return
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        df = pd.DataFrame(chunk, columns=columns)
+        if dtype_backend:
+            df = df.convert_dtypes(dtype_backend=dtype_backend)
+        yield df
+
+
+def _read_parquet_backend(
+    filepath: Union[str, Path],
+    backend: str,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Read a Parquet file or hive-partitioned directory with Polars or DuckDB."""
+    filepath = Path(filepath)
+    is_dir = filepath.is_dir()
+    source = str(filepath / '**' / '*.parquet') if is_dir else str(filepath)
+    if backend == 'polars':
+        import polars as pl
+
+        frame = pl.scan_parquet(source, hive_partitioning=is_dir)
+        if columns is not None:
+            frame = frame.select(columns)
+        table = frame.collect().to_arrow()
+    else:
+        import duckdb
+
+        with duckdb.connect() as connection:
+            relation = connection.sql(
+                f"SELECT * FROM read_parquet({quote_literal(source)}, "
+                f"hive_partitioning={str(is_dir).lower()})"
+            )
+            if columns is not None:
+                relation = relation.project(
+                    ', '.join(quote_identifier(name) for name in columns)
+                )
+            table = duckdb_to_arrow(relation)
+    return arrow_to_pandas(table, dtype_backend=get_settings().data.dtype_backend)
 
 
+@instrument()
 def load_parquet(
     filepath: Union[str, Path],
+    dataframe_backend: Optional[str] = None,
     **kwargs
 ) -> pd.DataFrame:
-    """Load data from a Parquet file.
+    """Load data from a Parquet file or a partitioned Parquet directory.
+
+    Partitioned datasets written by `save_dataset` are read with their
+    original dtypes; pass ``filters`` (e.g. ``[('year', '=', 2024)]``) to
+    read only the matching partitions. With the Polars or DuckDB backend
+    only the ``columns`` option is supported, and a pandas index stored in
+    the file metadata is read as a regular column.
 
     Parameters
     ----------
     filepath : Union[str, Path]
-        Path to the Parquet file
+        Path to the Parquet file or partitioned directory
+    dataframe_backend : Optional[str], optional
+        'pandas', 'polars' or 'duckdb', by default the active backend (see
+        `utils.backends`)
 
     Returns
     -------
@@ -69,9 +438,98 @@ def load_parquet(
         Loaded data
     """
 
+    backend = _loader_backend(dataframe_backend, kwargs, ('columns',))
+    if backend != 'pandas':
+        return _read_parquet_backend(filepath, backend, **kwargs)
+
+    dtype_backend = get_settings().data.dtype_backend
+    if dtype_backend:
+        kwargs.setdefault('dtype_backend', dtype_backend)
+    schema_path = Path(filepath) / COMMON_METADATA
+    if 'schema' not in kwargs and schema_path.is_file():
+        import pyarrow.parquet as pq
+
+        # Partition columns are typed from the schema instead of inferred
+        # from the directory names
+        kwargs['schema'] = pq.read_schema(schema_path)
     return pd.read_parquet(filepath, **kwargs)
 
 
+def iter_dataset(
+    filepath: Union[str, Path],
+    chunk_size: Optional[int] = None,
+    validator: Optional['Validator'] = None,
+    drop_invalid: bool = False
+) -> Iterator[pd.DataFrame]:
+    """Iterate over a dataset in chunks of rows, without loading it whole.
+
+    CSV files are parsed in chunks, Parquet files and partitioned directories
+    are read batch by batch, and Excel sheets are streamed with `iter_excel`.
+
+    Parameters
+    ----------
+    filepath : Union[str, Path]
+        Path to a ``.csv``, ``.xls``/``.xlsx``, or ``.parquet`` file, or a
+        partitioned Parquet directory
+    chunk_size : Optional[int], optional
+        Maximum rows per chunk, by default the configured
+        ``compute.chunk_size`` or `DEFAULT_CHUNK_SIZE`
+    validator : Optional[Validator], optional
+        Check every chunk against a schema as it is read; the results
+        accumulate in ``validator.report``
+    drop_invalid : bool, optional
+        With `validator`, drop the rows that fail a check, by default False
+
+    Yields
+    ------
+    pd.DataFrame
+        Consecutive chunks of the dataset
+
+    Raises
+    ------
+    ValueError
+        If the file format cannot be read in chunks.
+    """
+
+    chunks = _iter_chunks(Path(filepath), chunk_size)
+    if validator is not None:
+        chunks = validator.iter(chunks, drop_invalid=drop_invalid)
+    yield from chunks
+
+
+def _iter_chunks(filepath: Path, chunk_size: Optional[int]) -> Iterator[pd.DataFrame]:
+    chunk_size = chunk_size or get_settings().compute.chunk_size or DEFAULT_CHUNK_SIZE
+    suffix = filepath.suffix.lower()
+    if suffix == '.csv':
+        with load_csv(
+            filepath, dataframe_backend='pandas', chunksize=chunk_size
+        ) as reader:
+            yield from reader
+    elif suffix in ('.xls', '.xlsx', '.xlsm'):
+        yield from iter_excel(filepath, chunk_size=chunk_size)
+    elif suffix == '.parquet' or filepath.is_dir():
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        schema_path = filepath / COMMON_METADATA
+        dataset = ds.dataset(
+            filepath,
+            format='parquet',
+            partitioning='hive' if filepath.is_dir() else None,
+            schema=pq.read_schema(schema_path) if schema_path.is_file() else None,
+        )
+        dtype_backend = get_settings().data.dtype_backend
+        for batch in dataset.to_batches(batch_size=chunk_size):
+            if batch.num_rows:
+                yield arrow_to_pandas(
+                    pa.Table.from_batches([batch]), dtype_backend=dtype_backend
+                )
+    else:
+        raise ValueError(f"Unsupported file format for chunked reading: {suffix}")
+
+
+@instrument()
 def load_numpy(
     filepath: Union[str, Path],
     **kwargs
@@ -90,3 +548,207 @@ def load_numpy(
     """
 
     return np.load(filepath, **kwargs)
+
+
+def load_dataset(
+    filepath: Union[str, Path],
+    **kwargs
+) -> Union[pd.DataFrame, np.ndarray]:
+    """Load data from a file, choosing the loader from the file extension.
+
+    Parameters
+    ----------
+    filepath : Union[str, Path]
+        Path to a ``.csv``, ``.xls``/``.xlsx``, ``.parquet`` or ``.npy`` file,
+        or a partitioned Parquet directory
+
+    Returns
+    -------
+    Union[pd.DataFrame, np.ndarray]
+        Loaded data
+
+    Raises
+    ------
+    ValueError
+        If the file extension is not supported.
+    """
+    if Path(filepath).is_dir():
+        # Partitioned dataset written by `save_dataset`
+        return load_parquet(filepath, **kwargs)
+    suffix = Path(filepath).suffix.lower()
+    if suffix == '.csv':
+        return load_csv(filepath, **kwargs)
+    if suffix in ('.xls', '.xlsx', '.xlsm'):
+        return load_excel(filepath, **kwargs)
+    if suffix == '.parquet':
+        return load_parquet(filepath, **kwargs)
+    if suffix == '.npy':
+        return load_numpy(filepath, **kwargs)
+    raise ValueError(f"Unsupported file format: {suffix}")
+
+
+def _partition_segment(column: str, value: Any) -> str:
+    """Format a hive partition directory name, e.g. ``year=2024``."""
+    if pd.isna(value):
+        text = HIVE_NULL_PARTITION
+    elif isinstance(value, (bool, np.bool_)):
+        text = str(value).lower()
+    else:
+        # Escaped as pyarrow does, so that values may contain '/' or '='
+        text = quote(str(value), safe='')
+    return f'{column}={text}'
+
+
+def _replace_path(staging: Path, target: Path) -> None:
+    """Move `staging` to `target`, replacing what was there.
+
+    Files are replaced atomically. A directory is first renamed aside and
+    removed after the swap, so readers see either the old or the new data,
+    never a mix (for the instant between the two renames, the path is
+    missing).
+    """
+    backup = None
+    if target.is_dir():
+        backup = target.with_name(f'.{target.name}.old-{uuid.uuid4().hex}')
+        os.replace(target, backup)
+    elif target.exists() and staging.is_dir():
+        target.unlink()
+    try:
+        os.replace(staging, target)
+    except BaseException:
+        if backup is not None:
+            os.replace(backup, target)
+        raise
+    if backup is not None:
+        shutil.rmtree(backup, ignore_errors=True)
+
+
+def _write_partitions(
+    table: Any,
+    df: pd.DataFrame,
+    directory: Path,
+    partition_cols: List[str],
+    n_jobs: int,
+    write_options: Dict[str, Any]
+) -> None:
+    """Write one Parquet file per partition, in parallel threads."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    groups = df.groupby(partition_cols, dropna=False, observed=True, sort=False).indices
+
+    def write(key: Any, positions: np.ndarray) -> None:
+        values = key if isinstance(key, tuple) else (key,)
+        partition = directory.joinpath(*(
+            _partition_segment(column, value)
+            for column, value in zip(partition_cols, values, strict=True)
+        ))
+        partition.mkdir(parents=True, exist_ok=True)
+        data = table.take(positions).drop_columns(partition_cols)
+        pq.write_table(data, partition / 'part-0.parquet', **write_options)
+
+    # pyarrow releases the GIL while encoding and compressing
+    n_workers = min(resolve_n_jobs(n_jobs), len(groups) or 1)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(write, key, positions) for key, positions in groups.items()
+        ]
+        for future in futures:
+            future.result()
+
+    # The full schema, including the partition columns that are only encoded
+    # in the directory names, so that `load_parquet` restores every dtype
+    schema = table.schema
+    for column in partition_cols:
+        index = schema.get_field_index(column)
+        field = schema.field(index)
+        if pa.types.is_dictionary(field.type):
+            schema = schema.set(index, field.with_type(field.type.value_type))
+    pq.write_metadata(schema, directory / COMMON_METADATA)
+
+
+@instrument()
+def save_dataset(
+    df: pd.DataFrame,
+    filepath: Union[str, Path],
+    partition_cols: Optional[List[str]] = None,
+    row_group_size: Optional[int] = None,
+    compression: Optional[str] = None,
+    n_jobs: Optional[int] = None
+) -> Path:
+    """Write a DataFrame to disk, replacing any previous data atomically.
+
+    ``.csv`` paths are written as CSV, anything else as Parquet. With
+    `partition_cols`, `filepath` is a hive-partitioned directory
+    (``<col>=<value>/part-0.parquet``) whose partitions are written in
+    parallel; `load_parquet` reads it back with the original dtypes and
+    skips the partitions excluded by ``filters``. Categorical partition
+    columns are read back as strings.
+
+    Data are written to a temporary path next to `filepath` and swapped in
+    when complete, so readers never see partially written data.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Data to write; the index is not written
+    filepath : Union[str, Path]
+        Destination file or, with `partition_cols`, directory
+    partition_cols : Optional[List[str]], optional
+        Columns to partition the Parquet output by, by default None
+    row_group_size : Optional[int], optional
+        Maximum rows per Parquet row group, by default the configured
+        ``data.row_group_size``
+    compression : Optional[str], optional
+        Parquet compression codec, by default the configured
+        ``data.parquet_compression``
+    n_jobs : Optional[int], optional
+        Number of partitions written in parallel (-1 for all CPUs), by
+        default the configured ``compute.n_jobs``
+
+    Returns
+    -------
+    Path
+        The written file or directory
+
+    Raises
+    ------
+    ValueError
+        If partitioning is requested for CSV output or names unknown columns.
+    """
+
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    is_csv = filepath.suffix.lower() == '.csv'
+    if partition_cols:
+        if is_csv:
+            raise ValueError("Partitioned output requires Parquet, not CSV")
+        missing = [column for column in partition_cols if column not in df.columns]
+        if missing:
+            raise ValueError(f"Unknown partition columns: {missing}")
+
+    settings = get_settings()
+    write_options = {
+        'row_group_size': row_group_size or settings.data.row_group_size,
+        'compression': compression or settings.data.parquet_compression,
+    }
+    staging = filepath.with_name(f'.{filepath.name}.tmp-{uuid.uuid4().hex}')
+    try:
+        if is_csv:
+            df.to_csv(staging, index=False)
+        elif partition_cols:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            n_jobs = settings.compute.n_jobs if n_jobs is None else n_jobs
+            staging.mkdir()
+            _write_partitions(table, df, staging, partition_cols, n_jobs, write_options)
+        else:
+            df.to_parquet(staging, index=False, **write_options)
+        _replace_path(staging, filepath)
+    finally:
+        if staging.is_dir():
+            shutil.rmtree(staging, ignore_errors=True)
+        else:
+            staging.unlink(missing_ok=True)
+    return filepath
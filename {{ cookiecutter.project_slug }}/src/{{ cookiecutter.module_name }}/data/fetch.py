@@ -0,0 +1,579 @@
+"""
+Download the raw data listed in a manifest.
+
+The manifest (``config/data_manifest.yml`` by default) lists the URL,
+destination under ``data/raw`` or ``data/external`` and expected checksum of
+every file. `fetch_manifest` downloads the files concurrently with at most
+``fetch.max_workers`` connections and:
+
+- skips files whose checksum already matches, so reruns only download what
+  changed or is missing;
+- keeps interrupted downloads as ``<dest>.part`` and resumes them with HTTP
+  range requests, retrying failed connections with exponential backoff;
+- decompresses ``.gz``, ``.bz2`` and ``.xz`` files while they stream in and
+  extracts ``.zip`` archives once downloaded;
+- verifies the checksum of the downloaded bytes before moving the file into
+  place, so a destination is never left corrupted or half written.
+
+Digests of decompressed outputs are recorded in ``fetch_state.json`` in the
+cache directory to tell whether they are current::
+
+    my-cli fetch --only iris.csv
+"""
+
+import bz2
+import hashlib
+import http.client
+import json
+import lzma
+import os
+import re
+import shutil
+import time
+import uuid
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Union
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
+import yaml
+from pydantic import BaseModel, Field, field_validator
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.paths import (
+    data_external_dir,
+    data_raw_dir,
+    project_dir,
+)
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+
+# Bytes read from the connection at a time
+BLOCK_SIZE = 1 << 20
+# Digest of the decompressed outputs recorded in the fetch state
+OUTPUT_ALGORITHM = 'sha256'
+# File in the cache directory recording the outputs of previous downloads
+STATE_FILE = 'fetch_state.json'
+# Decompression inferred from the URL suffix with ``decompress: auto``
+SUFFIX_COMPRESSION = {
+    '.gz': 'gzip', '.gzip': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zip': 'zip'
+}
+# Transient HTTP statuses that are retried
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class ChecksumError(ValueError):
+    """Raised when downloaded bytes do not match the manifest checksum."""
+
+
+class FetchError(RuntimeError):
+    """Raised when some files of a manifest could not be downloaded."""
+
+    def __init__(self, results: List['FetchResult']) -> None:
+        self.results = results
+        failed = [
+            f"{result.name}: {result.error}"
+            for result in results if result.status == 'failed'
+        ]
+        super().__init__(f"{len(failed)} download(s) failed:\n" + '\n'.join(failed))
+
+
+class ManifestEntry(BaseModel):
+    """
+    One file of the data manifest.
+
+    Attributes
+    ----------
+    url : str
+        HTTP(S) URL of the file.
+    dest : pathlib.Path
+        Destination, relative to the project root, under ``data/raw`` or
+        ``data/external``. A directory for ``.zip`` archives.
+    checksum : str, optional
+        Digest of the downloaded bytes as ``<algorithm>:<hex>``, with any
+        `hashlib` algorithm, e.g. ``sha256:9f86d0...``.
+    decompress : str, optional
+        'gzip', 'bz2', 'xz', 'zip', 'auto' (default, from the URL suffix) or
+        None to keep the file as downloaded.
+    headers : dict of str to str
+        Request headers; ``${VAR}`` references to environment variables are
+        expanded, so tokens stay out of the manifest.
+    name : str, optional
+        Name used to select the file, by default the destination file name.
+    """
+
+    url: str
+    dest: Path
+    checksum: Optional[str] = None
+    decompress: Optional[Literal['auto', 'gzip', 'bz2', 'xz', 'zip']] = 'auto'
+    headers: Dict[str, str] = Field(default_factory=dict)
+    name: Optional[str] = None
+
+    @field_validator('url')
+    @classmethod
+    def _check_url(cls, url: str) -> str:
+        if urlparse(url).scheme not in ('http', 'https'):
+            raise ValueError(f"Only http and https URLs are supported, got {url!r}")
+        return url
+
+    @field_validator('checksum')
+    @classmethod
+    def _check_checksum(cls, checksum: Optional[str]) -> Optional[str]:
+        if checksum is None:
+            return None
+        algorithm, _, digest = checksum.partition(':')
+        algorithm = algorithm.lower()
+        valid_digest = re.fullmatch(r'[0-9a-fA-F]+', digest) is not None
+        if algorithm not in hashlib.algorithms_available or not valid_digest:
+            raise ValueError(
+                f"checksum must be '<algorithm>:<hex digest>', got {checksum!r}"
+            )
+        return f'{algorithm}:{digest.lower()}'
+
+    @property
+    def key(self) -> str:
+        """Name of the entry."""
+        return self.name or self.dest.name
+
+    @property
+    def algorithm(self) -> str:
+        """Hash algorithm of the checksum, sha256 when there is none."""
+        return self.checksum.split(':', 1)[0] if self.checksum else 'sha256'
+
+    @property
+    def compression(self) -> Optional[str]:
+        """Compression of the downloaded file, resolved from the URL with 'auto'."""
+        if self.decompress != 'auto':
+            return self.decompress
+        return SUFFIX_COMPRESSION.get(Path(urlparse(self.url).path).suffix.lower())
+
+    @property
+    def absolute_dest(self) -> Path:
+        """Absolute destination, relative ones being in the project directory."""
+        dest = self.dest if self.dest.is_absolute() else project_dir(self.dest)
+        return dest.resolve()
+
+    @property
+    def path(self) -> Path:
+        """Absolute destination, checked to be inside the data directories."""
+        path = self.absolute_dest
+        allowed = [data_raw_dir().resolve(), data_external_dir().resolve()]
+        if not any(path != root and path.is_relative_to(root) for root in allowed):
+            raise ValueError(
+                f"Destination {self.dest} is not inside data/raw or data/external"
+            )
+        return path
+
+
+class Manifest(BaseModel):
+    """
+    The files to download.
+
+    Attributes
+    ----------
+    files : list of ManifestEntry
+        Files of the manifest; their names must be unique.
+    """
+
+    files: List[ManifestEntry] = Field(default_factory=list)
+
+    @field_validator('files')
+    @classmethod
+    def _check_names(cls, files: List[ManifestEntry]) -> List[ManifestEntry]:
+        names = [entry.key for entry in files]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate file names in manifest: {duplicates}")
+        return files
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> 'Manifest':
+        """
+        Read a manifest from a YAML file.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            File with a ``files`` list.
+
+        Returns
+        -------
+        Manifest
+            The validated manifest.
+        """
+        with open(path, encoding='utf-8') as f:
+            return cls.model_validate(yaml.safe_load(f) or {})
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of fetching one file.
+
+    Attributes
+    ----------
+    name : str
+        Name of the manifest entry.
+    path : pathlib.Path
+        Destination file or directory.
+    status : str
+        'skipped' (already current), 'downloaded' or 'failed'.
+    bytes : int
+        Bytes received over the network, excluding resumed bytes.
+    resumed : bool
+        Whether a partial download was resumed.
+    checksum : str, optional
+        Digest of the downloaded bytes, e.g. to pin in the manifest.
+    error : str, optional
+        Error of a failed download.
+    """
+
+    name: str
+    path: Path
+    status: str
+    bytes: int = 0
+    resumed: bool = False
+    checksum: Optional[str] = None
+    error: Optional[str] = None
+
+
+class _StreamDecompressor:
+    """Incremental decompression of gzip, bz2 or xz data, including multiple streams."""
+
+    _FACTORIES: Dict[str, Callable[[], Any]] = {
+        'gzip': lambda: zlib.decompressobj(zlib.MAX_WBITS | 16),
+        'bz2': bz2.BZ2Decompressor,
+        'xz': lzma.LZMADecompressor,
+    }
+
+    def __init__(self, compression: str) -> None:
+        self._factory = self._FACTORIES[compression]
+        self._decompressor = self._factory()
+        self._pending = False
+
+    def decompress(self, data: bytes) -> bytes:
+        output = []
+        while data:
+            self._pending = True
+            output.append(self._decompressor.decompress(data))
+            if not self._decompressor.eof:
+                break
+            # The next stream starts after the end of this one
+            data = self._decompressor.unused_data
+            self._decompressor = self._factory()
+            self._pending = False
+        return b''.join(output)
+
+    def finish(self) -> None:
+        if self._pending:
+            raise ValueError("Compressed data ended before the end of the stream")
+
+
+def _file_digest(path: Path, algorithm: str) -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return f'{algorithm}:{digest.hexdigest()}'
+
+
+def _output_digests(path: Path) -> Dict[str, str]:
+    """Digest of a file, or of every file of a directory, by path relative to `path`."""
+    if path.is_file():
+        return {'.': _file_digest(path, OUTPUT_ALGORITHM)}
+    return {
+        file.relative_to(path).as_posix(): _file_digest(file, OUTPUT_ALGORITHM)
+        for file in sorted(path.rglob('*')) if file.is_file()
+    }
+
+
+def _is_current(
+    entry: ManifestEntry,
+    path: Path,
+    record: Optional[Dict[str, Any]]
+) -> bool:
+    """Whether `path` holds the data of `entry`, without downloading it."""
+    if not path.exists():
+        return False
+    if entry.compression is None and entry.checksum is not None:
+        return path.is_file() and _file_digest(path, entry.algorithm) == entry.checksum
+    if record is None or record.get('url') != entry.url:
+        return False
+    if entry.checksum is not None and record.get('checksum') != entry.checksum:
+        return False
+    outputs = record.get('outputs') or {}
+    return bool(outputs) and all(
+        (path / name).is_file()
+        and _file_digest(path / name, OUTPUT_ALGORITHM) == digest
+        for name, digest in outputs.items()
+    )
+
+
+def _open(
+    entry: ManifestEntry,
+    offset: int,
+    timeout: float
+) -> Optional[http.client.HTTPResponse]:
+    """Request the file from byte `offset`; None if the server has no bytes past it."""
+    headers = {key: os.path.expandvars(value) for key, value in entry.headers.items()}
+    if offset:
+        headers['Range'] = f'bytes={offset}-'
+    try:
+        return urlopen(Request(entry.url, headers=headers), timeout=timeout)
+    except HTTPError as error:
+        if error.code == 416 and offset:
+            return None
+        raise
+
+
+def _download(
+    entry: ManifestEntry,
+    path: Path,
+    part: Path,
+    timeout: float
+) -> FetchResult:
+    """Download `entry` into `part`, resuming it, and move the result to `path`."""
+    compression = entry.compression
+    offset = part.stat().st_size if part.exists() else 0
+    response = _open(entry, offset, timeout)
+    if response is not None and offset:
+        # Servers ignoring the range send the whole file again
+        match = re.match(r'bytes (\d+)-', response.headers.get('Content-Range', ''))
+        if response.status != 206 or match is None or int(match.group(1)) != offset:
+            offset = 0
+
+    digest = hashlib.new(entry.algorithm)
+    streaming = compression in _StreamDecompressor._FACTORIES
+    decompressor = _StreamDecompressor(compression) if streaming else None
+    staging = path.with_name(f'.{path.name}.tmp-{uuid.uuid4().hex}')
+    received = 0
+    try:
+        with open(staging, 'wb') if decompressor else nullcontext() as output:
+            # Bytes of the partial download are hashed and decompressed again,
+            # from the local disk, before the rest is appended
+            if offset:
+                with open(part, 'rb') as f:
+                    for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                        digest.update(block)
+                        if decompressor:
+                            output.write(decompressor.decompress(block))
+            if response is not None:
+                with response, open(part, 'ab' if offset else 'wb') as raw:
+                    for block in iter(lambda: response.read(BLOCK_SIZE), b''):
+                        raw.write(block)
+                        received += len(block)
+                        digest.update(block)
+                        if decompressor:
+                            output.write(decompressor.decompress(block))
+                # Reads return no data, rather than failing, when the
+                # connection closes early
+                length = response.headers.get('Content-Length')
+                if length is not None and received < int(length):
+                    raise http.client.IncompleteRead(b'', int(length) - received)
+            if decompressor:
+                decompressor.finish()
+
+        checksum = f'{entry.algorithm}:{digest.hexdigest()}'
+        if entry.checksum is not None and checksum != entry.checksum:
+            part.unlink(missing_ok=True)
+            raise ChecksumError(
+                f"Checksum mismatch for {entry.url}: "
+                f"expected {entry.checksum}, got {checksum}"
+            )
+
+        if compression == 'zip':
+            staging.mkdir()
+            with zipfile.ZipFile(part) as archive:
+                archive.extractall(staging)
+        elif decompressor is None:
+            os.replace(part, staging)
+        if path.is_dir():
+            shutil.rmtree(path)
+        os.replace(staging, path)
+        part.unlink(missing_ok=True)
+    finally:
+        if staging.is_dir():
+            shutil.rmtree(staging, ignore_errors=True)
+        else:
+            staging.unlink(missing_ok=True)
+    return FetchResult(entry.key, path, 'downloaded', received, offset > 0, checksum)
+
+
+def _is_transient(error: BaseException) -> bool:
+    if isinstance(error, HTTPError):
+        return error.code in RETRY_STATUSES
+    # URLError, timeouts and connection resets are all OSErrors
+    return isinstance(error, (OSError, http.client.HTTPException, ChecksumError))
+
+
+def fetch_file(
+    entry: ManifestEntry,
+    retries: Optional[int] = None,
+    timeout: Optional[float] = None,
+    backoff: Optional[float] = None,
+    force: bool = False,
+    state: Optional[Dict[str, Any]] = None
+) -> FetchResult:
+    """
+    Download one manifest entry unless its destination is current.
+
+    Parameters
+    ----------
+    entry : ManifestEntry
+        File to download.
+    retries : int, optional
+        Attempts after the first on connection errors, transient HTTP errors
+        and checksum mismatches. Defaults to ``fetch.retries``.
+    timeout : float, optional
+        Socket timeout in seconds. Defaults to ``fetch.timeout``.
+    backoff : float, optional
+        Seconds before the first retry, doubled on each retry. Defaults to
+        ``fetch.backoff``.
+    force : bool, optional
+        Download even if the destination is current (default is False).
+    state : dict, optional
+        Records of previous downloads by destination, updated in place.
+
+    Returns
+    -------
+    FetchResult
+        Status of the file; never 'failed', errors are raised.
+
+    Raises
+    ------
+    ChecksumError
+        If the downloaded bytes still do not match the checksum after retrying.
+    urllib.error.URLError
+        If the file cannot be downloaded.
+    """
+    settings = get_settings().fetch
+    retries = settings.retries if retries is None else retries
+    timeout = settings.timeout if timeout is None else timeout
+    backoff = settings.backoff if backoff is None else backoff
+    state = {} if state is None else state
+
+    path = entry.path
+    root = project_dir().resolve()
+    key = path.relative_to(root).as_posix() if path.is_relative_to(root) else str(path)
+    record = state.get(key)
+    if not force and _is_current(entry, path, record):
+        checksum = record['checksum'] if record else entry.checksum
+        return FetchResult(entry.key, path, 'skipped', checksum=checksum)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = path.with_name(f'{path.name}.part')
+    if force:
+        part.unlink(missing_ok=True)
+    for attempt in range(retries + 1):
+        try:
+            result = _download(entry, path, part, timeout)
+            break
+        except Exception as error:
+            if attempt == retries or not _is_transient(error):
+                raise
+            time.sleep(backoff * 2 ** attempt)
+    state[key] = {
+        'url': entry.url,
+        'checksum': result.checksum,
+        'outputs': _output_digests(path),
+    }
+    return result
+
+
+def _load_state(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_state(path: Path, state: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f'.{path.name}.tmp-{uuid.uuid4().hex}')
+    with open(staging, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(staging, path)
+
+
+@instrument()
+def fetch_manifest(
+    manifest: Optional[Union[str, Path, Manifest]] = None,
+    names: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    **kwargs: Any
+) -> List[FetchResult]:
+    """
+    Download the files of a manifest concurrently.
+
+    Every file is attempted; failures are raised together once the other
+    downloads are complete. Their partial downloads are kept and resumed by
+    the next run.
+
+    Parameters
+    ----------
+    manifest : str, pathlib.Path or Manifest, optional
+        Manifest or its YAML file. Defaults to ``fetch.manifest``.
+    names : sequence of str, optional
+        Names of the files to download (default is every file).
+    max_workers : int, optional
+        Maximum concurrent downloads. Defaults to ``fetch.max_workers``.
+    force : bool, optional
+        Download files even if they are current (default is False).
+    **kwargs
+        ``retries``, ``timeout`` and ``backoff``, passed to `fetch_file`.
+
+    Returns
+    -------
+    list of FetchResult
+        One result per file, in manifest order.
+
+    Raises
+    ------
+    ValueError
+        If `names` lists files that are not in the manifest.
+    FetchError
+        If any file could not be downloaded, with the results of every file.
+    """
+    settings = get_settings()
+    if manifest is None:
+        manifest = settings.fetch.manifest_path
+    if not isinstance(manifest, Manifest):
+        manifest = Manifest.from_yaml(manifest)
+    entries = manifest.files
+    if names is not None:
+        unknown = sorted(set(names) - {entry.key for entry in entries})
+        if unknown:
+            raise ValueError(f"Files not in the manifest: {unknown}")
+        entries = [entry for entry in entries if entry.key in names]
+
+    state_path = settings.cache.path / STATE_FILE
+    state = _load_state(state_path)
+
+    def fetch(entry: ManifestEntry) -> FetchResult:
+        # Downloads only get and set the record of their own destination,
+        # which are atomic on a dict shared between threads
+        try:
+            return fetch_file(entry, force=force, state=state, **kwargs)
+        except Exception as error:
+            # The destination is absolute, as in the other results, even
+            # when it is outside the data directories
+            return FetchResult(
+                entry.key, entry.absolute_dest, 'failed',
+                error=f'{type(error).__name__}: {error}'
+            )
+
+    workers = max(1, min(max_workers or settings.fetch.max_workers, len(entries)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(fetch, entries))
+    _save_state(state_path, state)
+
+    if any(result.status == 'failed' for result in results):
+        raise FetchError(results)
+    return results
@@ -0,0 +1,138 @@
+"""
+Turn raw data into a clean dataset ready for feature building.
+"""
+
+import re
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.data.data_loader import load_csv, load_dataset, save_dataset
+from {{ cookiecutter.module_name }}.data.validation import DatasetSchema, Validator
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+
+
+def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize column names to lowercase snake_case.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input DataFrame.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with normalized column names.
+    """
+    columns = [
+        re.sub(r'[^0-9a-zA-Z]+', '_', str(col)).strip('_').lower()
+        for col in df.columns
+    ]
+    return df.set_axis(columns, axis=1)
+
+
+def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the basic cleaning steps shared by all datasets.
+
+    Column names are normalized and rows where every value is missing are
+    dropped.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Raw DataFrame.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Cleaned DataFrame.
+    """
+    return clean_column_names(df).dropna(how='all')
+
+
+@instrument()
+def make_dataset(
+    input_filepath: Union[str, Path],
+    output_filepath: Union[str, Path],
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    drop_duplicates: bool = True,
+    partition_cols: Optional[List[str]] = None,
+    schema: Optional[Union[DatasetSchema, str, Path]] = None,
+    drop_invalid: bool = False
+) -> pd.DataFrame:
+    """
+    Load a raw dataset, clean it and write it to `output_filepath`.
+
+    Parameters
+    ----------
+    input_filepath : str or pathlib.Path
+        Path to the raw data file.
+    output_filepath : str or pathlib.Path
+        Path of the cleaned dataset (``.parquet`` or ``.csv``), or of a
+        partitioned Parquet directory with `partition_cols`.
+    chunk_size : int, optional
+        Read CSV input in chunks of this many rows to bound parser memory.
+    n_jobs : int, optional
+        When different from 1, partitions are written in parallel and, unless
+        ``data.csv_engine`` is configured, CSV input without `chunk_size` is
+        parsed with the multi-threaded pyarrow engine. Defaults to the
+        configured ``compute.n_jobs``.
+    drop_duplicates : bool, optional
+        Whether to drop duplicated rows (default is True).
+    partition_cols : list of str, optional
+        Columns to partition the output by (see `save_dataset`).
+    schema : DatasetSchema, str or pathlib.Path, optional
+        Schema (or YAML schema file) the cleaned rows are validated against,
+        chunk by chunk as they are read.
+    drop_invalid : bool, optional
+        Whether to drop the rows failing `schema` instead of raising
+        (default is False).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The cleaned dataset.
+
+    Raises
+    ------
+    ValidationError
+        If rows fail `schema` and `drop_invalid` is False. Nothing is written.
+    """
+    settings = get_settings()
+    if n_jobs is None:
+        n_jobs = settings.compute.n_jobs
+    input_filepath = Path(input_filepath)
+    is_csv = input_filepath.suffix.lower() == '.csv'
+    if schema is not None and not isinstance(schema, DatasetSchema):
+        schema = DatasetSchema.from_yaml(schema)
+    validator = Validator(schema) if schema is not None else None
+
+    if is_csv and chunk_size:
+        chunks = (clean_dataset(chunk) for chunk in load_csv(input_filepath, chunksize=chunk_size))
+        if validator is not None:
+            chunks = validator.iter(chunks, drop_invalid=drop_invalid)
+        df = pd.concat(chunks, ignore_index=True)
+    else:
+        # An explicitly configured CSV engine wins over the n_jobs heuristic
+        if is_csv and n_jobs != 1 and settings.data.csv_engine is None:
+            df = clean_dataset(load_csv(input_filepath, engine='pyarrow'))
+        else:
+            df = clean_dataset(pd.DataFrame(load_dataset(input_filepath)))
+        if validator is not None:
+            valid = validator.validate(df)
+            if drop_invalid:
+                df = df[valid]
+    if validator is not None and not drop_invalid:
+        validator.report.raise_for_errors()
+
+    if drop_duplicates:
+        df = df.drop_duplicates(ignore_index=True)
+
+    save_dataset(df, output_filepath, partition_cols=partition_cols, n_jobs=n_jobs)
+    return df
@@ -0,0 +1,546 @@
+"""
+Synthetic datasets of any size for load and performance testing.
+
+A `SyntheticSpec` describes the shape of a dataset: the number of rows, of
+numerical, categorical and datetime columns, the cardinality of the
+categorical columns, the share of missing values and an optional target that
+depends on the features. Rows are generated with vectorized NumPy in blocks
+of `BLOCK_ROWS`, each from its own random stream derived from the seed, so the
+data are the same whatever the chunk size or the number of workers.
+
+`write_synthetic` generates and serializes chunks in parallel and writes CSV,
+Parquet, NPY or Excel files; `synthetic_dataset` caches them by spec, so a
+dataset of 10^8 rows is only generated once::
+
+    my-cli synthesize data/raw/synthetic.parquet --rows 100000000 --jobs -1
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.parallel import resolve_n_jobs
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+
+# Rows generated from each random stream; chunks are multiples of it
+BLOCK_ROWS = 1 << 16
+# Bumped whenever the generated values change, to invalidate cached files
+GENERATOR_VERSION = 1
+# Data rows of an Excel worksheet, below the header row
+EXCEL_MAX_ROWS = 1_048_575
+FORMATS = ('csv', 'parquet', 'npy', 'xlsx')
+TARGETS = ('classification', 'regression')
+# Chunk size of `write_synthetic` when neither the argument nor the
+# ``compute.chunk_size`` setting is given
+DEFAULT_CHUNK_SIZE = 16 * BLOCK_ROWS
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    Shape of a synthetic dataset.
+
+    Columns are named ``num_<i>``, ``cat_<i>``, ``ts_<i>`` and ``target``.
+    Numerical columns cycle through normal, log-normal and uniform
+    distributions. Categorical values follow a Zipf-like distribution, so a
+    few levels are frequent and most are rare. Timestamps are uniform over
+    `days` days from `start`. The classification target is 1 with a
+    probability increasing with the first numerical columns and the first
+    categorical column; the regression target is a noisy linear function of
+    them. The target is never missing.
+
+    Parameters
+    ----------
+    rows : int
+        Number of rows.
+    numeric : int, optional
+        Number of numerical columns (default is 4).
+    categorical : int, optional
+        Number of categorical columns (default is 2).
+    datetime : int, optional
+        Number of datetime columns (default is 1).
+    cardinality : int or tuple of int, optional
+        Number of levels of every categorical column, or of each one.
+    null_rate : float, optional
+        Share of missing values in every feature column (default is 0).
+    target : str, optional
+        'classification', 'regression' or None for no target column.
+    seed : int, optional
+        Seed of the random streams.
+    start : str, optional
+        First possible timestamp.
+    days : int, optional
+        Span of the timestamps in days.
+    """
+
+    rows: int
+    numeric: int = 4
+    categorical: int = 2
+    datetime: int = 1
+    cardinality: Union[int, Tuple[int, ...]] = 100
+    null_rate: float = 0.0
+    target: Optional[str] = 'classification'
+    seed: int = 0
+    start: str = '2020-01-01'
+    days: int = 365
+
+    def __post_init__(self) -> None:
+        if min(self.rows, self.numeric, self.categorical, self.datetime) < 0:
+            raise ValueError("rows and column counts must not be negative")
+        if not 0 <= self.null_rate < 1:
+            raise ValueError(f"null_rate must be in [0, 1), got {self.null_rate}")
+        if self.target is not None and self.target not in TARGETS:
+            raise ValueError(
+                f"target must be one of {TARGETS} or None, got {self.target!r}"
+            )
+        if self.days <= 0:
+            raise ValueError(f"days must be positive, got {self.days}")
+        if not isinstance(self.cardinality, int):
+            # Lists are accepted but stored as tuples, so that the spec stays hashable
+            object.__setattr__(self, 'cardinality', tuple(self.cardinality))
+        if len(self.cardinalities) != self.categorical:
+            raise ValueError(
+                f"Got {len(self.cardinalities)} cardinalities for "
+                f"{self.categorical} categorical columns"
+            )
+        if any(levels < 1 for levels in self.cardinalities):
+            raise ValueError("Categorical columns need at least one level")
+
+    @property
+    def cardinalities(self) -> Tuple[int, ...]:
+        """Number of levels of each categorical column."""
+        if isinstance(self.cardinality, int):
+            return (self.cardinality,) * self.categorical
+        return tuple(self.cardinality)
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names, in order."""
+        names = [f'num_{i}' for i in range(self.numeric)]
+        names += [f'cat_{i}' for i in range(self.categorical)]
+        names += [f'ts_{i}' for i in range(self.datetime)]
+        if self.target is not None:
+            names.append('target')
+        return names
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        """Columns written to NPY files: the numerical features and target."""
+        names = [f'num_{i}' for i in range(self.numeric)]
+        if self.target is not None:
+            names.append('target')
+        return names
+
+    def key(self) -> str:
+        """Digest identifying the generated data, used as cache key."""
+        payload = json.dumps(
+            {**asdict(self), 'version': GENERATOR_VERSION}, sort_keys=True, default=list
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+# Distributions of the numerical columns, as (sampler, mean, std) so that the
+# target can be computed from standardized features
+_Sampler = Callable[[np.random.Generator, int], np.ndarray]
+_DISTRIBUTIONS: Tuple[Tuple[_Sampler, float, float], ...] = (
+    (lambda rng, n: rng.standard_normal(n), 0.0, 1.0),
+    (
+        lambda rng, n: rng.lognormal(0.0, 1.0, n),
+        np.exp(0.5),
+        np.sqrt((np.e - 1) * np.e),
+    ),
+    (lambda rng, n: rng.uniform(0.0, 100.0, n), 50.0, 100.0 / np.sqrt(12)),
+)
+# Numerical columns the target depends on
+_TARGET_FEATURES = 3
+
+
+def _zipf_cdf(levels: int) -> np.ndarray:
+    """Cumulative probabilities of levels with frequencies proportional to 1 / rank."""
+    weights = 1.0 / np.arange(1, levels + 1)
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def _generate_block(spec: SyntheticSpec, index: int) -> pd.DataFrame:
+    """Generate the rows of block `index` from its own random stream."""
+    start = index * BLOCK_ROWS
+    n = max(min(BLOCK_ROWS, spec.rows - start), 0)
+    rng = np.random.default_rng([spec.seed, index])
+    data: Dict[str, Any] = {}
+    score = np.zeros(n)
+
+    for i in range(spec.numeric):
+        sample, mean, std = _DISTRIBUTIONS[i % len(_DISTRIBUTIONS)]
+        values = sample(rng, n)
+        if i < _TARGET_FEATURES:
+            score += (values - mean) / std
+        data[f'num_{i}'] = values
+
+    for i, levels in enumerate(spec.cardinalities):
+        codes = np.searchsorted(_zipf_cdf(levels), rng.random(n), side='right')
+        codes = np.minimum(codes, levels - 1)
+        if i == 0:
+            score += (codes % 3 - 1) * 0.5
+        data[f'cat_{i}'] = codes
+
+    origin = np.datetime64(pd.Timestamp(spec.start).to_datetime64(), 's')
+    for i in range(spec.datetime):
+        offsets = rng.integers(0, spec.days * 86_400, n).astype('timedelta64[s]')
+        data[f'ts_{i}'] = (origin + offsets).astype('datetime64[ns]')
+
+    if spec.target == 'classification':
+        data['target'] = (score + rng.logistic(size=n) > 0).astype(np.int64)
+    elif spec.target == 'regression':
+        data['target'] = 10 * score + rng.standard_normal(n)
+
+    # Missing values are drawn last, so the null rate does not change the values
+    for name in spec.columns:
+        if name == 'target' or spec.null_rate == 0:
+            continue
+        missing = rng.random(n) < spec.null_rate
+        if name.startswith('num_'):
+            data[name][missing] = np.nan
+        elif name.startswith('cat_'):
+            data[name][missing] = -1
+        else:
+            data[name][missing] = np.datetime64('NaT')
+
+    for i, levels in enumerate(spec.cardinalities):
+        categories = [f'cat_{i}_{level}' for level in range(levels)]
+        data[f'cat_{i}'] = pd.Categorical.from_codes(data[f'cat_{i}'], categories)
+    index = pd.RangeIndex(start, start + n)
+    return pd.DataFrame(data, index=index, columns=spec.columns)
+
+
+def generate_rows(spec: SyntheticSpec, start: int, stop: int) -> pd.DataFrame:
+    """
+    Generate rows ``start`` to ``stop`` (excluded) of a synthetic dataset.
+
+    Parameters
+    ----------
+    spec : SyntheticSpec
+        Dataset shape.
+    start, stop : int
+        Row range; rows past ``spec.rows`` are not generated.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The rows, indexed by their position in the dataset.
+    """
+    stop = min(stop, spec.rows)
+    if start >= stop:
+        return _generate_block(spec, spec.rows // BLOCK_ROWS + 1).iloc[:0]
+    first, last = start // BLOCK_ROWS, (stop - 1) // BLOCK_ROWS
+    blocks = [_generate_block(spec, index) for index in range(first, last + 1)]
+    frame = blocks[0] if len(blocks) == 1 else pd.concat(blocks)
+    offset = first * BLOCK_ROWS
+    return frame.iloc[start - offset:stop - offset]
+
+
+def _chunk_ranges(rows: int, chunk_size: Optional[int]) -> List[Tuple[int, int]]:
+    """Row ranges of the chunks, rounded up to whole blocks."""
+    chunk_size = chunk_size or get_settings().compute.chunk_size or DEFAULT_CHUNK_SIZE
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    chunk_size = -(-chunk_size // BLOCK_ROWS) * BLOCK_ROWS
+    return [
+        (start, min(start + chunk_size, rows))
+        for start in range(0, rows, chunk_size)
+    ]
+
+
+def _ordered_map(
+    func: Callable[..., Any],
+    tasks: Sequence[Tuple[Any, ...]],
+    n_jobs: Optional[int],
+    backend: Optional[str]
+) -> Iterator[Any]:
+    """Yield ``func(*task)`` in task order, with two tasks per worker in flight."""
+    compute = get_settings().compute
+    n_workers = resolve_n_jobs(compute.n_jobs if n_jobs is None else n_jobs)
+    if n_workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield func(*task)
+        return
+    backend = backend or compute.backend
+    executor_class = (
+        ProcessPoolExecutor if backend == 'processes' else ThreadPoolExecutor
+    )
+    with executor_class(max_workers=n_workers) as executor:
+        pending: List[Future] = []
+        for task in tasks:
+            if len(pending) >= 2 * n_workers:
+                yield pending.pop(0).result()
+            pending.append(executor.submit(func, *task))
+        for future in pending:
+            yield future.result()
+
+
+def iter_synthetic(
+    spec: SyntheticSpec,
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    backend: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Generate a synthetic dataset chunk by chunk.
+
+    Parameters
+    ----------
+    spec : SyntheticSpec
+        Dataset shape.
+    chunk_size : int, optional
+        Rows per chunk, rounded up to a multiple of `BLOCK_ROWS`. Defaults to
+        the configured ``compute.chunk_size``, else `DEFAULT_CHUNK_SIZE`.
+    n_jobs : int, optional
+        Number of workers generating chunks ahead (-1 uses all CPUs).
+        Defaults to the configured ``compute.n_jobs``.
+    backend : str, optional
+        'threads' or 'processes', defaults to the configured
+        ``compute.backend``.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Consecutive chunks, in order.
+    """
+    ranges = _chunk_ranges(spec.rows, chunk_size)
+    tasks = [(spec, start, stop) for start, stop in ranges]
+    yield from _ordered_map(generate_rows, tasks, n_jobs, backend)
+
+
+@instrument()
+def generate_frame(
+    spec: SyntheticSpec,
+    n_jobs: Optional[int] = None,
+    backend: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Generate a whole synthetic dataset in memory.
+
+    Parameters
+    ----------
+    spec : SyntheticSpec
+        Dataset shape.
+    n_jobs : int, optional
+        Number of workers (-1 uses all CPUs). Defaults to the configured
+        ``compute.n_jobs``.
+    backend : str, optional
+        'threads' or 'processes', defaults to the configured
+        ``compute.backend``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The dataset, with a RangeIndex.
+    """
+    chunks = list(iter_synthetic(spec, n_jobs=n_jobs, backend=backend))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks) if chunks else generate_rows(spec, 0, 0)
+
+
+def _arrow_chunk(spec: SyntheticSpec, start: int, stop: int) -> Any:
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(generate_rows(spec, start, stop), preserve_index=False)
+
+
+def _csv_chunk(spec: SyntheticSpec, start: int, stop: int) -> bytes:
+    """Generate and serialize a chunk as CSV, with the header on the first one."""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    table = _arrow_chunk(spec, start, stop)
+    # Timestamps are whole seconds, written without a fractional part
+    for name in spec.columns:
+        if name.startswith('ts_'):
+            index = table.schema.get_field_index(name)
+            table = table.set_column(index, name, table[name].cast(pa.timestamp('s')))
+    sink = pa.BufferOutputStream()
+    # pyarrow serializes about ten times faster than `DataFrame.to_csv`
+    pa_csv.write_csv(table, sink, pa_csv.WriteOptions(include_header=start == 0))
+    return sink.getvalue().to_pybytes()
+
+
+def _npy_chunk(spec: SyntheticSpec, start: int, stop: int, path: str) -> None:
+    """Generate a chunk and write its numerical columns into the NPY file at `path`."""
+    array = np.load(path, mmap_mode='r+')
+    rows = generate_rows(spec, start, stop)[spec.numeric_columns]
+    array[start:stop] = rows.to_numpy(np.float64)
+    array.flush()
+
+
+def _write_excel(
+    chunks: Iterator[pd.DataFrame],
+    spec: SyntheticSpec,
+    path: Path
+) -> None:
+    """Stream chunks to a worksheet with the write-only openpyxl workbook."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(spec.columns)
+    for chunk in chunks:
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+
+@instrument()
+def write_synthetic(
+    spec: SyntheticSpec,
+    filepath: Union[str, Path],
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    backend: Optional[str] = None
+) -> Path:
+    """
+    Generate a synthetic dataset and write it to disk.
+
+    The format follows the extension: ``.csv``, ``.parquet``, ``.npy`` (a
+    float64 matrix of `SyntheticSpec.numeric_columns`) or ``.xlsx``. Chunks
+    are generated and serialized by parallel workers and written in order:
+    CSV text and Arrow tables are appended to the file, and NPY workers write
+    their rows into a memory-mapped file directly. The file is written next
+    to `filepath` and moved into place once complete.
+
+    Parameters
+    ----------
+    spec : SyntheticSpec
+        Dataset shape.
+    filepath : str or pathlib.Path
+        Destination file.
+    chunk_size : int, optional
+        Rows per chunk, as in `iter_synthetic`. Parquet row groups are at
+        most ``data.row_group_size`` rows.
+    n_jobs : int, optional
+        Number of workers (-1 uses all CPUs). Defaults to the configured
+        ``compute.n_jobs``.
+    backend : str, optional
+        'threads' or 'processes', defaults to the configured
+        ``compute.backend``.
+
+    Returns
+    -------
+    pathlib.Path
+        The written file.
+
+    Raises
+    ------
+    ValueError
+        If the format is not supported or an Excel file would exceed the
+        worksheet row limit.
+    """
+    filepath = Path(filepath)
+    fmt = filepath.suffix.lower().lstrip('.')
+    if fmt not in FORMATS:
+        raise ValueError(
+            f"Unsupported file format: {filepath.suffix}; expected one of {FORMATS}"
+        )
+    if fmt == 'xlsx' and spec.rows > EXCEL_MAX_ROWS:
+        raise ValueError(
+            f"Excel worksheets hold at most {EXCEL_MAX_ROWS} rows, got {spec.rows}"
+        )
+
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    staging = filepath.with_name(
+        f'.{filepath.name}.tmp-{uuid.uuid4().hex}{filepath.suffix}'
+    )
+    ranges = _chunk_ranges(spec.rows, chunk_size)
+    try:
+        if fmt == 'csv':
+            with open(staging, 'wb') as f:
+                if not ranges:
+                    f.write(_csv_chunk(spec, 0, 0))
+                tasks = [(spec, start, stop) for start, stop in ranges]
+                for data in _ordered_map(_csv_chunk, tasks, n_jobs, backend):
+                    f.write(data)
+        elif fmt == 'parquet':
+            import pyarrow.parquet as pq
+
+            settings = get_settings()
+            tasks = [(spec, start, stop) for start, stop in ranges] or [(spec, 0, 0)]
+            writer = None
+            try:
+                for table in _ordered_map(_arrow_chunk, tasks, n_jobs, backend):
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            staging, table.schema,
+                            compression=settings.data.parquet_compression,
+                        )
+                    writer.write_table(
+                        table, row_group_size=settings.data.row_group_size
+                    )
+            finally:
+                if writer is not None:
+                    writer.close()
+        elif fmt == 'npy':
+            shape = (spec.rows, len(spec.numeric_columns))
+            array = np.lib.format.open_memmap(
+                staging, mode='w+', dtype=np.float64, shape=shape
+            )
+            del array
+            tasks = [(spec, start, stop, str(staging)) for start, stop in ranges]
+            for _ in _ordered_map(_npy_chunk, tasks, n_jobs, backend):
+                pass
+        else:
+            chunks = iter_synthetic(spec, chunk_size, n_jobs, backend)
+            _write_excel(chunks, spec, staging)
+        os.replace(staging, filepath)
+    finally:
+        staging.unlink(missing_ok=True)
+    return filepath
+
+
+def synthetic_dataset(
+    spec: SyntheticSpec,
+    fmt: str = 'parquet',
+    cache_dir: Optional[Union[str, Path]] = None,
+    **kwargs: Any
+) -> Path:
+    """
+    Return a cached synthetic dataset file, generating it on first use.
+
+    Files are named after `SyntheticSpec.key`, so a spec is generated once
+    and reused by later calls and test sessions. Concurrent callers may both
+    generate the file; since the data are deterministic, either copy wins.
+
+    Parameters
+    ----------
+    spec : SyntheticSpec
+        Dataset shape.
+    fmt : str, optional
+        'csv', 'parquet' (default), 'npy' or 'xlsx'.
+    cache_dir : str or pathlib.Path, optional
+        Cache directory, by default ``synthetic`` under the configured
+        ``cache.dir``.
+    **kwargs
+        Passed to `write_synthetic`.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the cached file.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported file format: {fmt}; expected one of {FORMATS}")
+    if cache_dir is None:
+        cache_dir = get_settings().cache.path / 'synthetic'
+    path = Path(cache_dir) / f'synthetic-{spec.key()}.{fmt}'
+    if not path.exists():
+        write_synthetic(spec, path, **kwargs)
+    return path
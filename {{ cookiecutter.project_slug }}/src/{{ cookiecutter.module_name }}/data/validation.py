@@ -0,0 +1,497 @@
+"""
+Schema validation of datasets, chunk by chunk.
+
+A `DatasetSchema` declares, per column, the expected dtype, value range,
+nullability, uniqueness and allowed values. A `Validator` checks chunks
+against it with vectorized pandas/NumPy operations (one boolean mask per
+column and check, never a Python loop over rows) and aggregates the results
+in a `ValidationReport`: the number of failing values per column and check,
+the number of invalid rows, and a few sample bad rows for debugging.
+
+Validation runs inline on the chunked loaders, so checking a dataset does
+not need a second pass over the data::
+
+    validator = Validator(DatasetSchema.from_yaml(config_dir('schema.yml')))
+    for chunk in iter_dataset(data_raw_dir('input.csv'), validator=validator):
+        ...
+    validator.report.raise_for_errors()
+
+Uniqueness is checked across chunks with 64-bit hashes of the values, so its
+memory grows with 8 bytes per row rather than with the values themselves.
+
+Example schema file
+-------------------
+.. code-block:: yaml
+
+    strict: false
+    columns:
+      id: {dtype: int, nullable: false, unique: true}
+      age: {dtype: int, min_value: 0, max_value: 130}
+      country: {dtype: string, allowed: [FR, DE, ES]}
+      signup: {dtype: datetime, min_value: '2015-01-01'}
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import yaml
+from pydantic import BaseModel, Field, model_validator
+
+# Dtypes accepted by `ColumnSchema.dtype`
+DTYPES = ('int', 'float', 'bool', 'string', 'datetime')
+# Default number of sample bad rows kept by a `ValidationReport`
+DEFAULT_MAX_SAMPLES = 20
+
+_BOOL_VALUES = [True, False, 0, 1, 'true', 'false', 'True', 'False', 'TRUE', 'FALSE']
+
+
+class ValidationError(ValueError):
+    """Raised when a dataset does not match its schema."""
+
+    def __init__(self, report: 'ValidationReport') -> None:
+        self.report = report
+        super().__init__(report.summary())
+
+
+class ColumnSchema(BaseModel):
+    """
+    Expectations on the values of one column.
+
+    Attributes
+    ----------
+    dtype : str, optional
+        One of `DTYPES`; values must be convertible to it. Integer columns
+        also accept whole floats (e.g. ``3.0``, as read from a column with
+        missing values), and datetime columns accept parseable strings.
+    nullable : bool
+        Whether missing values are allowed (default is True).
+    unique : bool
+        Whether non-missing values must be unique across the whole dataset.
+    min_value, max_value : float or str, optional
+        Inclusive bounds of numeric or datetime values.
+    allowed : list, optional
+        Allowed values, e.g. the categories of a categorical column.
+    required : bool
+        Whether the column must be present (default is True).
+    format : str, optional
+        ``strftime`` format of datetime strings, faster than inferring it.
+    """
+
+    dtype: Optional[Literal['int', 'float', 'bool', 'string', 'datetime']] = None
+    nullable: bool = True
+    unique: bool = False
+    min_value: Optional[Union[float, str]] = None
+    max_value: Optional[Union[float, str]] = None
+    allowed: Optional[List[Any]] = None
+    required: bool = True
+    format: Optional[str] = None
+
+    @model_validator(mode='after')
+    def _check_bounds(self) -> 'ColumnSchema':
+        has_bounds = self.min_value is not None or self.max_value is not None
+        if has_bounds and self.dtype in ('bool', 'string'):
+            raise ValueError(f"min_value/max_value cannot be used with dtype {self.dtype!r}")
+        return self
+
+
+class DatasetSchema(BaseModel):
+    """
+    Expectations on the columns of a dataset.
+
+    Attributes
+    ----------
+    columns : dict of str to ColumnSchema
+        Schema of each declared column.
+    strict : bool
+        Whether columns that are not declared are errors (default is False).
+    """
+
+    columns: Dict[str, ColumnSchema] = Field(default_factory=dict)
+    strict: bool = False
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> 'DatasetSchema':
+        """
+        Read a schema from a YAML file.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            File with a ``columns`` mapping and an optional ``strict`` flag.
+
+        Returns
+        -------
+        DatasetSchema
+            The validated schema.
+        """
+        with open(path, encoding='utf-8') as f:
+            return cls.model_validate(yaml.safe_load(f) or {})
+
+
+class ValidationReport:
+    """
+    Aggregated result of validating a dataset.
+
+    Attributes
+    ----------
+    rows : int
+        Number of rows checked.
+    invalid_rows : int
+        Number of rows with at least one failing value.
+    errors : collections.Counter
+        Number of failing values per ``(column, check)``. Column-level checks
+        ('missing', 'unexpected') count one error per dataset.
+    samples : list of dict
+        Up to `max_samples` bad rows, with their row label, the failing
+        column, check and value, and the whole row as ``record``.
+    """
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES) -> None:
+        self.max_samples = max_samples
+        self.rows = 0
+        self.invalid_rows = 0
+        self.errors: Counter = Counter()
+        self.samples: List[Dict[str, Any]] = []
+
+    @property
+    def ok(self) -> bool:
+        """Whether no check failed."""
+        return not self.errors
+
+    def add(self, column: str, check: str, mask: np.ndarray, chunk: pd.DataFrame) -> None:
+        """Record the failing values of one check, given as a boolean mask."""
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return
+        self.errors[(column, check)] += count
+        remaining = self.max_samples - len(self.samples)
+        if remaining > 0:
+            # Only the sampled rows are converted to Python objects
+            bad_rows = chunk.iloc[np.flatnonzero(mask)[:remaining]]
+            for label, record in zip(bad_rows.index, bad_rows.to_dict('records')):
+                self.samples.append({
+                    'row': _to_builtin(label),
+                    'column': column,
+                    'check': check,
+                    'value': _to_builtin(record.get(column)),
+                    'record': {str(key): _to_builtin(value) for key, value in record.items()},
+                })
+
+    def summary(self) -> str:
+        """One line per failing check, e.g. for error messages."""
+        if self.ok:
+            return f"{self.rows} rows valid"
+        lines = [f"{self.invalid_rows} of {self.rows} rows invalid"]
+        lines += [
+            f"  {column}: {check} ({count})"
+            for (column, check), count in self.errors.most_common()
+        ]
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON serializable form of the report."""
+        return {
+            'ok': self.ok,
+            'rows': self.rows,
+            'invalid_rows': self.invalid_rows,
+            'errors': [
+                {'column': column, 'check': check, 'count': count}
+                for (column, check), count in self.errors.most_common()
+            ],
+            'samples': list(self.samples),
+        }
+
+    def raise_for_errors(self) -> None:
+        """
+        Raise if any check failed.
+
+        Raises
+        ------
+        ValidationError
+            If the report contains errors.
+        """
+        if not self.ok:
+            raise ValidationError(self)
+
+
+def _to_builtin(value: Any) -> Any:
+    """Convert NumPy and pandas scalars to JSON serializable values."""
+    if value is None or (not isinstance(value, (list, tuple)) and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    return value
+
+
+class _HashSet:
+    """
+    Set of 64-bit hashes kept as sorted runs of geometrically growing size.
+
+    Adding n hashes costs O(n log n) amortized and membership tests are a
+    binary search per run, so uniqueness can be tracked across chunks without
+    re-sorting everything seen so far.
+    """
+
+    def __init__(self) -> None:
+        self.runs: List[np.ndarray] = []
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            if not len(run):
+                continue
+            positions = np.searchsorted(run, hashes)
+            positions[positions == len(run)] = 0
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        run = _sorted_unique(hashes)
+        # Merge runs of similar size, keeping O(log n) runs
+        while self.runs and len(self.runs[-1]) <= 2 * len(run):
+            run = _sorted_unique(np.concatenate([self.runs.pop(), run]))
+        self.runs.append(run)
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    # Faster than np.unique, which also handles NaN and return options
+    values = np.sort(values)
+    if len(values) > 1:
+        values = values[np.concatenate([[True], values[1:] != values[:-1]])]
+    return values
+
+
+class Validator:
+    """
+    Check chunks of a dataset against a schema, accumulating a report.
+
+    Parameters
+    ----------
+    schema : DatasetSchema
+        Expected columns and values.
+    max_samples : int, optional
+        Number of sample bad rows kept in the report (default is
+        `DEFAULT_MAX_SAMPLES`).
+
+    Attributes
+    ----------
+    report : ValidationReport
+        Results of every chunk checked so far.
+    """
+
+    def __init__(self, schema: DatasetSchema, max_samples: int = DEFAULT_MAX_SAMPLES) -> None:
+        self.schema = schema
+        self.report = ValidationReport(max_samples)
+        self._seen: Dict[str, _HashSet] = {
+            name: _HashSet() for name, column in schema.columns.items() if column.unique
+        }
+        self._column_errors: set = set()
+
+    def _column_error(self, column: str, check: str) -> None:
+        # Reported once per dataset rather than once per chunk
+        if (column, check) not in self._column_errors:
+            self._column_errors.add((column, check))
+            self.report.errors[(column, check)] += 1
+
+    def validate(self, chunk: pd.DataFrame) -> np.ndarray:
+        """
+        Check one chunk and add its results to `report`.
+
+        Parameters
+        ----------
+        chunk : pandas.DataFrame
+            Consecutive rows of the dataset.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the rows of `chunk` that passed every check.
+        """
+        valid = np.ones(len(chunk), dtype=bool)
+        for name, column in self.schema.columns.items():
+            if name not in chunk.columns:
+                if column.required:
+                    self._column_error(name, 'missing')
+                continue
+            for check, mask in self._check_column(name, column, chunk[name]):
+                self.report.add(name, check, mask, chunk)
+                valid &= ~mask
+        if self.schema.strict:
+            for name in chunk.columns:
+                if name not in self.schema.columns:
+                    self._column_error(str(name), 'unexpected')
+
+        self.report.rows += len(chunk)
+        self.report.invalid_rows += int(len(chunk) - np.count_nonzero(valid))
+        return valid
+
+    def _check_column(
+        self,
+        name: str,
+        column: ColumnSchema,
+        values: pd.Series
+    ) -> Iterator[Tuple[str, np.ndarray]]:
+        """Yield the failing mask of each check of one column."""
+        missing = values.isna().to_numpy()
+        if not column.nullable:
+            yield 'not_null', missing
+
+        typed, bad_type = _coerce(values, column, missing)
+        yield 'dtype', bad_type
+        present = ~(missing | bad_type)
+
+        if column.min_value is not None:
+            bound = _bound(column.min_value, column)
+            yield 'min_value', present & (typed < bound).to_numpy(dtype=bool, na_value=False)
+        if column.max_value is not None:
+            bound = _bound(column.max_value, column)
+            yield 'max_value', present & (typed > bound).to_numpy(dtype=bool, na_value=False)
+        if column.allowed is not None:
+            yield 'allowed', ~missing & ~values.isin(column.allowed).to_numpy()
+        if column.unique:
+            yield 'unique', self._duplicates(name, column, typed, present)
+
+    def _duplicates(
+        self,
+        name: str,
+        column: ColumnSchema,
+        values: pd.Series,
+        present: np.ndarray
+    ) -> np.ndarray:
+        values = values[present]
+        # Hashes depend on the dtype, which may differ between chunks (e.g.
+        # int64, or float64 in a chunk with missing values)
+        if column.dtype == 'int':
+            values = values.astype('int64')
+        elif column.dtype == 'datetime':
+            values = values.astype('datetime64[ns]')
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            values = values.astype('float64')
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        seen = self._seen[name]
+        duplicated = pd.Series(hashes).duplicated().to_numpy() | seen.contains(hashes)
+        seen.add(hashes)
+        mask = np.zeros(len(present), dtype=bool)
+        mask[present] = duplicated
+        return mask
+
+    def iter(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        drop_invalid: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Validate chunks as they are consumed.
+
+        Parameters
+        ----------
+        chunks : iterable of pandas.DataFrame
+            Chunks of the dataset, e.g. from `iter_dataset`.
+        drop_invalid : bool, optional
+            Whether to drop the rows that failed a check (default is False).
+
+        Yields
+        ------
+        pandas.DataFrame
+            The chunks, unchanged or without their invalid rows.
+        """
+        for chunk in chunks:
+            valid = self.validate(chunk)
+            yield chunk[valid] if drop_invalid and not valid.all() else chunk
+
+
+def _coerce(
+    values: pd.Series,
+    column: ColumnSchema,
+    missing: np.ndarray
+) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Convert values to the dtype of the schema.
+
+    Returns the converted values, with values that cannot be converted as
+    missing, and the mask of those values.
+    """
+    no_errors = np.zeros(len(values), dtype=bool)
+    dtype = column.dtype
+    if dtype in ('int', 'float') or (dtype is None and _has_bounds(column)):
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            typed = values
+        else:
+            typed = pd.to_numeric(values, errors='coerce')
+        bad = typed.isna().to_numpy() & ~missing
+        if dtype == 'int' and not pd.api.types.is_integer_dtype(typed):
+            bad |= (typed % 1 != 0).to_numpy(dtype=bool, na_value=False) & ~missing
+        return typed, bad
+    if dtype == 'datetime':
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values, no_errors
+        typed = pd.to_datetime(values, errors='coerce', format=column.format)
+        return typed, typed.isna().to_numpy() & ~missing
+    if dtype == 'bool':
+        if pd.api.types.is_bool_dtype(values):
+            return values, no_errors
+        return values, ~missing & ~values.isin(_BOOL_VALUES).to_numpy()
+    if dtype == 'string':
+        if pd.api.types.is_string_dtype(values) and not pd.api.types.is_object_dtype(values):
+            return values, no_errors
+        if pd.api.types.is_object_dtype(values):
+            # Checked for the whole chunk in C; rows are only inspected on failure
+            if pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty'):
+                return values, no_errors
+            is_string = values.map(lambda value: isinstance(value, str))
+            return values, ~missing & ~is_string.to_numpy(dtype=bool)
+        return values, ~missing
+    return values, no_errors
+
+
+def _has_bounds(column: ColumnSchema) -> bool:
+    return column.min_value is not None or column.max_value is not None
+
+
+def _bound(value: Union[float, str], column: ColumnSchema) -> Any:
+    """Convert a bound to the type of the column values."""
+    if column.dtype == 'datetime':
+        return pd.Timestamp(value)
+    return float(value)
+
+
+def validate_dataset(
+    filepath: Union[str, Path],
+    schema: Union[DatasetSchema, str, Path],
+    chunk_size: Optional[int] = None,
+    max_samples: int = DEFAULT_MAX_SAMPLES
+) -> ValidationReport:
+    """
+    Validate a dataset file in one streaming pass.
+
+    Parameters
+    ----------
+    filepath : str or pathlib.Path
+        Dataset readable by `iter_dataset`.
+    schema : DatasetSchema, str or pathlib.Path
+        Schema, or path of a YAML schema file.
+    chunk_size : int, optional
+        Rows per chunk, by default as in `iter_dataset`.
+    max_samples : int, optional
+        Number of sample bad rows kept in the report.
+
+    Returns
+    -------
+    ValidationReport
+        Error counts and samples of the whole dataset.
+    """
+    from {{ cookiecutter.module_name }}.data.data_loader import iter_dataset
+
+    if not isinstance(schema, DatasetSchema):
+        schema = DatasetSchema.from_yaml(schema)
+    validator = Validator(schema, max_samples=max_samples)
+    for _ in iter_dataset(filepath, chunk_size=chunk_size, validator=validator):
+        pass
+    return validator.report
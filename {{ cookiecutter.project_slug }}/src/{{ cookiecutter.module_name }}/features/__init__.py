@@ -0,0 +1,24 @@
+"""
+Feature engineering and feature building utilities.
+"""
+
+from {{ cookiecutter.module_name }}.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["build_features", "feature_engineering", "selection"],
+    attrs={
+        "feature_engineering": [
+            "scale_features",
+            "encode_categorical",
+            "create_time_features",
+            "create_interaction_features",
+            "create_group_features",
+        ],
+        "selection": [
+            "FeatureSelector",
+            "ColumnMoments",
+            "select_features",
+        ],
+    },
+)
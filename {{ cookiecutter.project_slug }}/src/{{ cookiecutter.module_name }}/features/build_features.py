@@ -0,0 +1,657 @@
+"""
+Build the model feature matrix from a processed dataset.
+
+Feature matrices can be cached in a `FeatureStore`. Every output column is
+keyed by the fingerprint of the input columns it is derived from, the fitted
+transform parameters of that column and the source code of the step producing
+it, so rebuilding with one more feature only computes the new columns.
+
+With ``selection``, `build_features` fits a `FeatureSelector` on the feature
+matrix. Once fitted, the interaction and one-hot columns it drops are not
+computed at all.
+"""
+
+import hashlib
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.data.data_loader import load_dataset, save_dataset
+from {{ cookiecutter.module_name }}.features.feature_engineering import (
+    create_interaction_features,
+    create_time_features,
+    encode_categorical,
+    scale_features,
+)
+from {{ cookiecutter.module_name }}.features.selection import FeatureSelector
+from {{ cookiecutter.module_name }}.models.model_utils import load_model, save_model
+from {{ cookiecutter.module_name }}.utils.parallel import (
+    iter_slices,
+    parse_size,
+    resolve_n_jobs,
+)
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+
+T = TypeVar('T')
+
+# Bump to invalidate every cached feature block, e.g. after changing the format
+FEATURE_STORE_VERSION = 1
+
+
+class FeatureStore:
+    """
+    On-disk cache of feature columns with LRU eviction.
+
+    Each column is stored as a single-column Parquet block named after its
+    key. Reading a block refreshes its modification time, and `evict` removes
+    the least recently used blocks until the store fits in `max_size`.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path, optional
+        Store directory. Defaults to the configured ``cache.features_dir``
+        (``data/processed/features``).
+    max_size : str, optional
+        Maximum store size, e.g. '2G'. Defaults to the configured
+        ``cache.max_size``; None disables eviction.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_size: Optional[str] = None
+    ) -> None:
+        cache = get_settings().cache
+        self.directory = (
+            Path(directory) if directory is not None else cache.features_path
+        )
+        self.max_size = max_size if max_size is not None else cache.max_size
+        self.hits = 0
+        self.misses = 0
+
+    def _block_path(self, key: str) -> Path:
+        return self.directory / 'blocks' / f'{key}.parquet'
+
+    def _object_path(self, key: str) -> Path:
+        return self.directory / 'objects' / f'{key}.joblib'
+
+    def get(self, key: str, index: pd.Index) -> Optional[pd.Series]:
+        """Load a cached column with the given index, or None on a miss."""
+        path = self._block_path(key)
+        try:
+            block = pd.read_parquet(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        column = block.iloc[:, 0]
+        column.index = index
+        return column
+
+    def put(self, key: str, column: pd.Series) -> None:
+        """Store a column."""
+        path = self._block_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        column.to_frame().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def get_object(self, key: str) -> Any:
+        """Load a cached object (e.g. a fitted transformer), or None on a miss."""
+        path = self._object_path(key)
+        if not path.exists():
+            return None
+        os.utime(path)
+        return load_model(path)
+
+    def put_object(self, key: str, obj: Any) -> None:
+        """Store an object."""
+        save_model(obj, self._object_path(key))
+
+    def size(self) -> int:
+        """Total size of the stored blocks and objects in bytes."""
+        return sum(
+            path.stat().st_size for path in self.directory.rglob('*') if path.is_file()
+        )
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries until the store fits `max_size`.
+
+        Returns
+        -------
+        int
+            Number of removed entries.
+        """
+        if not self.max_size or not self.directory.exists():
+            return 0
+        entries = [
+            (stat.st_mtime, stat.st_size, path)
+            for path in self.directory.rglob('*')
+            if path.is_file() and (stat := path.stat())
+        ]
+        total = sum(size for _, size, _ in entries)
+        limit = parse_size(self.max_size)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for path in self.directory.rglob('*'):
+            if path.is_file():
+                path.unlink()
+
+
+def _digest(*parts: Any) -> str:
+    """Hash strings, bytes and arrays into a hexadecimal key."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = part.tobytes() if part.dtype != object else repr(part.tolist())
+        if not isinstance(part, bytes):
+            part = repr(part).encode()
+        h.update(len(part).to_bytes(8, 'little'))
+        h.update(part)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _code_version(func: Callable[..., Any]) -> str:
+    """Version a feature step by its source code."""
+    source = inspect.getsource(inspect.unwrap(func))
+    return _digest(FEATURE_STORE_VERSION, source)
+
+
+def _fingerprint_values(values: Union[pd.Series, pd.Index]) -> str:
+    """Fingerprint the values and dtype of a column or index."""
+    if isinstance(values, pd.RangeIndex):
+        return _digest('range', values.start, values.stop, values.step)
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        # Hashing the raw buffer is much faster than hash_pandas_object
+        return _digest(str(dtype), np.ascontiguousarray(values.to_numpy()))
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+    if pa is not None:
+        try:
+            array = pa.array(values)
+        except pa.ArrowException:
+            pass
+        else:
+            buffers = [
+                buffer.to_pybytes() for buffer in array.buffers() if buffer is not None
+            ]
+            return _digest(str(dtype), array.offset, len(array), *buffers)
+    hashed = pd.util.hash_pandas_object(values, index=False, categorize=False)
+    return _digest(str(dtype), hashed.to_numpy())
+
+
+def fingerprint_columns(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """
+    Fingerprint the values, dtype and row index of columns.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input DataFrame.
+    columns : list of str, optional
+        Columns to fingerprint (default is all columns).
+
+    Returns
+    -------
+    dict of str to str
+        Fingerprint per column.
+    """
+    index_fingerprint = _fingerprint_values(df.index)
+    return {
+        column: _digest(index_fingerprint, _fingerprint_values(df[column]))
+        for column in (df.columns if columns is None else columns)
+    }
+
+
+class _Column:
+    """Feature column loaded from the store or computed on demand."""
+
+    def __init__(
+        self,
+        key: Union[str, Callable[[], str]],
+        compute: Callable[[], pd.Series],
+        store: Optional[FeatureStore] = None
+    ) -> None:
+        self._key = key
+        self._compute = compute
+        self._store = store
+        self._value: Optional[pd.Series] = None
+
+    @property
+    def key(self) -> str:
+        # Input columns are only fingerprinted when a step uses them
+        if callable(self._key):
+            self._key = self._key()
+        return self._key
+
+    def value(self, index: pd.Index) -> pd.Series:
+        if self._value is None:
+            if self._store is not None:
+                self._value = self._store.get(self.key, index)
+            if self._value is None:
+                self._value = self._compute()
+                if self._store is not None:
+                    self._store.put(self.key, self._value)
+        return self._value
+
+
+def _once(compute: Callable[[], T]) -> Callable[[], T]:
+    """Memoize a computation, e.g. a step whose output columns are loaded one by one."""
+    result: List[T] = []
+
+    def run() -> T:
+        if not result:
+            result.append(compute())
+        return result[0]
+
+    return run
+
+
+def _column_params(
+    transformer: Any,
+    columns: List[str],
+    attributes: List[str]
+) -> Dict[str, Any]:
+    """Per-column fitted parameters of a column-wise transformer."""
+    names = list(getattr(transformer, 'feature_names_in_', columns))
+    params: Dict[str, Any] = {}
+    for column in columns:
+        i = names.index(column)
+        values = [transformer.get_params()]
+        for attribute in attributes:
+            fitted = getattr(transformer, attribute, None)
+            values.append(None if fitted is None else fitted[i])
+        params[column] = values
+    return params
+
+
+def _build_features_cached(
+    df: pd.DataFrame,
+    store: FeatureStore,
+    scale_columns: Optional[List[str]],
+    categorical_columns: Optional[List[str]],
+    datetime_column: Optional[str],
+    interaction_columns: Optional[List[str]],
+    transformers: Dict[str, Any],
+) -> tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Build features like `build_features`, reusing the columns in `store`.
+
+    Columns are tracked symbolically through the steps: each one gets a key
+    from its inputs' keys and the step, and is only computed (together with
+    the other columns of its step) when that key is not in the store.
+    """
+    index = df.index
+    float_dtype = get_settings().data.float_dtype
+    index_key = _once(lambda: _fingerprint_values(index))
+    columns: Dict[str, _Column] = {
+        name: _Column(
+            lambda name=name: _digest(index_key(), _fingerprint_values(df[name])),
+            partial(df.__getitem__, name),
+        )
+        for name in df.columns
+    }
+    order = list(df.columns)
+
+    def frame(
+        names: List[str],
+        nodes: Optional[Dict[str, _Column]] = None
+    ) -> pd.DataFrame:
+        nodes = columns if nodes is None else nodes
+        values = {name: nodes[name].value(index) for name in names}
+        return pd.DataFrame(values, index=index)
+
+    def inputs(names: List[str]) -> Dict[str, _Column]:
+        # Steps capture their input columns, which later steps may replace
+        return {name: columns[name] for name in names}
+
+    def probe(names: List[str]) -> pd.DataFrame:
+        # Empty frame used to derive the output column names of a step
+        return pd.DataFrame({name: pd.Series(dtype='float64') for name in names})
+
+    def add_step(step: Callable[[], pd.DataFrame], keys: Dict[str, str]) -> None:
+        run = _once(step)
+        for name, key in keys.items():
+            columns[name] = _Column(key, lambda name=name: run()[name], store)
+
+    if datetime_column:
+        version = _code_version(create_time_features)
+        dt_inputs = inputs([datetime_column])
+        dt_key = dt_inputs[datetime_column].key
+        probed = create_time_features(probe([datetime_column]), datetime_column)
+        names = [name for name in probed if name != datetime_column]
+        add_step(
+            lambda: create_time_features(
+                frame([datetime_column], dt_inputs), datetime_column
+            ),
+            {name: _digest('time', version, dt_key, name) for name in names},
+        )
+        order = [name for name in order if name != datetime_column] + names
+        del columns[datetime_column]
+
+    if interaction_columns:
+        version = _code_version(create_interaction_features)
+        for first, second in combinations(interaction_columns, 2):
+            pair = [first, second]
+            names = [
+                name for name in create_interaction_features(probe(pair), pair)
+                if name not in pair
+            ]
+            pair_inputs = inputs(pair)
+            keys = [pair_inputs[first].key, pair_inputs[second].key]
+            add_step(
+                lambda pair=pair, nodes=pair_inputs: create_interaction_features(
+                    frame(pair, nodes), pair
+                ),
+                {name: _digest('interaction', version, *keys, name) for name in names},
+            )
+            order += [name for name in names if name not in order]
+
+    if scale_columns:
+        version = _code_version(scale_features)
+        scale_inputs = inputs(scale_columns)
+        input_keys = [scale_inputs[name].key for name in scale_columns]
+        scaler = transformers.get('scaler')
+        fit_key = _digest('fit-scaler', version, float_dtype, *input_keys)
+        scaler = scaler if scaler is not None else store.get_object(fit_key)
+        fitted = None
+        if scaler is None:
+            fitted, scaler = scale_features(
+                frame(scale_columns, scale_inputs), scale_columns
+            )
+            store.put_object(fit_key, scaler)
+        transformers['scaler'] = scaler
+        params = _column_params(scaler, scale_columns, ['mean_', 'scale_'])
+
+        def scale(
+            fitted: Optional[pd.DataFrame] = fitted,
+            scaler: Any = scaler
+        ) -> pd.DataFrame:
+            if fitted is not None:
+                return fitted
+            return scale_features(
+                frame(scale_columns, scale_inputs), scale_columns, scaler=scaler
+            )[0]
+
+        add_step(scale, {
+            name: _digest('scale', version, float_dtype, key, params[name])
+            for name, key in zip(scale_columns, input_keys, strict=True)
+        })
+
+    if categorical_columns:
+        version = _code_version(encode_categorical)
+        encode_inputs = inputs(categorical_columns)
+        input_keys = [encode_inputs[name].key for name in categorical_columns]
+        encoder = transformers.get('encoder')
+        fit_key = _digest('fit-encoder', version, float_dtype, *input_keys)
+        encoder = encoder if encoder is not None else store.get_object(fit_key)
+        fitted = None
+        if encoder is None:
+            fitted, encoder = encode_categorical(
+                frame(categorical_columns, encode_inputs), categorical_columns
+            )
+            store.put_object(fit_key, encoder)
+        transformers['encoder'] = encoder
+        params = _column_params(
+            encoder, categorical_columns, ['categories_', 'drop_idx_']
+        )
+        names = list(encoder.get_feature_names_out(categorical_columns))
+
+        # Output columns of each input column, in the order of the encoder output
+        outputs: Dict[str, List[str]] = {}
+        remaining = iter(names)
+        for i, name in enumerate(categorical_columns):
+            n_outputs = len(encoder.categories_[i])
+            drop_idx = getattr(encoder, 'drop_idx_', None)
+            if drop_idx is not None and drop_idx[i] is not None:
+                n_outputs -= 1
+            outputs[name] = [next(remaining) for _ in range(n_outputs)]
+
+        def encode(
+            fitted: Optional[pd.DataFrame] = fitted,
+            encoder: Any = encoder
+        ) -> pd.DataFrame:
+            if fitted is not None:
+                return fitted
+            return encode_categorical(
+                frame(categorical_columns, encode_inputs), categorical_columns,
+                encoder=encoder,
+            )[0]
+
+        add_step(encode, {
+            output: _digest('encode', version, float_dtype, key, params[name], output)
+            for name, key in zip(categorical_columns, input_keys, strict=True)
+            for output in outputs[name]
+        })
+        order = [name for name in order if name not in categorical_columns] + names
+
+    df_features = frame(order)
+    store.evict()
+    return df_features, transformers
+
+
+@instrument()
+def build_features(
+    df: pd.DataFrame,
+    scale_columns: Optional[List[str]] = None,
+    categorical_columns: Optional[List[str]] = None,
+    datetime_column: Optional[str] = None,
+    interaction_columns: Optional[List[str]] = None,
+    transformers: Optional[Dict[str, Any]] = None,
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    backend: Optional[str] = None,
+    store: Optional[FeatureStore] = None,
+    selection: Optional[Dict[str, Any]] = None,
+    y: Optional[Any] = None
+) -> tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Apply the feature engineering steps in a fixed order.
+
+    Time features are extracted first, then interaction features are created,
+    numerical columns are scaled and categorical columns are one-hot encoded.
+    Finally, features are selected if a selector is requested or fitted.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Processed input DataFrame.
+    scale_columns : list of str, optional
+        Numerical columns to scale.
+    categorical_columns : list of str, optional
+        Categorical columns to one-hot encode.
+    datetime_column : str, optional
+        Datetime column to extract time features from.
+    interaction_columns : list of str, optional
+        Columns to create pairwise product features from.
+    transformers : dict, optional
+        Pre-fitted transformers (``'scaler'``, ``'encoder'``, ``'selector'``)
+        returned by a previous call, used to transform new data consistently.
+    chunk_size : int, optional
+        When every required transformer is already fitted, transform the data
+        in chunks of this many rows. Fitting always uses the full frame.
+        Defaults to the configured ``compute.chunk_size``.
+    n_jobs : int, optional
+        Number of chunks transformed concurrently (-1 for all CPUs). Defaults
+        to the configured ``compute.n_jobs``.
+    backend : str, optional
+        'threads' or 'processes'; worker processes read `df` from shared
+        memory instead of receiving a copy. Defaults to the configured
+        ``compute.backend``.
+    store : FeatureStore, optional
+        Feature cache. Cached columns are loaded instead of recomputed, and
+        computed columns are added to it.
+    selection : dict, optional
+        Parameters of a `FeatureSelector` fitted on the feature matrix, e.g.
+        ``{'correlation_threshold': 0.95}``. Ignored if `transformers` has a
+        fitted selector.
+    y : array-like, optional
+        Target of the rows of `df`, used to fit the selector.
+
+    Returns
+    -------
+    df_features : pandas.DataFrame
+        Feature matrix.
+    transformers : dict
+        Fitted transformers keyed by ``'scaler'``, ``'encoder'`` and
+        ``'selector'``.
+    """
+    transformers = dict(transformers or {})
+    if store is not None:
+        df_features, transformers = _build_features_cached(
+            df, store, scale_columns, categorical_columns, datetime_column,
+            interaction_columns, transformers
+        )
+        return _select(df_features, transformers, selection, y), transformers
+
+    compute = get_settings().compute
+    chunk_size = compute.chunk_size if chunk_size is None else chunk_size
+    n_jobs = compute.n_jobs if n_jobs is None else n_jobs
+    backend = backend or compute.backend
+
+    is_fitted = (
+        (not scale_columns or 'scaler' in transformers)
+        and (not categorical_columns or 'encoder' in transformers)
+        and (not selection or 'selector' in transformers)
+    )
+    if chunk_size and is_fitted and len(df) > chunk_size:
+        # Every step is row-wise once fitted, so chunks are independent
+        build_chunk = partial(
+            build_features,
+            scale_columns=scale_columns,
+            categorical_columns=categorical_columns,
+            datetime_column=datetime_column,
+            interaction_columns=interaction_columns,
+            transformers=transformers,
+            chunk_size=0,
+        )
+        n_workers = resolve_n_jobs(n_jobs)
+        if backend == 'processes' and n_workers > 1:
+            from {{ cookiecutter.module_name }}.utils.shared import map_shared_slices
+
+            results = map_shared_slices(build_chunk, df, chunk_size, n_workers)
+        else:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(build_chunk, iter_slices(df, chunk_size)))
+        return pd.concat([chunk for chunk, _ in results]), transformers
+
+    df_features = df
+    selector = transformers.get('selector')
+
+    if datetime_column:
+        df_features = create_time_features(df_features, datetime_column)
+        df_features = df_features.drop(columns=[datetime_column])
+
+    if interaction_columns:
+        # Dropped interactions are still needed if they are inputs of the scaler
+        skip = selector is not None and not any(
+            name in selector.dropped_ for name in scale_columns or []
+        )
+        df_features = create_interaction_features(
+            df_features, interaction_columns, selector=selector if skip else None
+        )
+
+    if scale_columns:
+        df_features, transformers['scaler'] = scale_features(
+            df_features, scale_columns, scaler=transformers.get('scaler')
+        )
+
+    if categorical_columns:
+        df_features, transformers['encoder'] = encode_categorical(
+            df_features, categorical_columns, encoder=transformers.get('encoder'),
+            selector=selector
+        )
+
+    return _select(df_features, transformers, selection, y), transformers
+
+
+def _select(
+    df_features: pd.DataFrame,
+    transformers: Dict[str, Any],
+    selection: Optional[Dict[str, Any]],
+    y: Optional[Any]
+) -> pd.DataFrame:
+    """Apply the fitted selector, fitting it first if `selection` is given."""
+    if 'selector' not in transformers:
+        if not selection:
+            return df_features
+        transformers['selector'] = FeatureSelector(**selection).fit(df_features, y)
+    return transformers['selector'].transform(df_features)
+
+
+def build_features_file(
+    input_filepath: Union[str, Path],
+    output_filepath: Union[str, Path],
+    target: Optional[str] = 'target',
+    transformers_path: Optional[Union[str, Path]] = None,
+    use_cache: bool = False,
+    **kwargs: Any
+) -> pd.DataFrame:
+    """
+    Build features from a dataset file and write them to `output_filepath`.
+
+    Parameters
+    ----------
+    input_filepath : str or pathlib.Path
+        Processed dataset.
+    output_filepath : str or pathlib.Path
+        Feature dataset (``.parquet`` or ``.csv``).
+    target : str, optional
+        Target column passed through without transformation, if present.
+    transformers_path : str or pathlib.Path, optional
+        If the file exists, its fitted transformers are reused; otherwise the
+        transformers fitted here are saved to it.
+    use_cache : bool, optional
+        Reuse and update the feature store in ``data/processed/features``
+        (default is False).
+    **kwargs
+        Keyword arguments passed to `build_features`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The feature matrix.
+    """
+    transformers = None
+    if transformers_path is not None and Path(transformers_path).exists():
+        transformers = load_model(transformers_path)
+
+    df = pd.DataFrame(load_dataset(input_filepath))
+    target_values = df.pop(target) if target in df.columns else None
+    store = FeatureStore() if use_cache else None
+    df_features, transformers = build_features(
+        df, transformers=transformers, store=store, y=target_values, **kwargs
+    )
+    if target_values is not None:
+        df_features[target] = target_values
+
+    save_dataset(df_features, output_filepath)
+    if transformers_path is not None:
+        save_model(transformers, transformers_path)
+    return df_features
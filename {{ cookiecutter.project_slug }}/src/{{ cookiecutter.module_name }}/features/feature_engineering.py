@@ -1,13 +1,35 @@
 """
 Feature engineering utilities for the project.
+
+The stateless feature functions (time, interaction and group features) can
+run on Polars or DuckDB as well as pandas (see `utils.backends`). The scaler
+and encoder are fitted scikit-learn objects, so `scale_features` and
+`encode_categorical` always run on scikit-learn.
+
+`create_interaction_features` and `encode_categorical` take an optional
+fitted `FeatureSelector`, whose dropped columns they do not output.
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.backends import (
+    arrow_to_pandas,
+    duckdb_to_arrow,
+    quote_identifier,
+    resolve_backend,
+)
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+
+if TYPE_CHECKING:
+    from {{ cookiecutter.module_name }}.features.selection import FeatureSelector
+
 
+@instrument()
 def scale_features(
     df: pd.DataFrame,
     columns: List[str],
@@ -16,6 +38,8 @@ def scale_features(
     """
     Scale numerical features using StandardScaler.
 
+    Scaled columns use the configured ``data.float_dtype``.
+
     Parameters
     ----------
     df : pandas.DataFrame
@@ -37,19 +61,24 @@ def scale_features(
         scaler.fit(df[columns])
 
     df_scaled = df.copy()
-    df_scaled[columns] = scaler.transform(df[columns])
+    float_dtype = get_settings().data.float_dtype
+    df_scaled[columns] = scaler.transform(df[columns]).astype(float_dtype)
     return df_scaled, scaler
 
 
+@instrument()
 def encode_categorical(
     df: pd.DataFrame,
     columns: List[str],
     encoder: Optional[OneHotEncoder] = None,
-    drop: str = 'first'
+    drop: str = 'first',
+    selector: Optional['FeatureSelector'] = None
 ) -> tuple[pd.DataFrame, OneHotEncoder]:
     """
     One-hot encode categorical features.
 
+    New encoders produce columns of the configured ``data.float_dtype``.
+
     Parameters
     ----------
     df : pandas.DataFrame
@@ -60,6 +89,8 @@ def encode_categorical(
         Optional pre-fitted encoder. If None, a new encoder is fitted.
     drop : str, optional
         Strategy for dropping categories (default is 'first').
+    selector : FeatureSelector, optional
+        Fitted selector; encoded columns it drops are left out.
 
     Returns
     -------
@@ -69,7 +100,11 @@ def encode_categorical(
         Fitted encoder.
     """
     if encoder is None:
-        encoder = OneHotEncoder(drop=drop, sparse_output=False)
+        encoder = OneHotEncoder(
+            drop=drop,
+            sparse_output=False,
+            dtype=get_settings().data.float_dtype
+        )
         encoder.fit(df[columns])
 
     encoded = encoder.transform(df[columns])
@@ -78,14 +113,65 @@ def encode_categorical(
         columns=encoder.get_feature_names_out(columns),
         index=df.index
     )
+    if selector is not None:
+        encoded_df = selector.transform(encoded_df)
 
     df_encoded = df.drop(columns=columns).join(encoded_df)
     return df_encoded, encoder
 
 
+def _time_features_polars(column: pd.Series, names: List[str]) -> pd.DataFrame:
+    import polars as pl
+
+    values = pl.from_pandas(column)
+    if values.dtype == pl.String:
+        values = values.str.to_datetime()
+    elif not isinstance(values.dtype, pl.Datetime):
+        values = pl.from_pandas(pd.to_datetime(column))
+    # pandas returns int32 components and numbers weekdays from 0
+    table = pl.DataFrame([
+        values.alias(names[0]),
+        values.dt.year().cast(pl.Int32).alias(names[1]),
+        values.dt.month().cast(pl.Int32).alias(names[2]),
+        values.dt.day().cast(pl.Int32).alias(names[3]),
+        values.dt.hour().cast(pl.Int32).alias(names[4]),
+        (values.dt.weekday() - 1).cast(pl.Int32).alias(names[5]),
+    ]).to_arrow()
+    return arrow_to_pandas(table, index=column.index)
+
+
+def _time_features_duckdb(column: pd.Series, names: List[str]) -> pd.DataFrame:
+    import duckdb
+
+    if isinstance(column.dtype, pd.DatetimeTZDtype):
+        # Extract the components in the column's time zone, as pandas does
+        column = column.dt.tz_localize(None)
+    elif not (
+        pd.api.types.is_datetime64_any_dtype(column) or pd.api.types.is_string_dtype(column)
+    ):
+        column = pd.to_datetime(column)
+    frame = pd.DataFrame({'value': column.to_numpy()})
+    value = 'CAST(value AS TIMESTAMP)'
+    components = [
+        f'{value} AS {quote_identifier(names[0])}',
+        *(
+            f'CAST({part}({value}) AS INTEGER) AS {quote_identifier(name)}'
+            for part, name in zip(['year', 'month', 'day', 'hour'], names[1:5])
+        ),
+        f'CAST(isodow({value}) - 1 AS INTEGER) AS {quote_identifier(names[5])}',
+    ]
+    with duckdb.connect() as connection:
+        connection.register('input_frame', frame)
+        query = f"SELECT {', '.join(components)} FROM input_frame"
+        table = duckdb_to_arrow(connection.sql(query))
+    return arrow_to_pandas(table, index=column.index)
+
+
+@instrument()
 def create_time_features(
     df: pd.DataFrame,
-    datetime_column: str
+    datetime_column: str,
+    dataframe_backend: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Create time-based features from a datetime column.
@@ -96,13 +182,30 @@ def create_time_features(
         Input DataFrame.
     datetime_column : str
         Name of the datetime column.
+    dataframe_backend : str, optional
+        'pandas', 'polars' or 'duckdb'. Defaults to the active backend (see
+        `utils.backends`).
 
     Returns
     -------
     df_time : pandas.DataFrame
         DataFrame with added time features (year, month, day, hour, dayofweek).
     """
+    backend = resolve_backend(dataframe_backend)
     df_time = df.copy()
+    if backend != 'pandas':
+        names = [datetime_column] + [
+            f'{datetime_column}_{part}' for part in ['year', 'month', 'day', 'hour', 'dayofweek']
+        ]
+        compute = _time_features_polars if backend == 'polars' else _time_features_duckdb
+        features = compute(df[datetime_column], names)
+        if pd.api.types.is_datetime64_any_dtype(df[datetime_column]):
+            # Keep datetime columns as they are, with their resolution and time zone
+            names = names[1:]
+        for name in names:
+            df_time[name] = features[name]
+        return df_time
+
     df_time[datetime_column] = pd.to_datetime(df_time[datetime_column])
 
     # Extract time components
@@ -115,10 +218,63 @@ def create_time_features(
     return df_time
 
 
+# Suffix and operator of each interaction operation
+INTERACTIONS = {
+    'multiply': ('product', '*'),
+    'add': ('sum', '+'),
+    'subtract': ('diff', '-'),
+    'divide': ('ratio', '/'),
+}
+
+
+def _interaction_features_backend(
+    df: pd.DataFrame,
+    pairs: List[Tuple[str, str, str]],
+    operation: str,
+    backend: str
+) -> pd.DataFrame:
+    symbol = INTERACTIONS[operation][1]
+    columns = list(dict.fromkeys(col for col1, col2, _ in pairs for col in (col1, col2)))
+    if backend == 'polars':
+        import polars as pl
+
+        # Keep NaN as NaN (not null), as in pandas arithmetic
+        frame = pl.from_pandas(df[columns], nan_to_null=False)
+        operators = {
+            '*': lambda a, b: a * b,
+            '+': lambda a, b: a + b,
+            '-': lambda a, b: a - b,
+            '/': lambda a, b: a / b,
+        }
+        table = frame.select([
+            operators[symbol](pl.col(col1), pl.col(col2)).alias(name)
+            for col1, col2, name in pairs
+        ]).to_arrow()
+    else:
+        import duckdb
+
+        def operand(name: str) -> str:
+            # Divide as doubles so that division by zero gives inf, as in pandas
+            column = quote_identifier(name)
+            return f'CAST({column} AS DOUBLE)' if symbol == '/' else column
+
+        expressions = ', '.join(
+            f'{operand(col1)} {symbol} {operand(col2)} AS {quote_identifier(name)}'
+            for col1, col2, name in pairs
+        )
+        with duckdb.connect() as connection:
+            connection.register('input_frame', df[columns].reset_index(drop=True))
+            table = duckdb_to_arrow(connection.sql(f'SELECT {expressions} FROM input_frame'))
+    return arrow_to_pandas(table, index=df.index)
+
+
+@instrument()
 def create_interaction_features(
     df: pd.DataFrame,
     columns: List[str],
-    operation: str = 'multiply'
+    operation: str = 'multiply',
+    dataframe_backend: Optional[str] = None,
+    selector: Optional['FeatureSelector'] = None
 ) -> pd.DataFrame:
     """
     Create interaction features between columns.
@@ -131,23 +287,175 @@ def create_interaction_features(
         List of columns to create interactions from.
     operation : str, optional
         Operation to perform ('multiply', 'add', 'subtract', 'divide'). Default is 'multiply'.
+    dataframe_backend : str, optional
+        'pandas', 'polars' or 'duckdb'. Defaults to the active backend (see
+        `utils.backends`).
+    selector : FeatureSelector, optional
+        Fitted selector; interactions it drops are not computed.
 
     Returns
     -------
     df_interact : pandas.DataFrame
         DataFrame with added interaction features.
     """
+    backend = resolve_backend(dataframe_backend)
     df_interact = df.copy()
+    if operation not in INTERACTIONS:
+        return df_interact
+
+    suffix = INTERACTIONS[operation][0]
+    pairs = [
+        (col1, col2, f'{col1}_{col2}_{suffix}')
+        for i, col1 in enumerate(columns) for col2 in columns[i + 1:]
+    ]
+    if selector is not None:
+        pairs = [pair for pair in pairs if selector.keeps(pair[2])]
+    if backend != 'pandas' and pairs:
+        features = _interaction_features_backend(df, pairs, operation, backend)
+        for _, _, name in pairs:
+            df_interact[name] = features[name]
+        return df_interact
 
-    for i, col1 in enumerate(columns):
-        for col2 in columns[i + 1:]:
-            if operation == 'multiply':
-                df_interact[f'{col1}_{col2}_product'] = df[col1] * df[col2]
-            elif operation == 'add':
-                df_interact[f'{col1}_{col2}_sum'] = df[col1] + df[col2]
-            elif operation == 'subtract':
-                df_interact[f'{col1}_{col2}_diff'] = df[col1] - df[col2]
-            elif operation == 'divide':
-                df_interact[f'{col1}_{col2}_ratio'] = df[col1] / df[col2]
+    for col1, col2, name in pairs:
+        if operation == 'multiply':
+            df_interact[name] = df[col1] * df[col2]
+        elif operation == 'add':
+            df_interact[name] = df[col1] + df[col2]
+        elif operation == 'subtract':
+            df_interact[name] = df[col1] - df[col2]
+        elif operation == 'divide':
+            df_interact[name] = df[col1] / df[col2]
 
     return df_interact
+
+
+# Aggregations of `create_group_features` and their DuckDB functions
+GROUP_AGGREGATIONS = {
+    'mean': 'AVG',
+    'sum': 'SUM',
+    'min': 'MIN',
+    'max': 'MAX',
+    'std': 'STDDEV_SAMP',
+    'count': 'COUNT',
+}
+
+
+def _group_features_backend(
+    df: pd.DataFrame,
+    group_columns: List[str],
+    features: List[Tuple[str, str, str]],
+    backend: str
+) -> pd.DataFrame:
+    value_columns = [column for column, _, _ in features]
+    columns = list(dict.fromkeys(group_columns + value_columns))
+    if backend == 'polars':
+        import polars as pl
+
+        # NaN values become nulls, which are skipped as in pandas
+        frame = pl.from_pandas(df[columns])
+        expressions = []
+        for column, aggregation, name in features:
+            expression = getattr(pl.col(column), aggregation)().over(group_columns)
+            if aggregation == 'count':
+                expression = expression.cast(pl.Int64)
+            elif aggregation in ('mean', 'std'):
+                expression = expression.cast(pl.Float64)
+            expressions.append(expression.alias(name))
+        table = frame.select(expressions).to_arrow()
+    else:
+        import duckdb
+
+        def aggregate(column: str, aggregation: str) -> str:
+            value = quote_identifier(column)
+            if pd.api.types.is_float_dtype(df[column]):
+                # Skip NaN values, as pandas does
+                value = f"NULLIF({value}, CAST('NaN' AS DOUBLE))"
+            expression = (
+                f'{GROUP_AGGREGATIONS[aggregation]}({value}) OVER (PARTITION BY {partition})'
+            )
+            if aggregation == 'sum' and pd.api.types.is_integer_dtype(df[column]):
+                # DuckDB sums integers as 128-bit integers
+                expression = f'CAST({expression} AS BIGINT)'
+            return expression
+
+        partition = ', '.join(quote_identifier(column) for column in group_columns)
+        expressions = ', '.join(
+            f'{aggregate(column, aggregation)} AS {quote_identifier(name)}'
+            for column, aggregation, name in features
+        )
+        frame = df[columns].reset_index(drop=True)
+        frame['__row__'] = np.arange(len(frame))
+        with duckdb.connect() as connection:
+            connection.register('input_frame', frame)
+            # Window functions do not preserve the row order
+            table = duckdb_to_arrow(connection.sql(
+                f'SELECT {expressions} FROM input_frame ORDER BY __row__'
+            ))
+    return arrow_to_pandas(table, index=df.index)
+
+
+@instrument()
+def create_group_features(
+    df: pd.DataFrame,
+    group_columns: List[str],
+    value_columns: List[str],
+    aggregations: Sequence[str] = ('mean',),
+    dataframe_backend: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Create group-wise aggregates of columns, broadcast back to every row.
+
+    Each feature is named ``<column>_<aggregation>_by_<group columns>``, e.g.
+    ``sales_mean_by_store``. Missing group keys form their own group.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input DataFrame.
+    group_columns : list of str
+        Columns defining the groups.
+    value_columns : list of str
+        Columns to aggregate.
+    aggregations : sequence of str, optional
+        Any of 'mean', 'sum', 'min', 'max', 'std' and 'count' (default is
+        ('mean',)).
+    dataframe_backend : str, optional
+        'pandas', 'polars' or 'duckdb'. Defaults to the active backend (see
+        `utils.backends`).
+
+    Returns
+    -------
+    df_grouped : pandas.DataFrame
+        DataFrame with added group features.
+
+    Raises
+    ------
+    ValueError
+        If an aggregation is not supported.
+    """
+    unsupported = [name for name in aggregations if name not in GROUP_AGGREGATIONS]
+    if unsupported:
+        raise ValueError(
+            f"Unsupported aggregations: {unsupported}, expected any of {list(GROUP_AGGREGATIONS)}"
+        )
+    backend = resolve_backend(dataframe_backend)
+    group_name = '_'.join(group_columns)
+    features = [
+        (column, aggregation, f'{column}_{aggregation}_by_{group_name}')
+        for column in value_columns for aggregation in aggregations
+    ]
+    df_grouped = df.copy()
+    if not features:
+        return df_grouped
+
+    if backend != 'pandas':
+        computed = _group_features_backend(df, group_columns, features, backend)
+        for _, _, name in features:
+            df_grouped[name] = computed[name]
+        return df_grouped
+
+    grouped = df.groupby(group_columns, sort=False, observed=True, dropna=False)
+    for column, aggregation, name in features:
+        df_grouped[name] = grouped[column].transform(aggregation)
+
+    return df_grouped
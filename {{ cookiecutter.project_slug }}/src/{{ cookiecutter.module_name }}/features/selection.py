@@ -0,0 +1,660 @@
+"""
+Filter-based selection of the columns of wide feature matrices.
+
+`FeatureSelector` drops numerical columns with four filters:
+
+- variance: columns whose variance is at most a threshold (constant columns
+  by default);
+- mutual information: columns sharing too little information with the
+  target, estimated from joint histograms;
+- model importance: columns with a small share of the absolute standardized
+  coefficients of a ridge model of the target;
+- correlation: of every pair of columns correlated above a threshold, the
+  less relevant one.
+
+The statistics are computed in at most two streaming passes over row chunks,
+as sums that merge exactly across chunks: moments in the first pass, then
+histograms and cross-products of the columns left by the variance filter in
+the second. Each chunk is processed in parallel column blocks, so memory is
+bounded by the chunk size and, for the correlation and importance filters,
+the square of the number of candidate columns.
+
+The fitted selector is a scikit-learn transformer. `build_features` fits it
+with the other transformers and applies it to new data, skipping the
+interaction and one-hot columns it drops instead of computing them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.parallel import iter_slices, resolve_n_jobs
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Columns per block processed by one worker
+DEFAULT_BLOCK_SIZE = 128
+# Rows per chunk when neither the argument nor ``compute.chunk_size`` is given
+DEFAULT_CHUNK_SIZE = 100_000
+# Histogram bins span this many standard deviations around the mean; values
+# outside fall in the outer bins
+HISTOGRAM_SPAN = 3.0
+# Filters in the order they are applied, as reported in `FeatureSelector.scores_`
+FILTERS = ('variance', 'mutual_info', 'importance', 'correlation', 'max_features')
+
+
+class ColumnMoments:
+    """
+    Count, mean and sum of squared deviations of each of many columns.
+
+    Batches are combined with the pairwise update of Chan et al., which is
+    exact, so the moments of chunks computed separately merge into the
+    moments of the whole data.
+
+    Parameters
+    ----------
+    n_columns : int
+        Number of columns.
+    """
+
+    def __init__(self, n_columns: int) -> None:
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+
+    def update(self, values: np.ndarray) -> 'ColumnMoments':
+        """Add a 2-D array of rows; missing values are ignored."""
+        batch = ColumnMoments(values.shape[1])
+        present = ~np.isnan(values)
+        batch.count = present.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sums = np.nansum(values, axis=0)
+            batch.mean = np.where(batch.count > 0, sums / batch.count, 0.0)
+        batch.m2 = np.nansum((values - batch.mean) ** 2, axis=0)
+        return self.merge(batch)
+
+    def merge(self, other: 'ColumnMoments') -> 'ColumnMoments':
+        """Combine with the moments of other rows of the same columns, in place."""
+        n = self.count + other.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            weight = np.where(n > 0, other.count / n, 0.0)
+            self.m2 = self.m2 + other.m2 + delta * delta * self.count * weight
+            self.mean = self.mean + delta * weight
+        self.count = n
+        return self
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance, NaN for columns with fewer than two values."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+
+def _parallel_map(
+    func: Callable[[T], R],
+    items: Sequence[T],
+    n_workers: int
+) -> List[R]:
+    if n_workers == 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(n_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def _blocks(n_columns: int, block_size: int) -> List[slice]:
+    """Consecutive column blocks of at most `block_size` columns."""
+    starts = range(0, n_columns, block_size)
+    return [slice(start, min(start + block_size, n_columns)) for start in starts]
+
+
+def _chunk_values(
+    features: pd.DataFrame,
+    target: Optional[pd.Series],
+    columns: List[Any]
+) -> Tuple[np.ndarray, Optional[pd.Series]]:
+    """Numerical values of a chunk as float64, without the rows missing the target."""
+    if target is not None:
+        present = target.notna().to_numpy()
+        if not present.all():
+            features, target = features[present], target[present]
+    return features[columns].to_numpy(dtype=np.float64, na_value=np.nan), target
+
+
+class _FirstPass:
+    """Column moments and target summary gathered by the first pass."""
+
+    def __init__(self, task: Optional[str]) -> None:
+        self.task = task
+        self.columns: Optional[List[Any]] = None
+        self.moments = ColumnMoments(0)
+        self.has_target = False
+        self.class_counts: Dict[Any, int] = {}
+        self.target_moments = ColumnMoments(1)
+
+    def update_target(self, target: pd.Series) -> None:
+        """Count the classes, or update the moments, of a chunk of the target."""
+        if self.task is None:
+            is_float = pd.api.types.is_float_dtype(target)
+            self.task = 'regression' if is_float else 'classification'
+        self.has_target = True
+        if self.task == 'classification':
+            labels, counts = np.unique(target.to_numpy(), return_counts=True)
+            for label, count in zip(labels.tolist(), counts.tolist(), strict=True):
+                self.class_counts[label] = self.class_counts.get(label, 0) + count
+        else:
+            self.target_moments.update(target.to_numpy(dtype=np.float64)[:, None])
+
+    def target_shape(self, bins: int) -> Tuple[int, int]:
+        """Numbers of outputs of the importance model and of target histogram bins."""
+        if self.task == 'classification':
+            return len(self.class_counts), len(self.class_counts)
+        return 1, bins
+
+    def encode_target(
+        self,
+        target: Optional[pd.Series],
+        bins: int
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Centered target outputs and target histogram bins of a chunk."""
+        if target is None:
+            return None, None
+        if self.task == 'classification':
+            classes = sorted(self.class_counts)
+            priors = np.asarray([self.class_counts[label] for label in classes])
+            codes = np.searchsorted(classes, target.to_numpy())
+            return np.eye(len(classes))[codes] - priors / priors.sum(), codes
+        y = target.to_numpy(dtype=np.float64) - self.target_moments.mean[0]
+        std = float(np.sqrt(np.nan_to_num(self.target_moments.variance[0])))
+        width = 2 * HISTOGRAM_SPAN * std / bins or 1.0
+        codes = np.floor((y + HISTOGRAM_SPAN * std) / width)
+        return y[:, None], np.clip(codes, 0, bins - 1).astype(np.int64)
+
+
+def _mutual_information(counts: np.ndarray) -> np.ndarray:
+    """Mutual information in nats of histograms shaped (columns, bins, classes)."""
+    total = counts.sum(axis=(1, 2), keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        joint = counts / total
+        expected = joint.sum(axis=2, keepdims=True) * joint.sum(axis=1, keepdims=True)
+        terms = np.where(joint > 0, joint * np.log(joint / expected), 0.0)
+    return np.maximum(terms.sum(axis=(1, 2)), 0.0)
+
+
+class FeatureSelector(TransformerMixin, BaseEstimator):
+    """
+    Select numerical columns with variance, mutual information, model
+    importance and correlation filters.
+
+    Columns that are not numerical are never dropped, and neither are
+    columns the selector was not fitted on. Missing values are ignored by the
+    variance and mutual information filters and replaced by the column mean
+    for the correlation and importance filters; rows with a missing target
+    are skipped.
+
+    Parameters
+    ----------
+    variance_threshold : float, optional
+        Columns whose variance is at most this are dropped (default is 0).
+    correlation_threshold : float, optional
+        Of two columns whose absolute Pearson correlation exceeds this, the
+        less relevant one is dropped (default is no correlation filter).
+    mutual_info_threshold : float, optional
+        Columns whose mutual information with the target, in nats, is below
+        this are dropped.
+    importance_threshold : float, optional
+        Columns whose share of the ridge model importance (the importances
+        sum to 1) is below this are dropped.
+    max_features : int, optional
+        Keep at most this many of the most relevant numerical columns.
+    task : str, optional
+        'classification' or 'regression'. By default, float targets are
+        regression targets and other targets are classes.
+    bins : int, optional
+        Histogram bins per column for the mutual information (default is 16).
+    alpha : float, optional
+        Ridge penalty of the importance model on standardized columns.
+    block_size : int, optional
+        Columns per block processed by one worker.
+    chunk_size : int, optional
+        Rows per chunk. Defaults to the configured ``compute.chunk_size``.
+    n_jobs : int, optional
+        Number of column blocks processed concurrently (-1 for all CPUs).
+        Defaults to the configured ``compute.n_jobs``.
+
+    Attributes
+    ----------
+    feature_names_in_ : numpy.ndarray
+        Numerical columns the selector was fitted on.
+    selected_ : list of str
+        Numerical columns kept, in their original order.
+    dropped_ : dict of str to str
+        Dropped columns and the filter that dropped them.
+    scores_ : pandas.DataFrame
+        Variance, mutual information, importance, relevance and the filter
+        that dropped it (``reason``, None if kept) of every fitted column.
+        ``correlated_with`` names the kept column a correlated column was
+        dropped for.
+
+    Examples
+    --------
+    >>> selector = FeatureSelector(correlation_threshold=0.95, max_features=500)
+    >>> X_selected = selector.fit(X, y).transform(X)
+    >>> selector.scores_.sort_values('relevance', ascending=False).head()
+    """
+
+    def __init__(
+        self,
+        variance_threshold: float = 0.0,
+        correlation_threshold: Optional[float] = None,
+        mutual_info_threshold: Optional[float] = None,
+        importance_threshold: Optional[float] = None,
+        max_features: Optional[int] = None,
+        task: Optional[str] = None,
+        bins: int = 16,
+        alpha: float = 1.0,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        chunk_size: Optional[int] = None,
+        n_jobs: Optional[int] = None
+    ) -> None:
+        self.variance_threshold = variance_threshold
+        self.correlation_threshold = correlation_threshold
+        self.mutual_info_threshold = mutual_info_threshold
+        self.importance_threshold = importance_threshold
+        self.max_features = max_features
+        self.task = task
+        self.bins = bins
+        self.alpha = alpha
+        self.block_size = block_size
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+
+    @instrument()
+    def fit(self, X: pd.DataFrame, y: Optional[Any] = None) -> 'FeatureSelector':
+        """
+        Fit the filters on a DataFrame, streaming it in row chunks.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Feature matrix.
+        y : array-like, optional
+            Target, required by the mutual information and importance filters.
+
+        Returns
+        -------
+        FeatureSelector
+            The fitted selector.
+        """
+        chunk_size = self._chunk_size()
+        target = None if y is None else np.asarray(y)
+        if target is not None and len(target) != len(X):
+            raise ValueError(f"y has {len(target)} rows, X has {len(X)}")
+
+        def chunks() -> Iterator[Tuple[pd.DataFrame, Optional[pd.Series]]]:
+            if target is None:
+                for chunk in iter_slices(X, chunk_size):
+                    yield chunk, None
+                return
+            targets = iter_slices(target, chunk_size)
+            for chunk, values in zip(iter_slices(X, chunk_size), targets, strict=True):
+                yield chunk, pd.Series(values, index=chunk.index)
+
+        return self._fit(chunks)
+
+    @instrument()
+    def fit_dataset(
+        self,
+        filepath: Union[str, Path],
+        target: Optional[str] = None
+    ) -> 'FeatureSelector':
+        """
+        Fit the filters on a dataset file too large to load, read in chunks.
+
+        Parameters
+        ----------
+        filepath : str or pathlib.Path
+            Dataset readable by `iter_dataset`.
+        target : str, optional
+            Target column, required by the mutual information and importance
+            filters. It is not a candidate feature.
+
+        Returns
+        -------
+        FeatureSelector
+            The fitted selector.
+        """
+        from {{ cookiecutter.module_name }}.data.data_loader import iter_dataset
+
+        def chunks() -> Iterator[Tuple[pd.DataFrame, Optional[pd.Series]]]:
+            for chunk in iter_dataset(filepath, chunk_size=self._chunk_size()):
+                yield chunk, chunk.pop(target) if target is not None else None
+
+        return self._fit(chunks)
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop the columns removed by the filters.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Data with any of the fitted columns.
+
+        Returns
+        -------
+        pandas.DataFrame
+            `X` without the dropped columns.
+        """
+        dropped = [column for column in X.columns if column in self.dropped_]
+        return X.drop(columns=dropped) if dropped else X
+
+    def keeps(self, column: str) -> bool:
+        """Whether `column` is kept, so that the others need not be computed."""
+        return column not in self.dropped_
+
+    def get_feature_names_out(
+        self,
+        input_features: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """Names of the kept columns among `input_features` (default: all fitted)."""
+        names = self.feature_names_in_ if input_features is None else input_features
+        return np.asarray([name for name in names if self.keeps(name)], dtype=object)
+
+    def _chunk_size(self) -> int:
+        chunk_size = self.chunk_size or get_settings().compute.chunk_size
+        return chunk_size or DEFAULT_CHUNK_SIZE
+
+    def _fit(
+        self,
+        chunks: Callable[[], Iterable[Tuple[pd.DataFrame, Optional[pd.Series]]]]
+    ) -> 'FeatureSelector':
+        """Fit from a function returning the ``(features, target)`` chunks per pass."""
+        threshold = self.correlation_threshold
+        if threshold is not None and not 0 < threshold <= 1:
+            raise ValueError(
+                f"correlation_threshold must be in (0, 1], got {threshold}"
+            )
+        compute = get_settings().compute
+        n_jobs = compute.n_jobs if self.n_jobs is None else self.n_jobs
+        n_workers = resolve_n_jobs(n_jobs)
+        supervised = (
+            self.mutual_info_threshold is not None
+            or self.importance_threshold is not None
+        )
+
+        stats = self._first_pass(chunks, n_workers)
+        if supervised and not stats.has_target:
+            raise ValueError(
+                "The mutual information and importance filters need a target"
+            )
+        columns = stats.columns
+        variance = stats.moments.variance
+        reasons: List[Optional[str]] = [
+            None if value > self.variance_threshold else 'variance'
+            for value in np.nan_to_num(variance, nan=-np.inf)
+        ]
+        candidates = np.flatnonzero([reason is None for reason in reasons])
+
+        mutual_info = np.full(len(columns), np.nan)
+        importance = np.full(len(columns), np.nan)
+        correlation = None
+        needs_gram = (
+            self.correlation_threshold is not None
+            or self.importance_threshold is not None
+        )
+        if len(candidates) and (supervised or needs_gram):
+            scores = self._second_pass(
+                chunks, stats, candidates, supervised, needs_gram, n_workers
+            )
+            mutual_info[candidates], importance[candidates], correlation = scores
+
+        # Relevance ranks the columns for the correlation and max_features filters
+        relevance = variance
+        for score in (mutual_info, importance):
+            if not np.isnan(score).all():
+                relevance = score
+        order = np.argsort(-np.nan_to_num(relevance, nan=-np.inf), kind='stable')
+
+        for name, score, threshold in (
+            ('mutual_info', mutual_info, self.mutual_info_threshold),
+            ('importance', importance, self.importance_threshold),
+        ):
+            if threshold is not None:
+                for i in candidates:
+                    if reasons[i] is None and score[i] < threshold:
+                        reasons[i] = name
+
+        correlated_with: List[Optional[str]] = [None] * len(columns)
+        if correlation is not None and self.correlation_threshold is not None:
+            # Greedily keep the most relevant column of each correlated group
+            position = np.full(len(columns), -1)
+            position[candidates] = np.arange(len(candidates))
+            kept: List[int] = []
+            for i in order:
+                if reasons[i] is not None:
+                    continue
+                if kept:
+                    row = np.abs(correlation[position[i], position[kept]])
+                    j = int(np.argmax(row))
+                    if row[j] > self.correlation_threshold:
+                        reasons[i] = 'correlation'
+                        correlated_with[i] = columns[kept[j]]
+                        continue
+                kept.append(i)
+
+        if self.max_features is not None:
+            remaining = [i for i in order if reasons[i] is None]
+            for i in remaining[self.max_features:]:
+                reasons[i] = 'max_features'
+
+        self.feature_names_in_ = np.asarray(columns, dtype=object)
+        self.n_features_in_ = len(columns)
+        self.task_ = stats.task
+        self.scores_ = pd.DataFrame({
+            'count': stats.moments.count,
+            'variance': variance,
+            'mutual_info': mutual_info,
+            'importance': importance,
+            'relevance': relevance,
+            'reason': reasons,
+            'correlated_with': correlated_with,
+        }, index=pd.Index(columns, name='feature'))
+        self.selected_ = [
+            column for column, reason in zip(columns, reasons, strict=True)
+            if reason is None
+        ]
+        self.dropped_ = {
+            column: reason
+            for column, reason in zip(columns, reasons, strict=True)
+            if reason is not None
+        }
+        return self
+
+    def _first_pass(
+        self,
+        chunks: Callable[[], Iterable[Tuple[pd.DataFrame, Optional[pd.Series]]]],
+        n_workers: int
+    ) -> '_FirstPass':
+        """Moments of the numerical columns and the classes or moments of the target."""
+        stats = _FirstPass(self.task)
+        for features, target in chunks():
+            if stats.columns is None:
+                numerical = features.select_dtypes(include=['number', 'bool'])
+                stats.columns = list(numerical.columns)
+                blocks = _blocks(len(stats.columns), self.block_size)
+                block_moments = [
+                    ColumnMoments(block.stop - block.start) for block in blocks
+                ]
+            values, target = _chunk_values(features, target, stats.columns)
+            if target is not None:
+                stats.update_target(target)
+            # Each worker gets its moments and the values of its block
+            _parallel_map(
+                lambda item: item[0].update(item[1]),
+                [(moments, values[:, block])
+                 for moments, block in zip(block_moments, blocks, strict=True)],
+                n_workers,
+            )
+        if stats.columns is None:
+            stats.columns, block_moments = [], []
+        # Blocks hold disjoint columns, so their moments are concatenated
+        stats.moments = ColumnMoments(len(stats.columns))
+        if block_moments:
+            for name in ('count', 'mean', 'm2'):
+                parts = [getattr(moments, name) for moments in block_moments]
+                setattr(stats.moments, name, np.concatenate(parts))
+        return stats
+
+    def _second_pass(
+        self,
+        chunks: Callable[[], Iterable[Tuple[pd.DataFrame, Optional[pd.Series]]]],
+        stats: '_FirstPass',
+        candidates: np.ndarray,
+        supervised: bool,
+        needs_gram: bool,
+        n_workers: int
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Mutual information, importance and correlation matrix of the candidates.
+
+        Values are centered with the first pass means, so the cross-products
+        of chunks simply add up.
+        """
+        n = len(candidates)
+        mean = stats.moments.mean[candidates]
+        std = np.sqrt(stats.moments.variance[candidates])
+        lower = mean - HISTOGRAM_SPAN * std
+        width = 2 * HISTOGRAM_SPAN * std / self.bins
+        n_outputs, n_target_bins = stats.target_shape(self.bins)
+
+        blocks = _blocks(n, self.block_size)
+        histograms = [
+            np.zeros((b.stop - b.start, self.bins + 1, n_target_bins), np.int64)
+            for b in blocks
+        ]
+        cross = np.zeros((n, n_outputs))
+        gram = np.zeros((n, n)) if needs_gram else None
+        rows = 0
+        for features, target in chunks():
+            values, target = _chunk_values(features, target, stats.columns)
+            values = values[:, candidates]
+            centered = np.nan_to_num(values - mean, nan=0.0)
+            rows += len(values)
+            outputs, target_bins = (
+                stats.encode_target(target, self.bins) if supervised else (None, None)
+            )
+
+            # The arrays of this chunk are bound as defaults, not looked up
+            # when the worker runs
+            def process(
+                b: int,
+                values: np.ndarray = values,
+                centered: np.ndarray = centered,
+                outputs: Optional[np.ndarray] = outputs,
+                target_bins: Optional[np.ndarray] = target_bins
+            ) -> None:
+                block = blocks[b]
+                if gram is not None:
+                    # Rows of the upper triangle, so blocks write disjoint rows
+                    tail = centered[:, block.start:]
+                    gram[block, block.start:] += centered[:, block].T @ tail
+                if outputs is not None and target_bins is not None:
+                    cross[block] += centered[:, block].T @ outputs
+                    histograms[b] += self._joint_histogram(
+                        values[:, block], target_bins, lower[block], width[block],
+                        n_target_bins,
+                    )
+
+            _parallel_map(process, range(len(blocks)), n_workers)
+
+        mutual_info = np.full(n, np.nan)
+        if supervised:
+            mutual_info = _mutual_information(np.concatenate(histograms))
+        importance = np.full(n, np.nan)
+        correlation = None
+        if gram is not None:
+            gram = np.triu(gram) + np.triu(gram, 1).T
+            norms = np.sqrt(np.diag(gram))
+            norms[norms == 0] = 1.0
+            correlation = gram / np.outer(norms, norms)
+            if self.importance_threshold is not None and rows > 1:
+                # Ridge regression on standardized columns, whose Gram matrix
+                # is (rows - 1) times their correlation matrix
+                lhs = (rows - 1) * correlation + self.alpha * np.eye(n)
+                rhs = np.sqrt(rows - 1) * cross / norms[:, None]
+                weights = np.abs(np.linalg.solve(lhs, rhs)).sum(axis=1)
+                importance = weights / (weights.sum() or 1.0)
+        return mutual_info, importance, correlation
+
+    def _joint_histogram(
+        self,
+        values: np.ndarray,
+        target_bins: np.ndarray,
+        lower: np.ndarray,
+        width: np.ndarray,
+        n_target_bins: int
+    ) -> np.ndarray:
+        """Counts per (column, value bin, target bin); missing values get the last."""
+        n_columns = values.shape[1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bins = np.floor((values - lower) / np.where(width > 0, width, 1.0))
+        bins = np.clip(np.nan_to_num(bins, nan=self.bins), 0, self.bins)
+        bins = bins.astype(np.int64)
+        bins[(bins == self.bins) & ~np.isnan(values)] = self.bins - 1
+        shape = (n_columns, self.bins + 1, n_target_bins)
+        cells = np.arange(n_columns) * shape[1] + bins
+        index = cells * n_target_bins + target_bins[:, None]
+        return np.bincount(index.ravel(), minlength=int(np.prod(shape))).reshape(shape)
+
+
+@instrument()
+def select_features(
+    df: pd.DataFrame,
+    y: Optional[Any] = None,
+    selector: Optional[FeatureSelector] = None,
+    **params: Any
+) -> tuple[pd.DataFrame, FeatureSelector]:
+    """
+    Drop uninformative and redundant numerical features.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Feature matrix.
+    y : array-like, optional
+        Target, required by the mutual information and importance filters.
+    selector : FeatureSelector, optional
+        Optional pre-fitted selector. If None, a new selector is fitted.
+    **params
+        Parameters of a new `FeatureSelector`, e.g. ``correlation_threshold``.
+
+    Returns
+    -------
+    df_selected : pandas.DataFrame
+        DataFrame without the dropped columns.
+    selector : FeatureSelector
+        Fitted selector.
+    """
+    if selector is None:
+        selector = FeatureSelector(**params).fit(df, y)
+    return selector.transform(df), selector
@@ -0,0 +1,32 @@
+"""
+Model training, prediction and evaluation utilities.
+"""
+
+from {{ cookiecutter.module_name }}.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["model_utils", "monitoring", "predict_model", "serving", "train_model"],
+    attrs={
+        "model_utils": [
+            "train_test_split_data",
+            "evaluate_classification",
+            "evaluate_regression",
+            "cross_validate_model",
+            "log_mlflow_experiment",
+            "save_model",
+            "load_model",
+        ],
+        "monitoring": [
+            "DriftMonitor",
+            "DriftReference",
+            "build_reference",
+            "reference_path",
+        ],
+        "train_model": [
+            "train_model",
+            "train_incremental",
+            "train_model_incremental",
+        ],
+    },
+)
@@ -2,11 +2,11 @@
 Model training and evaluation utilities.
 """
 
+import os
+import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union, Literal
 
-import mlflow
-import mlflow.sklearn
 import numpy as np
 import pandas as pd
 from sklearn.metrics import (
@@ -18,10 +18,13 @@ from sklearn.metrics import (
     recall_score
 )
 from sklearn.model_selection import cross_val_score, train_test_split
-import joblib
 import pickle
 
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
 
+
+@instrument()
 def train_test_split_data(
     X: pd.DataFrame,
     y: Union[pd.Series, np.ndarray],
@@ -61,6 +64,7 @@ def train_test_split_data(
     return X_train, X_test, y_train, y_test
 
 
+@instrument()
 def evaluate_classification(
     y_true: Union[pd.Series, np.ndarray],
     y_pred: Union[pd.Series, np.ndarray],
@@ -91,6 +95,7 @@ def evaluate_classification(
     }
 
 
+@instrument()
 def evaluate_regression(
     y_true: Union[pd.Series, np.ndarray],
     y_pred: Union[pd.Series, np.ndarray]
@@ -117,12 +122,14 @@ def evaluate_regression(
     }
 
 
+@instrument()
 def cross_validate_model(
     model: Any,
     X: pd.DataFrame,
     y: Union[pd.Series, np.ndarray],
     cv: int = 5,
-    scoring: str = 'accuracy'
+    scoring: str = 'accuracy',
+    n_jobs: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Perform cross-validation on a model.
@@ -139,13 +146,18 @@ def cross_validate_model(
         Number of cross-validation folds (default is 5).
     scoring : str, optional
         Scoring metric (default is 'accuracy').
+    n_jobs : int, optional
+        Number of folds evaluated in parallel (-1 for all CPUs). Defaults to
+        the configured ``compute.n_jobs``.
 
     Returns
     -------
     results : dict of str to float
         Dictionary of cross-validation results: mean_score, std_score, scores.
     """
-    scores = cross_val_score(model, X, y, cv=cv, scoring=scoring)
+    if n_jobs is None:
+        n_jobs = get_settings().compute.n_jobs
+    scores = cross_val_score(model, X, y, cv=cv, scoring=scoring, n_jobs=n_jobs)
     return {
         'mean_score': scores.mean(),
         'std_score': scores.std(),
@@ -153,6 +165,7 @@ def cross_validate_model(
     }
 
 
+@instrument()
 def log_mlflow_experiment(
     model: Any,
     params: Dict[str, Any],
@@ -179,6 +192,10 @@ def log_mlflow_experiment(
     model_name : str, optional
         Optional name for the model.
     """
+    # MLflow is optional and slow to import, so only load it when logging
+    import mlflow
+    import mlflow.sklearn
+
     mlflow.set_experiment(experiment_name)
 
     with mlflow.start_run(run_name=run_name):
@@ -195,6 +212,7 @@ def log_mlflow_experiment(
             mlflow.sklearn.log_model(model, "model")
 
 
+@instrument()
 def save_model(
     model: Any,
     filepath: Union[str, Path],
@@ -203,6 +221,9 @@ def save_model(
     """
     Save a trained model to disk.
 
+    The model is written to a temporary file that then replaces `filepath`,
+    so an interrupted save never leaves a truncated model behind.
+
     Parameters
     ----------
     model : object
@@ -212,18 +233,26 @@ def save_model(
     engine : str, optional
         Engine to save the model in ('joblib' or 'pickle'). Default is 'joblib'.
     """
+    if engine not in ('joblib', 'pickle'):
+        raise ValueError(f"Unsupported engine: {engine}")
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = filepath.with_name(f'.{filepath.name}.tmp-{uuid.uuid4().hex}')
 
-    if engine == 'joblib':
-        joblib.dump(model, filepath)
-    elif engine == 'pickle':
-        with open(filepath, 'wb') as f:
-            pickle.dump(model, f)
-    else:
-        raise ValueError(f"Unsupported engine: {engine}")
+    try:
+        if engine == 'joblib':
+            import joblib
 
+            joblib.dump(model, tmp_path)
+        else:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(model, f)
+        os.replace(tmp_path, filepath)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
+
+@instrument()
 def load_model(
     filepath: Union[str, Path],
     engine: str = 'joblib'
@@ -246,6 +275,8 @@ def load_model(
     filepath = Path(filepath)
 
     if engine == 'joblib':
+        import joblib
+
         return joblib.load(filepath)
     if engine == 'pickle':
         with open(filepath, 'rb') as f:
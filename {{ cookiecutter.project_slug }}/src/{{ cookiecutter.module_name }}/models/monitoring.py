@@ -0,0 +1,532 @@
+"""
+Data and prediction drift monitoring against a training reference.
+
+At training time, `build_reference` summarizes every feature and the model
+predictions as a histogram: quantile bins of numerical values (from a KLL
+sketch, so the training data is read once in chunks) or the frequent
+categories of other values, each with a missing values bin. The reference is
+stored next to the model (`reference_path`), e.g. ``models/model.drift.json``
+for ``models/model.joblib``.
+
+When scoring, a `DriftMonitor` bins each batch against the reference in
+O(batch) time and compares the histograms with three metrics:
+
+- PSI, the population stability index (above ~0.2 is usually a shift),
+- KS, the largest difference between the binned CDFs,
+- JS, the Jensen-Shannon distance (between 0 and 1).
+
+Metrics are computed for the batch and for all batches seen so far, whose
+counts are kept per bin, and every batch is appended as one JSON line to
+``logs/<monitoring.log_file>``. `predict_model` and the serving micro-batcher
+monitor automatically when a reference exists next to the model.
+
+Example
+-------
+>>> monitor = DriftMonitor.for_model(models_dir('model.joblib'))
+>>> monitor.update(X_batch, predictions)['age']
+{'psi': 0.31, 'ks': 0.18, 'js': 0.21}
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.paths import logs_dir
+from {{ cookiecutter.module_name }}.utils.sketches import FrequentItems, QuantileSketch
+
+# Name of the predictions in references and drift logs
+PREDICTION = 'prediction'
+# Maximum number of categories with their own bin; the others share one
+MAX_CATEGORIES = 50
+# Categories rarer than this share of the values share the "other" bin
+MIN_CATEGORY_SHARE = 0.005
+# Probability given to empty bins, so that PSI stays finite
+EPSILON = 1e-4
+
+
+def reference_path(model_path: Union[str, Path]) -> Path:
+    """Path of the drift reference stored next to a model file."""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}.drift.json")
+
+
+@dataclass
+class FeatureReference:
+    """
+    Reference histogram of one feature.
+
+    Attributes
+    ----------
+    kind : str
+        'numeric' (bins between `edges`) or 'categorical' (one bin per
+        category and one for the others).
+    expected : list of float
+        Reference probability of each bin: missing values first, then the
+        value bins.
+    edges : list of float
+        Inner bin edges of a numerical feature; bins are closed on the right.
+    categories : list
+        Categories of a categorical feature.
+    """
+
+    kind: str
+    expected: List[float]
+    edges: List[float] = field(default_factory=list)
+    categories: List[Any] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._index = pd.Index(self.categories) if self.kind == 'categorical' else None
+
+    def counts(self, values: pd.Series) -> np.ndarray:
+        """
+        Count the values of a batch per bin.
+
+        Parameters
+        ----------
+        values : pandas.Series
+            Values of the feature.
+
+        Returns
+        -------
+        numpy.ndarray
+            Number of values per bin, in the order of `expected`.
+        """
+        missing = values.isna().to_numpy()
+        present = values[~missing]
+        if self.kind == 'numeric':
+            x = pd.to_numeric(present, errors='coerce')
+            x = x.to_numpy(dtype='float64', na_value=np.nan)
+            bins = np.searchsorted(np.asarray(self.edges), x, side='left')
+            # Values that are not numbers count as missing
+            nan = np.isnan(x)
+            bins = bins[~nan] + 1
+            n_missing = int(missing.sum() + nan.sum())
+        else:
+            codes = self._index.get_indexer(present)
+            # Unknown categories go to the "other" bin, the last one
+            bins = np.where(codes < 0, len(self.categories), codes) + 1
+            n_missing = int(missing.sum())
+        counts = np.bincount(bins, minlength=len(self.expected)).astype(np.int64)
+        counts[0] = n_missing
+        return counts
+
+
+def _probabilities(counts: np.ndarray) -> np.ndarray:
+    total = counts.sum()
+    if not total:
+        return np.full(len(counts), np.nan)
+    return counts / total
+
+
+def drift_metrics(expected: np.ndarray, actual: np.ndarray) -> Dict[str, float]:
+    """
+    Compare two binned distributions.
+
+    Parameters
+    ----------
+    expected : numpy.ndarray
+        Reference probabilities per bin, missing values first.
+    actual : numpy.ndarray
+        Observed probabilities per bin.
+
+    Returns
+    -------
+    dict of str to float
+        'psi', 'ks' (over the value bins, ignoring missing values) and 'js'
+        (base 2 Jensen-Shannon distance).
+    """
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    p = np.clip(expected, EPSILON, None)
+    q = np.clip(actual, EPSILON, None)
+    p, q = p / p.sum(), q / q.sum()
+    psi = float(np.sum((q - p) * np.log(q / p)))
+
+    m = (p + q) / 2
+    divergence = 0.5 * np.sum(p * np.log2(p / m)) + 0.5 * np.sum(q * np.log2(q / m))
+    js = float(np.sqrt(max(divergence, 0.0)))
+
+    ks = 0.0
+    expected_values, actual_values = expected[1:], actual[1:]
+    if expected_values.sum() > 0 and actual_values.sum() > 0:
+        ks = float(np.max(np.abs(
+            np.cumsum(expected_values / expected_values.sum())
+            - np.cumsum(actual_values / actual_values.sum())
+        )))
+    return {'psi': psi, 'ks': ks, 'js': js}
+
+
+@dataclass
+class DriftReference:
+    """
+    Reference histograms of the features and predictions of a model.
+
+    Attributes
+    ----------
+    features : dict of str to FeatureReference
+        Reference of each feature.
+    prediction : FeatureReference, optional
+        Reference of the model predictions.
+    rows : int
+        Number of rows the reference was built from.
+    """
+
+    features: Dict[str, FeatureReference]
+    prediction: Optional[FeatureReference] = None
+    rows: int = 0
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the reference as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'rows': self.rows,
+            'features': {
+                name: asdict(feature) for name, feature in self.features.items()
+            },
+            'prediction': asdict(self.prediction) if self.prediction else None,
+        }
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, default=_to_builtin)
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'DriftReference':
+        """Read a reference written by `save`."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        prediction = data.get('prediction')
+        return cls(
+            features={
+                name: FeatureReference(**feature)
+                for name, feature in data['features'].items()
+            },
+            prediction=FeatureReference(**prediction) if prediction else None,
+            rows=data.get('rows', 0),
+        )
+
+
+def _to_builtin(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class _FeatureSketch:
+    """Sketches of one feature while the reference is built."""
+
+    def __init__(self) -> None:
+        self.kind: Optional[str] = None
+        self.rows = 0
+        self.missing = 0
+        self.quantiles = QuantileSketch(k=400)
+        self.frequent = FrequentItems(4 * MAX_CATEGORIES)
+
+    def update(self, values: pd.Series) -> None:
+        present = values.dropna()
+        self.rows += len(values)
+        self.missing += len(values) - len(present)
+        if not len(present):
+            return
+        if self.kind is None:
+            numeric = (
+                pd.api.types.is_numeric_dtype(present)
+                and not pd.api.types.is_bool_dtype(present)
+            )
+            self.kind = 'numeric' if numeric else 'categorical'
+        if self.kind == 'numeric':
+            self.quantiles.update(pd.to_numeric(present, errors='coerce'))
+        else:
+            self.frequent.update(present)
+
+    def reference(self, bins: int) -> FeatureReference:
+        rows = max(self.rows, 1)
+        missing = self.missing / rows
+        if self.kind == 'numeric' and self.quantiles.count:
+            inner = self.quantiles.quantile(np.linspace(0, 1, bins + 1)[1:-1])
+            edges = np.unique(inner)
+            # CDF at each edge, bins being closed on the right
+            cdf = np.concatenate([[0.0], self.quantiles.cdf(edges), [1.0]])
+            share = self.quantiles.count / rows
+            expected = [missing, *(np.diff(cdf) * share)]
+            return FeatureReference('numeric', expected, edges=edges.tolist())
+
+        present = self.rows - self.missing
+        categories, shares = [], []
+        for value, count in self.frequent.top(MAX_CATEGORIES):
+            if present and count / rows >= MIN_CATEGORY_SHARE:
+                if isinstance(value, np.generic):
+                    value = _to_builtin(value)
+                categories.append(value)
+                shares.append(count / rows)
+        other = max(1 - missing - sum(shares), 0.0)
+        return FeatureReference(
+            'categorical', [missing, *shares, other], categories=categories
+        )
+
+
+class ReferenceBuilder:
+    """
+    Build a `DriftReference` from chunks of training data.
+
+    Parameters
+    ----------
+    bins : int, optional
+        Number of quantile bins per numerical feature. Defaults to the
+        configured ``monitoring.bins``.
+    """
+
+    def __init__(self, bins: Optional[int] = None) -> None:
+        self.bins = bins or get_settings().monitoring.bins
+        self.rows = 0
+        self._features: Dict[str, _FeatureSketch] = {}
+        self._prediction: Optional[_FeatureSketch] = None
+
+    def update(
+        self,
+        X: pd.DataFrame,
+        predictions: Optional[Any] = None
+    ) -> 'ReferenceBuilder':
+        """Add a chunk of features and, optionally, the model predictions on it."""
+        for name in X.columns:
+            self._features.setdefault(str(name), _FeatureSketch()).update(X[name])
+        if predictions is not None:
+            if self._prediction is None:
+                self._prediction = _FeatureSketch()
+            self._prediction.update(pd.Series(np.asarray(predictions)))
+        self.rows += len(X)
+        return self
+
+    def build(self) -> DriftReference:
+        """Reference of everything added so far."""
+        return DriftReference(
+            features={
+                name: sketch.reference(self.bins)
+                for name, sketch in self._features.items()
+            },
+            prediction=(
+                self._prediction.reference(self.bins) if self._prediction else None
+            ),
+            rows=self.rows,
+        )
+
+
+def build_reference(
+    X: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    predictions: Optional[Any] = None,
+    bins: Optional[int] = None
+) -> DriftReference:
+    """
+    Build the drift reference of training data.
+
+    Parameters
+    ----------
+    X : pandas.DataFrame or iterable of pandas.DataFrame
+        Training features, whole or in chunks.
+    predictions : array-like or iterable of array-like, optional
+        Predictions of the model on `X`: one array for a DataFrame, or one
+        array per chunk for chunks.
+    bins : int, optional
+        Number of quantile bins per numerical feature.
+
+    Returns
+    -------
+    DriftReference
+        Histograms of the features and predictions.
+
+    Raises
+    ------
+    ValueError
+        If the prediction chunks do not match the chunks of `X`.
+    """
+    builder = ReferenceBuilder(bins)
+    if isinstance(X, pd.DataFrame):
+        builder.update(X, predictions)
+    elif predictions is None:
+        for chunk in X:
+            builder.update(chunk)
+    else:
+        prediction_chunks = iter(predictions)
+        for chunk in X:
+            chunk_predictions = next(prediction_chunks, None)
+            if chunk_predictions is None or np.ndim(chunk_predictions) != 1 or (
+                len(chunk_predictions) != len(chunk)
+            ):
+                raise ValueError(
+                    "predictions must hold one array per chunk of X, "
+                    "as long as the chunk"
+                )
+            builder.update(chunk, chunk_predictions)
+        if next(prediction_chunks, None) is not None:
+            raise ValueError("predictions has more chunks than X")
+    return builder.build()
+
+
+class DriftMonitor:
+    """
+    Compare scored batches with a drift reference, logging every batch.
+
+    Bins are counted per batch in O(batch) time and accumulated, so the drift
+    of all batches seen so far is available in constant memory. Updates are
+    thread-safe, e.g. from concurrent serving workers.
+
+    Parameters
+    ----------
+    reference : DriftReference
+        Training reference of the model.
+    name : str, optional
+        Model name written to the log (default is 'model').
+    log_path : str or pathlib.Path, optional
+        JSON lines log. Defaults to ``logs/<monitoring.log_file>``; False
+        disables logging.
+    psi_threshold : float, optional
+        PSI above which a feature is reported as drifted. Defaults to the
+        configured ``monitoring.psi_threshold``.
+    """
+
+    def __init__(
+        self,
+        reference: DriftReference,
+        name: str = 'model',
+        log_path: Optional[Union[str, Path, bool]] = None,
+        psi_threshold: Optional[float] = None
+    ) -> None:
+        settings = get_settings().monitoring
+        self.reference = reference
+        self.name = name
+        if log_path is None:
+            log_path = logs_dir(settings.log_file)
+        self.log_path = Path(log_path) if log_path else None
+        self.psi_threshold = (
+            settings.psi_threshold if psi_threshold is None else psi_threshold
+        )
+        self.rows = 0
+        self._counts = {
+            name: np.zeros(len(feature.expected), dtype=np.int64)
+            for name, feature in self._references().items()
+        }
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_model(
+        cls,
+        model_path: Union[str, Path],
+        **options: Any
+    ) -> Optional['DriftMonitor']:
+        """
+        Monitor of a saved model, if monitoring is enabled and the model has
+        a reference (see `reference_path`).
+
+        Parameters
+        ----------
+        model_path : str or pathlib.Path
+            Model saved with `save_model`.
+        **options
+            Keyword arguments of `DriftMonitor`.
+
+        Returns
+        -------
+        DriftMonitor or None
+            The monitor, or None without a reference.
+        """
+        path = reference_path(model_path)
+        if not get_settings().monitoring.enabled or not path.is_file():
+            return None
+        options.setdefault('name', Path(model_path).stem)
+        return cls(DriftReference.load(path), **options)
+
+    def _references(self) -> Dict[str, FeatureReference]:
+        references = dict(self.reference.features)
+        if self.reference.prediction is not None:
+            references[PREDICTION] = self.reference.prediction
+        return references
+
+    def update(
+        self,
+        X: pd.DataFrame,
+        predictions: Optional[Any] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compare a batch with the reference.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Features of the batch; features missing from it are skipped.
+        predictions : array-like, optional
+            Model predictions on the batch.
+
+        Returns
+        -------
+        dict of str to dict
+            'psi', 'ks' and 'js' of the batch per feature, and of the
+            predictions under `PREDICTION`.
+        """
+        columns = {
+            name: X[name] for name in self.reference.features if name in X.columns
+        }
+        if predictions is not None and self.reference.prediction is not None:
+            columns[PREDICTION] = pd.Series(np.asarray(predictions))
+        references = self._references()
+
+        batch_counts = {
+            name: references[name].counts(values) for name, values in columns.items()
+        }
+        metrics = {
+            name: drift_metrics(references[name].expected, _probabilities(counts))
+            for name, counts in batch_counts.items()
+        }
+        with self._lock:
+            for name, counts in batch_counts.items():
+                self._counts[name] += counts
+            self.rows += len(X)
+            total_rows = self.rows
+        if self.log_path is not None:
+            self._log(len(X), total_rows, metrics)
+        return metrics
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Drift metrics of all batches seen so far, per feature."""
+        references = self._references()
+        with self._lock:
+            counts = {name: counts.copy() for name, counts in self._counts.items()}
+        return {
+            name: drift_metrics(references[name].expected, _probabilities(values))
+            for name, values in counts.items() if values.sum()
+        }
+
+    def drifted(self, metrics: Dict[str, Dict[str, float]]) -> List[str]:
+        """Features whose PSI is above the threshold."""
+        return [
+            name for name, values in metrics.items()
+            if values['psi'] > self.psi_threshold
+        ]
+
+    def _log(
+        self,
+        rows: int,
+        total_rows: int,
+        metrics: Dict[str, Dict[str, float]]
+    ) -> None:
+        record = {
+            'time': time.time(),
+            'model': self.name,
+            'rows': rows,
+            'total_rows': total_rows,
+            'drifted': self.drifted(metrics),
+            'metrics': metrics,
+        }
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(line)
@@ -0,0 +1,173 @@
+"""
+Batch prediction and evaluation with trained models.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.data.data_loader import load_dataset
+from {{ cookiecutter.module_name }}.models.model_utils import (
+    evaluate_classification,
+    evaluate_regression,
+    load_model,
+)
+from {{ cookiecutter.module_name }}.models.monitoring import DriftMonitor
+from {{ cookiecutter.module_name }}.utils.parallel import iter_slices, resolve_n_jobs
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+
+
+def _predict_rows(X: pd.DataFrame, model: Any) -> np.ndarray:
+    return np.asarray(model.predict(X))
+
+
+@instrument()
+def predict(
+    model: Any,
+    X: pd.DataFrame,
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    backend: Optional[str] = None
+) -> np.ndarray:
+    """
+    Predict in row chunks, optionally scoring chunks concurrently.
+
+    Scikit-learn releases the GIL in most of its numerical code, so chunks are
+    scored on a thread pool by default and the model is shared rather than
+    copied. Models that hold the GIL can use worker processes instead; `X` is
+    then handed to the workers through shared memory rather than copied.
+
+    Parameters
+    ----------
+    model : object
+        Fitted model with a ``predict`` method.
+    X : pandas.DataFrame
+        Features.
+    chunk_size : int, optional
+        Number of rows per chunk. Defaults to the configured
+        ``compute.chunk_size``; if that is unset all rows are scored at once.
+    n_jobs : int, optional
+        Number of chunks scored concurrently (-1 for all CPUs). Defaults to
+        the configured ``compute.n_jobs``.
+    backend : str, optional
+        'threads' or 'processes'. Defaults to the configured
+        ``compute.backend``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Predictions in the row order of `X`.
+    """
+    compute = get_settings().compute
+    chunk_size = compute.chunk_size if chunk_size is None else chunk_size
+    n_jobs = compute.n_jobs if n_jobs is None else n_jobs
+    backend = backend or compute.backend
+
+    if not chunk_size or len(X) <= chunk_size:
+        return _predict_rows(X, model)
+
+    n_workers = resolve_n_jobs(n_jobs)
+    if backend == 'processes' and n_workers > 1:
+        from {{ cookiecutter.module_name }}.utils.shared import map_shared_slices
+
+        return np.concatenate(
+            map_shared_slices(_predict_rows, X, chunk_size, n_workers, model)
+        )
+
+    chunks = iter_slices(X, chunk_size)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        predictions = list(executor.map(model.predict, chunks))
+    return np.concatenate(predictions)
+
+
+def predict_model(
+    model_path: Union[str, Path],
+    data_path: Union[str, Path],
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None
+) -> np.ndarray:
+    """
+    Load a saved model and predict on a dataset.
+
+    If the model has a drift reference, the features and predictions are
+    compared with it and the drift metrics appended to the drift log (see
+    `DriftMonitor`).
+
+    Parameters
+    ----------
+    model_path : str or pathlib.Path
+        Path to a model saved with `save_model`.
+    data_path : str or pathlib.Path
+        Path to the feature dataset.
+    chunk_size : int, optional
+        Number of rows per prediction chunk.
+    n_jobs : int, optional
+        Number of chunks scored concurrently (-1 for all CPUs).
+
+    Returns
+    -------
+    numpy.ndarray
+        Predictions.
+    """
+    model = load_model(model_path)
+    X = pd.DataFrame(load_dataset(data_path))
+    predictions = predict(model, X, chunk_size=chunk_size, n_jobs=n_jobs)
+    monitor = DriftMonitor.for_model(model_path)
+    if monitor is not None:
+        monitor.update(X, predictions)
+    return predictions
+
+
+@instrument()
+def evaluate_model(
+    model_path: Union[str, Path],
+    data_path: Union[str, Path],
+    target: str = 'target',
+    task: str = 'classification',
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Evaluate a saved model on a labelled dataset.
+
+    Parameters
+    ----------
+    model_path : str or pathlib.Path
+        Path to a model saved with `save_model`.
+    data_path : str or pathlib.Path
+        Path to the labelled dataset.
+    target : str, optional
+        Name of the target column (default is 'target').
+    task : str, optional
+        'classification' or 'regression' (default is 'classification').
+    chunk_size : int, optional
+        Number of rows per prediction chunk.
+    n_jobs : int, optional
+        Number of chunks scored concurrently (-1 for all CPUs).
+
+    Returns
+    -------
+    metrics : dict of str to float
+        Metrics from `evaluate_classification` or `evaluate_regression`.
+    """
+    model = load_model(model_path)
+    df = pd.DataFrame(load_dataset(data_path))
+    y_true = df[target]
+    y_pred = predict(
+        model, df.drop(columns=[target]), chunk_size=chunk_size, n_jobs=n_jobs
+    )
+
+    if task == 'classification':
+        # The binary average scores the label 1, so other pairs of labels
+        # such as 'yes' and 'no' are averaged over their classes instead
+        labels = set(pd.unique(y_true)) | set(pd.unique(y_pred))
+        binary = pd.api.types.is_bool_dtype(y_true) or labels <= {0, 1}
+        average = 'binary' if binary else 'weighted'
+        return evaluate_classification(y_true, y_pred, average=average)
+    if task == 'regression':
+        return evaluate_regression(y_true, y_pred)
+    raise ValueError(f"Unsupported task: {task}")
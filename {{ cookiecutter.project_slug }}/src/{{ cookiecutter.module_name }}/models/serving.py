@@ -0,0 +1,416 @@
+"""
+Low-latency model serving with micro-batching.
+
+Concurrent requests for the same model are queued and collected into a single
+micro-batch until either ``max_batch_size`` rows are waiting or the oldest
+request has waited ``max_latency_ms``. Each micro-batch is scored with one
+vectorized `predict` call on a worker thread pool, so throughput scales with
+the batch size while the latency added by batching stays bounded.
+
+Models saved with `save_model` are loaded once and kept warm in memory by
+`ModelRegistry`; `LatencyTracker` records per-request latency percentiles and
+throughput for the ``/metrics`` endpoint of ``app/main.py``. Models saved with
+a drift reference are monitored by a `DriftMonitor`, off the request path.
+
+Example
+-------
+>>> registry = ModelRegistry.from_directory(models_dir())
+>>> predictions = await registry.batcher('model').submit(pd.DataFrame(records))
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.models.model_utils import load_model
+from {{ cookiecutter.module_name }}.models.monitoring import DriftMonitor
+from {{ cookiecutter.module_name }}.models.predict_model import predict
+from {{ cookiecutter.module_name }}.utils.parallel import resolve_n_jobs
+
+# File suffixes recognized as saved models by `ModelRegistry.from_directory`
+MODEL_SUFFIXES = ('.joblib', '.pkl', '.pickle')
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """
+    Rolling latency and throughput statistics.
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of most recent requests used for percentiles and throughput
+        (default is 10000).
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=window)
+        self.started = time.monotonic()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.errors = 0
+
+    def record_request(self, latency: float, rows: int) -> None:
+        """Record a completed request and its latency in seconds."""
+        self._samples.append((time.monotonic(), latency))
+        self.requests += 1
+        self.rows += rows
+
+    def record_batch(self, rows: int) -> None:
+        """Record a scored micro-batch of `rows` rows."""
+        self.batches += 1
+        self.batch_rows += rows
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the recorded requests.
+
+        Returns
+        -------
+        dict
+            Request, row, batch and error counts, the mean batch size, the
+            p50/p90/p99 latency in milliseconds and the throughput in requests
+            per second over the rolling window.
+        """
+        summary: Dict[str, Any] = {
+            'requests': self.requests,
+            'rows': self.rows,
+            'batches': self.batches,
+            'errors': self.errors,
+            'mean_batch_rows': self.batch_rows / self.batches if self.batches else None,
+            'uptime_s': time.monotonic() - self.started,
+            'latency_ms': None,
+            'throughput_rps': None,
+        }
+        if self._samples:
+            timestamps, latencies = zip(*self._samples)
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+            summary['latency_ms'] = {'p50': p50, 'p90': p90, 'p99': p99}
+            elapsed = time.monotonic() - (timestamps[0] - latencies[0])
+            summary['throughput_rps'] = len(timestamps) / elapsed if elapsed else None
+        return summary
+
+
+class MicroBatcher:
+    """
+    Collect concurrent prediction requests into vectorized micro-batches.
+
+    Parameters
+    ----------
+    model : object
+        Fitted model with a ``predict`` method.
+    max_batch_size : int, optional
+        Maximum number of rows per micro-batch. Defaults to the configured
+        ``serving.max_batch_size``.
+    max_latency_ms : float, optional
+        Maximum time the first request of a batch waits for more requests.
+        Defaults to the configured ``serving.max_latency_ms``.
+    workers : int, optional
+        Number of batches scored concurrently on a thread pool (-1 for all
+        CPUs). Defaults to the configured ``serving.workers``.
+    monitor : DriftMonitor, optional
+        Drift monitor updated with every scored batch, after its requests
+        have been answered, on a thread of its own so that monitoring never
+        holds a scoring worker. Failures are logged.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_batch_size: Optional[int] = None,
+        max_latency_ms: Optional[float] = None,
+        workers: Optional[int] = None,
+        monitor: Optional[DriftMonitor] = None
+    ) -> None:
+        serving = get_settings().serving
+        self.model = model
+        self.monitor = monitor
+        self.max_batch_size = max_batch_size or serving.max_batch_size
+        self.max_latency = (
+            serving.max_latency_ms if max_latency_ms is None else max_latency_ms
+        ) / 1000
+        workers = resolve_n_jobs(serving.workers if workers is None else workers)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        # One batch at a time, in the order they were scored
+        self._monitor_executor = (
+            ThreadPoolExecutor(max_workers=1) if monitor is not None else None
+        )
+        self._queue: "asyncio.Queue[Tuple[pd.DataFrame, asyncio.Future[np.ndarray]]]"
+        self._queue = asyncio.Queue()
+        # Batches scored concurrently, so that a slow batch does not stall intake
+        self._slots = asyncio.Semaphore(workers)
+        # Scoring tasks and monitoring updates still running
+        self._pending: Set["asyncio.Future[None]"] = set()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.metrics = LatencyTracker()
+
+    def start(self) -> None:
+        """Start collecting batches on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop collecting batches and wait for those being scored or monitored."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Batches being scored may still queue monitoring updates
+        while pending := [future for future in self._pending if not future.done()]:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+        if self._monitor_executor is not None:
+            self._monitor_executor.shutdown(wait=False)
+
+    async def submit(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Queue rows for prediction and wait for their batch to be scored.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Feature rows of one request.
+
+        Returns
+        -------
+        numpy.ndarray
+            Predictions for the rows of `X`.
+
+        Raises
+        ------
+        ValueError
+            If `X` lacks features the model was fitted on.
+        """
+        features = getattr(self.model, 'feature_names_in_', None)
+        if features is not None:
+            # Validate and align columns before batching: concatenating frames
+            # with different columns would silently fill the gaps with NaN
+            missing = [name for name in features if name not in X.columns]
+            if missing:
+                self.metrics.errors += 1
+                raise ValueError(f"Missing features: {missing}")
+            X = X[list(features)]
+        self.start()
+        start = time.perf_counter()
+        future: "asyncio.Future[np.ndarray]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((X, future))
+        try:
+            predictions = await future
+        except Exception:
+            self.metrics.errors += 1
+            raise
+        self.metrics.record_request(time.perf_counter() - start, len(X))
+        return predictions
+
+    async def _collect(self) -> List[Tuple[pd.DataFrame, "asyncio.Future[np.ndarray]"]]:
+        """Wait for a request, then gather more until the batch is full or due."""
+        batch = [await self._queue.get()]
+        rows = len(batch[0][0])
+        deadline = time.monotonic() + self.max_latency
+        while rows < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            # Wait for a free worker first, so that requests arriving while
+            # all workers are busy are scored together in the next batch
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            self._track(asyncio.get_running_loop().create_task(self._score(batch)))
+
+    def _track(self, future: "asyncio.Future[None]") -> None:
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    async def _predict(self, X: pd.DataFrame) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        # chunk_size=0 scores the whole micro-batch in one vectorized call
+        predictions = await loop.run_in_executor(
+            self._executor, lambda: predict(self.model, X, chunk_size=0)
+        )
+        self.metrics.record_batch(len(X))
+        return predictions
+
+    async def _score(
+        self,
+        batch: List[Tuple[pd.DataFrame, "asyncio.Future[np.ndarray]"]]
+    ) -> None:
+        try:
+            frames = [X for X, _ in batch]
+            X = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            try:
+                predictions = await self._predict(X)
+            except Exception:
+                if len(batch) == 1:
+                    raise
+                # Score the requests one by one so that a single malformed
+                # request does not fail the others of its batch
+                for frame, future in batch:
+                    try:
+                        future.set_result(await self._predict(frame))
+                    except Exception as e:
+                        future.set_exception(e)
+                return
+            offset = 0
+            for frame, future in batch:
+                if not future.done():
+                    future.set_result(predictions[offset:offset + len(frame)])
+                offset += len(frame)
+            if self.monitor is not None:
+                # After answering the requests, and without waiting for it, so
+                # that monitoring delays neither these requests nor the next batch
+                self._track(asyncio.get_running_loop().run_in_executor(
+                    self._monitor_executor, self._monitor, X, predictions
+                ))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+
+    def _monitor(self, X: pd.DataFrame, predictions: np.ndarray) -> None:
+        try:
+            self.monitor.update(X, predictions)
+        except Exception:
+            # Requests were answered already; monitoring must not fail serving
+            logger.exception("Drift monitoring failed on a batch of %d rows", len(X))
+
+
+class ModelRegistry:
+    """
+    Saved models kept warm in memory, with one `MicroBatcher` per model.
+
+    Parameters
+    ----------
+    models : dict of str to object, optional
+        Fitted models keyed by name.
+    monitors : dict of str to DriftMonitor, optional
+        Drift monitors of the models that have one, keyed by name.
+    **batcher_options
+        Keyword arguments for every `MicroBatcher` (e.g. ``max_latency_ms``).
+    """
+
+    def __init__(
+        self,
+        models: Optional[Dict[str, Any]] = None,
+        monitors: Optional[Dict[str, DriftMonitor]] = None,
+        **batcher_options: Any
+    ) -> None:
+        self.models: Dict[str, Any] = dict(models or {})
+        self.monitors: Dict[str, DriftMonitor] = dict(monitors or {})
+        self.batcher_options = batcher_options
+        self._batchers: Dict[str, MicroBatcher] = {}
+
+    @classmethod
+    def from_paths(
+        cls,
+        paths: Dict[str, Union[str, Path]],
+        **batcher_options: Any
+    ) -> "ModelRegistry":
+        """
+        Load models saved with `save_model`, and their drift references.
+
+        Parameters
+        ----------
+        paths : dict of str to str or pathlib.Path
+            Model files keyed by the name they are served under.
+        **batcher_options
+            Keyword arguments for every `MicroBatcher`.
+
+        Returns
+        -------
+        ModelRegistry
+            Registry with all models loaded.
+        """
+        models = {name: load_model(path) for name, path in paths.items()}
+        monitors = {
+            name: monitor for name, path in paths.items()
+            if (monitor := DriftMonitor.for_model(path, name=name)) is not None
+        }
+        return cls(models, monitors, **batcher_options)
+
+    @classmethod
+    def from_directory(
+        cls,
+        directory: Union[str, Path],
+        **batcher_options: Any
+    ) -> "ModelRegistry":
+        """
+        Load every saved model of a directory, named after its file stem.
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path
+            Directory of models saved with `save_model` (e.g. ``models/``).
+        **batcher_options
+            Keyword arguments for every `MicroBatcher`.
+
+        Returns
+        -------
+        ModelRegistry
+            Registry with all models loaded.
+        """
+        paths = {
+            path.stem: path for path in sorted(Path(directory).iterdir())
+            if path.suffix in MODEL_SUFFIXES
+        }
+        return cls.from_paths(paths, **batcher_options)
+
+    def batcher(self, name: str) -> MicroBatcher:
+        """
+        Return the micro-batcher of a model, creating it on first use.
+
+        Raises
+        ------
+        KeyError
+            If no model is registered under `name`.
+        """
+        if name not in self._batchers:
+            self._batchers[name] = MicroBatcher(
+                self.models[name], monitor=self.monitors.get(name), **self.batcher_options
+            )
+        return self._batchers[name]
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Latency and throughput summary per served model, and drift if monitored."""
+        metrics = {}
+        for name, batcher in self._batchers.items():
+            metrics[name] = batcher.metrics.summary()
+            if batcher.monitor is not None:
+                metrics[name]['drift'] = batcher.monitor.summary()
+        return metrics
+
+    async def close(self) -> None:
+        """Stop all micro-batchers."""
+        for batcher in self._batchers.values():
+            await batcher.stop()
+        self._batchers.clear()
@@ -0,0 +1,418 @@
+"""
+Model training entry points.
+
+`train_model` fits an estimator on a fully loaded dataset. For datasets that
+do not fit in memory, or that grow over time, `train_incremental` streams
+chunks into the ``partial_fit`` method of estimators that support it (e.g.
+the 'sgd', 'naive_bayes' and 'minibatch_kmeans' model types), checkpointing
+its progress with `save_model`. A run resumes from its checkpoint, and a
+daily retrain only trains on the new data.
+
+Both save a drift reference of the training data next to the model (see
+`models.monitoring`), against which scored batches are compared.
+
+Example
+-------
+>>> train_model_incremental(data_processed_dir('2024-06-02.parquet'),
+...                         model_type='sgd', model_path=models_dir('model.joblib'))
+"""
+
+import importlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.data.data_loader import iter_dataset, load_dataset
+from {{ cookiecutter.module_name }}.models.model_utils import load_model, save_model
+from {{ cookiecutter.module_name }}.models.monitoring import ReferenceBuilder, reference_path
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+
+# Chunks trained on between two checkpoints of `train_incremental`
+DEFAULT_CHECKPOINT_EVERY = 10
+# Completed sources remembered by a checkpoint of `train_incremental`; the
+# oldest are forgotten, so that a daily retrain does not grow it forever
+MAX_COMPLETED_SOURCES = 1_000
+
+# Estimators by model type and task, as import paths so that only the
+# selected estimator module is imported
+MODEL_TYPES: Dict[str, Dict[str, str]] = {
+    'random_forest': {
+        'classification': 'sklearn.ensemble.RandomForestClassifier',
+        'regression': 'sklearn.ensemble.RandomForestRegressor',
+    },
+    'gradient_boosting': {
+        'classification': 'sklearn.ensemble.HistGradientBoostingClassifier',
+        'regression': 'sklearn.ensemble.HistGradientBoostingRegressor',
+    },
+    'linear': {
+        'classification': 'sklearn.linear_model.LogisticRegression',
+        'regression': 'sklearn.linear_model.Ridge',
+    },
+    # Estimators supporting incremental training with `partial_fit`
+    'sgd': {
+        'classification': 'sklearn.linear_model.SGDClassifier',
+        'regression': 'sklearn.linear_model.SGDRegressor',
+    },
+    'naive_bayes': {
+        'classification': 'sklearn.naive_bayes.GaussianNB',
+    },
+    'minibatch_kmeans': {
+        'clustering': 'sklearn.cluster.MiniBatchKMeans',
+    },
+}
+
+
+def get_estimator(
+    model_type: str,
+    task: str = 'classification',
+    n_jobs: Optional[int] = None,
+    **model_params: Any
+) -> Any:
+    """
+    Instantiate an estimator from `MODEL_TYPES`.
+
+    Parameters
+    ----------
+    model_type : str
+        Key of `MODEL_TYPES`, e.g. 'random_forest'.
+    task : str, optional
+        'classification', 'regression' or 'clustering' (default is
+        'classification').
+    n_jobs : int, optional
+        Number of parallel jobs, passed on if the estimator supports it.
+        Defaults to the configured ``compute.n_jobs``.
+    **model_params
+        Keyword arguments passed to the estimator.
+
+    Returns
+    -------
+    estimator : object
+        Unfitted estimator.
+
+    Raises
+    ------
+    ValueError
+        If the model type or task is not supported.
+    """
+    try:
+        import_path = MODEL_TYPES[model_type][task]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported model type/task: {model_type}/{task}"
+        ) from None
+
+    module_name, class_name = import_path.rsplit('.', 1)
+    estimator = getattr(importlib.import_module(module_name), class_name)(**model_params)
+    if n_jobs is None:
+        n_jobs = get_settings().compute.n_jobs
+    if 'n_jobs' in estimator.get_params() and 'n_jobs' not in model_params:
+        estimator.set_params(n_jobs=n_jobs)
+    return estimator
+
+
+@instrument()
+def train_model(
+    data_path: Union[str, Path],
+    target: str = 'target',
+    model_type: str = 'random_forest',
+    task: str = 'classification',
+    model_path: Optional[Union[str, Path]] = None,
+    n_jobs: Optional[int] = None,
+    **model_params: Any
+) -> Any:
+    """
+    Train a model on a feature dataset and optionally save it.
+
+    Parameters
+    ----------
+    data_path : str or pathlib.Path
+        Path to the training dataset, including the target column.
+    target : str, optional
+        Name of the target column (default is 'target').
+    model_type : str, optional
+        Key of `MODEL_TYPES` (default is 'random_forest').
+    task : str, optional
+        'classification', 'regression' or 'clustering' (default is
+        'classification').
+    model_path : str or pathlib.Path, optional
+        Where to save the fitted model with `save_model`, together with the
+        drift reference of the features and predictions.
+    n_jobs : int, optional
+        Number of parallel jobs used by the estimator.
+    **model_params
+        Keyword arguments passed to the estimator.
+
+    Returns
+    -------
+    model : object
+        Fitted estimator.
+    """
+    df = pd.DataFrame(load_dataset(data_path))
+    model = get_estimator(model_type, task=task, n_jobs=n_jobs, **model_params)
+    X = df.drop(columns=[target], errors='ignore' if task == 'clustering' else 'raise')
+    if task == 'clustering':
+        model.fit(X)
+    else:
+        model.fit(X, df[target])
+
+    if model_path is not None:
+        save_model(model, model_path)
+        if get_settings().monitoring.enabled:
+            reference = ReferenceBuilder().update(X, model.predict(X)).build()
+            reference.save(reference_path(model_path))
+    return model
+
+
+@dataclass
+class TrainingState:
+    """
+    Progress of incremental training, saved in checkpoints.
+
+    Attributes
+    ----------
+    model : object
+        Estimator trained so far.
+    rows : int
+        Number of rows trained on, over all sources.
+    sources : dict of str to int
+        Number of rows consumed per interrupted source.
+    completed : list of str
+        Sources trained on completely, oldest first; they are skipped when
+        seen again.
+    """
+
+    model: Any
+    rows: int = 0
+    sources: Dict[str, int] = field(default_factory=dict)
+    completed: List[str] = field(default_factory=list)
+
+
+def supports_partial_fit(model: Any) -> bool:
+    """Whether `model` can be trained incrementally with ``partial_fit``."""
+    return callable(getattr(model, 'partial_fit', None))
+
+
+def _partial_fit(
+    model: Any,
+    chunk: pd.DataFrame,
+    target: str,
+    task: str,
+    classes: Optional[Sequence[Any]]
+) -> None:
+    """Train `model` on one chunk."""
+    from sklearn.base import is_classifier
+
+    if task == 'clustering':
+        model.partial_fit(chunk.drop(columns=[target], errors='ignore'))
+        return
+    X = chunk.drop(columns=[target])
+    y = chunk[target]
+    if is_classifier(model) and not hasattr(model, 'classes_'):
+        # The first call must list every class the stream may contain
+        model.partial_fit(X, y, classes=np.unique(y) if classes is None else np.asarray(classes))
+    else:
+        model.partial_fit(X, y)
+
+
+@instrument()
+def train_incremental(
+    chunks: Iterable[pd.DataFrame],
+    target: str = 'target',
+    model_type: str = 'sgd',
+    task: str = 'classification',
+    model: Optional[Any] = None,
+    classes: Optional[Sequence[Any]] = None,
+    checkpoint_path: Optional[Union[str, Path]] = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    source: Optional[str] = None,
+    max_completed: int = MAX_COMPLETED_SOURCES,
+    n_jobs: Optional[int] = None,
+    **model_params: Any
+) -> TrainingState:
+    """
+    Train an estimator incrementally on a stream of chunks.
+
+    If `checkpoint_path` exists, training resumes from it: the checkpointed
+    model is updated with the new chunks. Otherwise `model`, or a new
+    estimator from `MODEL_TYPES`, is trained from scratch.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.DataFrame
+        Training data, including the target column, e.g. from `iter_dataset`.
+    target : str, optional
+        Name of the target column (default is 'target'); ignored for
+        clustering.
+    model_type : str, optional
+        Key of `MODEL_TYPES` (default is 'sgd').
+    task : str, optional
+        'classification', 'regression' or 'clustering' (default is
+        'classification').
+    model : object, optional
+        Estimator with a ``partial_fit`` method to train instead of a new one.
+    classes : sequence, optional
+        Every class of a classification target. Defaults to the classes of
+        the first chunk, which must then contain all of them.
+    checkpoint_path : str or pathlib.Path, optional
+        Checkpoint to resume from and to save the `TrainingState` to.
+    checkpoint_every : int, optional
+        Number of chunks between checkpoints (default is
+        `DEFAULT_CHECKPOINT_EVERY`). A checkpoint is also saved at the end.
+    source : str, optional
+        Identifier of the chunk stream, e.g. a file and its version. An
+        interrupted source resumes after the rows of its last checkpoint
+        (whatever the chunk size), and a completed source is not trained on
+        again.
+    max_completed : int, optional
+        Number of completed sources remembered (default is
+        `MAX_COMPLETED_SOURCES`); older ones are trained on again if they
+        reappear. 0 remembers every source.
+    n_jobs : int, optional
+        Number of parallel jobs used by a new estimator.
+    **model_params
+        Keyword arguments passed to a new estimator.
+
+    Returns
+    -------
+    TrainingState
+        The trained model and the training progress.
+
+    Raises
+    ------
+    ValueError
+        If the estimator does not support ``partial_fit``.
+    """
+    state: Optional[TrainingState] = None
+    if checkpoint_path is not None and Path(checkpoint_path).exists():
+        state = load_model(checkpoint_path)
+    if state is None:
+        if model is None:
+            model = get_estimator(model_type, task=task, n_jobs=n_jobs, **model_params)
+        state = TrainingState(model)
+    if not supports_partial_fit(state.model):
+        raise ValueError(
+            f"{type(state.model).__name__} does not support incremental training (partial_fit)"
+        )
+    if source is not None and source in state.completed:
+        return state
+
+    def checkpoint() -> None:
+        if checkpoint_path is not None:
+            save_model(state, checkpoint_path)
+
+    # Rows consumed before an interruption were checkpointed already
+    done = state.sources.get(source, 0) if source is not None else 0
+    offset = 0
+    pending = 0
+    for chunk in chunks:
+        start, offset = offset, offset + len(chunk)
+        if offset <= done:
+            continue
+        if start < done:
+            chunk = chunk.iloc[done - start:]
+        if chunk.empty:
+            continue
+        _partial_fit(state.model, chunk, target, task, classes)
+        state.rows += len(chunk)
+        if source is not None:
+            state.sources[source] = offset
+        pending += 1
+        if checkpoint_every and pending >= checkpoint_every:
+            checkpoint()
+            pending = 0
+
+    if source is not None:
+        state.sources.pop(source, None)
+        state.completed.append(source)
+        if max_completed and len(state.completed) > max_completed:
+            del state.completed[:-max_completed]
+    checkpoint()
+    return state
+
+
+@instrument()
+def train_model_incremental(
+    data_path: Union[str, Path],
+    target: str = 'target',
+    model_type: str = 'sgd',
+    task: str = 'classification',
+    model_path: Optional[Union[str, Path]] = None,
+    checkpoint_path: Optional[Union[str, Path]] = None,
+    chunk_size: Optional[int] = None,
+    classes: Optional[Sequence[Any]] = None,
+    n_jobs: Optional[int] = None,
+    **model_params: Any
+) -> Any:
+    """
+    Train a model incrementally on a dataset read in chunks, and save it.
+
+    The dataset is identified by its path, size and modification time, so
+    running again on an unchanged file does not train twice, while a new or
+    updated file (e.g. today's data) updates the checkpointed model.
+
+    Parameters
+    ----------
+    data_path : str or pathlib.Path
+        Training dataset readable by `iter_dataset`, including the target.
+    target : str, optional
+        Name of the target column (default is 'target').
+    model_type : str, optional
+        Key of `MODEL_TYPES` (default is 'sgd').
+    task : str, optional
+        'classification', 'regression' or 'clustering' (default is
+        'classification').
+    model_path : str or pathlib.Path, optional
+        Where to save the trained model with `save_model`, together with the
+        drift reference of the features of `data_path`.
+    checkpoint_path : str or pathlib.Path, optional
+        Training checkpoint. Defaults to `model_path` with a ``.ckpt``
+        suffix, or no checkpoint without `model_path`.
+    chunk_size : int, optional
+        Rows per chunk. Defaults to the configured ``compute.chunk_size``.
+    classes : sequence, optional
+        Every class of a classification target (see `train_incremental`).
+    n_jobs : int, optional
+        Number of parallel jobs used by a new estimator.
+    **model_params
+        Keyword arguments passed to a new estimator.
+
+    Returns
+    -------
+    model : object
+        Trained estimator.
+    """
+    data_path = Path(data_path)
+    if checkpoint_path is None and model_path is not None:
+        checkpoint_path = Path(model_path).with_suffix('.ckpt')
+    stat = data_path.stat()
+    source = f"{data_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    reference = ReferenceBuilder() if get_settings().monitoring.enabled else None
+
+    def chunks() -> Iterable[pd.DataFrame]:
+        # The reference is built inline, without a second pass over the data
+        for chunk in iter_dataset(data_path, chunk_size=chunk_size):
+            if reference is not None:
+                reference.update(chunk.drop(columns=[target], errors='ignore'))
+            yield chunk
+
+    state = train_incremental(
+        chunks(),
+        target=target,
+        model_type=model_type,
+        task=task,
+        classes=classes,
+        checkpoint_path=checkpoint_path,
+        source=source,
+        n_jobs=n_jobs,
+        **model_params,
+    )
+    if model_path is not None:
+        save_model(state.model, model_path)
+        # A source trained on before is skipped, keeping the previous reference
+        if reference is not None and reference.rows:
+            reference.build().save(reference_path(model_path))
+    return state.model
@@ -0,0 +1,656 @@
+"""
+Lightweight local DAG executor for the project pipeline.
+
+Stages declare the files they read (`deps`) and write (`outs`) under the
+project directories from `utils.paths`. The dependency graph is derived from
+those paths, as in DVC: a stage depends on every stage producing one of its
+inputs. Before running a stage its inputs, code and parameters are
+fingerprinted; stages whose fingerprint matches the last successful run and
+whose outputs are unchanged are skipped. Paths are fingerprinted relative to
+the project root, so a cloned or moved project keeps its up-to-date stages.
+Independent stages run at the same time on a process pool.
+
+The executor does not need DVC, but pipelines can be read from and written to
+a ``dvc.yaml`` file so that both tools drive the same stages.
+
+Example
+-------
+>>> pipeline = default_pipeline()
+>>> pipeline.status()
+{'make_dataset': 'stale', 'build_features': 'stale', 'train': 'stale'}
+>>> pipeline.run(n_jobs=-1)
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from {{ cookiecutter.module_name }}.utils.parallel import resolve_n_jobs
+from {{ cookiecutter.module_name }}.utils.paths import (
+    data_interim_dir,
+    data_processed_dir,
+    data_raw_dir,
+    models_dir,
+    project_dir,
+)
+from {{ cookiecutter.module_name }}.utils.profiling import profile_call, span
+
+PathLike = Union[str, Path]
+
+# Read files in 1 MiB blocks when hashing
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class PipelineError(RuntimeError):
+    """Raised when a pipeline stage fails or does not produce its outputs."""
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline stage.
+
+    Parameters
+    ----------
+    name : str
+        Unique stage name.
+    func : str, optional
+        Import path of the function to run, as ``'package.module:function'``.
+        The function is called with `params` as keyword arguments.
+    cmd : str, optional
+        Shell command to run instead of `func` (used for ``dvc.yaml`` stages).
+    deps : list of path
+        Files or directories the stage reads.
+    outs : list of path
+        Files or directories the stage writes.
+    params : dict, optional
+        Keyword arguments for `func`. They are part of the fingerprint.
+    code : list of path, optional
+        Source files or directories the stage runs, in addition to the
+        package defining `func`, e.g. the scripts called by `cmd`.
+    """
+
+    name: str
+    func: Optional[str] = None
+    cmd: Optional[str] = None
+    deps: List[PathLike] = field(default_factory=list)
+    outs: List[PathLike] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+    code: List[PathLike] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if (self.func is None) == (self.cmd is None):
+            raise ValueError(f"Stage {self.name!r} needs exactly one of func or cmd")
+        self.deps = [Path(dep) for dep in self.deps]
+        self.outs = [Path(out) for out in self.outs]
+        self.code = [Path(path) for path in self.code]
+
+
+def resolve_callable(import_path: str) -> Callable[..., Any]:
+    """
+    Import a function from a ``'package.module:function'`` path.
+
+    Parameters
+    ----------
+    import_path : str
+        Import path of the function.
+
+    Returns
+    -------
+    callable
+        The imported function.
+    """
+    module_name, _, func_name = import_path.partition(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def run_stage(stage: Stage, profile: Optional[str] = None) -> None:
+    """
+    Execute a single stage in the current process.
+
+    Parameters
+    ----------
+    stage : Stage
+        Stage to run.
+    profile : str, optional
+        If given, profile the stage with `utils.profiling.profile_call` in this
+        format ('cprofile' or 'collapsed'), writing ``logs/<stage>.*``.
+    """
+    if profile is not None:
+        profile_call(run_stage, stage, name=stage.name, output_format=profile)
+        return
+    with span(f"pipeline.{stage.name}"):
+        if stage.cmd is not None:
+            subprocess.run(stage.cmd, shell=True, check=True, cwd=project_dir())
+        else:
+            resolve_callable(str(stage.func))(**stage.params)
+
+
+def hash_file(filepath: Path) -> str:
+    """
+    Compute the SHA-256 digest of a file.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path
+        File to hash.
+
+    Returns
+    -------
+    str
+        Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """
+    A DAG of stages with fingerprint-based caching and parallel scheduling.
+
+    Parameters
+    ----------
+    stages : iterable of Stage, optional
+        Stages of the pipeline.
+    state_path : str or pathlib.Path, optional
+        JSON file storing fingerprints of successful runs
+        (default is ``.pipeline/state.json`` in the project root).
+    """
+
+    def __init__(
+        self,
+        stages: Optional[Iterable[Stage]] = None,
+        state_path: Optional[PathLike] = None
+    ) -> None:
+        self.stages: Dict[str, Stage] = {}
+        self.state_path = Path(state_path or project_dir('.pipeline', 'state.json'))
+        self._state = self._load_state()
+        for stage in stages or []:
+            self.add(stage)
+
+    # --- Graph ---
+    def add(self, stage: Stage) -> Stage:
+        """Add a stage to the pipeline and return it."""
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        self.stages[stage.name] = stage
+        return stage
+
+    def upstream(self, name: str) -> Set[str]:
+        """Return the names of the stages producing inputs of stage `name`."""
+        producers = {
+            self._resolve(out): other.name
+            for other in self.stages.values()
+            for out in other.outs
+        }
+        upstream = set()
+        for dep in self.stages[name].deps:
+            dep = self._resolve(dep)
+            for out, producer in producers.items():
+                # A dependency may be an output or a file inside an output directory
+                if producer != name and (dep == out or out in dep.parents):
+                    upstream.add(producer)
+        return upstream
+
+    def topological_order(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Order stages so that every stage comes after its upstream stages.
+
+        Parameters
+        ----------
+        targets : iterable of str, optional
+            Only include these stages and their upstream stages.
+
+        Returns
+        -------
+        list of str
+            Stage names in execution order.
+        """
+        order: List[str] = []
+        visiting: Set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through stage {name!r}")
+            visiting.add(name)
+            for parent in sorted(self.upstream(name)):
+                visit(parent)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in targets or self.stages:
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            visit(name)
+        return order
+
+    # --- Fingerprints ---
+    def fingerprint(self, name: str) -> Optional[str]:
+        """
+        Fingerprint the inputs, code and parameters of a stage.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+
+        Returns
+        -------
+        str or None
+            Hex digest, or None if an input is missing.
+        """
+        stage = self.stages[name]
+        root = project_dir()
+        deps = {}
+        for dep in stage.deps:
+            path = self._resolve(dep)
+            dep_hash = self._hash_path(path)
+            if dep_hash is None:
+                return None
+            deps[_relative(path, root)] = dep_hash
+
+        payload = {
+            'deps': deps,
+            'code': self._hash_code(stage),
+            'params': _portable(stage.params, root),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def is_up_to_date(self, name: str, fingerprint: Optional[str] = None) -> bool:
+        """Whether stage `name` can be skipped because nothing changed."""
+        stage = self.stages[name]
+        fingerprint = fingerprint or self.fingerprint(name)
+        record = self._state['stages'].get(name)
+        if fingerprint is None or record is None:
+            return False
+        if record['fingerprint'] != fingerprint:
+            return False
+        return self._hash_outs(stage) == record['outs']
+
+    def status(self) -> Dict[str, str]:
+        """
+        Report whether each stage is up to date.
+
+        Stages downstream of a stale stage are reported as stale as well, since
+        running the pipeline will recompute their inputs.
+
+        Returns
+        -------
+        dict of str to str
+            Stage name to ``'up-to-date'`` or ``'stale'``.
+        """
+        status: Dict[str, str] = {}
+        for name in self.topological_order():
+            stale_upstream = any(status[up] == 'stale' for up in self.upstream(name))
+            up_to_date = not stale_upstream and self.is_up_to_date(name)
+            status[name] = 'up-to-date' if up_to_date else 'stale'
+        return status
+
+    # --- Execution ---
+    def run(
+        self,
+        targets: Optional[Iterable[str]] = None,
+        n_jobs: Optional[int] = None,
+        force: bool = False,
+        with_deps: bool = True,
+        dry_run: bool = False,
+        profile: Optional[str] = None
+    ) -> List[str]:
+        """
+        Run stale stages, executing independent stages concurrently.
+
+        Parameters
+        ----------
+        targets : iterable of str, optional
+            Stages to run (default is all stages).
+        n_jobs : int, optional
+            Number of worker processes (-1 for all CPUs). With a single worker
+            stages run in the current process.
+        force : bool, optional
+            Run the selected stages even if they are up to date.
+        with_deps : bool, optional
+            Also run the upstream stages of `targets` (default is True).
+        dry_run : bool, optional
+            Only report which stages would run.
+        profile : str, optional
+            Profile each stage in this format ('cprofile' or 'collapsed').
+
+        Returns
+        -------
+        list of str
+            Names of the stages that were run (or would run with `dry_run`).
+        """
+        targets = list(targets or self.stages)
+        # Ordering also validates the targets and rejects cycles among them
+        order = self.topological_order(targets)
+        selected = order if with_deps else [name for name in order if name in targets]
+        if dry_run:
+            status = self.status()
+            return [name for name in selected if force or status[name] == 'stale']
+
+        # Only wait on upstream stages that are part of this run
+        waits_on = {name: self.upstream(name) & set(selected) for name in selected}
+        pending = list(selected)
+        done: Set[str] = set()
+        executed: List[str] = []
+        running: Dict[Future[None], tuple[str, Optional[str]]] = {}
+        n_workers = resolve_n_jobs(n_jobs)
+        executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+
+        try:
+            while pending or running:
+                ready = [n for n in pending if waits_on[n] <= done]
+                if not ready and not running:
+                    raise PipelineError(
+                        f"Stages {', '.join(pending)} wait on stages that never run"
+                    )
+                for name in ready:
+                    pending.remove(name)
+                    fingerprint = self.fingerprint(name)
+                    if not force and self.is_up_to_date(name, fingerprint):
+                        done.add(name)
+                    elif executor is None:
+                        self._run_inline(name, fingerprint, profile)
+                        done.add(name)
+                        executed.append(name)
+                    else:
+                        future = executor.submit(run_stage, self.stages[name], profile)
+                        running[future] = (name, fingerprint)
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, fingerprint = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        raise PipelineError(f"Stage {name!r} failed: {e}") from e
+                    self._record(name, fingerprint)
+                    done.add(name)
+                    executed.append(name)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return executed
+
+    # --- DVC interoperability ---
+    @classmethod
+    def from_dvc_yaml(
+        cls,
+        filepath: Optional[PathLike] = None,
+        state_path: Optional[PathLike] = None
+    ) -> "Pipeline":
+        """
+        Build a pipeline from the stages of a ``dvc.yaml`` file.
+
+        Parameters
+        ----------
+        filepath : str or pathlib.Path, optional
+            Path to ``dvc.yaml`` (default is the one in the project root).
+        state_path : str or pathlib.Path, optional
+            See `Pipeline`.
+
+        Returns
+        -------
+        Pipeline
+            Pipeline of shell command stages.
+        """
+        import yaml
+
+        filepath = Path(filepath or project_dir('dvc.yaml'))
+        with open(filepath, encoding='utf-8') as f:
+            spec = yaml.safe_load(f) or {}
+
+        stages = []
+        for name, stage_spec in spec.get('stages', {}).items():
+            cmd = stage_spec['cmd']
+            stages.append(Stage(
+                name=name,
+                cmd=' && '.join(cmd) if isinstance(cmd, list) else cmd,
+                deps=[_dvc_path(dep) for dep in stage_spec.get('deps', [])],
+                outs=[_dvc_path(out) for out in stage_spec.get('outs', [])],
+                params={'dvc_params': stage_spec.get('params', [])},
+            ))
+        return cls(stages, state_path=state_path)
+
+    def to_dvc_yaml(self, filepath: Optional[PathLike] = None) -> Path:
+        """
+        Write the pipeline as a ``dvc.yaml`` file.
+
+        Function stages are exported as commands invoking this executor for a
+        single stage, so ``dvc repro`` and the local executor run the same code.
+
+        Parameters
+        ----------
+        filepath : str or pathlib.Path, optional
+            Destination (default is ``dvc.yaml`` in the project root).
+
+        Returns
+        -------
+        pathlib.Path
+            Path of the written file.
+        """
+        import yaml
+
+        root = project_dir()
+        stages = {}
+        for name in self.topological_order():
+            stage = self.stages[name]
+            cmd = stage.cmd or (
+                f"python -m {__package__} pipeline {name} --force --no-deps"
+            )
+            stages[name] = {
+                'cmd': cmd,
+                'deps': [_relative(self._resolve(dep), root) for dep in stage.deps],
+                'outs': [_relative(self._resolve(out), root) for out in stage.outs],
+            }
+
+        filepath = Path(filepath or root / 'dvc.yaml')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            yaml.safe_dump({'stages': stages}, f, sort_keys=False)
+        return filepath
+
+    # --- Internals ---
+    def _run_inline(
+        self,
+        name: str,
+        fingerprint: Optional[str],
+        profile: Optional[str] = None
+    ) -> None:
+        try:
+            run_stage(self.stages[name], profile)
+        except Exception as e:
+            raise PipelineError(f"Stage {name!r} failed: {e}") from e
+        self._record(name, fingerprint)
+
+    def _record(self, name: str, fingerprint: Optional[str]) -> None:
+        """Store the fingerprint and output hashes of a successful run."""
+        stage = self.stages[name]
+        outs = self._hash_outs(stage)
+        missing = [str(out) for out, digest in outs.items() if digest is None]
+        if missing:
+            raise PipelineError(f"Stage {name!r} did not produce: {', '.join(missing)}")
+        # Inputs may have been produced by this run, so fingerprint again if needed
+        self._state['stages'][name] = {
+            'fingerprint': fingerprint or self.fingerprint(name),
+            'outs': outs,
+        }
+        self._save_state()
+
+    def _hash_outs(self, stage: Stage) -> Dict[str, Optional[str]]:
+        root = project_dir()
+        return {
+            _relative(self._resolve(out), root): self._hash_path(self._resolve(out))
+            for out in stage.outs
+        }
+
+    def _hash_path(self, path: Path) -> Optional[str]:
+        """
+        Hash a file or directory, reusing cached digests of unchanged files.
+
+        Files are identified by size and modification time, so large inputs
+        are only read again after they change.
+        """
+        if path.is_dir():
+            digest = hashlib.sha256()
+            for child in sorted(p for p in path.rglob('*') if p.is_file()):
+                digest.update(str(child.relative_to(path)).encode())
+                digest.update(str(self._hash_path(child)).encode())
+            return digest.hexdigest()
+        if not path.is_file():
+            return None
+
+        stat = path.stat()
+        key = str(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        cached = self._state['files'].get(key)
+        if cached is not None and cached['signature'] == signature:
+            return str(cached['hash'])
+        file_hash = hash_file(path)
+        self._state['files'][key] = {'signature': signature, 'hash': file_hash}
+        return file_hash
+
+    def _hash_code(self, stage: Stage) -> str:
+        """
+        Hash the command or function of a stage and the code it runs.
+
+        A function usually calls code from other modules of its package (data
+        loaders, feature functions, model helpers), so the sources of the
+        whole top-level package defining it are hashed, along with the `code`
+        paths of the stage.
+        """
+        root = project_dir()
+        digest = hashlib.sha256()
+        digest.update(str(stage.cmd or stage.func).encode())
+        if stage.func is not None:
+            # Only the contents, as the package may be installed anywhere
+            package_path = _package_path(resolve_callable(stage.func))
+            if package_path is not None:
+                digest.update(str(self._hash_sources(package_path)).encode())
+        for source in stage.code:
+            path = self._resolve(source)
+            digest.update(_relative(path, root).encode())
+            digest.update(str(self._hash_sources(path)).encode())
+        return digest.hexdigest()
+
+    def _hash_sources(self, path: Path) -> Optional[str]:
+        """Hash a source file or directory, ignoring compiled bytecode."""
+        if not path.is_dir():
+            return self._hash_path(path)
+        digest = hashlib.sha256()
+        for child in sorted(p for p in path.rglob('*') if p.is_file()):
+            if '__pycache__' in child.parts or child.suffix in ('.pyc', '.pyo'):
+                continue
+            digest.update(child.relative_to(path).as_posix().encode())
+            digest.update(str(self._hash_path(child)).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _resolve(path: PathLike) -> Path:
+        path = Path(path)
+        return path if path.is_absolute() else project_dir(path)
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if self.state_path.is_file():
+            with open(self.state_path, encoding='utf-8') as f:
+                state: Dict[str, Dict[str, Any]] = json.load(f)
+            return state
+        return {'stages': {}, 'files': {}}
+
+    def _save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+
+def _dvc_path(entry: Union[str, Dict[str, Any]]) -> str:
+    """Extract the path from a ``dvc.yaml`` dep/out entry (str or mapping)."""
+    return entry if isinstance(entry, str) else next(iter(entry))
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _portable(value: Any, root: Path) -> Any:
+    """Replace absolute paths inside the project by project-relative ones."""
+    if isinstance(value, dict):
+        return {key: _portable(item, root) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_portable(item, root) for item in value]
+    if isinstance(value, (str, Path)) and Path(value).is_absolute():
+        return _relative(Path(value), root)
+    return value
+
+
+def _package_path(func: Callable[..., Any]) -> Optional[Path]:
+    """Source directory of the top-level package defining `func`, or its file."""
+    module = inspect.getmodule(func)
+    if module is None:
+        return None
+    package = importlib.import_module(module.__name__.partition('.')[0])
+    source_file = getattr(package, '__file__', None)
+    if source_file is None:
+        return None
+    source = Path(source_file)
+    return source.parent if source.name == '__init__.py' else source
+
+
+def default_pipeline() -> Pipeline:
+    """
+    Build the default project pipeline: make-dataset, build-features, train.
+
+    Edit the stages (paths, columns, model parameters) to fit the project.
+
+    Returns
+    -------
+    Pipeline
+        The project pipeline.
+    """
+    raw_data = data_raw_dir('dataset.csv')
+    dataset = data_interim_dir('dataset.parquet')
+    features = data_processed_dir('features.parquet')
+    model = models_dir('model.joblib')
+
+    return Pipeline([
+        Stage(
+            name='make_dataset',
+            func=f'{__package__}.data.make_dataset:make_dataset',
+            deps=[raw_data],
+            outs=[dataset],
+            params={'input_filepath': raw_data, 'output_filepath': dataset},
+        ),
+        Stage(
+            name='build_features',
+            func=f'{__package__}.features.build_features:build_features_file',
+            deps=[dataset],
+            outs=[features],
+            params={'input_filepath': dataset, 'output_filepath': features},
+        ),
+        Stage(
+            name='train',
+            func=f'{__package__}.models.train_model:train_model',
+            deps=[features],
+            outs=[model],
+            params={'data_path': features, 'target': 'target', 'model_path': model},
+        ),
+    ])
@@ -0,0 +1,10 @@
+"""
+Helper utilities shared across the project.
+"""
+
+from {{ cookiecutter.module_name }}.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["backends", "lazy", "parallel", "paths", "profiling", "shared", "sketches"],
+)
@@ -0,0 +1,162 @@
+"""
+Pluggable DataFrame backends for the data loaders and feature functions.
+
+The loaders in `data.data_loader` and the stateless feature functions in
+`features.feature_engineering` take and return pandas objects, but can run
+their work on another engine:
+
+- 'pandas' (default): the reference implementation.
+- 'polars': multi-threaded, lazily optimized queries.
+- 'duckdb': vectorized SQL that spills to disk for data larger than memory.
+
+The backend is chosen per call with the ``dataframe_backend`` argument, for a
+block of code with `use_backend`, or globally with the
+``data.dataframe_backend`` setting (e.g.
+``{{ cookiecutter.module_name.upper() }}_DATA__DATAFRAME_BACKEND=polars``). Polars and DuckDB are optional
+dependencies; selecting one that is not installed raises an ImportError.
+
+Results are converted back to pandas through Arrow, so every backend returns
+the same columns, dtypes and values (up to floating point summation order).
+
+Example
+-------
+>>> with use_backend('polars'):
+...     df = load_csv(data_raw_dir('input.csv'))
+...     df = create_group_features(df, ['store'], ['sales'], ['mean', 'max'])
+"""
+
+import contextvars
+import importlib.util
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+
+# Supported backends, pandas first as the reference implementation
+BACKENDS = ("pandas", "polars", "duckdb")
+
+_backend_override: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "dataframe_backend", default=None
+)
+
+
+def backend_available(name: str) -> bool:
+    """Whether the package of backend `name` is installed."""
+    return name == "pandas" or importlib.util.find_spec(name) is not None
+
+
+def available_backends() -> List[str]:
+    """Names of the supported backends that are installed."""
+    return [name for name in BACKENDS if backend_available(name)]
+
+
+def _check_backend(name: str) -> str:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DataFrame backend: {name!r}, expected one of {BACKENDS}")
+    if not backend_available(name):
+        raise ImportError(
+            f"The {name} DataFrame backend requires the '{name}' package "
+            f"(pip install {name})"
+        )
+    return name
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Resolve the backend of a call.
+
+    Parameters
+    ----------
+    name : str, optional
+        Backend requested by the call. Defaults to the innermost `use_backend`
+        block, then to the ``data.dataframe_backend`` setting.
+
+    Returns
+    -------
+    str
+        One of `BACKENDS`.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown.
+    ImportError
+        If the backend package is not installed.
+    """
+    if name is None:
+        name = _backend_override.get()
+    if name is None:
+        from {{ cookiecutter.module_name }}.config import get_settings
+
+        name = get_settings().data.dataframe_backend
+    return _check_backend(name)
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[str]:
+    """
+    Run the loaders and feature functions of a block on backend `name`.
+
+    Calls passing ``dataframe_backend`` explicitly are not affected.
+
+    Parameters
+    ----------
+    name : str
+        One of `BACKENDS`.
+
+    Yields
+    ------
+    str
+        The backend name.
+    """
+    token = _backend_override.set(_check_backend(name))
+    try:
+        yield name
+    finally:
+        _backend_override.reset(token)
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a column name for use in DuckDB SQL."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def quote_literal(value: str) -> str:
+    """Quote a string (e.g. a file path) as a DuckDB SQL literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def duckdb_to_arrow(relation: Any) -> Any:
+    """Fetch a DuckDB relation as an Arrow table, across DuckDB versions."""
+    fetch = getattr(relation, "to_arrow_table", None) or relation.fetch_arrow_table
+    return fetch()
+
+
+def arrow_to_pandas(table: Any, index: Any = None, dtype_backend: Optional[str] = None) -> Any:
+    """
+    Convert an Arrow table produced by a backend to a pandas DataFrame.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        Result of a Polars (``to_arrow``) or DuckDB (`duckdb_to_arrow`) query.
+    index : pandas.Index, optional
+        Index of the result, e.g. the index of the input frame.
+    dtype_backend : str, optional
+        'numpy_nullable' or 'pyarrow' as in pandas readers; by default the
+        NumPy dtypes pandas would infer.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Converted table.
+    """
+    import pandas as pd
+
+    if dtype_backend == "pyarrow":
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    else:
+        df = table.to_pandas()
+        if dtype_backend == "numpy_nullable":
+            df = df.convert_dtypes(dtype_backend="numpy_nullable")
+    if index is not None:
+        df.index = index
+    return df
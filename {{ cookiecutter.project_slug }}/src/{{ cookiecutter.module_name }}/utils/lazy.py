@@ -0,0 +1,78 @@
+"""
+Helpers for lazily loading submodules and attributes (PEP 562).
+
+Heavy dependencies such as pandas, scikit-learn, matplotlib or MLflow take
+seconds to import. Packages in this project declare their public names with
+`attach` so that importing a package (for example to run the CLI) does not
+import any of those dependencies until a name is actually accessed.
+
+Example
+-------
+>>> # In a package ``__init__.py``
+>>> __getattr__, __dir__, __all__ = attach(
+...     __name__,
+...     submodules=["data_loader"],
+...     attrs={"data_loader": ["load_csv"]},
+... )
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def attach(
+    package_name: str,
+    submodules: Optional[Iterable[str]] = None,
+    attrs: Optional[Dict[str, List[str]]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """
+    Build module-level ``__getattr__``, ``__dir__`` and ``__all__`` for lazy loading.
+
+    Parameters
+    ----------
+    package_name : str
+        Name of the package the names are attached to (usually ``__name__``).
+    submodules : iterable of str, optional
+        Submodules that are imported on first access, e.g. ``package.data``.
+    attrs : dict of str to list of str, optional
+        Mapping of submodule name to the attributes it exports. Accessing
+        ``package.<attr>`` imports the submodule and returns the attribute.
+
+    Returns
+    -------
+    __getattr__ : callable
+        Module-level attribute hook resolving the lazy names.
+    __dir__ : callable
+        Module-level ``dir()`` hook listing the lazy names.
+    __all__ : list of str
+        Sorted list of all public names.
+    """
+    submodule_set = set(submodules or [])
+    attr_to_module = {
+        attr: module
+        for module, names in (attrs or {}).items()
+        for attr in names
+    }
+    __all__ = sorted(submodule_set | set(attr_to_module))
+
+    def __getattr__(name: str) -> Any:
+        if name in submodule_set:
+            value = importlib.import_module(f"{package_name}.{name}")
+        elif name in attr_to_module:
+            module = importlib.import_module(
+                f"{package_name}.{attr_to_module[name]}"
+            )
+            value = getattr(module, name)
+        else:
+            raise AttributeError(
+                f"module {package_name!r} has no attribute {name!r}"
+            )
+        # Cache on the package so later lookups bypass this hook
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return list(__all__)
+
+    return __getattr__, __dir__, __all__
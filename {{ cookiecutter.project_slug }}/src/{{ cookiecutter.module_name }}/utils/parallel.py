@@ -0,0 +1,87 @@
+"""
+Helpers for running work in parallel.
+
+The functions here are dependency-free so that they can be used from the CLI
+and from any stage without importing the data science stack.
+"""
+
+import os
+import re
+from typing import Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Binary multiples of the size suffixes accepted by `parse_size`
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def resolve_n_jobs(n_jobs: Optional[int] = None) -> int:
+    """
+    Resolve a scikit-learn style ``n_jobs`` value to a concrete worker count.
+
+    Parameters
+    ----------
+    n_jobs : int, optional
+        Number of workers. ``None`` means 1, ``-1`` means all CPUs, ``-2`` all
+        CPUs but one, and so on.
+
+    Returns
+    -------
+    int
+        Number of workers, at least 1.
+    """
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    cpu_count = os.cpu_count() or 1
+    if n_jobs < 0:
+        return max(cpu_count + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def iter_slices(sequence: Sequence[T], chunk_size: int) -> Iterator[Sequence[T]]:
+    """
+    Yield consecutive slices of at most `chunk_size` items.
+
+    Parameters
+    ----------
+    sequence : Sequence
+        Any sliceable sequence, e.g. a list, a NumPy array or a DataFrame
+        (sliced by row position).
+    chunk_size : int
+        Maximum number of items per slice.
+
+    Yields
+    ------
+    Sequence
+        Consecutive slices of the input.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    for start in range(0, len(sequence), chunk_size):
+        yield sequence[start:start + chunk_size]
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a human readable size such as ``512M`` or ``4GB`` into bytes.
+
+    Parameters
+    ----------
+    value : str
+        Size with an optional K, M, G or T suffix (binary multiples).
+
+    Returns
+    -------
+    int
+        Size in bytes.
+
+    Raises
+    ------
+    ValueError
+        If `value` is not a size.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*", value.upper())
+    if match is None:
+        raise ValueError(f"Invalid size: {value!r}")
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit])
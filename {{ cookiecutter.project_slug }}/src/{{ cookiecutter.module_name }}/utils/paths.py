@@ -8,17 +8,69 @@ This enables consistent and portable path handling across the project, ensuring
 relative paths are resolved reliably, regardless of the script's location within the 
 project structure.
 
+The project root is resolved once and cached, so building a path costs about as much
+as a plain `Path.joinpath`. The root can be overridden with the
+`{{ cookiecutter.module_name.upper() }}_PROJECT_ROOT` environment variable (e.g. in containers where the
+root markers are not shipped) or with `set_project_root`, and `reset_project_root`
+clears the cached value (e.g. between tests).
+
 Dependencies:
 -------------
 - pyprojroot: Detects the root of the project.
 - pathlib: Provides an object-oriented interface for handling filesystem paths.
 """
 
+import os
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Union
+from typing import Callable, Dict, Iterable, List, Optional, Union
 
 from pyprojroot import here
 
+# Environment variable overriding the detected project root
+PROJECT_ROOT_ENV_VAR = "{{ cookiecutter.module_name.upper() }}_PROJECT_ROOT"
+
+_project_root: Optional[Path] = None
+
+
+def get_project_root() -> Path:
+    """
+    Return the project root directory, resolving and caching it on first use.
+
+    The root is taken from the `PROJECT_ROOT_ENV_VAR` environment variable if it
+    is set, and otherwise detected with `pyprojroot.here()`.
+
+    Returns
+    -------
+    Path
+        The project root directory.
+    """
+    global _project_root
+    if _project_root is None:
+        env_root = os.environ.get(PROJECT_ROOT_ENV_VAR)
+        _project_root = Path(env_root).resolve() if env_root else here()
+    return _project_root
+
+
+def set_project_root(path: Union[str, Path]) -> None:
+    """
+    Override the project root used by all directory functions.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        New project root directory.
+    """
+    global _project_root
+    _project_root = Path(path).resolve()
+
+
+def reset_project_root() -> None:
+    """
+    Clear the cached project root so that it is resolved again on next use.
+    """
+    global _project_root
+    _project_root = None
+
 
 def make_dir_function(dir_name: Union[str, Iterable[str]]) -> Callable[..., Path]:
     """
@@ -39,11 +91,12 @@ def make_dir_function(dir_name: Union[str, Iterable[str]]) -> Callable[..., Path
         A function that, when called, returns the full path relative to the project directory.
         The returned function can accept additional arguments to further extend the path.
     """
+    # Normalize once so that each call is a single joinpath on the cached root
+    parts = (dir_name,) if isinstance(dir_name, str) else tuple(dir_name)
+
     def dir_path(*args: str) -> Path:
         # Join the dir_name and any additional arguments as a path relative to the project root
-        if isinstance(dir_name, str):
-            return here().joinpath(dir_name, *args)
-        return here().joinpath(*dir_name, *args)
+        return get_project_root().joinpath(*parts, *args)
 
     return dir_path
 
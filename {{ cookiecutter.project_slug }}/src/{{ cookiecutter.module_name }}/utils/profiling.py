@@ -0,0 +1,366 @@
+"""
+Lightweight instrumentation of the pipeline hot paths.
+
+A span measures one unit of work: wall time, CPU time, the increase of the
+process peak RSS and the number of rows processed. Spans are appended as JSON
+lines to ``logs/<profiling.spans_file>`` and nest, so every record names its
+parent span.
+
+Spans are disabled by default; enable them with the ``profiling.spans``
+setting (e.g. ``{{ cookiecutter.module_name.upper() }}_PROFILING__SPANS=true``), with `enable_spans`, or with the
+CLI ``--profile`` option. When disabled, an instrumented function costs one
+flag check on top of the call.
+
+For whole-stage profiles, `profile_call` runs a function under cProfile or
+under a sampling profiler writing collapsed stacks that can be rendered with
+``flamegraph.pl`` or speedscope.
+
+Example
+-------
+>>> @instrument()
+... def load(path):
+...     ...
+>>> with span('custom_step') as current:
+...     current.rows = len(df)
+"""
+
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# None until resolved from the settings on first use
+_enabled: Optional[bool] = None
+_spans_path: Optional[Path] = None
+_write_lock = threading.Lock()
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+try:
+    import resource
+
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    _RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+    def _peak_rss() -> Optional[int]:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+except ImportError:  # Windows
+
+    def _peak_rss() -> Optional[int]:
+        return None
+
+
+class Span:
+    """
+    Measurements of a single unit of work.
+
+    Attributes
+    ----------
+    name : str
+        Span name, by default the qualified name of the instrumented function.
+    parent : str or None
+        Name of the enclosing span.
+    rows : int or None
+        Number of rows processed, set by the instrumented code.
+    """
+
+    def __init__(self, name: str, parent: Optional["Span"] = None) -> None:
+        self.name = name
+        self.parent = parent
+        self.rows: Optional[int] = None
+        self.record: Dict[str, Any] = {}
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_rss = _peak_rss()
+        self._timestamp = time.time()
+
+    def finish(self, status: str = "ok") -> Dict[str, Any]:
+        """Stop the measurements and return the span record."""
+        wall_time = time.perf_counter() - self._start
+        end_rss = _peak_rss()
+        rss_delta = None
+        if end_rss is not None and self._start_rss is not None:
+            rss_delta = end_rss - self._start_rss
+
+        self.record = {
+            "name": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "timestamp": self._timestamp,
+            "pid": os.getpid(),
+            "status": status,
+            "wall_time_s": wall_time,
+            "cpu_time_s": time.process_time() - self._start_cpu,
+            "peak_rss_delta_bytes": rss_delta,
+            "rows": self.rows,
+            "rows_per_s": self.rows / wall_time if self.rows and wall_time else None,
+        }
+        return self.record
+
+
+def spans_enabled() -> bool:
+    """Whether spans are recorded, resolving the setting on first use."""
+    global _enabled
+    if _enabled is None:
+        from {{ cookiecutter.module_name }}.config import get_settings
+
+        _enabled = get_settings().profiling.spans
+    return _enabled
+
+
+def enable_spans(path: Optional[Path] = None) -> None:
+    """
+    Record spans from now on.
+
+    Parameters
+    ----------
+    path : pathlib.Path, optional
+        JSON lines file to append spans to (default is
+        ``logs/<profiling.spans_file>``).
+    """
+    global _enabled, _spans_path
+    _enabled = True
+    _spans_path = path
+
+
+def disable_spans() -> None:
+    """Stop recording spans."""
+    global _enabled
+    _enabled = False
+
+
+def reset_spans() -> None:
+    """Forget `enable_spans`/`disable_spans` and use the settings again."""
+    global _enabled, _spans_path
+    _enabled = None
+    _spans_path = None
+
+
+def _write_record(record: Dict[str, Any]) -> None:
+    global _spans_path
+    if _spans_path is None:
+        from {{ cookiecutter.module_name }}.config import get_settings
+        from {{ cookiecutter.module_name }}.utils.paths import logs_dir
+
+        _spans_path = logs_dir(get_settings().profiling.spans_file)
+    line = json.dumps(record, default=str) + "\n"
+    with _write_lock:
+        _spans_path.parent.mkdir(parents=True, exist_ok=True)
+        # Single appends of one line are atomic enough for concurrent workers
+        with open(_spans_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+@contextmanager
+def span(name: str, rows: Optional[int] = None) -> Iterator[Span]:
+    """
+    Measure the enclosed block and write it as a span.
+
+    Parameters
+    ----------
+    name : str
+        Span name.
+    rows : int, optional
+        Number of rows processed; can also be set on the yielded span.
+
+    Yields
+    ------
+    Span
+        The running span. When spans are disabled, nothing is written.
+    """
+    current = Span(name, parent=_current_span.get())
+    current.rows = rows
+    token = _current_span.set(current)
+    status = "ok"
+    try:
+        yield current
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        _current_span.reset(token)
+        record = current.finish(status)
+        if spans_enabled():
+            _write_record(record)
+
+
+def count_rows(value: Any) -> Optional[int]:
+    """
+    Count the rows of a function result or argument.
+
+    DataFrames, Series and arrays count their first dimension and lists their
+    length; tuples (e.g. ``(df, scaler)``) count their first element. Other
+    objects, such as models, are not counted.
+
+    Parameters
+    ----------
+    value : Any
+        Object to count.
+
+    Returns
+    -------
+    int or None
+        Number of rows, or None if it cannot be determined.
+    """
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    if isinstance(value, list):
+        return len(value)
+    shape = getattr(value, "shape", None)
+    if isinstance(shape, tuple) and shape:
+        return int(shape[0])
+    return None
+
+
+def instrument(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorate a function so that each call is recorded as a span.
+
+    Rows are counted from the result, falling back to the first argument
+    (e.g. ``y_true`` for metrics).
+
+    Parameters
+    ----------
+    name : str, optional
+        Span name (default is ``<module>.<qualified name>`` of the function).
+
+    Returns
+    -------
+    callable
+        Decorator.
+    """
+    def decorator(func: F) -> F:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Fast path: a single flag check when spans are disabled
+            if _enabled is False or (_enabled is None and not spans_enabled()):
+                return func(*args, **kwargs)
+            with span(span_name) as current:
+                result = func(*args, **kwargs)
+                current.rows = count_rows(result)
+                if current.rows is None and args:
+                    current.rows = count_rows(args[0])
+            return result
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+class StackSampler:
+    """
+    Sampling profiler collecting collapsed stacks of the calling thread.
+
+    A background thread samples the stack of the profiled thread every
+    `interval` seconds. The result uses the collapsed stack format
+    (``frame;frame;frame count`` per line) read by ``flamegraph.pl`` and
+    speedscope.
+
+    Parameters
+    ----------
+    interval : float, optional
+        Seconds between samples (default is 0.005).
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "StackSampler":
+        self._thread_id = threading.get_ident()
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            frames: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def write(self, filepath: Path) -> None:
+        """Write the collapsed stacks to `filepath`."""
+        with open(filepath, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def profile_call(
+    func: Callable[..., Any],
+    *args: Any,
+    name: str,
+    output_format: str = "cprofile",
+    output_dir: Optional[Path] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Call a function under a profiler and write the profile to ``logs/``.
+
+    Parameters
+    ----------
+    func : callable
+        Function to profile.
+    *args
+        Positional arguments for `func`.
+    name : str
+        Profile name, used as the file stem (e.g. the pipeline stage name).
+    output_format : str, optional
+        'cprofile' writes ``<name>.prof`` for pstats/snakeviz; 'collapsed'
+        writes flamegraph-ready ``<name>.folded`` stacks.
+    output_dir : pathlib.Path, optional
+        Output directory (default is ``logs_dir()``).
+    **kwargs
+        Keyword arguments for `func`.
+
+    Returns
+    -------
+    Any
+        The result of `func`.
+    """
+    if output_dir is None:
+        from {{ cookiecutter.module_name }}.utils.paths import logs_dir
+
+        output_dir = logs_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if output_format == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            profiler.dump_stats(output_dir / f"{name}.prof")
+    if output_format == "collapsed":
+        from {{ cookiecutter.module_name }}.config import get_settings
+
+        sampler = StackSampler(get_settings().profiling.sample_interval)
+        try:
+            with sampler:
+                return func(*args, **kwargs)
+        finally:
+            sampler.write(output_dir / f"{name}.folded")
+    raise ValueError(f"Unsupported profile format: {output_format}")
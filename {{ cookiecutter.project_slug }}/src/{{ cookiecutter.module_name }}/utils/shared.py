@@ -0,0 +1,237 @@
+"""
+Zero-copy handoff of DataFrames and NumPy arrays to worker processes.
+
+Passing a DataFrame to a process pool pickles it and copies it into every
+worker, so memory grows with the worker count. Instead, `share` publishes the
+data once as a file in shared memory (``/dev/shm`` where available): DataFrames
+as an Arrow IPC file, arrays as ``.npy``. Only a small picklable `SharedHandle`
+is sent to the workers, which memory-map the file and get read-only views;
+the pages are shared by all processes.
+
+Published files are reference-counted in the publishing process: `share`
+takes the first reference, `retain` and `release` add and drop references,
+and the file is removed when the count drops to zero (or at exit). Workers
+that still have the data mapped keep their views valid until they drop them.
+
+Example
+-------
+>>> with shared(df) as handle:
+...     results = list(executor.map(score_rows, [handle] * n, ranges))
+>>> def score_rows(handle, rows):
+...     df = handle.load()  # zero-copy, read-only
+"""
+
+import atexit
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Shared memory filesystem, falling back to the temporary directory elsewhere
+SHM_DIR = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())
+
+_lock = threading.Lock()
+_refcounts: Dict[str, int] = {}
+# Function and arguments of `map_shared_slices`, set once per worker process
+_worker_task: Optional[Tuple[Callable[..., Any], Tuple[Any, ...]]] = None
+
+
+@dataclass(frozen=True)
+class SharedHandle:
+    """
+    Picklable reference to data published with `share`.
+
+    Attributes
+    ----------
+    path : str
+        Shared memory file holding the data.
+    kind : str
+        'frame' for a DataFrame, 'array' for a NumPy array.
+    """
+
+    path: str
+    kind: str
+
+    def load(self) -> Union[pd.DataFrame, np.ndarray]:
+        """
+        Map the shared data into this process.
+
+        Numeric columns and arrays are read-only views of the shared pages;
+        string columns are materialized by Arrow.
+
+        Returns
+        -------
+        pandas.DataFrame or numpy.ndarray
+            The published data.
+        """
+        if self.kind == "array":
+            return np.load(self.path, mmap_mode="r")
+
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        with pa.memory_map(self.path, "r") as source:
+            table = ipc.open_file(source).read_all()
+        # split_blocks keeps one block per column, so columns stay zero-copy
+        return table.to_pandas(split_blocks=True)
+
+
+def share(data: Union[pd.DataFrame, np.ndarray], directory: Optional[Path] = None) -> SharedHandle:
+    """
+    Publish a DataFrame or array to shared memory.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or numpy.ndarray
+        Data to publish. It is written once; later changes are not shared.
+    directory : pathlib.Path, optional
+        Directory of the shared file (default is `SHM_DIR`).
+
+    Returns
+    -------
+    SharedHandle
+        Handle holding one reference, to be dropped with `release`.
+    """
+    directory = directory or SHM_DIR
+    stem = f"shared-{os.getpid()}-{uuid.uuid4().hex}"
+
+    if isinstance(data, np.ndarray):
+        path = directory / f"{stem}.npy"
+        np.save(path, np.ascontiguousarray(data), allow_pickle=False)
+        handle = SharedHandle(str(path), "array")
+    elif isinstance(data, pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        path = directory / f"{stem}.arrow"
+        table = pa.Table.from_pandas(data, preserve_index=None)
+        with pa.OSFile(str(path), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        handle = SharedHandle(str(path), "frame")
+    else:
+        raise ValueError(f"Cannot share objects of type {type(data).__name__}")
+
+    with _lock:
+        _refcounts[handle.path] = 1
+    return handle
+
+
+def retain(handle: SharedHandle) -> SharedHandle:
+    """Add a reference to published data, e.g. for a second consumer."""
+    with _lock:
+        if handle.path not in _refcounts:
+            raise ValueError(f"Shared data was already released: {handle.path}")
+        _refcounts[handle.path] += 1
+    return handle
+
+
+def release(handle: SharedHandle) -> None:
+    """Drop a reference, removing the shared file when none are left."""
+    with _lock:
+        count = _refcounts.get(handle.path, 0) - 1
+        if count > 0:
+            _refcounts[handle.path] = count
+            return
+        _refcounts.pop(handle.path, None)
+    Path(handle.path).unlink(missing_ok=True)
+
+
+@contextmanager
+def shared(data: Union[pd.DataFrame, np.ndarray]) -> Iterator[SharedHandle]:
+    """
+    Publish data for the duration of a block.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or numpy.ndarray
+        Data to publish.
+
+    Yields
+    ------
+    SharedHandle
+        Handle to pass to the workers.
+    """
+    handle = share(data)
+    try:
+        yield handle
+    finally:
+        release(handle)
+
+
+def resolve(data: Any) -> Any:
+    """Load `data` if it is a `SharedHandle`, otherwise return it unchanged."""
+    return data.load() if isinstance(data, SharedHandle) else data
+
+
+def _init_worker(func: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+    global _worker_task
+    _worker_task = (func, args)
+
+
+def _apply_to_slice(handle: SharedHandle, start: int, stop: int) -> Any:
+    assert _worker_task is not None
+    func, args = _worker_task
+    data = handle.load()
+    rows = data.iloc[start:stop] if isinstance(data, pd.DataFrame) else data[start:stop]
+    return func(rows, *args)
+
+
+def map_shared_slices(
+    func: Callable[..., Any],
+    data: Union[pd.DataFrame, np.ndarray],
+    chunk_size: int,
+    n_workers: int,
+    *args: Any
+) -> List[Any]:
+    """
+    Apply a function to row slices of `data` in worker processes.
+
+    `data` is published once with `share` instead of being pickled per task,
+    and `func` and `args` (e.g. a fitted model) are sent once per worker.
+
+    Parameters
+    ----------
+    func : callable
+        Picklable function called as ``func(rows, *args)``.
+    data : pandas.DataFrame or numpy.ndarray
+        Data sliced by row position.
+    chunk_size : int
+        Number of rows per slice.
+    n_workers : int
+        Number of worker processes.
+    *args
+        Additional arguments for `func`.
+
+    Returns
+    -------
+    list
+        Results of `func`, in row order.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    with shared(data) as handle, ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(func, args)
+    ) as executor:
+        futures = [
+            executor.submit(_apply_to_slice, handle, start, start + chunk_size)
+            for start in range(0, len(data), chunk_size)
+        ]
+        return [future.result() for future in futures]
+
+
+@atexit.register
+def _release_all() -> None:
+    # Forked workers inherit the table but must not remove the parent's files
+    for path in list(_refcounts):
+        if Path(path).name.startswith(f"shared-{os.getpid()}-"):
+            Path(path).unlink(missing_ok=True)
+    _refcounts.clear()
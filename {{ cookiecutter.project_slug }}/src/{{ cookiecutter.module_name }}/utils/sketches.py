@@ -0,0 +1,451 @@
+"""
+Mergeable streaming sketches of column values.
+
+Each sketch summarizes a stream of values in bounded memory, is updated with
+whole NumPy arrays or pandas Series (vectorized, no Python loop over values),
+and can be merged with a sketch of the same kind built on other data, e.g. by
+another worker. Merging the sketches of disjoint chunks gives (up to the
+sketch error) the sketch of their union:
+
+- `Moments`: count, sum, min/max, mean, variance, skewness and kurtosis,
+  exact up to floating point.
+- `HyperLogLog`: approximate number of distinct values (about 0.8% relative
+  error with the default precision).
+- `QuantileSketch`: KLL sketch of approximate quantiles and CDF values (rank
+  error of about 1% with the default size).
+- `FrequentItems`: Misra-Gries summary of the most frequent values.
+
+All sketches are picklable, so they can be built in worker processes.
+
+Example
+-------
+>>> left, right = QuantileSketch(), QuantileSketch()
+>>> left.update(chunk_a['price'])
+>>> right.update(chunk_b['price'])
+>>> left.merge(right).quantile([0.5, 0.99])
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.Series, Sequence[Any]]
+
+# Default precision of `HyperLogLog`: 2**14 registers, 16 KiB
+DEFAULT_HLL_PRECISION = 14
+# Default size of `QuantileSketch`
+DEFAULT_QUANTILE_K = 200
+# Default number of counters of `FrequentItems`
+DEFAULT_FREQUENT_CAPACITY = 100
+
+
+def hash_values(values: ArrayLike) -> np.ndarray:
+    """
+    Hash values to uint64, consistently across chunks.
+
+    Numbers are hashed as float64, so that e.g. ``3`` in an integer chunk and
+    ``3.0`` in a chunk with missing values get the same hash; strings hash the
+    same whether stored as object, string or Arrow dtype.
+
+    Parameters
+    ----------
+    values : array-like
+        Non-missing values.
+
+    Returns
+    -------
+    numpy.ndarray
+        One uint64 hash per value.
+    """
+    series = pd.Series(values, copy=False)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        series = series.astype('float64')
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def _as_float_array(values: ArrayLike) -> np.ndarray:
+    """Non-missing values as a float64 array."""
+    array = pd.Series(values, copy=False).to_numpy(dtype='float64', na_value=np.nan)
+    return array[~np.isnan(array)]
+
+
+class Moments:
+    """
+    Count, extrema and central moments of numerical values.
+
+    Batches are reduced with NumPy and combined with the pairwise update
+    formulas of Pébay (2008), which are exact and numerically stable.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: ArrayLike) -> 'Moments':
+        """Add values; missing values are ignored."""
+        x = _as_float_array(values)
+        if not len(x):
+            return self
+        batch = Moments()
+        batch.count = len(x)
+        batch.mean = float(x.mean())
+        d = x - batch.mean
+        d2 = d * d
+        batch.m2 = float(d2.sum())
+        batch.m3 = float((d2 * d).sum())
+        batch.m4 = float((d2 * d2).sum())
+        batch.min = float(x.min())
+        batch.max = float(x.max())
+        return self.merge(batch)
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        """Combine with the moments of other values, in place."""
+        if not other.count:
+            return self
+        if not self.count:
+            self.__dict__.update(other.__dict__)
+            return self
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        m2 = self.m2 + other.m2 + delta * delta_n * na * nb
+        m3 = (
+            self.m3 + other.m3
+            + delta * delta_n ** 2 * na * nb * (na - nb)
+            + 3 * delta_n * (na * other.m2 - nb * self.m2)
+        )
+        m4 = (
+            self.m4 + other.m4
+            + delta * delta_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+            + 6 * delta_n ** 2 * (na * na * other.m2 + nb * nb * self.m2)
+            + 4 * delta_n * (na * other.m3 - nb * self.m3)
+        )
+        self.mean += delta_n * nb
+        self.count, self.m2, self.m3, self.m4 = n, m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def sum(self) -> float:
+        return self.mean * self.count
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (``ddof=1``, as in pandas)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.count > 1 else math.nan
+
+    @property
+    def skewness(self) -> float:
+        """Bias-corrected sample skewness, as `pandas.Series.skew`."""
+        n = self.count
+        if n < 3 or self.m2 == 0:
+            return math.nan
+        g1 = math.sqrt(n) * self.m3 / self.m2 ** 1.5
+        return g1 * math.sqrt(n * (n - 1)) / (n - 2)
+
+    @property
+    def kurtosis(self) -> float:
+        """Bias-corrected excess kurtosis, as `pandas.Series.kurt`."""
+        n = self.count
+        if n < 4 or self.m2 == 0:
+            return math.nan
+        g2 = n * self.m4 / self.m2 ** 2 - 3
+        return ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """Summary statistics, with None where undefined."""
+        values = {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+            'std': self.std,
+            'skewness': self.skewness,
+            'kurtosis': self.kurtosis,
+        }
+        if not self.count:
+            values.update(min=math.nan, max=math.nan, mean=math.nan)
+        return {key: None if math.isnan(value) else value for key, value in values.items()}
+
+
+class HyperLogLog:
+    """
+    HyperLogLog estimate of the number of distinct values.
+
+    Parameters
+    ----------
+    precision : int, optional
+        Number of index bits p, using ``2**p`` one-byte registers. The
+        relative standard error is about ``1.04 / sqrt(2**p)``.
+    """
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: ArrayLike) -> 'HyperLogLog':
+        """Add non-missing values."""
+        return self.update_hashes(hash_values(values))
+
+    def update_hashes(self, hashes: np.ndarray) -> 'HyperLogLog':
+        """Add values given as their `hash_values` hashes."""
+        if not len(hashes):
+            return self
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Position of the leftmost 1 bit in the remaining 64 - p bits; float64
+        # represents them exactly, so log2 gives the bit length
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        nonzero = rest != 0
+        bit_length[nonzero] = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64) + 1
+        rank = (64 - p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Combine with the sketch of other values, in place."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class QuantileSketch:
+    """
+    KLL sketch of approximate quantiles of numerical values.
+
+    Values are kept in levels of sorted compactors; a full level keeps every
+    other value (at a random offset) at the next level with twice the weight.
+    Memory is O(k log(n / k)) for n values.
+
+    Parameters
+    ----------
+    k : int, optional
+        Size of the top compactor; the rank error is about ``1.7 / k``.
+    seed : int, optional
+        Seed of the random compaction offsets.
+    """
+
+    def __init__(self, k: int = DEFAULT_QUANTILE_K, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError(f"k must be at least 8, got {k}")
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        # Compact the lowest full level until the sketch fits its total capacity
+        while sum(map(len, self.levels)) > sum(map(self._capacity, range(len(self.levels)))):
+            level = next(
+                level for level in range(len(self.levels))
+                if len(self.levels[level]) >= self._capacity(level)
+            )
+            values = np.sort(self.levels[level])
+            # An odd value out stays at its level
+            keep = values[-1:] if len(values) % 2 else values[:0]
+            paired = values[:len(values) - len(keep)]
+            promoted = paired[self._rng.integers(2)::2]
+            self.levels[level] = keep
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def update(self, values: ArrayLike) -> 'QuantileSketch':
+        """Add values; missing values are ignored."""
+        x = _as_float_array(values)
+        if not len(x):
+            return self
+        self.count += len(x)
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        self.levels[0] = np.concatenate([self.levels[0], x])
+        self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Combine with the sketch of other values, in place."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _weighted(self) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)
+        ])
+        order = np.argsort(values, kind='stable')
+        return values[order], np.cumsum(weights[order])
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
+        """
+        Approximate quantiles.
+
+        Parameters
+        ----------
+        q : float or sequence of float
+            Quantiles between 0 and 1.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The values at the quantiles, NaN if the sketch is empty.
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        if not self.count:
+            result = np.full(len(qs), np.nan)
+        else:
+            values, cumulative = self._weighted()
+            positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+            result = values[np.clip(positions, 0, len(values) - 1)]
+            result[qs <= 0] = self.min
+            result[qs >= 1] = self.max
+        return float(result[0]) if np.ndim(q) == 0 else result
+
+    def cdf(self, x: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
+        """
+        Approximate fraction of values less than or equal to `x`.
+
+        Parameters
+        ----------
+        x : float or sequence of float
+            Points at which to evaluate the CDF.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            CDF values between 0 and 1, NaN if the sketch is empty.
+        """
+        xs = np.atleast_1d(np.asarray(x, dtype=float))
+        if not self.count:
+            result = np.full(len(xs), np.nan)
+        else:
+            values, cumulative = self._weighted()
+            positions = np.searchsorted(values, xs, side='right')
+            result = np.where(positions > 0, cumulative[positions - 1], 0.0) / cumulative[-1]
+        return float(result[0]) if np.ndim(x) == 0 else result
+
+    def histogram(self, bins: Union[int, Sequence[float]] = 30) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate histogram, as `numpy.histogram`.
+
+        Parameters
+        ----------
+        bins : int or sequence of float, optional
+            Number of equal-width bins between the minimum and maximum, or the
+            bin edges.
+
+        Returns
+        -------
+        counts : numpy.ndarray
+            Estimated number of values per bin.
+        edges : numpy.ndarray
+            Bin edges.
+        """
+        if isinstance(bins, int):
+            edges = np.linspace(self.min, self.max, bins + 1) if self.count else np.zeros(bins + 1)
+        else:
+            edges = np.asarray(bins, dtype=float)
+        if not self.count:
+            return np.zeros(len(edges) - 1), edges
+        cumulative = self.cdf(edges) * self.count
+        counts = np.diff(cumulative)
+        if edges[0] <= self.min:
+            # The first bin is closed on the left, as in numpy.histogram
+            counts[0] += cumulative[0]
+        return counts, edges
+
+
+class FrequentItems:
+    """
+    Misra-Gries summary of the most frequent values.
+
+    At most `capacity` counters are kept. Counts are lower bounds of the true
+    counts, underestimated by at most `error`; every value more frequent than
+    ``n / (capacity + 1)`` is guaranteed to be kept.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Number of counters, a few times the number of values reported.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_FREQUENT_CAPACITY) -> None:
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')
+        self.error = 0
+
+    def update(self, values: ArrayLike) -> 'FrequentItems':
+        """Add values; missing values are ignored."""
+        counts = pd.Series(values, copy=False).value_counts(dropna=True)
+        return self._add(*self._reduce(counts))
+
+    def merge(self, other: 'FrequentItems') -> 'FrequentItems':
+        """Combine with the summary of other values, in place."""
+        return self._add(other.counts, other.error)
+
+    def _reduce(self, counts: pd.Series) -> Tuple[pd.Series, int]:
+        """Keep the `capacity` largest of counts sorted in decreasing order."""
+        if len(counts) <= self.capacity:
+            return counts, 0
+        # Subtracting the (capacity + 1)-th count keeps the summary mergeable
+        threshold = int(counts.iloc[self.capacity])
+        counts = counts.iloc[:self.capacity] - threshold
+        return counts[counts > 0], threshold
+
+    def _add(self, counts: pd.Series, error: int) -> 'FrequentItems':
+        self.error += error
+        if not len(counts):
+            return self
+        counts = counts.astype('int64')
+        counts.index = counts.index.astype(object)
+        if len(self.counts):
+            counts = self.counts.add(counts, fill_value=0).astype('int64')
+        counts, threshold = self._reduce(counts.sort_values(ascending=False, kind='stable'))
+        self.counts = counts
+        self.error += threshold
+        return self
+
+    def top(self, k: int = 10) -> List[Tuple[Any, int]]:
+        """The `k` most frequent values with their (lower bound) counts."""
+        return [(value, int(count)) for value, count in self.counts.iloc[:k].items()]
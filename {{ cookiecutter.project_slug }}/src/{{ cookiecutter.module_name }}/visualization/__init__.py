@@ -0,0 +1,24 @@
+"""
+Visualization utilities.
+"""
+
+from {{ cookiecutter.module_name }}.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["profile", "visualize"],
+    attrs={
+        "profile": [
+            "ColumnProfile",
+            "DatasetProfile",
+            "profile_dataset",
+        ],
+        "visualize": [
+            "plot_distribution",
+            "plot_correlation_matrix",
+            "plot_time_series",
+            "plot_boxplots",
+            "plot_scatter_matrix",
+        ],
+    },
+)
@@ -0,0 +1,463 @@
+"""
+One-pass profiling of datasets too large to load.
+
+`profile_dataset` streams a dataset in chunks and summarizes every column with
+mergeable sketches (see `utils.sketches`): row, value and missing counts,
+min/max and moments, HyperLogLog distinct counts, KLL quantiles and the most
+frequent values. Memory does not grow with the number of rows, and chunks can
+be profiled by parallel workers whose profiles are merged.
+
+The summary is written as JSON together with a missing values chart, a
+histogram of each numerical column and a bar chart of the most frequent
+values of each other column, under ``reports/profile`` by default::
+
+    my-cli profile data/interim/dataset.parquet --jobs -1
+"""
+
+import copy
+import json
+import re
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Union
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.parallel import iter_slices, resolve_n_jobs
+from {{ cookiecutter.module_name }}.utils.paths import reports_dir
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
+from {{ cookiecutter.module_name }}.utils.sketches import (
+    DEFAULT_FREQUENT_CAPACITY,
+    FrequentItems,
+    HyperLogLog,
+    Moments,
+    QuantileSketch,
+    hash_values,
+)
+
+# Quantiles reported for numerical and datetime columns
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+# Name of the JSON summary written by `profile_dataset`
+PROFILE_FILE = 'profile.json'
+
+
+def _column_kind(values: pd.Series) -> str:
+    """Kind of profile a column gets: numeric, datetime, boolean or categorical."""
+    if pd.api.types.is_bool_dtype(values):
+        return 'boolean'
+    if pd.api.types.is_numeric_dtype(values):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return 'datetime'
+    return 'categorical'
+
+
+def _common_kind(name: str, kind: Optional[str], other: Optional[str]) -> Optional[str]:
+    """Kind of a column with values of both kinds, e.g. from different chunks."""
+    if kind is None or other is None or kind == other:
+        return kind or other
+    if 'categorical' in (kind, other):
+        return 'categorical'
+    if {kind, other} == {'numeric', 'boolean'}:
+        return 'numeric'
+    raise ValueError(f"Column {name!r} has {kind} and {other} values")
+
+
+def _to_builtin(value: Any) -> Any:
+    """Convert NumPy scalars to JSON serializable values."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class ColumnProfile:
+    """
+    Streaming summary of one column.
+
+    The kind of the column is set by the chunks with values in it, whatever
+    their order: booleans in a numeric column are profiled as numbers, and a
+    column with categorical values in any chunk is profiled as categorical,
+    with its other values as strings. Datetimes are profiled as nanoseconds
+    since the epoch.
+
+    Parameters
+    ----------
+    name : str
+        Column name.
+    frequent_capacity : int, optional
+        Number of counters of the frequent values summary.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        frequent_capacity: int = DEFAULT_FREQUENT_CAPACITY
+    ) -> None:
+        self.name = name
+        self.kind: Optional[str] = None
+        self.rows = 0
+        self.nulls = 0
+        self.moments = Moments()
+        self.distinct = HyperLogLog()
+        self.quantiles = QuantileSketch()
+        self.frequent = FrequentItems(frequent_capacity)
+
+    def update(self, values: pd.Series) -> 'ColumnProfile':
+        """Add the values of a chunk."""
+        self.rows += len(values)
+        # e.g. booleans with missing values are read as objects
+        present = values.dropna().infer_objects()
+        self.nulls += len(values) - len(present)
+        if not len(present):
+            return self
+
+        kind = _column_kind(present)
+        common = _common_kind(self.name, self.kind, kind)
+        if self.kind not in (None, common):
+            self._convert(common)
+        self.kind = common
+        # Values are hashed as read, as in the profiles `merge` combines
+        self.distinct.update_hashes(hash_values(present))
+        if kind != common:
+            present = present.astype(str if common == 'categorical' else 'float64')
+
+        self.frequent.update(present)
+        if self.kind == 'datetime':
+            self.quantiles.update(present.astype('datetime64[ns]').astype('int64'))
+        elif self.kind in ('numeric', 'boolean'):
+            # Booleans are sketched as 0/1 too, in case numbers follow
+            self.moments.update(present)
+            self.quantiles.update(present)
+        return self
+
+    def _convert(self, kind: str) -> None:
+        """Profile the values seen so far as values of `kind`."""
+        if kind == 'categorical':
+            # Distinct counts keep the hashes of the original values
+            counts = self.frequent.counts
+            frequent = FrequentItems(self.frequent.capacity)
+            frequent.error = self.frequent.error
+            if len(counts):
+                counts = counts.groupby(counts.index.map(str), sort=False).sum()
+                frequent.counts = counts.sort_values(ascending=False, kind='stable')
+            self.frequent = frequent
+            self.moments = Moments()
+            self.quantiles = QuantileSketch()
+        self.kind = kind
+
+    def merge(self, other: 'ColumnProfile') -> 'ColumnProfile':
+        """
+        Combine with the profile of other rows of the same column, in place.
+
+        Profiles of different kinds are combined as `update` combines chunks
+        of different kinds; `other` is left unchanged.
+        """
+        kind = _common_kind(self.name, self.kind, other.kind)
+        if self.kind not in (None, kind):
+            self._convert(kind)
+        if other.kind not in (None, kind):
+            other = copy.copy(other)
+            other._convert(kind)
+        self.kind = kind
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.moments.merge(other.moments)
+        self.distinct.merge(other.distinct)
+        self.quantiles.merge(other.quantiles)
+        self.frequent.merge(other.frequent)
+        return self
+
+    def to_dict(
+        self,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        top_k: int = 10
+    ) -> Dict[str, Any]:
+        """
+        JSON serializable summary of the column.
+
+        Parameters
+        ----------
+        quantiles : sequence of float, optional
+            Quantiles to report for numerical and datetime columns.
+        top_k : int, optional
+            Number of most frequent values to report.
+
+        Returns
+        -------
+        dict
+            Counts, statistics, quantiles and frequent values.
+        """
+        summary: Dict[str, Any] = {
+            'kind': self.kind,
+            'rows': self.rows,
+            'count': self.rows - self.nulls,
+            'nulls': self.nulls,
+            'null_fraction': self.nulls / self.rows if self.rows else None,
+            'distinct': min(self.distinct.estimate(), self.rows - self.nulls),
+        }
+        if self.kind in ('numeric', 'boolean'):
+            statistics = self.moments.to_dict()
+            del statistics['count']
+            summary.update(statistics)
+        if self.kind == 'numeric' and self.quantiles.count:
+            values = self.quantiles.quantile(quantiles)
+            summary['quantiles'] = {
+                str(q): float(v) for q, v in zip(quantiles, values, strict=True)
+            }
+        if self.kind == 'datetime' and self.quantiles.count:
+            values = self.quantiles.quantile([0.0, *quantiles, 1.0])
+            timestamps = [str(pd.Timestamp(int(v))) for v in values]
+            summary['min'], summary['max'] = timestamps[0], timestamps[-1]
+            summary['quantiles'] = dict(
+                zip(map(str, quantiles), timestamps[1:-1], strict=True)
+            )
+        convert: Callable[[Any], Any] = str if self.kind == 'datetime' else _to_builtin
+        summary['top_values'] = [
+            {'value': convert(value), 'count': count}
+            for value, count in self.frequent.top(top_k)
+        ]
+        summary['top_values_max_error'] = self.frequent.error
+        return summary
+
+
+class DatasetProfile:
+    """
+    Streaming summary of a dataset, one `ColumnProfile` per column.
+
+    Parameters
+    ----------
+    columns : list of str, optional
+        Columns to profile (default is every column).
+    frequent_capacity : int, optional
+        Number of counters of the frequent values summaries.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        frequent_capacity: int = DEFAULT_FREQUENT_CAPACITY
+    ) -> None:
+        self.selected = columns
+        self.frequent_capacity = frequent_capacity
+        self.rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+
+    def _column(self, name: str) -> ColumnProfile:
+        if name not in self.columns:
+            self.columns[name] = ColumnProfile(name, self.frequent_capacity)
+        return self.columns[name]
+
+    def update(self, chunk: pd.DataFrame) -> 'DatasetProfile':
+        """Add the rows of a chunk."""
+        names = self.selected if self.selected is not None else chunk.columns
+        for name in names:
+            self._column(str(name)).update(chunk[name])
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other: 'DatasetProfile') -> 'DatasetProfile':
+        """Combine with the profile of other rows, in place."""
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(column)
+            else:
+                self.columns[name] = column
+        self.rows += other.rows
+        return self
+
+    def to_dict(
+        self,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        top_k: int = 10
+    ) -> Dict[str, Any]:
+        """JSON serializable summary of the dataset (see `ColumnProfile.to_dict`)."""
+        return {
+            'rows': self.rows,
+            'columns': {
+                name: column.to_dict(quantiles, top_k)
+                for name, column in self.columns.items()
+            },
+        }
+
+    def plot(
+        self,
+        output_dir: Union[str, Path],
+        top_k: int = 10,
+        bins: int = 30
+    ) -> List[Path]:
+        """
+        Save the figures of the profile.
+
+        Parameters
+        ----------
+        output_dir : str or pathlib.Path
+            Directory of the figures.
+        top_k : int, optional
+            Number of frequent values per bar chart.
+        bins : int, optional
+            Number of histogram bins.
+
+        Returns
+        -------
+        list of pathlib.Path
+            Paths of the saved figures.
+        """
+        # Figures are created without pyplot, so batch jobs never open a window
+        from matplotlib.figure import Figure
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        dpi = get_settings().plotting.dpi
+        paths: List[Path] = []
+        used: Set[str] = set()
+
+        def save(fig: Figure, stem: str) -> None:
+            stem = re.sub(r'[^0-9A-Za-z_.-]+', '_', stem)
+            while stem in used:
+                stem += '_'
+            used.add(stem)
+            path = output_dir / f"{stem}.png"
+            fig.savefig(path, bbox_inches='tight', dpi=dpi)
+            paths.append(path)
+
+        names = list(self.columns)
+        fractions = [
+            self.columns[name].nulls / max(self.columns[name].rows, 1) for name in names
+        ]
+        fig = Figure(figsize=(8, max(2, 0.3 * len(names))))
+        ax = fig.subplots()
+        ax.barh(names, fractions)
+        ax.set_xlim(0, 1)
+        ax.set_xlabel('Missing fraction')
+        ax.set_title('Missing values')
+        save(fig, 'missing')
+
+        for name, column in self.columns.items():
+            if column.kind == 'numeric' and column.quantiles.count:
+                counts, edges = column.quantiles.histogram(bins)
+                fig = Figure(figsize=(8, 5))
+                ax = fig.subplots()
+                ax.stairs(counts, edges, fill=True)
+                ax.set_xlabel(name)
+                ax.set_ylabel('Frequency (estimated)')
+                ax.set_title(f'Distribution of {name}')
+                save(fig, f'{name}_distribution')
+            elif len(column.frequent.counts):
+                top = column.frequent.top(top_k)[::-1]
+                fig = Figure(figsize=(8, max(2, 0.4 * len(top))))
+                ax = fig.subplots()
+                ax.barh([str(value) for value, _ in top], [count for _, count in top])
+                ax.set_xlabel('Count')
+                ax.set_title(f'Most frequent values of {name}')
+                save(fig, f'{name}_top_values')
+        return paths
+
+
+def _profile_chunk(
+    chunk: pd.DataFrame,
+    columns: Optional[List[str]],
+    frequent_capacity: int
+) -> DatasetProfile:
+    return DatasetProfile(columns, frequent_capacity).update(chunk)
+
+
+@instrument()
+def profile_dataset(
+    data: Union[str, Path, pd.DataFrame, Iterable[pd.DataFrame]],
+    output_dir: Optional[Union[str, Path]] = None,
+    columns: Optional[List[str]] = None,
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    backend: Optional[str] = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    top_k: int = 10,
+    figures: bool = True
+) -> DatasetProfile:
+    """
+    Profile a dataset in a single streaming pass.
+
+    Chunks are profiled in parallel when `n_jobs` is not 1, with at most two
+    chunks per worker in flight, and the partial profiles are merged as they
+    complete, so memory stays bounded by the chunk size.
+
+    Parameters
+    ----------
+    data : str, pathlib.Path, pandas.DataFrame or iterable of pandas.DataFrame
+        Dataset readable by `iter_dataset`, a DataFrame, or chunks.
+    output_dir : str or pathlib.Path, optional
+        Directory of the JSON summary (`PROFILE_FILE`) and figures (default is
+        ``reports/profile``).
+    columns : list of str, optional
+        Columns to profile (default is every column).
+    chunk_size : int, optional
+        Rows per chunk of a file or DataFrame, by default as in `iter_dataset`.
+    n_jobs : int, optional
+        Number of workers (-1 uses all CPUs). Defaults to the configured
+        ``compute.n_jobs``.
+    backend : str, optional
+        'threads' or 'processes', defaults to the configured
+        ``compute.backend``.
+    quantiles : sequence of float, optional
+        Quantiles reported for numerical and datetime columns.
+    top_k : int, optional
+        Number of most frequent values reported per column (default is 10).
+    figures : bool, optional
+        Whether to save figures next to the summary (default is True).
+
+    Returns
+    -------
+    DatasetProfile
+        The merged profile, whose sketches can be merged with other profiles.
+    """
+    from {{ cookiecutter.module_name }}.data.data_loader import DEFAULT_CHUNK_SIZE, iter_dataset
+
+    compute = get_settings().compute
+    n_workers = resolve_n_jobs(compute.n_jobs if n_jobs is None else n_jobs)
+    backend = backend or compute.backend
+    frequent_capacity = max(DEFAULT_FREQUENT_CAPACITY, 10 * top_k)
+
+    if isinstance(data, (str, Path)):
+        chunks: Iterable[pd.DataFrame] = iter_dataset(data, chunk_size=chunk_size)
+    elif isinstance(data, pd.DataFrame) and len(data):
+        # Sliced like a file, so that chunks are profiled by parallel workers
+        size = chunk_size or compute.chunk_size or DEFAULT_CHUNK_SIZE
+        chunks = iter_slices(data, size)
+    elif isinstance(data, pd.DataFrame):
+        chunks = [data]
+    else:
+        chunks = data
+
+    profile = DatasetProfile(columns, frequent_capacity)
+    if n_workers == 1:
+        for chunk in chunks:
+            profile.update(chunk)
+    else:
+        executor_class = (
+            ProcessPoolExecutor if backend == 'processes' else ThreadPoolExecutor
+        )
+        with executor_class(max_workers=n_workers) as executor:
+            pending: Set[Future] = set()
+            for chunk in chunks:
+                if len(pending) >= 2 * n_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        profile.merge(future.result())
+                pending.add(executor.submit(
+                    _profile_chunk, chunk, columns, frequent_capacity
+                ))
+            for future in pending:
+                profile.merge(future.result())
+
+    output_dir = Path(output_dir) if output_dir is not None else reports_dir('profile')
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / PROFILE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(profile.to_dict(quantiles, top_k), f, indent=2, default=str)
+    if figures:
+        profile.plot(output_dir, top_k=top_k)
+    return profile
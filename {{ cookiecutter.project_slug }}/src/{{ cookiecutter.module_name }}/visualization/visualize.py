@@ -10,7 +10,32 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from {{ cookiecutter.module_name }}.config import get_settings
+from {{ cookiecutter.module_name }}.utils.profiling import instrument
 
+
+def _finish_figure(save_path: Optional[Union[str, Path]] = None) -> None:
+    """
+    Save and display or close the current figure.
+
+    The resolution and whether figures are displayed come from the
+    ``plotting`` settings, so headless runs do not block or leak figures.
+
+    Parameters
+    ----------
+    save_path : str or pathlib.Path, optional
+        Path to save the plot (default is None).
+    """
+    settings = get_settings().plotting
+    if save_path:
+        plt.savefig(save_path, bbox_inches='tight', dpi=settings.dpi)
+    if settings.show:
+        plt.show()
+    else:
+        plt.close()
+
+
+@instrument()
 def plot_distribution(
     data: Union[pd.Series, np.ndarray],
     title: str,
@@ -47,11 +72,10 @@ def plot_distribution(
     plt.xlabel(xlabel)
     plt.ylabel('Frequency')
 
-    if save_path:
-        plt.savefig(save_path, bbox_inches='tight', dpi=300)
-    plt.show()
+    _finish_figure(save_path)
 
 
+@instrument()
 def plot_correlation_matrix(
     df: pd.DataFrame,
     title: str = 'Correlation Matrix',
@@ -90,11 +114,10 @@ def plot_correlation_matrix(
     )
     plt.title(title)
 
-    if save_path:
-        plt.savefig(save_path, bbox_inches='tight', dpi=300)
-    plt.show()
+    _finish_figure(save_path)
 
 
+@instrument()
 def plot_time_series(
     df: pd.DataFrame,
     time_column: str,
@@ -133,11 +156,10 @@ def plot_time_series(
     plt.xticks(rotation=45)
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, bbox_inches='tight', dpi=300)
-    plt.show()
+    _finish_figure(save_path)
 
 
+@instrument()
 def plot_boxplots(
     df: pd.DataFrame,
     columns: List[str],
@@ -171,11 +193,10 @@ def plot_boxplots(
     plt.xticks(rotation=45)
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, bbox_inches='tight', dpi=300)
-    plt.show()
+    _finish_figure(save_path)
 
 
+@instrument()
 def plot_scatter_matrix(
     df: pd.DataFrame,
     columns: List[str],
@@ -212,6 +233,4 @@ def plot_scatter_matrix(
     plt.suptitle(title)
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, bbox_inches='tight', dpi=300)
-    plt.show()
+    _finish_figure(save_path)
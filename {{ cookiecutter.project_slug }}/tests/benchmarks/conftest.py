@@ -0,0 +1,97 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Benchmarks are marked with ``bench`` and excluded from the default test run;
+run them with ``make bench``. Each benchmark records the number of rows it
+processes and the peak memory of a single call in ``extra_info`` so that
+``scripts/compare_benchmarks.py`` can check throughput and memory against the
+baseline in ``reports/benchmarks/``.
+"""
+
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a frame with numerical, categorical and datetime columns."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'num_a': rng.normal(size=rows),
+        'num_b': rng.uniform(1, 100, size=rows),
+        'num_c': rng.integers(0, 1_000, size=rows).astype('float64'),
+        'cat_a': rng.choice(['red', 'green', 'blue'], size=rows),
+        'cat_b': rng.choice([f'level_{i}' for i in range(20)], size=rows),
+        'timestamp': pd.date_range('2020-01-01', periods=rows, freq='min'),
+        'target': rng.integers(0, 2, size=rows),
+    })
+
+
+@pytest.fixture(scope='session')
+def frame_factory() -> Callable[[int], pd.DataFrame]:
+    """Return a function building (and caching) a benchmark frame per size."""
+    cache: Dict[int, pd.DataFrame] = {}
+
+    def factory(rows: int) -> pd.DataFrame:
+        if rows not in cache:
+            cache[rows] = make_frame(rows)
+        return cache[rows]
+
+    return factory
+
+
+@pytest.fixture(scope='session')
+def data_files(
+    tmp_path_factory: pytest.TempPathFactory,
+    frame_factory: Callable[[int], pd.DataFrame]
+) -> Callable[[int, str], Path]:
+    """Return a function writing (and caching) a benchmark file per size and format."""
+    directory = tmp_path_factory.mktemp('bench_data')
+    cache: Dict[tuple[int, str], Path] = {}
+
+    def factory(rows: int, fmt: str) -> Path:
+        key = (rows, fmt)
+        if key not in cache:
+            df = frame_factory(rows)
+            path = directory / f'data_{rows}.{fmt}'
+            if fmt == 'csv':
+                df.to_csv(path, index=False)
+            elif fmt == 'parquet':
+                df.to_parquet(path, index=False)
+            elif fmt == 'xlsx':
+                df.to_excel(path, index=False)
+            elif fmt == 'npy':
+                np.save(path, df.select_dtypes('number').to_numpy())
+            else:
+                raise ValueError(f"Unsupported format: {fmt}")
+            cache[key] = path
+        return cache[key]
+
+    return factory
+
+
+@pytest.fixture
+def run_benchmark(benchmark: Any) -> Callable[..., Any]:
+    """
+    Benchmark a function and record its throughput inputs and peak memory.
+
+    The function is called once under ``tracemalloc`` to measure peak memory
+    (tracing slows calls down, so it is kept out of the timed rounds) and
+    then timed by pytest-benchmark.
+    """
+    def run(func: Callable[..., Any], *args: Any, rows: int, **kwargs: Any) -> Any:
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['rows'] = rows
+        benchmark.extra_info['peak_memory_bytes'] = peak
+        return benchmark(func, *args, **kwargs)
+
+    return run
@@ -0,0 +1,46 @@
+"""
+Benchmarks for the data loaders.
+"""
+
+import pytest
+
+from {{ cookiecutter.module_name }}.data.data_loader import (
+    load_csv,
+    load_excel,
+    load_numpy,
+    load_parquet,
+)
+
+pytestmark = pytest.mark.bench
+
+SIZES = [10_000, 100_000, 1_000_000]
+# Excel files are slow to write and read, keep them smaller
+EXCEL_SIZES = [1_000, 10_000]
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_load_csv(run_benchmark, data_files, rows):
+    path = data_files(rows, 'csv')
+    df = run_benchmark(load_csv, path, rows=rows)
+    assert len(df) == rows
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_load_parquet(run_benchmark, data_files, rows):
+    path = data_files(rows, 'parquet')
+    df = run_benchmark(load_parquet, path, rows=rows)
+    assert len(df) == rows
+
+
+@pytest.mark.parametrize('rows', EXCEL_SIZES)
+def test_load_excel(run_benchmark, data_files, rows):
+    path = data_files(rows, 'xlsx')
+    df = run_benchmark(load_excel, path, rows=rows)
+    assert len(df) == rows
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_load_numpy(run_benchmark, data_files, rows):
+    path = data_files(rows, 'npy')
+    array = run_benchmark(load_numpy, path, rows=rows)
+    assert len(array) == rows
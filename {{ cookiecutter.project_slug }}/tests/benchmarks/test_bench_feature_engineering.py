@@ -0,0 +1,53 @@
+"""
+Benchmarks for the feature engineering functions.
+"""
+
+import pytest
+
+from {{ cookiecutter.module_name }}.features.feature_engineering import (
+    create_interaction_features,
+    create_time_features,
+    encode_categorical,
+    scale_features,
+)
+from {{ cookiecutter.module_name }}.features.selection import FeatureSelector
+
+pytestmark = pytest.mark.bench
+
+SIZES = [10_000, 100_000, 1_000_000]
+NUMERIC_COLUMNS = ['num_a', 'num_b', 'num_c']
+CATEGORICAL_COLUMNS = ['cat_a', 'cat_b']
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_scale_features(run_benchmark, frame_factory, rows):
+    df = frame_factory(rows)
+    run_benchmark(scale_features, df, NUMERIC_COLUMNS, rows=rows)
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_encode_categorical(run_benchmark, frame_factory, rows):
+    df = frame_factory(rows)
+    run_benchmark(encode_categorical, df, CATEGORICAL_COLUMNS, rows=rows)
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_create_time_features(run_benchmark, frame_factory, rows):
+    df = frame_factory(rows)
+    run_benchmark(create_time_features, df, 'timestamp', rows=rows)
+
+
+@pytest.mark.parametrize('operation', ['multiply', 'add', 'subtract', 'divide'])
+@pytest.mark.parametrize('rows', SIZES)
+def test_create_interaction_features(run_benchmark, frame_factory, rows, operation):
+    df = frame_factory(rows)
+    run_benchmark(
+        create_interaction_features, df, NUMERIC_COLUMNS, operation=operation, rows=rows
+    )
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_feature_selector(run_benchmark, frame_factory, rows):
+    df = frame_factory(rows)
+    selector = FeatureSelector(correlation_threshold=0.95, mutual_info_threshold=0.001)
+    run_benchmark(selector.fit, df, df['num_a'] > 0, rows=rows)
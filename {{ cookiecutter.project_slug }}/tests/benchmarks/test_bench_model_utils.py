@@ -0,0 +1,68 @@
+"""
+Benchmarks for the model evaluation and persistence utilities.
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from {{ cookiecutter.module_name }}.models.model_utils import (
+    evaluate_classification,
+    evaluate_regression,
+    load_model,
+    save_model,
+)
+
+pytestmark = pytest.mark.bench
+
+SIZES = [10_000, 100_000, 1_000_000]
+# Number of trees of the persisted model, which drives its size on disk
+MODEL_SIZES = [10, 100]
+
+
+@pytest.fixture(scope='module')
+def labels():
+    rng = np.random.default_rng(42)
+    return {
+        rows: (rng.integers(0, 2, size=rows), rng.integers(0, 2, size=rows))
+        for rows in SIZES
+    }
+
+
+@pytest.fixture(scope='module')
+def models(frame_factory):
+    df = frame_factory(10_000)
+    X, y = df[['num_a', 'num_b', 'num_c']], df['target']
+    return {
+        n_trees: RandomForestClassifier(n_estimators=n_trees, random_state=42).fit(X, y)
+        for n_trees in MODEL_SIZES
+    }
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_evaluate_classification(run_benchmark, labels, rows):
+    y_true, y_pred = labels[rows]
+    run_benchmark(evaluate_classification, y_true, y_pred, rows=rows)
+
+
+@pytest.mark.parametrize('rows', SIZES)
+def test_evaluate_regression(run_benchmark, labels, rows):
+    y_true, y_pred = labels[rows]
+    run_benchmark(
+        evaluate_regression, y_true.astype(float), y_pred.astype(float), rows=rows
+    )
+
+
+@pytest.mark.parametrize('engine', ['joblib', 'pickle'])
+@pytest.mark.parametrize('n_trees', MODEL_SIZES)
+def test_save_model(run_benchmark, models, tmp_path, n_trees, engine):
+    path = tmp_path / f'model.{engine}'
+    run_benchmark(save_model, models[n_trees], path, engine=engine, rows=n_trees)
+
+
+@pytest.mark.parametrize('engine', ['joblib', 'pickle'])
+@pytest.mark.parametrize('n_trees', MODEL_SIZES)
+def test_load_model(run_benchmark, models, tmp_path, n_trees, engine):
+    path = tmp_path / f'model.{engine}'
+    save_model(models[n_trees], path, engine=engine)
+    run_benchmark(load_model, path, engine=engine, rows=n_trees)
@@ -0,0 +1,103 @@
+"""
+Shared fixtures of the test suite.
+
+Synthetic datasets stand in for production data, which is never copied to
+test environments. `synthetic_data` writes files of a given shape and format
+once per session into a temporary directory, or once across sessions into
+``--synthetic-cache`` (e.g. ``data/interim/cache/synthetic``). Their default
+size is set with ``--synthetic-rows``, so the same tests run as quick checks
+or, e.g. with ``pytest --synthetic-rows 10000000 --synthetic-jobs -1
+--synthetic-cache data/interim/cache/synthetic``, as scale tests.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.data.synthetic import (
+    SyntheticSpec,
+    generate_frame,
+    synthetic_dataset,
+)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('synthetic', 'synthetic test data')
+    group.addoption(
+        '--synthetic-rows', type=int, default=10_000,
+        help='default number of rows of the synthetic datasets')
+    group.addoption(
+        '--synthetic-jobs', type=int, default=None,
+        help='workers generating synthetic datasets (-1 uses all CPUs)')
+    group.addoption(
+        '--synthetic-cache', default=None, metavar='DIR',
+        help='cache directory of the synthetic datasets, kept across sessions '
+             '(default is a temporary directory)')
+
+
+@pytest.fixture(scope='session')
+def synthetic_rows(pytestconfig: pytest.Config) -> int:
+    """Default number of rows of the synthetic datasets."""
+    return pytestconfig.getoption('synthetic_rows')
+
+
+@pytest.fixture(scope='session')
+def synthetic_spec(synthetic_rows: int) -> Callable[..., SyntheticSpec]:
+    """Return a function building a `SyntheticSpec`, by default of ``--synthetic-rows`` rows."""
+    def factory(rows: Optional[int] = None, **shape: Any) -> SyntheticSpec:
+        return SyntheticSpec(rows=synthetic_rows if rows is None else rows, **shape)
+
+    return factory
+
+
+@pytest.fixture(scope='session')
+def synthetic_frame(
+    pytestconfig: pytest.Config,
+    synthetic_spec: Callable[..., SyntheticSpec]
+) -> Callable[..., pd.DataFrame]:
+    """
+    Return a function generating a synthetic DataFrame per shape.
+
+    Frames are generated once per session and shape, e.g.
+    ``synthetic_frame(rows=500, categorical=1, target=None)``, and each call
+    returns a copy, which tests are free to modify.
+    """
+    n_jobs = pytestconfig.getoption('synthetic_jobs')
+    cache: Dict[SyntheticSpec, pd.DataFrame] = {}
+
+    def factory(rows: Optional[int] = None, **shape: Any) -> pd.DataFrame:
+        spec = synthetic_spec(rows, **shape)
+        if spec not in cache:
+            cache[spec] = generate_frame(spec, n_jobs=n_jobs)
+        return cache[spec].copy()
+
+    return factory
+
+
+@pytest.fixture(scope='session')
+def synthetic_data(
+    pytestconfig: pytest.Config,
+    tmp_path_factory: pytest.TempPathFactory,
+    synthetic_spec: Callable[..., SyntheticSpec]
+) -> Callable[..., Path]:
+    """
+    Return a function writing a synthetic dataset file per shape and format.
+
+    Files are cached for the session, e.g. ``synthetic_data(fmt='csv',
+    null_rate=0.1)`` generates the file on the first call only, and across
+    sessions with ``--synthetic-cache``.
+    """
+    n_jobs = pytestconfig.getoption('synthetic_jobs')
+    # Test runs never write into the project data unless asked to
+    cache_dir = (
+        pytestconfig.getoption('synthetic_cache')
+        or tmp_path_factory.mktemp('synthetic')
+    )
+
+    def factory(rows: Optional[int] = None, fmt: str = 'parquet', **shape: Any) -> Path:
+        spec = synthetic_spec(rows, **shape)
+        return synthetic_dataset(spec, fmt, cache_dir=cache_dir, n_jobs=n_jobs)
+
+    return factory
@@ -0,0 +1,132 @@
+"""
+Parity tests of the DataFrame backends.
+
+Every loader and feature function must give the same result on Polars and
+DuckDB as on pandas, the reference backend. Backends that are not installed
+are skipped.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.data.data_loader import load_csv, load_parquet
+from {{ cookiecutter.module_name }}.features.feature_engineering import (
+    GROUP_AGGREGATIONS,
+    INTERACTIONS,
+    create_group_features,
+    create_interaction_features,
+    create_time_features,
+)
+from {{ cookiecutter.module_name }}.utils.backends import (
+    BACKENDS,
+    backend_available,
+    resolve_backend,
+    use_backend,
+)
+
+
+@pytest.fixture(params=[name for name in BACKENDS if name != 'pandas'])
+def backend(request: pytest.FixtureRequest) -> str:
+    """Name of an installed non-reference backend."""
+    pytest.importorskip(request.param)
+    return request.param
+
+
+@pytest.fixture
+def frame(synthetic_frame: Callable[..., pd.DataFrame]) -> pd.DataFrame:
+    """Frame with numerical, categorical, datetime and missing values."""
+    df = synthetic_frame(
+        rows=500, numeric=3, categorical=2, cardinality=(3, 4), null_rate=0.05,
+        target=None
+    )
+    df.loc[::23, 'num_1'] = 0
+    # Strings, since backends read the dictionary columns of Parquet differently
+    df[['cat_0', 'cat_1']] = df[['cat_0', 'cat_1']].astype(str)
+    # Non-default index, which every backend must preserve
+    return df.set_axis(pd.RangeIndex(1000, 1000 + len(df)))
+
+
+def test_load_csv(backend: str, frame: pd.DataFrame, tmp_path: Path) -> None:
+    path = tmp_path / 'data.csv'
+    frame.drop(columns=['ts_0']).to_csv(path, index=False)
+
+    for options in ({}, {'usecols': ['num_1', 'cat_0']}, {'nrows': 42}):
+        expected = load_csv(path, dataframe_backend='pandas', **options)
+        result = load_csv(path, dataframe_backend=backend, **options)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_load_csv_rejects_pandas_options(backend: str, tmp_path: Path) -> None:
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'a': [1, 2]}).to_csv(path, index=False)
+
+    with pytest.raises(ValueError):
+        load_csv(path, dataframe_backend=backend, chunksize=1)
+    # A globally selected backend falls back to pandas instead
+    with use_backend(backend):
+        chunks = list(load_csv(path, chunksize=1))
+    assert len(chunks) == 2
+
+
+def test_load_parquet(backend: str, frame: pd.DataFrame, tmp_path: Path) -> None:
+    path = tmp_path / 'data.parquet'
+    frame.to_parquet(path, index=False)
+
+    for options in ({}, {'columns': ['num_2', 'cat_0']}):
+        expected = load_parquet(path, dataframe_backend='pandas', **options)
+        result = load_parquet(path, dataframe_backend=backend, **options)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('as_strings', [False, True])
+def test_create_time_features(backend: str, frame: pd.DataFrame, as_strings: bool) -> None:
+    df = frame[['ts_0', 'num_0']].copy()
+    if as_strings:
+        df['ts_0'] = df['ts_0'].dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    expected = create_time_features(df, 'ts_0', dataframe_backend='pandas')
+    result = create_time_features(df, 'ts_0', dataframe_backend=backend)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('operation', list(INTERACTIONS))
+def test_create_interaction_features(backend: str, frame: pd.DataFrame, operation: str) -> None:
+    columns = ['num_0', 'num_1', 'num_2']
+
+    expected = create_interaction_features(frame, columns, operation, dataframe_backend='pandas')
+    result = create_interaction_features(frame, columns, operation, dataframe_backend=backend)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('group_columns', [['cat_0'], ['cat_0', 'cat_1']])
+def test_create_group_features(
+    backend: str,
+    frame: pd.DataFrame,
+    group_columns: list[str]
+) -> None:
+    options = {
+        'group_columns': group_columns,
+        'value_columns': ['num_0', 'num_1'],
+        'aggregations': list(GROUP_AGGREGATIONS),
+    }
+
+    expected = create_group_features(frame, dataframe_backend='pandas', **options)
+    result = create_group_features(frame, dataframe_backend=backend, **options)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_use_backend_selects_the_default() -> None:
+    assert resolve_backend() == 'pandas'
+    with use_backend('pandas'):
+        assert resolve_backend() == 'pandas'
+    with pytest.raises(ValueError):
+        resolve_backend('spark')
+
+
+@pytest.mark.parametrize('name', [name for name in BACKENDS if not backend_available(name)])
+def test_missing_backend_raises(name: str) -> None:
+    with pytest.raises(ImportError, match=name):
+        resolve_backend(name)
@@ -0,0 +1,113 @@
+"""
+Tests of the command line interface.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from {{ cookiecutter.module_name }}.__main__ import _apply_settings, build_parser, main
+from {{ cookiecutter.module_name }}.config import (
+    ENV_PREFIX,
+    ENV_VAR,
+    get_settings,
+    reset_settings,
+)
+from {{ cookiecutter.module_name }}.models.model_utils import save_model
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # The CLI exports its options as environment variables, which are
+    # restored by monkeypatch once they are recorded here
+    for name in [name for name in os.environ if name.startswith(ENV_PREFIX)]:
+        monkeypatch.delenv(name)
+    monkeypatch.setenv(ENV_VAR, 'dev')
+    monkeypatch.setenv(f'{ENV_PREFIX}PROFILING__SPANS', 'false')
+    reset_settings()
+    yield
+    monkeypatch.undo()
+    reset_settings()
+
+
+def test_missing_options_default_to_the_settings(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(f'{ENV_PREFIX}COMPUTE__N_JOBS', '3')
+    monkeypatch.setenv(f'{ENV_PREFIX}COMPUTE__CHUNK_SIZE', '500')
+    monkeypatch.setenv(f'{ENV_PREFIX}COMPUTE__MEMORY_LIMIT', '2G')
+    parser = build_parser()
+    args = parser.parse_args(['validate', 'data.csv', '--schema', 'schema.yml'])
+    _apply_settings(args)
+    assert (args.jobs, args.chunk_size, args.memory_limit) == (3, 500, 2 * 1024**3)
+
+    # Options on the command line win over the settings
+    args = parser.parse_args([
+        'validate', 'data.csv', '--schema', 'schema.yml',
+        '--jobs', '2', '--chunk-size', '10', '--memory-limit', '512M',
+    ])
+    _apply_settings(args)
+    assert (args.jobs, args.chunk_size, args.memory_limit) == (2, 10, 512 * 1024**2)
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(['validate', 'data.csv', '--schema', 'schema.yml',
+                           '--memory-limit', 'lots'])
+
+
+def test_env_option_selects_the_configuration() -> None:
+    args = build_parser().parse_args(['pipeline', '--env', 'prod', '--profile'])
+    _apply_settings(args)
+    assert os.environ[ENV_VAR] == 'prod'
+    assert get_settings().env == 'prod'
+    assert get_settings().profiling.spans is True
+    assert args.jobs == -1 and args.chunk_size == 1_000_000
+
+
+def test_validate_reports_bad_rows(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str]
+) -> None:
+    data = tmp_path / 'input.csv'
+    pd.DataFrame({'age': [10, -5, 20]}).to_csv(data, index=False)
+    schema = tmp_path / 'schema.yml'
+    schema.write_text('columns:\n  age: {dtype: int, min_value: 0}\n')
+    report = tmp_path / 'report.json'
+
+    with pytest.raises(SystemExit) as error:
+        main(['validate', str(data), '--schema', str(schema),
+              '--output', str(report), '--chunk-size', '2'])
+    assert error.value.code == 1
+    assert capsys.readouterr().out.startswith('1 of 3 rows invalid')
+    assert json.loads(report.read_text())['invalid_rows'] == 1
+
+    pd.DataFrame({'age': [10, 20]}).to_csv(data, index=False)
+    assert main(['validate', str(data), '--schema', str(schema)]) == 0
+
+
+@pytest.mark.parametrize('labels', [[0, 1], [False, True], ['no', 'yes']])
+def test_evaluate_binary_labels(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    labels: List[Any]
+) -> None:
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=200)
+    target = np.where(x + 0.5 * rng.normal(size=200) > 0, labels[1], labels[0])
+    df = pd.DataFrame({'x': x, 'label': target})
+    data = tmp_path / 'test.parquet'
+    df.to_parquet(data)
+    model = LogisticRegression().fit(df[['x']], df['label'])
+    model_path = tmp_path / 'model.joblib'
+    save_model(model, model_path)
+
+    assert main(['evaluate', str(model_path), str(data), '--target', 'label']) == 0
+    metrics = json.loads(capsys.readouterr().out)
+    assert set(metrics) == {'accuracy', 'precision', 'recall', 'f1'}
+    assert 0.7 < metrics['accuracy'] <= 1
+    assert 0.7 < metrics['f1'] <= 1
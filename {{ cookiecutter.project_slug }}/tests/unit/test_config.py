@@ -0,0 +1,117 @@
+"""
+Tests of the settings loader.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.config import (
+    ENV_PREFIX,
+    _deep_merge,
+    get_settings,
+    load_settings,
+    reset_settings,
+)
+from {{ cookiecutter.module_name }}.data.data_loader import load_csv
+from {{ cookiecutter.module_name }}.data.make_dataset import make_dataset
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # Overrides set in the shell would change the expected values
+    for name in [name for name in os.environ if name.startswith(ENV_PREFIX)]:
+        monkeypatch.delenv(name)
+    reset_settings()
+    yield
+    monkeypatch.undo()
+    reset_settings()
+
+
+def test_file_values_are_merged_into_defaults(tmp_path: Path) -> None:
+    path = tmp_path / 'test.yml'
+    path.write_text('compute:\n  n_jobs: 3\ndata:\n  csv_engine: python\n')
+    settings = load_settings('test', config_path=path)
+    assert settings.env == 'test'
+    assert settings.compute.n_jobs == 3
+    assert settings.compute.backend == 'threads'
+    assert settings.data.csv_engine == 'python'
+    assert settings.data.float_dtype == 'float64'
+
+    base = {'a': {'b': 1, 'c': 2}, 'd': 1}
+    merged = _deep_merge(base, {'a': {'c': 3}, 'd': {'e': 4}})
+    assert merged == {'a': {'b': 1, 'c': 3}, 'd': {'e': 4}}
+    assert base == {'a': {'b': 1, 'c': 2}, 'd': 1}
+
+
+def test_environment_overrides_files(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / 'test.yml'
+    path.write_text('compute:\n  n_jobs: 3\n  chunk_size: 10\n')
+    monkeypatch.setenv(f'{ENV_PREFIX}COMPUTE__N_JOBS', '8')
+    monkeypatch.setenv(f'{ENV_PREFIX}PLOTTING__SHOW', 'false')
+    monkeypatch.setenv(f'{ENV_PREFIX}DATA__ROW_GROUP_SIZE', 'null')
+    monkeypatch.setenv(f'{ENV_PREFIX}UNKNOWN__KEY', '1')
+    settings = load_settings('test', config_path=path)
+    assert settings.compute.n_jobs == 8
+    assert settings.compute.chunk_size == 10
+    assert settings.plotting.show is False
+    assert settings.data.row_group_size is None
+
+    monkeypatch.setenv(f'{ENV_PREFIX}COMPUTE__BACKEND', 'gpu')
+    with pytest.raises(ValueError, match='backend'):
+        load_settings('test', config_path=path)
+
+
+def test_settings_are_cached_until_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = get_settings()
+    monkeypatch.setenv(f'{ENV_PREFIX}COMPUTE__N_JOBS', '7')
+    assert get_settings() is settings
+    reset_settings()
+    assert get_settings() is not settings
+    assert get_settings().compute.n_jobs == 7
+
+
+@pytest.mark.parametrize(
+    'csv_engine, expected', [(None, 'pyarrow'), ('python', 'python'), ('c', 'c')]
+)
+def test_configured_csv_engine_wins_over_n_jobs(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    csv_engine: Optional[str],
+    expected: str
+) -> None:
+    monkeypatch.setenv(f'{ENV_PREFIX}DATA__CSV_ENGINE', csv_engine or 'null')
+    engines: List[Any] = []
+    read_csv = pd.read_csv
+
+    def spy(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        engines.append(kwargs.get('engine'))
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_csv', spy)
+    pd.DataFrame({'a': [1, 2, 2]}).to_csv(tmp_path / 'raw.csv', index=False)
+    df = make_dataset(tmp_path / 'raw.csv', tmp_path / 'out.parquet', n_jobs=2)
+    assert engines == [expected]
+    assert df['a'].tolist() == [1, 2]
+
+
+def test_pyarrow_engine_skips_options_it_rejects(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(f'{ENV_PREFIX}DATA__CSV_ENGINE', 'pyarrow')
+    path = tmp_path / 'raw.csv'
+    pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']}).to_csv(path, index=False)
+    assert load_csv(path)['a'].tolist() == [1, 2, 3]
+    assert load_csv(path, nrows=1)['b'].tolist() == ['x']
+    assert load_csv(path, comment='#', nrows=None)['a'].tolist() == [1, 2, 3]
+    assert load_csv(path, low_memory=False).shape == (3, 2)
+    with load_csv(path, iterator=True) as reader:
+        assert len(reader.get_chunk(2)) == 2
+    assert [len(chunk) for chunk in load_csv(path, chunksize=2)] == [2, 1]
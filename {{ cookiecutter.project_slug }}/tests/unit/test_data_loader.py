@@ -0,0 +1,136 @@
+"""
+Tests of `save_dataset` and reading partitioned datasets back.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, List
+
+import pandas as pd
+import pytest
+
+import {{ cookiecutter.module_name }}.data.data_loader as data_loader
+from {{ cookiecutter.module_name }}.data.data_loader import (
+    COMMON_METADATA,
+    load_parquet,
+    save_dataset,
+)
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'year': [2023, 2024, 2024, 2023, 2024, 2023],
+        'region': ['a/b', 'x=y', None, 'a/b', 'plain', '100%'],
+        'kind': pd.Categorical(['u', 'v', 'u', 'v', 'u', 'v']),
+        'flag': [True, False, True, True, False, False],
+        'value': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        'count': pd.array([1, None, 3, 4, 5, 6], dtype='Int64'),
+    })
+
+
+def read(path: Path, **kwargs: Any) -> pd.DataFrame:
+    return load_parquet(path, **kwargs).sort_values('value', ignore_index=True)
+
+
+def siblings(path: Path) -> List[str]:
+    return sorted(p.name for p in path.parent.iterdir() if p.name != path.name)
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_partitions_round_trip(
+    frame: pd.DataFrame,
+    tmp_path: Path,
+    n_jobs: int
+) -> None:
+    path = save_dataset(frame, tmp_path / 'dataset', n_jobs=n_jobs,
+                        partition_cols=['year', 'region', 'kind'])
+    assert (path / COMMON_METADATA).is_file()
+    # Values containing '/' or '=' stay within their partition segment
+    assert {p.name for p in path.glob('year=*/region=*')} == {
+        'region=a%2Fb', 'region=x%3Dy', 'region=plain', 'region=100%25',
+        'region=__HIVE_DEFAULT_PARTITION__',
+    }
+
+    df = read(path)
+    assert list(df.columns) == list(frame.columns)
+    # Partition columns are typed from the schema, not from directory names
+    for column in ('year', 'flag', 'value', 'count'):
+        assert df[column].dtype == frame[column].dtype
+    assert df['region'].isna().tolist() == frame['region'].isna().tolist()
+    # Categorical partition columns come back as strings
+    expected = frame.assign(kind=frame['kind'].astype(str))
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+def test_filters_read_only_matching_partitions(
+    frame: pd.DataFrame,
+    tmp_path: Path
+) -> None:
+    path = save_dataset(frame, tmp_path / 'dataset', partition_cols=['year', 'region'])
+    df = read(path, filters=[('year', '=', 2024)])
+    assert df['value'].tolist() == [2.0, 3.0, 5.0]
+    assert read(path, filters=[('region', '=', 'x=y')])['value'].tolist() == [2.0]
+    df = read(path, filters=[('year', '=', 2023), ('region', '=', 'a/b')])
+    assert df['value'].tolist() == [1.0, 4.0]
+    assert set(df['year']) == {2023}
+
+
+def test_existing_directory_is_replaced_atomically(
+    frame: pd.DataFrame,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / 'dataset'
+    save_dataset(frame, path, partition_cols=['year'])
+    save_dataset(frame[frame['year'] == 2024], path, partition_cols=['region'])
+    # Nothing of the previous layout survives the replacement
+    assert not list(path.glob('year=*'))
+    assert read(path)['value'].tolist() == [2.0, 3.0, 5.0]
+    assert siblings(path) == []
+
+    # A failed write leaves the previous data in place and no staging files
+    def fail(*args: Any) -> None:
+        raise OSError('disk full')
+
+    monkeypatch.setattr(data_loader, '_write_partitions', fail)
+    with pytest.raises(OSError, match='disk full'):
+        save_dataset(frame, path, partition_cols=['year'])
+    assert read(path)['value'].tolist() == [2.0, 3.0, 5.0]
+    assert siblings(path) == []
+    monkeypatch.undo()
+
+    # A file may replace a directory, and the other way around
+    save_dataset(frame, path)
+    assert path.is_file() and len(read(path)) == len(frame)
+    save_dataset(frame, path, partition_cols=['year'])
+    assert path.is_dir() and len(read(path)) == len(frame)
+    assert siblings(path) == []
+
+
+def test_failed_swap_restores_the_previous_directory(
+    frame: pd.DataFrame,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = save_dataset(frame, tmp_path / 'dataset', partition_cols=['year'])
+    replace = os.replace
+
+    def fail_on_staging(src: Any, dst: Any) -> None:
+        if Path(src).name.startswith('.dataset.tmp-'):
+            raise OSError('interrupted')
+        replace(src, dst)
+
+    monkeypatch.setattr(data_loader.os, 'replace', fail_on_staging)
+    with pytest.raises(OSError, match='interrupted'):
+        save_dataset(frame.head(2), path, partition_cols=['year'])
+    monkeypatch.undo()
+    assert len(read(path)) == len(frame)
+    assert siblings(path) == []
+
+
+def test_invalid_partitioning_raises(frame: pd.DataFrame, tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match='requires Parquet'):
+        save_dataset(frame, tmp_path / 'data.csv', partition_cols=['year'])
+    with pytest.raises(ValueError, match='Unknown partition columns'):
+        save_dataset(frame, tmp_path / 'dataset', partition_cols=['month'])
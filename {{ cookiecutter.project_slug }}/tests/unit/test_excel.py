@@ -0,0 +1,78 @@
+"""
+Tests of the Excel readers.
+"""
+
+import importlib.util
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.data.data_loader import iter_excel, load_excel
+
+ENGINES = [
+    'openpyxl',
+    pytest.param('calamine', marks=pytest.mark.skipif(
+        importlib.util.find_spec('python_calamine') is None,
+        reason='python-calamine is not installed',
+    )),
+]
+
+
+@pytest.fixture(scope='module')
+def sheets() -> Dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    return {
+        name: pd.DataFrame({
+            'id': np.arange(rows),
+            'value': rng.normal(size=rows).round(6),
+            'city': rng.choice(['north', 'south', 'east'], size=rows),
+        })
+        for name, rows in [('first', 53), ('second', 20), ('third', 7)]
+    }
+
+
+@pytest.fixture(scope='module')
+def workbook(
+    sheets: Dict[str, pd.DataFrame],
+    tmp_path_factory: pytest.TempPathFactory
+) -> Path:
+    path = tmp_path_factory.mktemp('excel') / 'book.xlsx'
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return path
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('sheet_name', [0, 'second', 2])
+def test_chunks_concatenate_to_the_whole_sheet(
+    workbook: Path,
+    engine: str,
+    sheet_name: object
+) -> None:
+    expected = load_excel(workbook, sheet_name=sheet_name, engine=engine)
+    chunks = list(iter_excel(workbook, sheet_name=sheet_name, chunk_size=6,
+                             engine=engine))
+    assert all(len(chunk) <= 6 for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parallel_sheets_match_sequential(
+    workbook: Path,
+    sheets: Dict[str, pd.DataFrame],
+    engine: str
+) -> None:
+    sequential = load_excel(workbook, sheet_name=None, engine=engine, n_jobs=1)
+    parallel = load_excel(workbook, sheet_name=None, engine=engine, n_jobs=2)
+    assert list(parallel) == list(sequential) == list(sheets)
+    for name, df in sheets.items():
+        pd.testing.assert_frame_equal(parallel[name], sequential[name])
+        pd.testing.assert_frame_equal(parallel[name], df)
+
+    subset = load_excel(workbook, sheet_name=['third', 0], engine=engine, n_jobs=2)
+    assert list(subset) == ['third', 0]
+    pd.testing.assert_frame_equal(subset[0], sheets['first'])
@@ -0,0 +1,89 @@
+"""
+Tests of the feature store behind ``build-features --cache``.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.features.build_features import FeatureStore, build_features
+
+
+@pytest.fixture
+def frame(synthetic_frame: Callable[..., pd.DataFrame]) -> pd.DataFrame:
+    df = synthetic_frame(rows=500, numeric=3, categorical=1, cardinality=3, target=None)
+    return df.set_axis(pd.RangeIndex(7, 7 + len(df)))
+
+
+STEPS: Dict[str, Any] = dict(
+    scale_columns=['num_1'],
+    categorical_columns=['cat_0'],
+    datetime_column='ts_0',
+    interaction_columns=['num_0', 'num_1'],
+)
+
+
+def build(frame: pd.DataFrame, store: FeatureStore, **steps: Any) -> pd.DataFrame:
+    return build_features(frame, store=store, **{**STEPS, **steps})[0]
+
+
+def test_cached_columns_match_uncached_build(frame: pd.DataFrame, tmp_path: Path) -> None:
+    expected, _ = build_features(frame, **STEPS)
+    store = FeatureStore(tmp_path)
+    pd.testing.assert_frame_equal(build(frame, store), expected)
+    assert store.hits == 0 and store.misses == expected.shape[1] - 2
+
+    # A second build loads every derived column instead of computing it
+    store = FeatureStore(tmp_path)
+    pd.testing.assert_frame_equal(build(frame, store), expected)
+    assert store.misses == 0 and store.hits == expected.shape[1] - 2
+
+
+def test_only_new_or_changed_columns_are_computed(
+    frame: pd.DataFrame,
+    tmp_path: Path
+) -> None:
+    build(frame, FeatureStore(tmp_path))
+
+    # One more interaction column adds the two products with 'num_2'
+    columns = ['num_0', 'num_1', 'num_2']
+    store = FeatureStore(tmp_path)
+    df_features = build(frame, store, interaction_columns=columns)
+    products = {'num_0_num_2_product', 'num_1_num_2_product'}
+    assert products <= set(df_features.columns)
+    assert store.misses == 2
+
+    # Changing 'num_0' invalidates the products using it, and nothing else
+    changed = frame.assign(num_0=frame['num_0'].where(frame.index != 10, 0.0))
+    store = FeatureStore(tmp_path)
+    df_features = build(changed, store, interaction_columns=columns)
+    assert store.misses == 2
+    pd.testing.assert_frame_equal(
+        df_features,
+        build_features(changed, **{**STEPS, 'interaction_columns': columns})[0],
+    )
+
+
+def test_eviction_removes_least_recently_used_entries(tmp_path: Path) -> None:
+    store = FeatureStore(tmp_path)
+    index = pd.RangeIndex(2_000)
+    sizes = []
+    for i in range(4):
+        store.put(f'key{i}', pd.Series(np.random.default_rng(i).normal(size=2_000)))
+        path = store._block_path(f'key{i}')
+        os.utime(path, (1_000 + i, 1_000 + i))
+        sizes.append(path.stat().st_size)
+    store.max_size = str(sizes[0] + sizes[3])
+
+    # Reading refreshes an entry, so the oldest unread ones go first
+    assert store.get('key0', index) is not None
+    assert store.evict() == 2
+    assert store.size() == sizes[0] + sizes[3]
+    assert [store.get(f'key{i}', index) is not None for i in range(4)] == [
+        True, False, False, True
+    ]
+    assert FeatureStore(tmp_path, max_size=None).evict() == 0
@@ -0,0 +1,171 @@
+"""
+Tests of the data fetcher against a local HTTP server.
+
+The server serves in-memory files, honours range requests and can be told to
+drop connections, so that retries and resumed downloads are exercised
+without network access.
+"""
+
+import gzip
+import hashlib
+import io
+import re
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import pytest
+
+from {{ cookiecutter.module_name }}.data.fetch import (
+    FetchError,
+    Manifest,
+    ManifestEntry,
+    fetch_manifest,
+)
+from {{ cookiecutter.module_name }}.utils.paths import reset_project_root, set_project_root
+
+CSV = b''.join(b'%d,%d\n' % (i, i * i) for i in range(200_000))
+
+
+class Server(ThreadingHTTPServer):
+    files: Dict[str, bytes]
+    requests: List[Dict[str, str]]
+    # Paths whose next response is cut after this many bytes
+    truncate: Dict[str, int]
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: Server
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.server.requests.append({'path': self.path, **self.headers})
+        data = self.server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        start = 0
+        match = re.fullmatch(r'bytes=(\d+)-', self.headers.get('Range', ''))
+        if match:
+            start = int(match.group(1))
+            if start >= len(data):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+        else:
+            self.send_response(200)
+        body = data[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        cut = self.server.truncate.pop(self.path, None)
+        self.wfile.write(body if cut is None else body[:cut])
+
+
+@pytest.fixture
+def server() -> Iterator[Server]:
+    httpd = Server(('127.0.0.1', 0), Handler)
+    httpd.files, httpd.requests, httpd.truncate = {}, [], {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def project(tmp_path: Path) -> Iterator[Path]:
+    set_project_root(tmp_path)
+    yield tmp_path
+    reset_project_root()
+
+
+def sha256(data: bytes) -> str:
+    return 'sha256:' + hashlib.sha256(data).hexdigest()
+
+
+def url(server: Server, path: str) -> str:
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_downloads_decompress_and_skip_current_files(server: Server, project: Path) -> None:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as f:
+        f.writestr('a.csv', CSV)
+        f.writestr('nested/b.txt', b'b')
+    server.files = {
+        '/plain.csv': CSV,
+        '/packed.csv.gz': gzip.compress(CSV[:1000]) + gzip.compress(CSV[1000:]),
+        '/archive.zip': archive.getvalue(),
+    }
+    manifest = Manifest(files=[
+        ManifestEntry(url=url(server, '/plain.csv'), dest='data/raw/plain.csv',
+                      checksum=sha256(CSV)),
+        ManifestEntry(url=url(server, '/packed.csv.gz'), dest='data/external/packed.csv',
+                      checksum=sha256(server.files['/packed.csv.gz'])),
+        ManifestEntry(url=url(server, '/archive.zip'), dest='data/raw/archive'),
+    ])
+
+    results = fetch_manifest(manifest, max_workers=3, backoff=0)
+    assert [result.status for result in results] == ['downloaded'] * 3
+    assert (project / 'data/raw/plain.csv').read_bytes() == CSV
+    assert (project / 'data/external/packed.csv').read_bytes() == CSV
+    assert (project / 'data/raw/archive/nested/b.txt').read_bytes() == b'b'
+    assert results[2].checksum == sha256(archive.getvalue())
+    assert not list(project.glob('data/**/*.part'))
+
+    requests = len(server.requests)
+    assert [r.status for r in fetch_manifest(manifest)] == ['skipped'] * 3
+    assert len(server.requests) == requests
+
+    # A modified output is downloaded again
+    (project / 'data/external/packed.csv').write_bytes(b'changed')
+    statuses = [r.status for r in fetch_manifest(manifest, names=['packed.csv'])]
+    assert statuses == ['downloaded']
+    assert (project / 'data/external/packed.csv').read_bytes() == CSV
+
+
+def test_interrupted_download_is_resumed(server: Server, project: Path) -> None:
+    data = gzip.compress(CSV)
+    server.files = {'/data.csv.gz': data}
+    server.truncate = {'/data.csv.gz': len(data) // 2}
+    entry = ManifestEntry(url=url(server, '/data.csv.gz'), dest='data/raw/data.csv',
+                          checksum=sha256(data))
+
+    [result] = fetch_manifest(Manifest(files=[entry]), backoff=0)
+    assert result.resumed and result.bytes == len(data) - len(data) // 2
+    assert server.requests[-1]['Range'] == f'bytes={len(data) // 2}-'
+    assert (project / 'data/raw/data.csv').read_bytes() == CSV
+
+
+def test_checksum_mismatch_fails_without_writing(server: Server, project: Path) -> None:
+    server.files = {'/plain.csv': CSV}
+    entry = ManifestEntry(url=url(server, '/plain.csv'), dest='data/raw/plain.csv',
+                          checksum=sha256(b'other'))
+    missing = ManifestEntry(url=url(server, '/missing.csv'), dest='data/raw/missing.csv')
+
+    with pytest.raises(FetchError) as excinfo:
+        fetch_manifest(Manifest(files=[entry, missing]), retries=1, backoff=0)
+    assert [r.status for r in excinfo.value.results] == ['failed', 'failed']
+    # Failed results name their absolute destination, as the others do
+    assert [r.path for r in excinfo.value.results] == [
+        entry.path, (project / 'data/raw/missing.csv').resolve()
+    ]
+    assert 'ChecksumError' in excinfo.value.results[0].error
+    assert '404' in excinfo.value.results[1].error
+    assert len([r for r in server.requests if r['path'] == '/plain.csv']) == 2
+    assert not (project / 'data/raw').exists() or not list((project / 'data/raw').iterdir())
+
+
+def test_destination_must_be_a_data_directory(server: Server) -> None:
+    entry = ManifestEntry(url=url(server, '/plain.csv'), dest='models/plain.csv')
+    with pytest.raises(FetchError, match='not inside data/raw') as excinfo:
+        fetch_manifest(Manifest(files=[entry]))
+    assert excinfo.value.results[0].path == entry.absolute_dest
+    assert entry.absolute_dest.is_absolute()
+    with pytest.raises(ValueError, match='checksum'):
+        ManifestEntry(url=url(server, '/plain.csv'), dest='data/raw/a', checksum='abc')
@@ -0,0 +1,72 @@
+"""
+Import-time budget tests.
+
+Importing the package and starting the CLI must stay cheap: heavy
+dependencies are only loaded when the functionality that needs them is used.
+"""
+
+import subprocess
+import sys
+import time
+
+PACKAGE = "{{ cookiecutter.module_name }}"
+
+# Dependencies that must not be imported as a side effect of importing the package
+HEAVY_MODULES = [
+    "dotenv",
+    "duckdb",
+    "joblib",
+    "matplotlib",
+    "mlflow",
+    "numpy",
+    "pandas",
+    "polars",
+    "seaborn",
+    "sklearn",
+]
+
+# Startup budget for the CLI, on top of the bare interpreter startup
+CLI_STARTUP_BUDGET_SECONDS = 0.1
+
+
+def _best_wall_time(args: list[str], repeat: int = 5) -> float:
+    """Return the fastest wall time of running a Python subprocess."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_package_import_does_not_load_heavy_dependencies() -> None:
+    """Importing the package and its subpackages keeps heavy deps unloaded."""
+    code = (
+        "import sys\n"
+        f"import {PACKAGE}.__main__\n"
+        f"from {PACKAGE} import data, features, models, utils, visualization\n"
+        f"heavy = {HEAVY_MODULES!r}\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_cli_help_startup_within_budget() -> None:
+    """`python -m <package> --help` starts within the startup budget."""
+    baseline = _best_wall_time(["-c", "pass"])
+    cli = _best_wall_time(["-m", PACKAGE, "--help"])
+    assert cli - baseline < CLI_STARTUP_BUDGET_SECONDS, (
+        f"CLI startup took {cli - baseline:.3f}s over interpreter startup "
+        f"(budget {CLI_STARTUP_BUDGET_SECONDS:.3f}s)"
+    )
@@ -0,0 +1,135 @@
+"""
+Tests of drift references, metrics and monitors.
+"""
+
+import json
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.models.monitoring import (
+    PREDICTION,
+    DriftMonitor,
+    DriftReference,
+    FeatureReference,
+    ReferenceBuilder,
+    build_reference,
+    drift_metrics,
+)
+
+
+@pytest.fixture
+def frame(synthetic_frame: Callable[..., pd.DataFrame]) -> pd.DataFrame:
+    return synthetic_frame(
+        rows=5_000, numeric=2, categorical=1, datetime=0, cardinality=4,
+        null_rate=0.1, target=None
+    )
+
+
+def test_values_are_counted_per_bin() -> None:
+    numeric = FeatureReference('numeric', [0.1, 0.3, 0.3, 0.2, 0.1], edges=[1, 2, 3])
+    values = pd.Series([0.5, 1, 1.5, 3, 4, np.nan, 'x'], dtype=object)
+    # Missing values first, then bins closed on the right; non-numbers are missing
+    assert numeric.counts(values).tolist() == [2, 2, 1, 1, 1]
+
+    categorical = FeatureReference('categorical', [0.1, 0.5, 0.3, 0.1],
+                                   categories=['a', 'b'])
+    values = pd.Series(['a', 'b', 'c', None, 'a', 'd'])
+    assert categorical.counts(values).tolist() == [1, 2, 1, 2]
+
+
+def test_drift_metrics() -> None:
+    expected = np.array([0.0, 0.25, 0.25, 0.25, 0.25])
+    same = drift_metrics(expected, expected)
+    assert same == pytest.approx({'psi': 0.0, 'ks': 0.0, 'js': 0.0}, abs=1e-9)
+
+    shifted = drift_metrics(expected, np.array([0.0, 0.0, 0.25, 0.25, 0.5]))
+    assert shifted['ks'] == pytest.approx(0.25)
+    assert shifted['psi'] > 0.2 and 0 < shifted['js'] < 1
+    disjoint = drift_metrics(np.array([0.0, 1.0, 0.0]), np.array([0.0, 0.0, 1.0]))
+    assert disjoint['ks'] == 1.0 and disjoint['js'] == pytest.approx(1.0, abs=1e-2)
+    # Only the missing share changed: no shift of the values themselves
+    missing = drift_metrics(np.array([0.0, 0.5, 0.5]), np.array([0.5, 0.25, 0.25]))
+    assert missing['ks'] == 0.0 and missing['psi'] > 0
+
+
+def test_reference_round_trip(frame: pd.DataFrame, tmp_path: Path) -> None:
+    predictions = (frame['num_0'] > 0).astype(int).to_numpy()
+    reference = build_reference(frame, predictions, bins=10)
+    assert reference.rows == len(frame)
+    assert set(reference.features) == {'num_0', 'num_1', 'cat_0'}
+    for feature in [*reference.features.values(), reference.prediction]:
+        assert sum(feature.expected) == pytest.approx(1.0)
+    numeric = reference.features['num_1']
+    assert numeric.kind == 'numeric' and len(numeric.edges) == 9
+    assert numeric.expected[0] == pytest.approx(frame['num_1'].isna().mean())
+    # Deciles hold a tenth of the present values each
+    np.testing.assert_allclose(numeric.expected[1:], 0.09, atol=0.01)
+    categorical = reference.features['cat_0']
+    assert categorical.kind == 'categorical'
+    assert categorical.categories == ['cat_0_0', 'cat_0_1', 'cat_0_2', 'cat_0_3']
+
+    path = reference.save(tmp_path / 'model.drift.json')
+    loaded = DriftReference.load(path)
+    assert loaded == reference
+    assert loaded.features['cat_0'].counts(frame['cat_0']).tolist() == (
+        categorical.counts(frame['cat_0']).tolist()
+    )
+
+    # References built from chunks match the one built at once
+    chunks = ReferenceBuilder(bins=10)
+    for start in range(0, len(frame), 1_000):
+        chunks.update(frame.iloc[start:start + 1_000])
+    chunked = chunks.build()
+    assert chunked.features['cat_0'] == categorical
+    np.testing.assert_allclose(chunked.features['num_0'].expected,
+                               reference.features['num_0'].expected, atol=0.01)
+
+
+def test_chunks_take_one_prediction_array_each(frame: pd.DataFrame) -> None:
+    predictions = (frame['num_0'] > 0).astype(int).to_numpy()
+    whole = build_reference(frame, predictions, bins=10)
+    chunks = [frame.iloc[start:start + 1_000] for start in range(0, len(frame), 1_000)]
+    parts = [predictions[start:start + 1_000] for start in range(0, len(frame), 1_000)]
+    chunked = build_reference(iter(chunks), iter(parts), bins=10)
+    assert chunked.prediction is not None and whole.prediction is not None
+    # Quantile sketches of chunks are approximate
+    np.testing.assert_allclose(chunked.prediction.expected,
+                               whole.prediction.expected, atol=0.01)
+    assert build_reference(iter(chunks), bins=10).prediction is None
+
+    # A single array for all chunks, or chunks that do not line up, are errors
+    for bad in (predictions, parts[:-1], parts + [parts[0]], [p[:-1] for p in parts]):
+        with pytest.raises(ValueError, match='predictions'):
+            build_reference(iter(chunks), bad, bins=10)
+
+
+def test_monitor_accumulates_and_logs_batches(
+    frame: pd.DataFrame,
+    tmp_path: Path
+) -> None:
+    predictions = (frame['num_0'] > 0).astype(int).to_numpy()
+    reference = build_reference(frame, predictions, bins=10)
+    log_path = tmp_path / 'drift.jsonl'
+    monitor = DriftMonitor(reference, name='demo', log_path=log_path, psi_threshold=0.2)
+
+    same = monitor.update(frame.iloc[:2_000], predictions[:2_000])
+    assert set(same) == {'num_0', 'num_1', 'cat_0', PREDICTION}
+    assert monitor.drifted(same) == []
+    older = frame.iloc[2_000:].assign(num_0=frame['num_0'].iloc[2_000:] + 1.5)
+    shifted = monitor.update(older.drop(columns=['cat_0']))
+    assert 'cat_0' not in shifted and PREDICTION not in shifted
+    assert monitor.drifted(shifted) == ['num_0']
+
+    assert monitor.rows == len(frame)
+    summary = monitor.summary()
+    assert summary['num_0']['psi'] < shifted['num_0']['psi']
+    assert summary['cat_0']['psi'] == pytest.approx(same['cat_0']['psi'])
+
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [record['rows'] for record in records] == [2_000, 3_000]
+    assert records[-1]['total_rows'] == len(frame)
+    assert records[-1]['model'] == 'demo' and records[-1]['drifted'] == ['num_0']
@@ -0,0 +1,160 @@
+"""
+Tests of the local pipeline executor.
+
+Stages are shell commands working on files of a temporary project, so that
+scheduling, fingerprinting and the ``dvc.yaml`` round trip are exercised
+without running the project stages.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from {{ cookiecutter.module_name }}.pipeline import Pipeline, PipelineError, Stage
+from {{ cookiecutter.module_name }}.utils.paths import reset_project_root, set_project_root
+
+
+@pytest.fixture(autouse=True)
+def project(tmp_path: Path) -> Iterator[Path]:
+    set_project_root(tmp_path)
+    (tmp_path / 'data').mkdir()
+    (tmp_path / 'data/raw.txt').write_text('raw\n')
+    yield tmp_path
+    reset_project_root()
+
+
+def diamond() -> Pipeline:
+    """raw -> a -> (b, c) -> d, each stage appending its name to its input."""
+    return Pipeline([
+        Stage('d', cmd='cat data/b.txt data/c.txt > data/d.txt',
+              deps=['data/b.txt', 'data/c.txt'], outs=['data/d.txt']),
+        Stage('b', cmd='cat data/a.txt > data/b.txt && echo b >> data/b.txt',
+              deps=['data/a.txt'], outs=['data/b.txt']),
+        Stage('c', cmd='cat data/a.txt > data/c.txt && echo c >> data/c.txt',
+              deps=['data/a.txt'], outs=['data/c.txt']),
+        Stage('a', cmd='cat data/raw.txt > data/a.txt && echo a >> data/a.txt',
+              deps=['data/raw.txt'], outs=['data/a.txt']),
+    ])
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_runs_stale_stages_in_dependency_order(project: Path, n_jobs: int) -> None:
+    pipeline = diamond()
+    assert pipeline.topological_order() == ['a', 'b', 'c', 'd']
+    executed = pipeline.run(n_jobs=n_jobs)
+    assert executed[0] == 'a' and executed[-1] == 'd' and len(executed) == 4
+    assert (project / 'data/d.txt').read_text() == 'raw\na\nb\nraw\na\nc\n'
+    assert set(pipeline.status().values()) == {'up-to-date'}
+
+    # State persists across instances; only the stages downstream of a change run
+    assert diamond().run(n_jobs=n_jobs) == []
+    (project / 'data/c.txt').write_text('edited\n')
+    assert diamond().run(n_jobs=n_jobs) == ['c']
+    (project / 'data/raw.txt').write_text('new\n')
+    assert diamond().status() == dict.fromkeys('abcd', 'stale')
+    assert diamond().run(['b'], n_jobs=n_jobs) == ['a', 'b']
+    assert diamond().run(['d'], with_deps=False, dry_run=True) == ['d']
+
+
+def test_fingerprint_covers_inputs_code_and_params(project: Path) -> None:
+    pipeline = diamond()
+    fingerprint = pipeline.fingerprint('a')
+    assert fingerprint is not None and pipeline.fingerprint('b') is None
+
+    (project / 'data/raw.txt').write_text('changed\n')
+    assert pipeline.fingerprint('a') != fingerprint
+
+    stage = dict(name='a', cmd='true', deps=['data/raw.txt'], outs=['data/a.txt'])
+    fingerprints = {
+        Pipeline([Stage(**stage, params=params)]).fingerprint('a')
+        for params in ({}, {'k': 1}, {'k': 2})
+    }
+    assert len(fingerprints) == 3
+
+
+def test_failures_and_invalid_graphs_raise(project: Path) -> None:
+    with pytest.raises(PipelineError, match='did not produce'):
+        Pipeline([Stage('a', cmd='true', outs=['data/missing.txt'])]).run()
+    with pytest.raises(PipelineError, match="'a' failed"):
+        Pipeline([Stage('a', cmd='exit 3')]).run()
+
+    cycle = Pipeline([
+        Stage('A', cmd='true', deps=['data/b.txt'], outs=['data/a.txt']),
+        Stage('B', cmd='true', deps=['data/a.txt'], outs=['data/b.txt']),
+    ])
+    for with_deps in (True, False):
+        with pytest.raises(ValueError, match='cycle'):
+            cycle.run(['A', 'B'], with_deps=with_deps)
+    with pytest.raises(ValueError, match='Unknown stage'):
+        cycle.run(['C'], with_deps=False)
+
+
+def test_dvc_yaml_round_trip(project: Path) -> None:
+    path = diamond().to_dvc_yaml()
+    assert path == project / 'dvc.yaml'
+    pipeline = Pipeline.from_dvc_yaml(state_path=project / 'state.json')
+    assert pipeline.topological_order() == ['a', 'b', 'c', 'd']
+    for name, stage in diamond().stages.items():
+        loaded = pipeline.stages[name]
+        assert loaded.cmd == stage.cmd
+        assert (loaded.deps, loaded.outs) == (stage.deps, stage.outs)
+    assert pipeline.run() == ['a', 'b', 'c', 'd']
+
+
+def test_fingerprint_covers_the_code_a_stage_calls(
+    project: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    package = project / 'src' / 'stagepkg'
+    package.mkdir(parents=True)
+    (package / '__init__.py').write_text('')
+    (package / 'stage.py').write_text(
+        'from stagepkg.helpers import suffix\n\n'
+        'def run():\n    return suffix()\n'
+    )
+    (package / 'helpers.py').write_text('def suffix():\n    return 1\n')
+    monkeypatch.syspath_prepend(str(project / 'src'))
+    monkeypatch.delitem(sys.modules, 'stagepkg', raising=False)
+    pipeline = Pipeline([Stage('a', func='stagepkg.stage:run')])
+    fingerprint = pipeline.fingerprint('a')
+
+    # Bytecode caches are not code changes, but edits of called modules are
+    (package / '__pycache__').mkdir()
+    (package / '__pycache__' / 'helpers.cpython.pyc').write_bytes(b'\0')
+    assert pipeline.fingerprint('a') == fingerprint
+    (package / 'helpers.py').write_text('def suffix():\n    return 22\n')
+    assert pipeline.fingerprint('a') != fingerprint
+
+    # Command stages hash the code they declare
+    (project / 'scripts').mkdir()
+    script = project / 'scripts' / 'step.sh'
+    script.write_text('echo one\n')
+    stage = Pipeline([Stage('a', cmd='sh scripts/step.sh', code=['scripts'])])
+    fingerprint = stage.fingerprint('a')
+    script.write_text('echo three\n')
+    assert stage.fingerprint('a') != fingerprint
+
+
+def test_moved_project_stays_up_to_date(
+    project: Path,
+    tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    def pipeline(root: Path) -> Pipeline:
+        # Absolute paths, as built by the helpers of utils.paths
+        return Pipeline([Stage(
+            'a', cmd='cat data/raw.txt > data/a.txt',
+            deps=[root / 'data/raw.txt'], outs=[root / 'data/a.txt'],
+            params={'input': root / 'data/raw.txt',
+                    'output': str(root / 'data/a.txt')},
+        )])
+
+    assert pipeline(project).run() == ['a']
+    moved = tmp_path_factory.mktemp('moved') / 'project'
+    shutil.copytree(project, moved)
+    set_project_root(moved)
+    assert pipeline(moved).status() == {'a': 'up-to-date'}
+    (moved / 'data/raw.txt').write_text('changed\n')
+    assert pipeline(moved).run() == ['a']
@@ -0,0 +1,123 @@
+"""
+Tests of spans and of the stage profilers.
+"""
+
+import json
+import os
+import pstats
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.config import ENV_PREFIX, reset_settings
+from {{ cookiecutter.module_name }}.utils.paths import reset_project_root, set_project_root
+from {{ cookiecutter.module_name }}.utils.profiling import (
+    disable_spans,
+    enable_spans,
+    instrument,
+    profile_call,
+    reset_spans,
+    span,
+    spans_enabled,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_spans(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    for name in [name for name in os.environ if name.startswith(ENV_PREFIX)]:
+        monkeypatch.delenv(name)
+    reset_settings()
+    reset_spans()
+    yield
+    reset_spans()
+    monkeypatch.undo()
+    reset_settings()
+
+
+def records(path: Path) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@instrument(name='load')
+def load(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({'a': range(rows)})
+
+
+def busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_spans_record_nesting_rows_and_errors(tmp_path: Path) -> None:
+    path = tmp_path / 'spans.jsonl'
+    enable_spans(path)
+    with span('outer') as outer:
+        outer.rows = 10
+        with span('inner', rows=5):
+            pass
+        assert len(load(7)) == 7
+    with pytest.raises(ValueError, match='boom'):
+        with span('failing'):
+            raise ValueError('boom')
+
+    inner, loaded, outer_record, failing = records(path)
+    assert (inner['name'], inner['parent'], inner['rows']) == ('inner', 'outer', 5)
+    assert (loaded['name'], loaded['parent'], loaded['rows']) == ('load', 'outer', 7)
+    assert outer_record['parent'] is None and outer_record['rows'] == 10
+    assert outer_record['wall_time_s'] >= inner['wall_time_s'] >= 0
+    assert outer_record['rows_per_s'] > 0 and outer_record['pid'] == os.getpid()
+    assert [inner['status'], outer_record['status']] == ['ok', 'ok']
+    assert failing['status'] == 'error' and failing['rows'] is None
+
+
+def test_disabled_spans_write_nothing(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / 'spans.jsonl'
+    enable_spans(path)
+    disable_spans()
+    assert not spans_enabled()
+    with span('ignored') as current:
+        current.rows = 1
+    assert len(load(3)) == 3
+    assert not path.exists()
+
+    # Once reset, the settings decide again and name the file in logs/
+    monkeypatch.setenv(f'{ENV_PREFIX}PROFILING__SPANS', 'true')
+    monkeypatch.setenv(f'{ENV_PREFIX}PROFILING__SPANS_FILE', 'test-spans.jsonl')
+    reset_settings()
+    reset_spans()
+    set_project_root(tmp_path)
+    try:
+        assert spans_enabled()
+        load(2)
+    finally:
+        reset_project_root()
+    assert not path.exists()
+    written = records(tmp_path / 'logs' / 'test-spans.jsonl')
+    assert [record['name'] for record in written] == ['load']
+
+
+def test_profile_call_writes_profiles(tmp_path: Path) -> None:
+    result = profile_call(busy, 10_000, name='stage', output_dir=tmp_path)
+    assert result == busy(10_000)
+    stats = pstats.Stats(str(tmp_path / 'stage.prof'))
+    assert 'busy' in stats.get_stats_profile().func_profiles
+
+    profile_call(
+        busy, 2_000_000, name='stage', output_format='collapsed', output_dir=tmp_path
+    )
+    lines = (tmp_path / 'stage.folded').read_text().splitlines()
+    assert lines and all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines)
+    assert any('busy' in line for line in lines)
+
+    # The profile is written even if the function fails
+    with pytest.raises(ZeroDivisionError):
+        profile_call(lambda: 1 / 0, name='failing', output_dir=tmp_path)
+    assert (tmp_path / 'failing.prof').is_file()
+
+    with pytest.raises(ValueError, match='Unsupported profile format'):
+        profile_call(busy, 1, name='other', output_format='svg', output_dir=tmp_path)
+    assert not (tmp_path / 'other.svg').exists()
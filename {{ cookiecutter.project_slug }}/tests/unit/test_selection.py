@@ -0,0 +1,136 @@
+"""
+Tests of the streaming feature selector.
+
+Selection must not depend on how the data are chunked or split into column
+blocks, and the fitted selector must make `build_features` skip the columns
+it drops.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.features.build_features import build_features
+from {{ cookiecutter.module_name }}.features.feature_engineering import create_interaction_features
+from {{ cookiecutter.module_name }}.features.selection import (
+    ColumnMoments,
+    FeatureSelector,
+    select_features,
+)
+
+
+@pytest.fixture
+def frame(synthetic_frame: Callable[..., pd.DataFrame]) -> pd.DataFrame:
+    """Frame with informative, noise, constant and redundant columns, and a target."""
+    rng = np.random.default_rng(0)
+    rows = 5_000
+    signal = rng.normal(size=rows)
+    df = pd.DataFrame({
+        'signal': signal,
+        'signal_copy': 2 * signal + 0.01 * rng.normal(size=rows),
+        'weak': rng.normal(size=rows),
+        'constant': np.ones(rows),
+        'flag': rng.integers(0, 2, size=rows).astype(bool),
+    })
+    # Synthetic columns unrelated to the target: noise and a categorical one,
+    # from another seed than the signal
+    unrelated = synthetic_frame(
+        rows=rows, numeric=6, categorical=1, datetime=0, cardinality=2,
+        target=None, seed=1
+    )
+    df = pd.concat([df, unrelated], axis=1)
+    df.loc[::50, 'weak'] = np.nan
+    noise = 0.3 * rng.normal(size=rows)
+    df['target'] = (signal + 0.5 * df['weak'].fillna(0) + noise > 0)
+    df['target'] = df['target'].astype(int)
+    df.index = pd.RangeIndex(100, 100 + rows)
+    return df
+
+
+def test_moments_merge_exactly() -> None:
+    values = np.random.default_rng(1).normal(size=(1_001, 3))
+    values[::7, 1] = np.nan
+    merged = ColumnMoments(3).update(values[:400])
+    merged.merge(ColumnMoments(3).update(values[400:]))
+    np.testing.assert_array_equal(merged.count, [1_001, 858, 1_001])
+    np.testing.assert_allclose(merged.mean, np.nanmean(values, axis=0))
+    np.testing.assert_allclose(merged.variance, np.nanvar(values, axis=0, ddof=1))
+
+
+def test_filters(frame: pd.DataFrame) -> None:
+    y = frame.pop('target')
+    selector = FeatureSelector(
+        correlation_threshold=0.9, mutual_info_threshold=0.005, chunk_size=1_000
+    ).fit(frame, y)
+    assert selector.task_ == 'classification'
+    assert selector.dropped_['constant'] == 'variance'
+    assert selector.dropped_['signal_copy'] == 'correlation'
+    assert selector.scores_.loc['signal_copy', 'correlated_with'] == 'signal'
+    assert {'signal', 'weak'} <= set(selector.selected_)
+    assert all(selector.dropped_.get(f'num_{i}') == 'mutual_info' for i in range(6))
+    assert list(selector.feature_names_in_) == [c for c in frame.columns if c != 'cat_0']
+
+    selected = selector.transform(frame)
+    assert 'cat_0' in selected.columns and 'constant' not in selected.columns
+    assert list(selector.get_feature_names_out()) == selector.selected_
+
+    importance = FeatureSelector(importance_threshold=0.05, max_features=1)
+    importance.fit(frame, y)
+    # The two collinear columns share the importance of the signal
+    assert importance.selected_ in (['signal'], ['signal_copy'])
+    assert importance.dropped_['num_0'] == 'importance'
+    assert importance.scores_['importance'].sum() == pytest.approx(1.0)
+    with pytest.raises(ValueError, match='target'):
+        FeatureSelector(mutual_info_threshold=0.01).fit(frame)
+
+
+def test_result_does_not_depend_on_chunks_or_blocks(
+    frame: pd.DataFrame,
+    tmp_path: Path
+) -> None:
+    y = frame.pop('target').astype(float)
+    params = dict(
+        correlation_threshold=0.8, importance_threshold=0.01, task='regression'
+    )
+    expected = FeatureSelector(**params, chunk_size=len(frame)).fit(frame, y)
+    for chunk_size, block_size, n_jobs in [(333, 1, 4), (1_000, 3, 2), (4_999, 128, 1)]:
+        selector = FeatureSelector(
+            **params, chunk_size=chunk_size, block_size=block_size, n_jobs=n_jobs
+        ).fit(frame, y)
+        assert selector.dropped_ == expected.dropped_
+        pd.testing.assert_frame_equal(selector.scores_, expected.scores_, rtol=1e-9)
+
+    path = tmp_path / 'features.parquet'
+    frame.assign(target=y).to_parquet(path)
+    from_file = FeatureSelector(**params, chunk_size=700)
+    from_file.fit_dataset(path, target='target')
+    assert from_file.dropped_ == expected.dropped_
+
+
+def test_build_features_skips_dropped_columns(frame: pd.DataFrame) -> None:
+    y = frame.pop('target')
+    columns = ['signal', 'weak', 'num_0']
+    df_features, transformers = build_features(
+        frame, categorical_columns=['cat_0'], interaction_columns=columns,
+        selection={'max_features': 4, 'mutual_info_threshold': 0.0}, y=y
+    )
+    selector = transformers['selector']
+    assert not set(df_features.columns) & set(selector.dropped_)
+    assert len(selector.selected_) == 4
+
+    interactions = create_interaction_features(frame, columns, selector=selector)
+    assert not set(interactions.columns) - set(frame.columns) - set(selector.selected_)
+
+    # Applying the fitted selector, in chunks or not, gives the same columns
+    for chunk_size in [0, 1_000]:
+        rebuilt, _ = build_features(
+            frame, categorical_columns=['cat_0'], interaction_columns=columns,
+            transformers=transformers, chunk_size=chunk_size, n_jobs=2
+        )
+        pd.testing.assert_frame_equal(rebuilt, df_features)
+
+    selected, fitted = select_features(df_features, y, selector=selector)
+    assert fitted is selector and selected.equals(df_features)
@@ -0,0 +1,186 @@
+"""
+Tests of the micro-batching model server.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from {{ cookiecutter.module_name }}.models.model_utils import save_model
+from {{ cookiecutter.module_name }}.models.monitoring import DriftMonitor, build_reference
+from {{ cookiecutter.module_name }}.models.serving import MicroBatcher, ModelRegistry
+
+APP = Path(__file__).resolve().parents[2] / 'app' / 'main.py'
+
+
+@pytest.fixture(scope='module')
+def model() -> LinearRegression:
+    X = pd.DataFrame({'a': [0.0, 1.0, 2.0, 3.0], 'b': [1.0, 0.0, 1.0, 0.0]})
+    return LinearRegression().fit(X, 2 * X['a'] + X['b'])
+
+
+def requests(n: int) -> List[pd.DataFrame]:
+    return [pd.DataFrame({'b': [0.0, 1.0], 'a': [float(i), 0.0]}) for i in range(n)]
+
+
+def test_concurrent_requests_are_batched(model: LinearRegression) -> None:
+    async def run() -> List[np.ndarray]:
+        batcher = MicroBatcher(model, max_latency_ms=50, workers=1)
+        try:
+            results = await asyncio.gather(*(batcher.submit(X) for X in requests(10)))
+        finally:
+            await batcher.stop()
+        assert batcher.metrics.batches < 10
+        summary = batcher.metrics.summary()
+        assert (summary['requests'], summary['rows'], summary['errors']) == (10, 20, 0)
+        assert summary['mean_batch_rows'] > 2
+        assert summary['latency_ms']['p99'] >= summary['latency_ms']['p50'] > 0
+        return results
+
+    for i, predictions in enumerate(asyncio.run(run())):
+        np.testing.assert_allclose(predictions, [2 * i, 1.0], atol=1e-9)
+
+
+def test_bad_request_does_not_fail_its_batch(model: LinearRegression) -> None:
+    async def run() -> List[Any]:
+        batcher = MicroBatcher(model, max_latency_ms=50, workers=1)
+        bad = pd.DataFrame({'a': ['x'], 'b': [0.0]})
+        try:
+            results = await asyncio.gather(
+                *(batcher.submit(X) for X in [*requests(3), bad]),
+                batcher.submit(pd.DataFrame({'a': [1.0]})),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+        assert batcher.metrics.errors == 2
+        assert batcher.metrics.requests == 3
+        return results
+
+    *results, bad, missing = asyncio.run(run())
+    for i, predictions in enumerate(results):
+        np.testing.assert_allclose(predictions, [2 * i, 1.0], atol=1e-9)
+    assert isinstance(bad, ValueError)
+    assert isinstance(missing, ValueError) and 'Missing features' in str(missing)
+
+
+def test_registry_loads_and_reports_models(
+    model: LinearRegression,
+    tmp_path: Path
+) -> None:
+    save_model(model, tmp_path / 'linear.joblib')
+    (tmp_path / 'notes.txt').write_text('not a model')
+
+    async def run() -> Any:
+        registry = ModelRegistry.from_directory(tmp_path, max_latency_ms=0)
+        assert list(registry.models) == ['linear']
+        assert registry.batcher('linear') is registry.batcher('linear')
+        predictions = await registry.batcher('linear').submit(requests(2)[1])
+        metrics = registry.metrics()
+        await registry.close()
+        return predictions, metrics
+
+    predictions, metrics = asyncio.run(run())
+    np.testing.assert_allclose(predictions, [2.0, 1.0], atol=1e-9)
+    assert metrics['linear']['requests'] == 1 and 'drift' not in metrics['linear']
+
+
+class BlockingMonitor(DriftMonitor):
+    """Monitor whose updates wait for `release`, or fail with `error`."""
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        X = pd.DataFrame({'a': np.arange(10.0), 'b': np.arange(10.0) % 2})
+        super().__init__(build_reference(X, bins=4), log_path=False)
+        self.release = threading.Event()
+        self.error = error
+
+    def update(self, X: pd.DataFrame, predictions: Optional[Any] = None) -> Any:
+        self.release.wait(10)
+        if self.error is not None:
+            raise self.error
+        return super().update(X, predictions)
+
+
+def test_monitoring_does_not_hold_the_scoring_worker(model: LinearRegression) -> None:
+    monitor = BlockingMonitor()
+
+    async def run() -> List[np.ndarray]:
+        batcher = MicroBatcher(model, max_latency_ms=0, workers=1, monitor=monitor)
+        try:
+            # The second batch is scored while the first is still monitored
+            first = await asyncio.wait_for(batcher.submit(requests(1)[0]), 5)
+            second = await asyncio.wait_for(batcher.submit(requests(2)[1]), 5)
+            assert monitor.rows == 0
+        finally:
+            monitor.release.set()
+            await batcher.stop()
+        assert monitor.rows == 4
+        return [first, second]
+
+    first, second = asyncio.run(run())
+    np.testing.assert_allclose(first, [0.0, 1.0], atol=1e-9)
+    np.testing.assert_allclose(second, [2.0, 1.0], atol=1e-9)
+
+
+def test_monitoring_failures_are_logged(
+    model: LinearRegression,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    monitor = BlockingMonitor(RuntimeError('log volume full'))
+    monitor.release.set()
+
+    async def run() -> np.ndarray:
+        batcher = MicroBatcher(model, max_latency_ms=0, workers=1, monitor=monitor)
+        try:
+            return await batcher.submit(requests(1)[0])
+        finally:
+            await batcher.stop()
+
+    with caplog.at_level(logging.ERROR):
+        predictions = asyncio.run(run())
+    np.testing.assert_allclose(predictions, [0.0, 1.0], atol=1e-9)
+    assert 'Drift monitoring failed on a batch of 2 rows' in caplog.text
+    assert 'log volume full' in caplog.text
+
+
+def load_app() -> ModuleType:
+    spec = importlib.util.spec_from_file_location('serving_app', APP)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-1'])
+def test_malformed_content_length_is_answered(
+    model: LinearRegression,
+    length: bytes
+) -> None:
+    app = load_app()
+    server = app.InferenceServer(ModelRegistry({'linear': model}))
+
+    async def run() -> bytes:
+        listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'POST /predict/linear HTTP/1.1\r\nContent-Length: ' + length
+                         + b'\r\n\r\n{}')
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        await server.registry.close()
+        return response
+
+    response = asyncio.run(run())
+    assert response.startswith(b'HTTP/1.1 400 ')
+    assert b'Content-Length must' in response and b'Connection: close' in response
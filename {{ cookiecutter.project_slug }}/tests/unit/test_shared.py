@@ -0,0 +1,80 @@
+"""
+Tests of the shared memory handoff to worker processes.
+"""
+
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from {{ cookiecutter.module_name }}.features.build_features import build_features
+from {{ cookiecutter.module_name }}.models.predict_model import predict
+from {{ cookiecutter.module_name }}.utils.shared import (
+    SHM_DIR,
+    release,
+    retain,
+    share,
+    shared,
+)
+
+
+@pytest.fixture
+def frame(synthetic_frame: Callable[..., pd.DataFrame]) -> pd.DataFrame:
+    df = synthetic_frame(
+        rows=1_000, numeric=2, categorical=1, datetime=0, cardinality=2, target=None
+    )
+    return df.set_axis(pd.RangeIndex(10, 10 + len(df)))
+
+
+def shm_files() -> List[Path]:
+    return sorted(SHM_DIR.glob('shared-*'))
+
+
+def test_files_are_removed_with_the_last_reference(
+    frame: pd.DataFrame,
+    tmp_path: Path
+) -> None:
+    handle = share(frame, directory=tmp_path)
+    assert retain(handle) is handle
+    pd.testing.assert_frame_equal(handle.load(), frame)
+    release(handle)
+    assert Path(handle.path).exists()
+    release(handle)
+    assert not Path(handle.path).exists()
+    with pytest.raises(ValueError, match='already released'):
+        retain(handle)
+
+    before = shm_files()
+    with shared(np.arange(6.0).reshape(3, 2)) as array_handle:
+        array = array_handle.load()
+        np.testing.assert_array_equal(array, [[0, 1], [2, 3], [4, 5]])
+        assert not array.flags.writeable
+    assert shm_files() == before
+    with pytest.raises(ValueError, match='Cannot share'):
+        share([1, 2])
+
+
+def test_processes_match_threads(frame: pd.DataFrame) -> None:
+    before = shm_files()
+    X = frame[['num_0', 'num_1']]
+    model = LinearRegression().fit(X, X['num_0'] * 2 - X['num_1'])
+    options = dict(chunk_size=150, n_jobs=2)
+    np.testing.assert_array_equal(
+        predict(model, X, backend='processes', **options),
+        predict(model, X, backend='threads', **options),
+    )
+
+    steps = dict(scale_columns=['num_0'], categorical_columns=['cat_0'],
+                 interaction_columns=['num_0', 'num_1'])
+    _, transformers = build_features(frame, chunk_size=0, **steps)
+    threads, processes = (
+        build_features(
+            frame, transformers=transformers, backend=backend, **steps, **options
+        )[0]
+        for backend in ('threads', 'processes')
+    )
+    pd.testing.assert_frame_equal(processes, threads)
+    assert shm_files() == before
@@ -0,0 +1,171 @@
+"""
+Tests of the mergeable sketches and of the dataset profile built on them.
+"""
+
+from pathlib import Path
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.utils.sketches import (
+    FrequentItems,
+    HyperLogLog,
+    Moments,
+    QuantileSketch,
+)
+from {{ cookiecutter.module_name }}.visualization.profile import DatasetProfile, profile_dataset
+
+
+def split(values: np.ndarray, parts: int = 7) -> List[np.ndarray]:
+    # Uneven parts, including an empty one
+    bounds = np.random.default_rng(1).integers(0, len(values), parts)
+    return np.split(values, np.sort(bounds))
+
+
+def test_merged_moments_are_exact() -> None:
+    values = np.random.default_rng(0).gamma(2.0, 3.0, size=10_000)
+    merged = Moments()
+    for part in split(values):
+        merged.merge(Moments().update(part))
+    merged.merge(Moments())
+    expected = pd.Series(values)
+    assert merged.count == len(values)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+    assert merged.sum == pytest.approx(values.sum(), rel=1e-12)
+    assert merged.mean == pytest.approx(expected.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(expected.std(), rel=1e-12)
+    assert merged.skewness == pytest.approx(expected.skew(), rel=1e-9)
+    assert merged.kurtosis == pytest.approx(expected.kurt(), rel=1e-9)
+    assert Moments().update([np.nan]).to_dict()['mean'] is None
+
+
+def test_merged_quantiles_are_within_the_rank_error() -> None:
+    values = np.random.default_rng(0).lognormal(size=100_000)
+    merged = QuantileSketch(seed=0)
+    for part in split(values, 20):
+        merged.merge(QuantileSketch(seed=0).update(part))
+    assert merged.count == len(values)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+    qs = np.array([0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+    ranks = np.searchsorted(np.sort(values), merged.quantile(qs)) / len(values)
+    np.testing.assert_allclose(ranks, qs, atol=0.02)
+    points = np.quantile(values, qs)
+    np.testing.assert_allclose(merged.cdf(points), qs, atol=0.02)
+    counts, edges = merged.histogram(10)
+    assert counts.sum() == pytest.approx(len(values))
+    exact, _ = np.histogram(values, edges)
+    np.testing.assert_allclose(counts, exact, atol=0.02 * len(values))
+
+
+def test_merged_distinct_count_matches_a_single_sketch() -> None:
+    values = np.random.default_rng(0).integers(0, 50_000, size=200_000)
+    whole = HyperLogLog().update(values)
+    merged = HyperLogLog()
+    for part in split(values):
+        merged.merge(HyperLogLog().update(part))
+    np.testing.assert_array_equal(merged.registers, whole.registers)
+    exact = len(np.unique(values))
+    assert merged.estimate() == pytest.approx(exact, rel=0.03)
+    # Integers and whole floats are the same values
+    assert HyperLogLog().update(values[:100].astype(float)).estimate() == (
+        HyperLogLog().update(values[:100]).estimate()
+    )
+    with pytest.raises(ValueError, match='precision'):
+        merged.merge(HyperLogLog(precision=10))
+
+
+def test_merged_frequent_items_bound_the_true_counts() -> None:
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        np.repeat(['a', 'b', 'c'], [3_000, 2_000, 1_000]),
+        rng.integers(0, 5_000, size=10_000).astype(str),
+    ])
+    rng.shuffle(values)
+    merged = FrequentItems(capacity=20)
+    for part in split(values, 10):
+        merged.merge(FrequentItems(capacity=20).update(part))
+
+    true_counts = pd.Series(values).value_counts()
+    assert [value for value, _ in merged.top(3)] == ['a', 'b', 'c']
+    assert merged.error <= len(values) / 21
+    for value, count in merged.top(20):
+        assert true_counts[value] - merged.error <= count <= true_counts[value]
+
+
+@pytest.fixture
+def mixed_csv(tmp_path: Path) -> Path:
+    rng = np.random.default_rng(0)
+    rows = 4_000
+    # Digit-only codes in some chunks and alphanumeric codes in others, so
+    # that chunks are read as numeric or as categorical
+    codes = np.where(
+        (np.arange(rows) // 500) % 3 == 0,
+        rng.integers(100, 130, size=rows).astype(str),
+        np.char.add('A', rng.integers(0, 30, size=rows).astype(str)),
+    )
+    path = tmp_path / 'mixed.csv'
+    pd.DataFrame({
+        'code': codes,
+        'value': rng.normal(size=rows),
+        'flag': rng.integers(0, 2, size=rows).astype(bool),
+    }).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('backend', ['threads', 'processes'])
+def test_parallel_profile_matches_sequential(
+    mixed_csv: Path,
+    tmp_path: Path,
+    backend: str
+) -> None:
+    options = dict(chunk_size=500, figures=False)
+    sequential = profile_dataset(
+        mixed_csv, output_dir=tmp_path / 'sequential', n_jobs=1, **options
+    ).to_dict(top_k=100)
+    parallel = profile_dataset(
+        mixed_csv, output_dir=tmp_path / 'parallel', n_jobs=2, backend=backend,
+        **options
+    ).to_dict(top_k=100)
+
+    assert parallel['rows'] == sequential['rows'] == 4_000
+    code, expected = parallel['columns']['code'], sequential['columns']['code']
+    assert code['kind'] == expected['kind'] == 'categorical'
+    assert code['distinct'] == expected['distinct'] == 60
+    top = {item['value']: item['count'] for item in code['top_values']}
+    assert top == {item['value']: item['count'] for item in expected['top_values']}
+    assert sum(top.values()) == 4_000 and '100' in top
+
+    for name in ('value', 'flag'):
+        column, expected = parallel['columns'][name], sequential['columns'][name]
+        assert column['kind'] == expected['kind']
+        for key in ('count', 'min', 'max', 'mean', 'std'):
+            assert column[key] == pytest.approx(expected[key], rel=1e-9)
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_dataframes_are_profiled_in_chunks(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    n_jobs: int
+) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'x': rng.normal(size=1_000), 'y': rng.integers(0, 5, 1_000)})
+    sizes: List[int] = []
+    update = DatasetProfile.update
+
+    def spy(self: DatasetProfile, chunk: pd.DataFrame) -> Any:
+        sizes.append(len(chunk))
+        return update(self, chunk)
+
+    monkeypatch.setattr(DatasetProfile, 'update', spy)
+    profile = profile_dataset(
+        df, output_dir=tmp_path, chunk_size=100, n_jobs=n_jobs, figures=False
+    )
+    assert sizes == [100] * 10
+    summary = profile.to_dict()
+    assert summary['rows'] == 1_000
+    assert summary['columns']['x']['mean'] == pytest.approx(df['x'].mean(), rel=1e-9)
+    assert summary['columns']['y']['distinct'] == 5
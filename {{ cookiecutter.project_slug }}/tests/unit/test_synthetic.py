@@ -0,0 +1,89 @@
+"""
+Tests of the synthetic dataset generator.
+
+The generated data must depend on the spec only, not on how it was chunked
+or parallelized, and read back identically from every file format.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.data.data_loader import load_csv, load_numpy, load_parquet
+from {{ cookiecutter.module_name }}.data.synthetic import (
+    BLOCK_ROWS,
+    EXCEL_MAX_ROWS,
+    SyntheticSpec,
+    generate_frame,
+    generate_rows,
+    iter_synthetic,
+    synthetic_dataset,
+    write_synthetic,
+)
+
+ROWS = 2 * BLOCK_ROWS + 123
+
+
+def test_data_do_not_depend_on_chunking_or_workers() -> None:
+    spec = SyntheticSpec(rows=ROWS, null_rate=0.05)
+    expected = generate_frame(spec)
+    chunked = pd.concat(iter_synthetic(spec, chunk_size=1, n_jobs=3))
+    pd.testing.assert_frame_equal(chunked, expected)
+    pd.testing.assert_frame_equal(
+        generate_rows(spec, 1_000, BLOCK_ROWS + 7), expected.iloc[1_000:BLOCK_ROWS + 7]
+    )
+    assert not generate_frame(SyntheticSpec(rows=ROWS, seed=1)).equals(expected)
+
+
+def test_shape_follows_spec() -> None:
+    spec = SyntheticSpec(
+        rows=ROWS, numeric=3, categorical=2, datetime=2, cardinality=(5, 1_000), null_rate=0.2
+    )
+    df = generate_frame(spec)
+    assert list(df.columns) == spec.columns
+    assert len(df) == ROWS
+    assert df['cat_0'].nunique() == 5
+    assert 900 < df['cat_1'].nunique() <= 1_000
+    features = df.drop(columns='target')
+    np.testing.assert_allclose(features.isna().mean(), 0.2, atol=0.01)
+    assert df['target'].notna().all() and set(df['target'].unique()) == {0, 1}
+    assert pd.api.types.is_datetime64_any_dtype(df['ts_0'])
+
+
+def test_invalid_spec_raises() -> None:
+    with pytest.raises(ValueError, match='cardinalities'):
+        SyntheticSpec(rows=10, categorical=2, cardinality=(3,))
+    with pytest.raises(ValueError, match='null_rate'):
+        SyntheticSpec(rows=10, null_rate=1.5)
+    with pytest.raises(ValueError, match='Excel'):
+        write_synthetic(SyntheticSpec(rows=EXCEL_MAX_ROWS + 1), 'unused.xlsx')
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'npy'])
+def test_files_read_back_as_generated(tmp_path: Path, fmt: str) -> None:
+    spec = SyntheticSpec(rows=ROWS, null_rate=0.1)
+    path = write_synthetic(spec, tmp_path / f'data.{fmt}', chunk_size=BLOCK_ROWS, n_jobs=2)
+    expected = generate_frame(spec)
+    if fmt == 'npy':
+        np.testing.assert_array_equal(load_numpy(path), expected[spec.numeric_columns].to_numpy())
+        return
+    df = load_csv(path, parse_dates=['ts_0']) if fmt == 'csv' else load_parquet(path)
+    # CSV has no categorical dtype and its floats are parsed to within one ulp
+    dtypes = {'cat_0': str, 'cat_1': str, 'ts_0': 'datetime64[ns]'}
+    expected = expected.reset_index(drop=True).astype(dtypes)
+    df = df.astype(dtypes)
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False, rtol=1e-15)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_datasets_are_cached(tmp_path: Path, synthetic_data: Callable[..., Path]) -> None:
+    spec = SyntheticSpec(rows=1_000)
+    path = synthetic_dataset(spec, 'csv', cache_dir=tmp_path)
+    modified = path.stat().st_mtime_ns
+    assert synthetic_dataset(spec, 'csv', cache_dir=tmp_path) == path
+    assert path.stat().st_mtime_ns == modified
+    assert synthetic_dataset(SyntheticSpec(rows=1_001), 'csv', cache_dir=tmp_path) != path
+    assert synthetic_data(rows=1_000, fmt='parquet').exists()
@@ -0,0 +1,111 @@
+"""
+Tests of incremental training and its checkpoints.
+"""
+
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.models.model_utils import load_model, save_model
+from {{ cookiecutter.module_name }}.models.train_model import (
+    train_incremental,
+    train_model_incremental,
+)
+from {{ cookiecutter.module_name }}.utils.parallel import iter_slices
+
+# Deterministic updates that do not depend on the chunk boundaries
+SGD = dict(shuffle=False, random_state=0, learning_rate='constant', eta0=0.01)
+
+
+@pytest.fixture
+def frame(synthetic_frame: Callable[..., pd.DataFrame]) -> pd.DataFrame:
+    return synthetic_frame(rows=300, numeric=3, categorical=0, datetime=0)
+
+
+def interrupted(chunks: Iterator[pd.DataFrame], after: int) -> Iterator[pd.DataFrame]:
+    for i, chunk in enumerate(chunks):
+        if i == after:
+            raise KeyboardInterrupt
+        yield chunk
+
+
+def test_resume_with_another_chunk_size(frame: pd.DataFrame, tmp_path: Path) -> None:
+    checkpoint = tmp_path / 'model.ckpt'
+    options: Any = dict(source='data-v1', checkpoint_path=checkpoint,
+                        checkpoint_every=1, classes=[0, 1], **SGD)
+    with pytest.raises(KeyboardInterrupt):
+        train_incremental(interrupted(iter_slices(frame, 70), after=2), **options)
+    state = load_model(checkpoint)
+    assert state.rows == 140 and state.sources == {'data-v1': 140}
+
+    # Rows already trained on are skipped, even mid-chunk
+    state = train_incremental(iter_slices(frame, 45), **options)
+    assert state.rows == len(frame)
+    assert state.sources == {} and state.completed == ['data-v1']
+
+    expected = train_incremental(iter_slices(frame, 100), classes=[0, 1], **SGD)
+    np.testing.assert_allclose(state.model.coef_, expected.model.coef_)
+    np.testing.assert_allclose(state.model.intercept_, expected.model.intercept_)
+
+
+def test_completed_sources_are_skipped_and_capped(
+    frame: pd.DataFrame,
+    tmp_path: Path
+) -> None:
+    checkpoint = tmp_path / 'model.ckpt'
+    options: Any = dict(checkpoint_path=checkpoint, max_completed=2, **SGD)
+    train_incremental(iter_slices(frame, 100), source='day-1', **options)
+    coef = load_model(checkpoint).model.coef_.copy()
+    state = train_incremental(iter_slices(frame, 100), source='day-1', **options)
+    assert state.rows == len(frame)
+    np.testing.assert_array_equal(state.model.coef_, coef)
+
+    for day in ('day-2', 'day-3'):
+        state = train_incremental(iter_slices(frame, 100), source=day, **options)
+    assert state.completed == ['day-2', 'day-3']
+    assert state.rows == 3 * len(frame)
+    # A forgotten source is trained on again
+    state = train_incremental(iter_slices(frame, 100), source='day-1', **options)
+    assert state.rows == 4 * len(frame)
+    assert state.completed == ['day-3', 'day-1']
+
+
+def test_unchanged_dataset_is_not_trained_twice(
+    frame: pd.DataFrame,
+    tmp_path: Path
+) -> None:
+    data_path = tmp_path / 'train.parquet'
+    frame.to_parquet(data_path)
+    model_path = tmp_path / 'model.joblib'
+    options: Any = dict(model_path=model_path, chunk_size=64, **SGD)
+    model = train_model_incremental(data_path, **options)
+    assert load_model(model_path.with_suffix('.ckpt')).rows == len(frame)
+    again = train_model_incremental(data_path, **options)
+    np.testing.assert_array_equal(again.coef_, model.coef_)
+
+    # An updated file is a new source
+    frame.head(50).to_parquet(data_path)
+    os.utime(data_path, ns=(1, 1))
+    train_model_incremental(data_path, **options)
+    state = load_model(model_path.with_suffix('.ckpt'))
+    assert state.rows == len(frame) + 50 and len(state.completed) == 2
+
+
+class Unpicklable:
+    def __reduce__(self) -> Any:
+        raise pickle.PicklingError('cannot pickle')
+
+
+@pytest.mark.parametrize('engine', ['joblib', 'pickle'])
+def test_failed_save_keeps_the_previous_model(tmp_path: Path, engine: str) -> None:
+    path = tmp_path / 'model.joblib'
+    save_model({'version': 1}, path, engine=engine)
+    with pytest.raises(pickle.PicklingError):
+        save_model({'version': 2, 'bad': Unpicklable()}, path, engine=engine)
+    assert load_model(path, engine=engine) == {'version': 1}
+    assert [p.name for p in tmp_path.iterdir()] == ['model.joblib']
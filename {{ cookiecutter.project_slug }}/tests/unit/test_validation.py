@@ -0,0 +1,120 @@
+"""
+Tests of chunked schema validation.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.module_name }}.data.validation import (
+    DatasetSchema,
+    ValidationError,
+    Validator,
+    validate_dataset,
+)
+
+
+def validator(strict: bool = False, **columns: Dict[str, Any]) -> Validator:
+    schema = DatasetSchema.model_validate({'columns': columns, 'strict': strict})
+    return Validator(schema)
+
+
+def run(validator: Validator, *chunks: List[Any]) -> List[List[bool]]:
+    return [
+        validator.validate(pd.DataFrame({'id': chunk})).tolist() for chunk in chunks
+    ]
+
+
+def test_uniqueness_holds_across_chunks() -> None:
+    unique = validator(id={'dtype': 'int', 'unique': True})
+    assert run(unique, [1, 2], [], [3, 1], [2.0, 4.0, 4.0], []) == [
+        [True, True], [], [True, False], [False, True, False], []
+    ]
+    assert unique.report.errors == {('id', 'unique'): 3}
+    assert (unique.report.rows, unique.report.invalid_rows) == (7, 3)
+    assert [sample['row'] for sample in unique.report.samples] == [1, 0, 2]
+
+
+def test_missing_and_mistyped_values_are_not_duplicates() -> None:
+    unique = validator(id={'dtype': 'int', 'unique': True})
+    assert run(unique, [1.0, np.nan, 2.0], [np.nan, np.nan], [1, 'x', 2, 'x', 3]) == [
+        [True, True, True], [True, True], [False, False, False, False, True]
+    ]
+    assert unique.report.errors == {('id', 'dtype'): 2, ('id', 'unique'): 2}
+
+    required = validator(id={'dtype': 'string', 'nullable': False, 'unique': True})
+    assert run(required, ['a', None, 'b'], ['b', 3, 'c']) == [
+        [True, False, True], [False, False, True]
+    ]
+    assert required.report.errors == {
+        ('id', 'not_null'): 1, ('id', 'dtype'): 1, ('id', 'unique'): 1
+    }
+
+
+def test_report_counts_checks_and_columns() -> None:
+    checks = validator(
+        strict=True,
+        age={'dtype': 'int', 'min_value': 0, 'max_value': 130},
+        country={'allowed': ['FR', 'DE']},
+        signup={'dtype': 'datetime', 'min_value': '2015-01-01'},
+        email={'dtype': 'string'},
+    )
+    chunks = [
+        pd.DataFrame({
+            'age': [30, -1, 200, 41.5],
+            'country': ['FR', 'US', None, 'DE'],
+            'signup': ['2020-01-01', '2010-05-01', 'soon', None],
+            'extra': [1, 2, 3, 4],
+        }),
+        pd.DataFrame({
+            'age': [50, 60],
+            'country': ['DE', 'FR'],
+            'signup': ['2021-01-01', '2022-01-01'],
+            'extra': [5, 6],
+        }),
+    ]
+    valid = [checks.validate(chunk).tolist() for chunk in chunks]
+    assert valid == [[True, False, False, False], [True, True]]
+    report = checks.report
+    assert report.errors == {
+        ('age', 'min_value'): 1, ('age', 'max_value'): 1, ('age', 'dtype'): 1,
+        ('country', 'allowed'): 1, ('signup', 'min_value'): 1,
+        ('signup', 'dtype'): 1, ('email', 'missing'): 1, ('extra', 'unexpected'): 1,
+    }
+    assert (report.rows, report.invalid_rows, report.ok) == (6, 3, False)
+    assert len(report.samples) == 6
+    assert report.samples[0]['check'] == 'dtype' and report.samples[0]['value'] == 41.5
+    assert report.to_dict()['errors'][0]['count'] == 1
+    assert report.summary().startswith('3 of 6 rows invalid')
+    with pytest.raises(ValidationError, match='email: missing'):
+        report.raise_for_errors()
+
+
+def test_invalid_rows_are_dropped(tmp_path: Path) -> None:
+    path = tmp_path / 'input.csv'
+    pd.DataFrame({
+        'id': [1, 2, 2, 3, None, 4, 1],
+        'age': [10, -5, 20, 30, 40, 50, 60],
+    }).to_csv(path, index=False)
+    schema = tmp_path / 'schema.yml'
+    schema.write_text(
+        'columns:\n'
+        '  id: {dtype: int, nullable: false, unique: true}\n'
+        '  age: {dtype: int, min_value: 0}\n'
+    )
+
+    for chunk_size in (2, 3, 7):
+        checks = Validator(DatasetSchema.from_yaml(schema))
+        chunks = pd.read_csv(path, chunksize=chunk_size)
+        df = pd.concat(checks.iter(chunks, drop_invalid=True))
+        assert df['id'].tolist() == [1.0, 3.0, 4.0]
+        assert checks.report.invalid_rows == 4
+
+    report = validate_dataset(path, schema, chunk_size=2)
+    assert report.errors == {
+        ('id', 'unique'): 2, ('id', 'not_null'): 1, ('age', 'min_value'): 1
+    }
+    assert report.rows == 7 and report.invalid_rows == 4